@@ -19,6 +19,12 @@ Commands:
   optimize                        Cost-optimization hints (pod density, LoadBalancers)
   chaos  <ns> <selector> [live]   Inject pod failure (default: dry-run; pass 'live' to act)
   provider                        Detect cloud provider, CNI, pending LoadBalancers
+  simulate [--drain=<n1,n2>] [--add-nodes=<N>:like=<node>|cpu=..,memory=..,pods=..]
+           [--scale=<ns>/<deploy>=<n>]
+                                  What-if bin-packing: which pods would (stop) fitting
+  analyze-logs <path...> [--workers=N] [--chunk-mb=N]
+                                  Pattern-match log files on disk: per-class counts,
+                                  first/last offsets and timestamps (no cluster needed)
 
 Flags:
   --dry-run     Preview what a fix command would do without making changes.
@@ -38,7 +44,12 @@ try:
     from src.k8s_diagnostics.core.client import K8sClient
     from src.k8s_diagnostics.automation.diagnostics import DiagnosticsEngine
     from src.k8s_diagnostics.automation.fixes import AutoFixer
+    from src.k8s_diagnostics.automation.mutations import MutationExecutor
+    from src.k8s_diagnostics.automation.registry import DETECTORS_BY_TYPE, parse_detector_list
+    from src.k8s_diagnostics.automation.runner import DetectorRunner
     from src.k8s_diagnostics.automation.chaos import ChaosEngine
+    from src.k8s_diagnostics.automation.simulator import Scenario
+    from src.k8s_diagnostics.analysis.log_files import DEFAULT_CHUNK_BYTES, analyze_files
 except ModuleNotFoundError as exc:
     IMPORT_ERROR = exc
 
@@ -50,11 +61,63 @@ def _parse_args(argv):
     return positional, flags
 
 
+def _flag_values(flags, name):
+    """Values of every --name=value flag, in sorted order."""
+    prefix = f"{name}="
+    return sorted(f[len(prefix):] for f in flags if f.startswith(prefix))
+
+
+def analyze_logs(paths, flags):
+    """Match the pattern library against log files on disk; needs no cluster."""
+    usage = "Usage: analyze-logs <path...> [--workers=N] [--chunk-mb=N]"
+    workers = _flag_values(flags, "--workers")
+    chunk_mb = _flag_values(flags, "--chunk-mb")
+    if len(workers) > 1 or len(chunk_mb) > 1:
+        print(f"{usage}  (give --workers and --chunk-mb at most once)")
+        sys.exit(1)
+    try:
+        workers = int(workers[0]) if workers else None
+        chunk_mb = float(chunk_mb[0]) if chunk_mb else None
+    except ValueError:
+        print(usage)
+        sys.exit(1)
+    if (workers is not None and workers < 1) or (chunk_mb is not None and not 0 < chunk_mb < float("inf")):
+        print(f"{usage}  (--workers must be >= 1, --chunk-mb > 0)")
+        sys.exit(1)
+    missing = [p for p in paths if not os.path.isfile(p)]
+    if missing:
+        print(f"analyze-logs: not a file: {', '.join(missing)}")
+        sys.exit(1)
+    chunk_bytes = int(chunk_mb * 1024 * 1024) if chunk_mb else DEFAULT_CHUNK_BYTES
+    print(json.dumps(analyze_files(paths, workers=workers, chunk_bytes=chunk_bytes), indent=2))
+
+
 class DiagnosticsCLI:
     def __init__(self):
         self.k8s = K8sClient()
-        self.diagnostics = DiagnosticsEngine(self.k8s)
-        self.fixer = AutoFixer(self.k8s)
+        if os.environ.get("K8S_DIAGNOSTICS_RAW_JSON") == "1":
+            self.k8s.enable_raw_json()
+        self.diagnostics = DiagnosticsEngine(
+            self.k8s,
+            pod_page_size=int(os.getenv("K8S_DIAGNOSTICS_POD_PAGE_SIZE", "0")) or None,
+            detector_runner=DetectorRunner(
+                max_workers=int(os.getenv("K8S_DIAGNOSTICS_DETECTOR_CONCURRENCY", "8")),
+                timeout_seconds=float(os.getenv("K8S_DIAGNOSTICS_DETECTOR_TIMEOUT_SECONDS", "30")),
+            ),
+            enabled_detectors=parse_detector_list(os.getenv("K8S_DIAGNOSTICS_DETECTORS")),
+            disabled_detectors=parse_detector_list(os.getenv("K8S_DIAGNOSTICS_SKIP_DETECTORS")),
+            incremental=os.environ.get("K8S_DIAGNOSTICS_INCREMENTAL") == "1",
+            pod_scan_timeout_seconds=float(os.getenv("K8S_DIAGNOSTICS_POD_SCAN_TIMEOUT_SECONDS", "120")),
+        )
+        self.fixer = AutoFixer(
+            self.k8s,
+            executor=MutationExecutor(
+                qps=float(os.getenv("K8S_DIAGNOSTICS_MUTATION_QPS", "20")),
+                burst=int(os.getenv("K8S_DIAGNOSTICS_MUTATION_BURST", "40")),
+                per_namespace=int(os.getenv("K8S_DIAGNOSTICS_MUTATION_NAMESPACE_CONCURRENCY", "4")),
+                pdb_wait_seconds=float(os.getenv("K8S_DIAGNOSTICS_PDB_WAIT_SECONDS", "60")),
+            ),
+        )
         self.chaos = ChaosEngine(self.k8s)
         self.k8s.fixer = self.fixer
 
@@ -108,14 +171,21 @@ class DiagnosticsCLI:
     async def optimize(self):
         print(json.dumps(self.diagnostics.optimize_costs(), indent=2))
 
+    async def simulate(self, scenario):
+        print(json.dumps(await self.diagnostics.simulate_capacity(scenario), indent=2))
+
     async def provider_diag(self):
         print(json.dumps(self.diagnostics.provider_diagnostics(), indent=2))
 
     async def provider_check(self):
         """Run provider-specific cloud infrastructure checks (AKS/EKS/GKE)."""
+        from src.k8s_diagnostics.core.snapshot import ClusterSnapshot
         from src.k8s_diagnostics.providers.detector import detect_provider, run_provider_checks
-        provider = detect_provider(self.k8s)
-        issues = run_provider_checks(self.k8s)
+        snapshot = ClusterSnapshot.fetch(
+            self.k8s, kinds=("nodes", "pods", "services", "persistentvolumes")
+        )
+        provider = detect_provider(self.k8s, snapshot)
+        issues = run_provider_checks(self.k8s, snapshot=snapshot)
         print(json.dumps({
             "provider": provider or "unknown",
             "issues_found": len([i for i in issues if i.get("severity") != "info"]),
@@ -142,219 +212,21 @@ class DiagnosticsCLI:
                 "details": issue.get("details") or issue.get("scheduling_analysis"),
             }
 
-            # Map each detected issue type to its dry-run fix
-            if issue["type"] == "failed_pods":
-                fix = await self.fixer.restart_failed_pods(dry_run=True)
-                entry["suggested_fix"] = fix
-            elif issue["type"] == "dns_unhealthy":
-                fix = await self.fixer.fix_dns_issues(dry_run=True)
-                entry["suggested_fix"] = fix
-            elif issue["type"] == "image_pull_errors":
-                fix = await self.fixer.fix_image_pull_errors(dry_run=True)
-                entry["suggested_fix"] = fix
-            elif issue["type"] == "service_selector_mismatch":
-                fix = await self.fixer.fix_service_selector_mismatches(dry_run=True)
-                entry["suggested_fix"] = fix
-            elif issue["type"] == "configmap_key_mismatch":
-                fix = await self.fixer.fix_configmap_key_mismatches(dry_run=True)
-                entry["suggested_fix"] = fix
-            elif issue["type"] == "ingress_backend_missing_service":
-                fix = await self.fixer.fix_ingress_backends(dry_run=True)
-                entry["suggested_fix"] = fix
-            elif issue["type"] == "aggressive_liveness_probe":
-                fix = await self.fixer.fix_aggressive_liveness_probes(dry_run=True)
-                entry["suggested_fix"] = fix
-            elif issue["type"] == "gitops_controller_unhealthy":
-                fix = await self.fixer.restart_unhealthy_gitops_controllers(dry_run=True)
-                entry["suggested_fix"] = fix
-            elif issue["type"] == "gitops_crd_missing":
-                entry["suggested_fix"] = {
-                    "action": "manual_required",
-                    "hint": (
-                        "Reapply the GitOps controller install manifests. "
-                        "For Argo CD CRD annotation errors, use: "
-                        "kubectl apply --server-side --force-conflicts -n argocd "
-                        "-f https://raw.githubusercontent.com/argoproj/argo-cd/stable/manifests/install.yaml"
-                    ),
-                }
-            elif issue["type"] == "argocd_application_unhealthy":
-                entry["suggested_fix"] = {
-                    "action": "manual_required",
-                    "hint": (
-                        "kubectl describe application <name> -n <ns>; "
-                        "inspect repo/auth/path errors, then fix Git or sync/revert in Argo CD. "
-                        "The CLI does not patch Application state because Git should remain the source of truth."
-                    ),
-                }
-            elif issue["type"] == "flux_resource_not_ready":
-                entry["suggested_fix"] = {
-                    "action": "manual_required",
-                    "hint": (
-                        "kubectl describe gitrepository <name> -n <ns> "
-                        "(or describe the affected kustomization/helmrelease); "
-                        "fix source auth, path, dependency, or Helm values in Git, then reconcile. "
-                        "The CLI does not patch Flux custom resources because Git should remain the source of truth."
-                    ),
-                }
-            elif issue["type"] == "pvc_not_bound":
-                entry["suggested_fix"] = {
-                    "action": "manual_required",
-                    "hint": "kubectl describe pvc <name> — check StorageClass and provisioner",
-                }
-            elif issue["type"] == "load_balancer_pending":
-                entry["suggested_fix"] = {
-                    "action": "manual_required",
-                    "hint": (
-                        "Check Azure/AWS LB quota and cloud-controller-manager logs: "
-                        "kubectl logs -n kube-system -l component=cloud-controller-manager"
-                    ),
-                }
-            elif issue["type"] == "nodes_not_ready":
-                entry["suggested_fix"] = {
-                    "action": "manual_required",
-                    "hint": (
-                        "kubectl describe node <node> — check Conditions section; "
-                        "journalctl -u kubelet on the node"
-                    ),
-                }
-            elif issue["type"] == "node_pressure":
-                entry["suggested_fix"] = {
-                    "action": "manual_required",
-                    "hint": (
-                        "kubectl describe node <node> — check Conditions and Allocatable. "
-                        "MemoryPressure: free memory or evict pods. "
-                        "DiskPressure: clear logs/images with 'crictl rmi --prune'. "
-                        "PIDPressure: check for fork-bombing processes on node. "
-                        "NetworkUnavailable: check CNI plugin pods in kube-system."
-                    ),
-                }
-            elif issue["type"] == "warning_events":
-                entry["suggested_fix"] = {
-                    "action": "manual_required",
-                    "hint": (
-                        "kubectl get events -A --field-selector type=Warning "
-                        "--sort-by=.lastTimestamp | tail -30 — "
-                        "then use 'diagnose <ns> <pod>' for any affected pod"
-                    ),
-                }
-            elif issue["type"] == "control_plane_unhealthy":
-                entry["suggested_fix"] = {
-                    "action": "manual_required",
-                    "hint": (
-                        "kubectl get componentstatuses — "
-                        "etcd: check etcd pod logs and disk space. "
-                        "scheduler/controller-manager: check kube-system pod logs. "
-                        "Note: on AKS/EKS/GKE the control plane is managed and not visible here."
-                    ),
-                }
-            elif issue["type"] == "pending_pods":
-                entry["suggested_fix"] = {
-                    "action": "see_scheduling_analysis",
-                    "hint": (
-                        "Each pending pod's root cause is in scheduling_analysis above. "
-                        "Use 'diagnose <ns> <pod>' for full detail."
-                    ),
-                }
-            elif issue["type"] == "high_restart_count":
-                # High restart count → check for aggressive liveness probes first
-                fix = await self.fixer.fix_aggressive_liveness_probes(dry_run=True)
-                entry["suggested_fix"] = fix
-                entry["suggested_fix"]["hint"] = (
-                    "Use 'diagnose <ns> <pod>' to see exit code analysis. "
-                    "Exit 137=OOMKill (raise memory limits), "
-                    "Exit 143=SIGTERM (fix liveness probe initialDelaySeconds)"
-                )
-            elif issue["type"] == "probe_failures":
-                entry["suggested_fix"] = {
-                    "action": "manual_required",
-                    "hint": (
-                        "Use 'diagnose <ns> <pod>' to get per-container probe analysis "
-                        "showing mismatched ports, wrong paths, and low initialDelaySeconds"
-                    ),
-                }
-            elif issue["type"] == "init_containers_blocked":
-                entry["suggested_fix"] = {
-                    "action": "manual_required",
-                    "hint": (
-                        "Run: kubectl logs <pod> -n <ns> -c <init-container>. "
-                        "If logs say a service is not ready, verify it with: "
-                        "kubectl get svc,endpoints,endpointslice -n <ns> | grep <service>. "
-                        "Fix the missing Service/endpoints; remove initContainers only as a lab workaround."
-                    ),
-                }
-            elif issue["type"] == "crashloop_backoff":
-                # CrashLoopBackOff pods are caught by restart_failed_pods; dry-run it
-                fix = await self.fixer.restart_failed_pods(dry_run=True)
-                entry["suggested_fix"] = fix
-                entry["suggested_fix"]["hint"] = (
-                    "kubectl logs <pod> -n <ns> --previous for root cause; "
-                    "Exit 137=OOMKill (raise memory limits), "
-                    "Exit 127=bad command (check entrypoint), Exit 1=app error"
-                )
-            elif issue["type"] == "stuck_terminating":
-                entry["suggested_fix"] = {
-                    "action": "manual_required",
-                    "hint": (
-                        "kubectl patch pod <pod> -n <ns> "
-                        "-p '{\"metadata\":{\"finalizers\":[]}}' --type=merge — "
-                        "WARNING: only do this after confirming the finalizer owner is gone"
-                    ),
-                }
-            elif issue["type"] == "missing_config_refs":
-                entry["suggested_fix"] = {
-                    "action": "manual_required",
-                    "hint": (
-                        "Create the missing ConfigMap or Secret shown above, "
-                        "or set optional=true in the pod spec if the ref is non-critical"
-                    ),
-                }
-            elif issue["type"] == "networkpolicy_deny_all":
-                entry["suggested_fix"] = {
-                    "action": "manual_required",
-                    "hint": (
-                        "kubectl get networkpolicy -n <ns> -o yaml — "
-                        "add an ingress allow rule, or create a second NetworkPolicy "
-                        "that explicitly allows traffic from the required sources"
-                    ),
-                }
-            elif issue["type"] == "hpa_issues":
-                entry["suggested_fix"] = {
-                    "action": "manual_required",
-                    "hint": (
-                        "kubectl describe hpa -n <ns> — "
-                        "ScalingActive=False usually means metrics-server is down or "
-                        "the metric name in the HPA spec does not match what is exposed. "
-                        "Check: kubectl top pods -n <ns>"
-                    ),
-                }
-            elif issue["type"] == "tls_cert_expiring":
-                entry["suggested_fix"] = {
-                    "action": "manual_required",
-                    "hint": (
-                        "If using cert-manager: "
-                        "kubectl annotate certificate <name> -n <ns> "
-                        "cert-manager.io/renewal-reason=manual-$(date +%s). "
-                        "If manual: replace tls.crt and tls.key in the Secret."
-                    ),
-                }
-            elif issue["type"] == "stuck_jobs":
-                entry["suggested_fix"] = {
-                    "action": "manual_required",
-                    "hint": (
-                        "kubectl describe job <name> -n <ns> — check pod logs for exit reason. "
-                        "To retry: kubectl delete job <name> -n <ns> and recreate. "
-                        "Note: Jobs are immutable — you must delete and recreate to change spec."
-                    ),
-                }
-            elif issue["type"] == "daemonset_not_fully_scheduled":
-                entry["suggested_fix"] = {
-                    "action": "manual_required",
-                    "hint": (
-                        "kubectl describe ds <name> -n <ns> — "
-                        "check nodeSelector and tolerations match all target nodes. "
-                        "New nodes may need labels: kubectl label node <node> <key>=<value>"
-                    ),
+            # Dry-run the fixers the detector registry links to this issue type
+            detector = DETECTORS_BY_TYPE.get(issue["type"])
+            if detector and detector.fixers:
+                fixes = {
+                    label: await getattr(self.fixer, method)(dry_run=True)
+                    for label, method in detector.fixers
                 }
+                if len(fixes) == 1:
+                    entry["suggested_fix"] = next(iter(fixes.values()))
+                else:
+                    entry["suggested_fix"] = {"action": "multiple_fixes", "fixes": fixes}
+                if detector.remediation:
+                    entry["suggested_fix"]["hint"] = detector.remediation
+            elif detector and detector.remediation:
+                entry["suggested_fix"] = {"action": "manual_required", "hint": detector.remediation}
             elif issue.get("layer") == "layer5" or issue.get("provider"):
                 # Provider-layer issue — the suggested_action from the detector is the hint
                 entry["suggested_fix"] = {
@@ -376,12 +248,23 @@ class DiagnosticsCLI:
 
     # ─── Mutating commands (all support --dry-run) ──────────────
 
+    @staticmethod
+    def _progress(tally):
+        """Running tally of a mutation pass, on stderr so stdout stays JSON."""
+        print(
+            f"\r{tally['done']}/{tally['total']} done "
+            f"({tally['ok']} ok, {tally['failed']} failed, {tally['skipped']} skipped)",
+            end="\n" if tally["done"] == tally["total"] else "",
+            file=sys.stderr,
+            flush=True,
+        )
+
     async def fix_failed_pods(self, dry_run: bool = False):
-        result = await self.fixer.restart_failed_pods(dry_run=dry_run)
+        result = await self.fixer.restart_failed_pods(dry_run=dry_run, progress=self._progress)
         print(json.dumps(result, indent=2))
 
     async def cleanup_evicted(self, dry_run: bool = False):
-        result = await self.fixer.cleanup_evicted_pods(dry_run=dry_run)
+        result = await self.fixer.cleanup_evicted_pods(dry_run=dry_run, progress=self._progress)
         print(json.dumps(result, indent=2))
 
     async def fix_dns(self, dry_run: bool = False):
@@ -465,6 +348,13 @@ def main():
     if "--help" in flags or command in ("-h", "help"):
         _usage(0)
 
+    if command == "analyze-logs":
+        if len(args) < 2:
+            print("Usage: analyze-logs <path...> [--workers=N] [--chunk-mb=N]")
+            sys.exit(1)
+        analyze_logs(args[1:], flags)
+        return
+
     cli = DiagnosticsCLI()
 
     if command == "health":
@@ -533,6 +423,18 @@ def main():
     elif command == "provider-check":
         asyncio.run(cli.provider_check())
 
+    elif command == "simulate":
+        try:
+            scenario = Scenario.parse(
+                add_nodes=_flag_values(flags, "--add-nodes"),
+                drain=",".join(_flag_values(flags, "--drain")),
+                scale=_flag_values(flags, "--scale"),
+            )
+            asyncio.run(cli.simulate(scenario))
+        except ValueError as e:
+            print(f"simulate: {e}")
+            sys.exit(1)
+
     else:
         print(f"Unknown command: '{command}'")
         _usage()
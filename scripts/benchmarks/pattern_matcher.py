@@ -0,0 +1,184 @@
+#!/usr/bin/env python3
+"""Benchmark: pattern_matcher.match() vs. the original one-regex-at-a-time loop.
+
+Runs both over the same log lines, checks that they return the same
+matches, and reports lines per second. Then times match_log_lines() on
+the whole log as one buffer against the line-by-line path, and match()
+on repetitive Warning event messages with and without a MatchCache.
+With --workers, also writes the log to a temporary file and reports
+analyze_files() throughput at each worker count.
+
+Usage:
+  # Recorded logs (recommended): kubectl logs <pod> --all-containers > pod.log
+  python scripts/benchmarks/pattern_matcher.py --input pod.log
+
+  # Synthetic log of N lines, one in --error-every carrying a known error
+  python scripts/benchmarks/pattern_matcher.py --lines 50000 --error-every 200
+
+  # analyze-logs throughput on 1, 2, 4 and 8 processes
+  python scripts/benchmarks/pattern_matcher.py --lines 2000000 --workers 1,2,4,8
+"""
+
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / "src"))
+
+from k8s_diagnostics.analysis import log_files, pattern_matcher  # noqa: E402
+
+ERROR_LINES = [
+    "Failed to pull image \"registry.example.com/web:1.2.4\": manifest unknown",
+    "Readiness probe failed: Get \"http://10.0.3.7:8080/ready\": dial tcp 10.0.3.7:8080: connect: connection refused",
+    "Liveness probe failed: HTTP probe failed with statuscode: 500",
+    "Container web was OOMKilled (exit code 137)",
+    "0/12 nodes are available: 12 Insufficient memory.",
+    "dial tcp: lookup postgres-service on 10.96.0.10:53: no such host",
+    "x509: certificate has expired or is not yet valid",
+    "Error from server (Forbidden): pods is forbidden: User \"system:serviceaccount:prod:web\" cannot list resource",
+]
+
+
+def synthetic_line(i: int, error_every: int) -> str:
+    if error_every and i % error_every == 0:
+        return ERROR_LINES[i // error_every % len(ERROR_LINES)]
+    return (
+        f"2024-05-01T10:{i // 60 % 60:02d}:{i % 60:02d}.{i % 1000:03d}Z INFO http "
+        f"method=GET path=/api/v1/items/{i} status=200 duration_ms={i % 97} "
+        f"request_id=5f0c{i:08x} user=u{i % 13}"
+    )
+
+
+EVENT_TEMPLATES = [
+    "Back-off restarting failed container app in pod web-{hash}-{pod}_prod({uid})",
+    "0/{nodes} nodes are available: {nodes} Insufficient memory, {cpu} Insufficient cpu.",
+    "Readiness probe failed: Get \"http://{ip}:8080/ready\": dial tcp {ip}:8080: connect: connection refused",
+    "Liveness probe failed: HTTP probe failed with statuscode: 500",
+    "MountVolume.SetUp failed for volume \"cfg-{pod}\" : configmap \"cfg-{pod}\" not found",
+]
+_POD_CHARS = "bcdfghjklmnpqrstvwxz2456789"
+
+
+def synthetic_event(i: int) -> str:
+    def word(n, salt):
+        return "".join(_POD_CHARS[(i * 7 + salt * 13 + k * 5) % len(_POD_CHARS)] for k in range(n))
+
+    return EVENT_TEMPLATES[i % len(EVENT_TEMPLATES)].format(
+        hash=word(9, 1), pod=word(5, 2), uid=f"{i:08x}-0000-4000-8000-{i * 31:012x}",
+        nodes=1000 + i % 3000, cpu=i % 997, ip=f"10.{i // 65536 % 256}.{i // 256 % 256}.{i % 256}",
+    )
+
+
+def reference_match(text: str):
+    """match() as it was before the engine: every IGNORECASE regex, one at a time."""
+    results = []
+    seen_classes = set()
+    for compiled, pattern in pattern_matcher._COMPILED:
+        m = compiled.search(text)
+        if m and pattern.error_class not in seen_classes:
+            seen_classes.add(pattern.error_class)
+            results.append((pattern.error_class, m.group(0)))
+    return results
+
+
+def engine_match(text: str):
+    return [(pm.error_class, pm.signal) for pm in pattern_matcher.match(text)]
+
+
+def bench(label: str, func, lines, repeat: int):
+    best = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        found = [func(line) for line in lines]
+        elapsed = time.perf_counter() - started
+        if best is None or elapsed < best[0]:
+            best = (elapsed, found)
+    elapsed, found = best
+    hits = sum(1 for matches in found if matches)
+    print(f"{label:<24} {elapsed:8.3f}s  {len(lines) / elapsed:12,.0f} lines/s  lines with hits={hits}")
+    return elapsed, found
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--input", help="log file, one message per line")
+    parser.add_argument("--lines", type=int, default=50000, help="synthetic line count")
+    parser.add_argument("--error-every", type=int, default=200, help="synthetic error line interval (0 = none)")
+    parser.add_argument("--events", type=int, default=20000, help="synthetic Warning event count")
+    parser.add_argument("--workers", help="comma-separated analyze_files() worker counts, e.g. 1,2,4")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    if args.input:
+        lines = [
+            line.strip()
+            for line in Path(args.input).read_text(errors="replace").splitlines()
+            if line.strip()
+        ]
+    else:
+        lines = [synthetic_line(i, args.error_every) for i in range(args.lines)]
+    print(f"lines: {len(lines):,}  patterns: {len(pattern_matcher._COMPILED)}")
+
+    reference_s, expected = bench("sequential IGNORECASE", reference_match, lines, args.repeat)
+    engine_s, actual = bench("match()", engine_match, lines, args.repeat)
+    if actual != expected:
+        mismatched = sum(1 for a, b in zip(actual, expected) if a != b)
+        sys.exit(f"match() disagrees with the reference on {mismatched} lines")
+    print(f"speedup: {reference_s / engine_s:.1f}x")
+
+    log_text = "\n".join(lines)
+    print(f"\nlog buffer: {len(log_text) / 1e6:.1f} MB")
+    per_line_s, expected = bench_log("match() per line", pattern_matcher._match_lines, log_text, args.repeat)
+    buffer_s, actual = bench_log("match_log_lines()", pattern_matcher.match_log_lines, log_text, args.repeat)
+    if actual != expected:
+        sys.exit("match_log_lines() disagrees with the line-by-line results")
+    print(f"speedup: {per_line_s / buffer_s:.1f}x")
+
+    events = [synthetic_event(i) for i in range(args.events)]
+    print(f"\nevents: {len(events):,}  templates: {len(EVENT_TEMPLATES)}")
+    cache = pattern_matcher.MatchCache()
+    uncached_s, expected = bench("match()", engine_match, events, args.repeat)
+    cached_s, actual = bench("MatchCache.match()", lambda text: [
+        pm.error_class for pm in cache.match(text)
+    ], events, args.repeat)
+    if actual != [[cls for cls, _ in found] for found in expected]:
+        sys.exit("MatchCache disagrees with match()")
+    print(f"speedup: {uncached_s / cached_s:.1f}x  cache: {cache.stats()}")
+
+    if args.workers:
+        bench_files(log_text, [int(n) for n in args.workers.split(",")])
+
+
+def bench_files(log_text: str, worker_counts):
+    with tempfile.NamedTemporaryFile(suffix=".log") as f:
+        f.write(log_text.encode())
+        f.flush()
+        print(f"\nanalyze_files(): {len(log_text) / 1e6:.1f} MB")
+        baseline = None
+        for workers in worker_counts:
+            result = log_files.analyze_files([f.name], workers=workers, chunk_bytes=8 * 1024 * 1024)
+            if baseline is None:
+                baseline = result
+            elif result["classes"] != baseline["classes"]:
+                sys.exit(f"analyze_files() with {workers} workers disagrees with {baseline['workers']}")
+            print(f"workers={result['workers']:<3} chunks={result['chunks']:<4} "
+                  f"{result['seconds']:8.3f}s  {result['mb_per_second']:8.1f} MB/s")
+
+
+def bench_log(label: str, func, log_text: str, repeat: int):
+    best = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        found = func(log_text)
+        elapsed = time.perf_counter() - started
+        if best is None or elapsed < best[0]:
+            best = (elapsed, found)
+    elapsed, found = best
+    print(f"{label:<24} {elapsed * 1000:8.1f}ms  classes={len(found)}")
+    return best
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""Benchmark: kubernetes model deserialization vs. the raw-JSON view fast path.
+
+Times how long it takes to turn one pod-list response body into objects the
+detectors can read, then to run a detector-style pass over them
+(phase, waiting reason, restart count, deletion timestamp).
+
+Usage:
+  # Recorded list (recommended): kubectl get pods -A -o json > pods.json
+  python scripts/benchmarks/raw_json_list.py --input pods.json
+
+  # Synthetic list of N pods shaped like a typical Deployment replica
+  python scripts/benchmarks/raw_json_list.py --pods 50000
+"""
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / "src"))
+
+from kubernetes.client import ApiClient  # noqa: E402
+
+from k8s_diagnostics.core.views import parse_list  # noqa: E402
+
+
+def synthetic_pod(i: int) -> dict:
+    waiting = i % 50 == 0
+    return {
+        "metadata": {
+            "name": f"web-{i}",
+            "namespace": f"team-{i % 40}",
+            "uid": f"00000000-0000-0000-0000-{i:012d}",
+            "resourceVersion": str(100000 + i),
+            "creationTimestamp": "2024-05-01T10:00:00Z",
+            "labels": {"app": "web", "pod-template-hash": "5d8f7c9b6"},
+            "ownerReferences": [{
+                "apiVersion": "apps/v1", "kind": "ReplicaSet",
+                "name": "web-5d8f7c9b6", "uid": "rs-uid", "controller": True,
+            }],
+        },
+        "spec": {
+            "nodeName": f"node-{i % 300}",
+            "serviceAccountName": "default",
+            "containers": [{
+                "name": "web",
+                "image": "registry.example.com/web:1.2.3",
+                "ports": [{"containerPort": 8080, "protocol": "TCP"}],
+                "env": [{"name": "LOG_LEVEL", "value": "info"}],
+                "resources": {
+                    "requests": {"cpu": "100m", "memory": "128Mi"},
+                    "limits": {"cpu": "500m", "memory": "256Mi"},
+                },
+                "livenessProbe": {
+                    "httpGet": {"path": "/healthz", "port": 8080},
+                    "initialDelaySeconds": 10, "periodSeconds": 10,
+                },
+            }],
+            "volumes": [{"name": "config", "configMap": {"name": "web-config"}}],
+        },
+        "status": {
+            "phase": "Pending" if waiting else "Running",
+            "podIP": f"10.0.{i // 250 % 250}.{i % 250}",
+            "startTime": "2024-05-01T10:00:05Z",
+            "conditions": [
+                {"type": "Ready", "status": "False" if waiting else "True",
+                 "lastTransitionTime": "2024-05-01T10:00:20Z"},
+            ],
+            "containerStatuses": [{
+                "name": "web",
+                "image": "registry.example.com/web:1.2.3",
+                "imageID": "registry.example.com/web@sha256:abc",
+                "ready": not waiting,
+                "restartCount": i % 13,
+                "state": (
+                    {"waiting": {"reason": "ImagePullBackOff", "message": "back-off"}}
+                    if waiting else {"running": {"startedAt": "2024-05-01T10:00:10Z"}}
+                ),
+            }],
+        },
+    }
+
+
+def detector_pass(pods) -> int:
+    findings = 0
+    for pod in pods:
+        if pod.metadata.deletion_timestamp:
+            findings += 1
+        if pod.status.phase not in ("Running", "Succeeded"):
+            findings += 1
+        for cs in pod.status.container_statuses or []:
+            if cs.state and cs.state.waiting and cs.state.waiting.reason:
+                findings += 1
+            if cs.restart_count > 10:
+                findings += 1
+    return findings
+
+
+class _RecordedResponse:
+    def __init__(self, data: bytes):
+        self.data = data
+
+
+def bench(label: str, build, body: bytes, repeat: int):
+    best = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        pods = build(body)
+        parsed = time.perf_counter()
+        findings = detector_pass(pods)
+        finished = time.perf_counter()
+        run = (parsed - started, finished - parsed, findings)
+        if best is None or sum(run[:2]) < sum(best[:2]):
+            best = run
+    parse_s, detect_s, findings = best
+    print(f"{label:<28} parse {parse_s:8.3f}s  detect {detect_s:7.3f}s  "
+          f"total {parse_s + detect_s:8.3f}s  findings={findings}")
+    return parse_s + detect_s
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--input", help="recorded `kubectl get pods -A -o json` output")
+    parser.add_argument("--pods", type=int, default=50000, help="synthetic pod count")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    if args.input:
+        body = Path(args.input).read_bytes()
+    else:
+        body = json.dumps({
+            "kind": "PodList", "apiVersion": "v1",
+            "metadata": {"resourceVersion": "123456"},
+            "items": [synthetic_pod(i) for i in range(args.pods)],
+        }).encode()
+    print(f"list body: {len(body) / 1e6:.1f} MB")
+
+    api_client = ApiClient()
+    model_total = bench(
+        "V1PodList deserialize",
+        lambda data: api_client.deserialize(_RecordedResponse(data), "V1PodList").items,
+        body, args.repeat,
+    )
+    raw_total = bench("raw JSON + ObjectView", lambda data: parse_list(data)[0], body, args.repeat)
+    print(f"speedup: {model_total / raw_total:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
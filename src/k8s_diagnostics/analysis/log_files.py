@@ -0,0 +1,231 @@
+"""Pattern analysis of large log files on disk.
+
+diagnose_pod() sees only the last 150 lines of a container log. During an
+incident the evidence is often in multi-GB node journals, containerd logs
+or `kubectl logs` dumps pulled to disk. analyze_files() memory-maps each
+file and splits it into line-aligned chunks. It then matches the chunks
+in a process pool, so throughput scales with cores. Each worker maps the
+file itself, so only offsets and per-class summaries cross process
+boundaries.
+
+Lines are separated by "\\n"; a trailing "\\r" is ignored. Each line is
+matched as match_log_lines() matches one: a class is counted at most once
+per line. ASCII lines are matched as bytes by the pattern engine. Lines
+with non-ASCII or information-separator bytes are decoded and go through
+match(), where str case folding and line splitting apply.
+"""
+
+import mmap
+import os
+import re
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from .pattern_matcher import _ENGINE, LAYER_LABELS, match
+
+DEFAULT_CHUNK_BYTES = 32 * 1024 * 1024
+
+# RFC 3339 (kubectl --timestamps, containerd), syslog/journalctl short, klog
+_TIMESTAMP = re.compile(
+    rb"\d{4}-\d{2}-\d{2}[T ]\d{2}:\d{2}:\d{2}(?:[.,]\d+)?(?:Z|[+-]\d{2}:?\d{2})?"
+    rb"|\b[A-Z][a-z]{2} [ \d]\d \d{2}:\d{2}:\d{2}\b"
+    rb"|\b[IWEF]\d{4} \d{2}:\d{2}:\d{2}\.\d+"
+)
+
+# Bytes that make a line go through match(): non-ASCII, and \x1c-\x1f, which
+# str.splitlines() and `\s` treat differently from their bytes counterparts
+_SPECIAL_BYTES = bytes(range(0x1c, 0x20)) + bytes(range(0x80, 0x100))
+_SPECIAL_MARKS = bytes.maketrans(_SPECIAL_BYTES, b"\x01" * len(_SPECIAL_BYTES))
+# error_class -> its first pattern, for the class's diagnosis
+_PATTERNS_BY_CLASS = {pattern.error_class: pattern for pattern, *_ in reversed(_ENGINE._entries)}
+# Classes with several patterns; only these can hit one line twice
+_SHARED_CLASSES = frozenset(
+    error_class for error_class in _PATTERNS_BY_CLASS
+    if sum(pattern.error_class == error_class for pattern, *_ in _ENGINE._entries) > 1
+)
+
+
+def line_aligned_chunks(path: str, chunk_bytes: int = DEFAULT_CHUNK_BYTES) -> List[Tuple[int, int]]:
+    """(start, end) byte ranges of about `chunk_bytes` that cover `path` and end after a newline."""
+    size = os.path.getsize(path)
+    if size == 0:
+        return []
+    chunks = []
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        start = 0
+        while start < size:
+            end = start + max(1, chunk_bytes)
+            if end < size:
+                newline = mm.find(b"\n", end - 1)
+                end = size if newline < 0 else newline + 1
+            end = min(end, size)
+            chunks.append((start, end))
+            start = end
+    return chunks
+
+
+def analyze_chunk(task: Tuple[str, int, int]) -> Dict:
+    """Per-class hits in one chunk of a file; runs in a worker process."""
+    path, start, end = task
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        data = mm[start:end]
+    return match_chunk(data, start)
+
+
+def match_chunk(data: bytes, base: int = 0) -> Dict:
+    """Count the lines of `data` each error class matches.
+
+    Returns {"lines": n, "classes": {error_class: {"count", "first", "last"}}}.
+    "first" and "last" hold the matching line's file offset (`base` plus its
+    start in `data`), its 0-based line index within `data`, its timestamp
+    and its stripped text.
+    """
+    special = _special_lines(data)
+    # error_class -> [count, first (start, end), last (start, end), lines counted if shared]
+    hits: Dict[str, list] = {}
+
+    def record(error_class: str, start: int, end: int) -> None:
+        entry = hits.get(error_class)
+        if entry is None:
+            hits[error_class] = [1, (start, end), (start, end), {start} if error_class in _SHARED_CLASSES else None]
+            return
+        if entry[3] is not None:
+            if start in entry[3]:
+                return
+            entry[3].add(start)
+        entry[0] += 1
+        if start < entry[1][0]:
+            entry[1] = (start, end)
+        if start > entry[2][0]:
+            entry[2] = (start, end)
+
+    for start, end, pattern in _ENGINE.byte_line_hits(data):
+        if start not in special:
+            record(pattern.error_class, start, end)
+    for start, end in special.items():
+        line = data[start:end].decode("utf-8", errors="replace").strip()
+        for pm in match(line):
+            record(pm.error_class, start, end)
+
+    positions = sorted({span[0] for count, first, last, _ in hits.values() for span in (first, last)})
+    line_index = {}
+    counted, previous = 0, 0
+    for position in positions:
+        counted += data.count(b"\n", previous, position)
+        line_index[position] = counted
+        previous = position
+
+    def describe(span: Tuple[int, int]) -> Dict:
+        start, end = span
+        line = data[start:end]
+        stamp = _TIMESTAMP.search(line, 0, 128)
+        return {
+            "offset": base + start,
+            "line_index": line_index[start],
+            "timestamp": stamp.group(0).decode() if stamp else None,
+            "text": line.decode("utf-8", errors="replace").strip()[:200],
+        }
+
+    lines = data.count(b"\n") + (1 if data and not data.endswith(b"\n") else 0)
+    return {
+        "lines": lines,
+        "classes": {
+            error_class: {"count": count, "first": describe(first), "last": describe(last)}
+            for error_class, (count, first, last, _) in hits.items()
+        },
+    }
+
+
+def _special_lines(data: bytes) -> Dict[int, int]:
+    """start -> end (excluding "\\n" and a trailing "\\r") of lines with _SPECIAL_BYTES."""
+    if data.isascii() and not any(bytes([b]) in data for b in _SPECIAL_BYTES[:4]):
+        return {}
+    marks = data.translate(_SPECIAL_MARKS)
+    lines = {}
+    at = marks.find(b"\x01")
+    while at >= 0:
+        start = data.rfind(b"\n", 0, at) + 1
+        end = data.find(b"\n", at)
+        end = len(data) if end < 0 else end
+        lines[start] = end - 1 if data.endswith(b"\r", start, end) else end
+        at = marks.find(b"\x01", end)
+    return lines
+
+
+def analyze_files(
+    paths: Sequence[str],
+    workers: Optional[int] = None,
+    chunk_bytes: int = DEFAULT_CHUNK_BYTES,
+) -> Dict:
+    """Match the pattern library against every line of `paths`.
+
+    Chunks run on `workers` processes (default: every core); one worker,
+    or a single chunk, runs in this process. Classes are ordered by count,
+    and each carries its first and last matching line across all files.
+    """
+    tasks = [(path, start, end) for path in paths for start, end in line_aligned_chunks(path, chunk_bytes)]
+    workers = max(1, min(workers or os.cpu_count() or 1, len(tasks) or 1))
+    started = time.perf_counter()
+    if workers == 1:
+        results: Iterable[Dict] = [analyze_chunk(task) for task in tasks]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(analyze_chunk, tasks))
+    elapsed = time.perf_counter() - started
+
+    files = {path: {"path": path, "bytes": os.path.getsize(path), "lines": 0} for path in paths}
+    classes: Dict[str, Dict] = {}
+    for (path, _, _), result in zip(tasks, results):
+        lines_before = files[path]["lines"]
+        files[path]["lines"] += result["lines"]
+        for error_class, chunk in result["classes"].items():
+            first = _located(path, lines_before, chunk["first"])
+            last = _located(path, lines_before, chunk["last"])
+            summary = classes.get(error_class)
+            if summary is None:
+                classes[error_class] = {"count": chunk["count"], "first": first, "last": last}
+            else:
+                summary["count"] += chunk["count"]
+                summary["last"] = last
+
+    total_bytes = sum(f["bytes"] for f in files.values())
+    return {
+        "files": list(files.values()),
+        "bytes": total_bytes,
+        "lines": sum(f["lines"] for f in files.values()),
+        "chunks": len(tasks),
+        "workers": workers,
+        "seconds": round(elapsed, 3),
+        "mb_per_second": round(total_bytes / 1e6 / elapsed, 1) if elapsed else None,
+        "classes": [
+            _describe_class(error_class, summary)
+            for error_class, summary in sorted(classes.items(), key=lambda item: (-item[1]["count"], item[0]))
+        ],
+    }
+
+
+def _located(path: str, lines_before: int, hit: Dict) -> Dict:
+    return {
+        "path": path,
+        "offset": hit["offset"],
+        "line": lines_before + hit["line_index"] + 1,
+        "timestamp": hit["timestamp"],
+        "text": hit["text"],
+    }
+
+
+def _describe_class(error_class: str, summary: Dict) -> Dict:
+    pattern = _PATTERNS_BY_CLASS[error_class]
+    return {
+        "error_class": error_class,
+        "layer": pattern.layer,
+        "layer_label": LAYER_LABELS.get(pattern.layer, pattern.layer),
+        "severity": pattern.severity,
+        "count": summary["count"],
+        "first": summary["first"],
+        "last": summary["last"],
+        "root_cause": pattern.root_cause,
+        "next_command": pattern.next_command,
+        "fix": {"command": pattern.fix_command, "description": pattern.fix_description},
+    }
@@ -16,8 +16,10 @@ Layer map:
 """
 
 import re
+import threading
+from collections import OrderedDict
 from dataclasses import dataclass, field
-from typing import List, Optional
+from typing import Dict, FrozenSet, Iterable, Iterator, List, Optional, Sequence, Set, Tuple
 
 
 @dataclass
@@ -33,6 +35,7 @@ class PatternMatch:
     fix_description: str          # what the fix does
     confidence: str = "high"      # high / medium — medium if pattern is broad
     matched_text: str = ""        # the substring that triggered this match
+    line_number: Optional[int] = None  # 1-based log line, for match_log_lines() results
 
 
 @dataclass
@@ -704,6 +707,431 @@ _COMPILED: List[tuple] = [
     (re.compile(p.regex, p.flags), p) for p in _PATTERNS
 ]
 
+
+def _fold_case(regex: str) -> str:
+    """`regex` with its literal characters lowercased; escapes are left as written.
+
+    On lowercased ASCII text, the result compiled without IGNORECASE matches
+    exactly where `regex` compiled with IGNORECASE matches the original.
+    """
+    out = []
+    i = 0
+    while i < len(regex):
+        if regex[i] == "\\":
+            out.append(regex[i:i + 2])
+            i += 2
+        else:
+            out.append(regex[i].lower())
+            i += 1
+    return "".join(out)
+
+
+def _closing(regex: str, i: int) -> int:
+    """Index of the `]` or `)` closing the class or group that opens at `i`."""
+    depth = 0
+    in_class = False
+    class_start = -1
+    j = i
+    while j < len(regex):
+        c = regex[j]
+        if c == "\\":
+            j += 2
+            continue
+        if in_class:
+            # a `]` right after `[` or `[^` is a literal member
+            if c == "]" and j > class_start + 1 and not (j == class_start + 2 and regex[j - 1] == "^"):
+                in_class = False
+                if regex[i] == "[":
+                    return j
+        elif c == "[":
+            in_class, class_start = True, j
+        elif c == "(":
+            depth += 1
+        elif c == ")":
+            depth -= 1
+            if depth == 0:
+                return j
+        j += 1
+    raise ValueError(f"unbalanced regex: {regex!r}")
+
+
+def _top_level_branches(regex: str) -> List[str]:
+    branches, start, i = [], 0, 0
+    while i < len(regex):
+        c = regex[i]
+        if c == "\\":
+            i += 2
+            continue
+        if c in "[(":
+            i = _closing(regex, i)
+        elif c == "|":
+            branches.append(regex[start:i])
+            start = i + 1
+        i += 1
+    branches.append(regex[start:])
+    return branches
+
+
+def _required_literals(regex: str) -> Optional[FrozenSet[str]]:
+    """Lowercase literals of which every match of `regex` contains at least one.
+
+    One literal is taken from each top-level branch, so a text containing
+    none of them cannot match. Groups are used only when not quantified.
+    Returns None when some branch has no literal it is guaranteed to
+    contain, e.g. `.*` or `[a-z]+`.
+    """
+    literals = set()
+    for branch in _top_level_branches(regex):
+        required = _branch_literals(branch)
+        if required is None:
+            return None
+        literals |= required
+    return frozenset(literals)
+
+
+def _branch_literals(branch: str) -> Optional[FrozenSet[str]]:
+    best: Optional[FrozenSet[str]] = None
+    run: List[str] = []
+
+    def consider(candidate: Optional[FrozenSet[str]]) -> None:
+        nonlocal best
+        if candidate and all(candidate) and (
+            best is None or min(map(len, candidate)) > min(map(len, best))
+        ):
+            best = candidate
+
+    def end_run() -> None:
+        if run:
+            consider(frozenset({"".join(run).lower()}))
+            run.clear()
+
+    i = 0
+    while i < len(branch):
+        c = branch[i]
+        if c == "\\":
+            escaped = branch[i + 1:i + 2]
+            i += 2
+            if not escaped or escaped.isalnum():
+                # \d, \S, \b, back-references, ...: not a single literal character
+                end_run()
+            else:
+                run.append(escaped)
+            continue
+        if c == "[":
+            end_run()
+            i = _closing(branch, i) + 1
+            continue
+        if c == "(":
+            end = _closing(branch, i)
+            inner = branch[i + 1:end]
+            i = end + 1
+            end_run()
+            quantified = i < len(branch) and branch[i] in "?*{"
+            if inner.startswith("?:"):
+                inner = inner[2:]
+            elif inner.startswith("?P<"):
+                inner = inner[inner.index(">") + 1:]
+            elif inner.startswith("?"):
+                # lookaround, inline flags, conditionals
+                continue
+            if not quantified:
+                consider(_required_literals(inner))
+            continue
+        if c in "*?{":
+            # the preceding character may be absent
+            if run:
+                run.pop()
+            end_run()
+            i = branch.index("}", i) + 1 if c == "{" else i + 1
+            continue
+        if c in "+.^$":
+            end_run()
+            i += 1
+            continue
+        run.append(c)
+        i += 1
+    end_run()
+    return best
+
+
+def _literal_runs(regex: str) -> Set[str]:
+    """Every lowercase run of literal characters in `regex`, as a match can contain it.
+
+    Runs break at anything that is not a literal character. An optional
+    character (`services?`) yields the run with and without it. A repeated
+    character (`x*`, `x+`) stands alone. Over-reporting is safe: the runs
+    only tell MatchCache which parts of a message a pattern might read.
+    """
+    runs: Set[str] = set()
+    variants = [""]
+    before: Optional[List[str]] = None  # variants before the last literal character
+
+    def end_run() -> None:
+        nonlocal variants, before
+        runs.update(variant for variant in variants if variant)
+        variants, before = [""], None
+
+    i = 0
+    while i < len(regex):
+        c = regex[i]
+        if c == "\\":
+            escaped = regex[i + 1:i + 2]
+            i += 2
+            if not escaped or escaped.isalnum():
+                end_run()
+            else:
+                before, variants = variants, [v + escaped.lower() for v in variants]
+            continue
+        if c == "?" and before is not None:
+            variants = before + variants
+            before = None
+            if len(variants) > 64:
+                end_run()
+            i += 1
+            continue
+        if c in "*+{":
+            # keep what precedes the repeated character, and the character itself
+            repeated = variants[0][-1:] if before is not None else ""
+            if before is not None:
+                variants = before if c != "+" else variants
+            end_run()
+            if repeated:
+                runs.add(repeated)
+            i = regex.index("}", i) + 1 if c == "{" else i + 1
+            continue
+        if c == "[":
+            end_run()
+            i = _closing(regex, i) + 1
+            continue
+        if c == "(":
+            end_run()
+            i += 1
+            if regex.startswith("?", i):
+                prefix = re.match(r"\?(?::|P<\w+>|=|!|<=|<!)", regex[i:])
+                i = i + prefix.end() if prefix else regex.index(")", i) + 1
+            continue
+        if c in ").^$|?":
+            end_run()
+            i += 1
+            continue
+        before, variants = variants, [v + c.lower() for v in variants]
+        i += 1
+    end_run()
+    return runs
+
+
+class _PatternSet:
+    """The pattern library as one matcher: every pattern that fires on a text.
+
+    Python's `re` is a backtracking engine, so a single alternation of all
+    patterns is no cheaper than searching them one by one. It is slower,
+    because the alternation loses each pattern's literal-prefix scan.
+    The real cost is IGNORECASE, which makes every search fold case
+    character by character. So an ASCII text is lowercased once and
+    searched with case-sensitive equivalents of the patterns. Signals are
+    sliced from the original text, so they keep their case. Non-ASCII
+    text, where lowercasing is not equivalent to IGNORECASE, uses the
+    original patterns.
+
+    Most patterns also contain literals that every match must include
+    ("oomkilled", "no such host"). These are extracted at import time, and
+    a pattern is searched only when one of its literals occurs in the
+    lowercased text. All literals are also combined into one alternation.
+    Its single search rejects a healthy log line before any pattern
+    regex runs.
+
+    `first_hits()` matches a whole log buffer instead of one line. Each
+    pattern is searched once, and only on the lines that contain one of
+    its literals. Those lines are found with `str.find` over the buffer.
+    Each literal's first offset is looked up once per buffer. A literal
+    is not scanned for at all when a shorter literal inside it is absent.
+    Each search is bounded by `pos`/`endpos` to one line, so no match
+    spans a line break. The buffer regexes are compiled with MULTILINE,
+    so `^` and `$` still anchor at line boundaries.
+    """
+
+    def __init__(self, compiled: List[tuple]):
+        # (pattern, IGNORECASE regex, case-sensitive regex for lowercased ASCII or None,
+        #  required literals or None)
+        self._entries = []
+        for regex, pattern in compiled:
+            folded = None
+            if pattern.flags & re.IGNORECASE and pattern.regex.isascii():
+                folded = re.compile(_fold_case(pattern.regex), pattern.flags & ~re.IGNORECASE)
+            literals = None if pattern.flags & re.VERBOSE else _required_literals(pattern.regex)
+            self._entries.append((pattern, regex, folded, literals))
+        # first_hits() variants: (regex, whether it searches the lowercased buffer)
+        self._line_regexes = [
+            (re.compile(folded.pattern, folded.flags | re.MULTILINE), True) if folded is not None
+            else (re.compile(regex.pattern, regex.flags | re.MULTILINE), False)
+            for _, regex, folded, _ in self._entries
+        ]
+        # byte_line_hits() variants, compiled on first use
+        self._byte_regexes: Optional[List[tuple]] = None
+
+        # Usable only when every pattern has literals; otherwise some always run
+        all_literals = set()
+        for *_, literals in self._entries:
+            all_literals |= literals or {""}
+        # literal -> shorter literals inside it; if one is absent, so is the literal
+        self._parts = {
+            literal: [part for part in all_literals if part and part != literal and part in literal]
+            for literal in all_literals
+        }
+        self._gate = None
+        if "" not in all_literals:
+            self._gate = re.compile("|".join(
+                re.escape(literal) for literal in sorted(all_literals, key=len, reverse=True)
+            ))
+
+    def candidates(self, lowered: str) -> List[_Pattern]:
+        """Patterns that can match `lowered`, a lowercased ASCII text."""
+        if self._gate is not None and not self._gate.search(lowered):
+            return []
+        return [
+            pattern for pattern, _, _, literals in self._entries
+            if literals is None or any(literal in lowered for literal in literals)
+        ]
+
+    def search(self, text: str) -> Iterator[Tuple[_Pattern, str]]:
+        """(pattern, signal) for each pattern that matches `text`, in library order."""
+        for _, pattern, signal in self.search_indexed(text):
+            yield pattern, signal
+
+    def search_indexed(
+        self, text: str, indexes: Optional[Sequence[int]] = None
+    ) -> Iterator[Tuple[int, _Pattern, str]]:
+        """(entry index, pattern, signal) for each matching pattern, in library order.
+
+        `indexes` limits the search to those entries of `_entries`.
+        """
+        lowered = text.lower() if text.isascii() else None
+        if indexes is None:
+            if lowered is not None and self._gate is not None and not self._gate.search(lowered):
+                return
+            indexes = range(len(self._entries))
+        for index in indexes:
+            pattern, regex, folded, literals = self._entries[index]
+            if lowered is not None and literals is not None and not any(
+                literal in lowered for literal in literals
+            ):
+                continue
+            if lowered is not None and folded is not None:
+                m = folded.search(lowered)
+                if m:
+                    yield index, pattern, text[m.start():m.end()]
+            else:
+                m = regex.search(text)
+                if m:
+                    yield index, pattern, m.group(0)
+
+    def first_hits(self, buffer: str) -> List[Tuple[int, _Pattern, int, int]]:
+        """(line start, pattern, match start, match end) of each error class's first hit.
+
+        `buffer` is ASCII text whose only line break is "\\n". Hits are in
+        line order, then library order, one per error class. Each pattern
+        stops at its first matching line, and a pattern whose class already
+        has a hit only looks at the lines before it.
+        """
+        lowered = buffer.lower()
+        offsets: Dict[str, int] = {}
+
+        def locate(literal: str) -> int:
+            if literal not in offsets:
+                absent = any(locate(part) < 0 for part in self._parts[literal])
+                offsets[literal] = -1 if absent else lowered.find(literal)
+            return offsets[literal]
+
+        first = {}
+        for index, (pattern, _, _, literals) in enumerate(self._entries):
+            known = first.get(pattern.error_class)
+            limit = known[0] if known else len(buffer)
+            regex, folded = self._line_regexes[index]
+            found = None
+            if literals is not None:
+                found = {literal: locate(literal) for literal in literals}
+                found = {literal: offset if offset < limit else -1 for literal, offset in found.items()}
+            hit = next(_line_matches(regex, lowered if folded else buffer, lowered, found, limit), None)
+            if hit is not None and (known is None or hit[0] < known[0]):
+                first[pattern.error_class] = (hit[0], index, pattern, hit[2])
+        hits = sorted(first.values(), key=lambda hit: hit[:2])
+        return [(start, pattern, m.start(), m.end()) for start, _, pattern, m in hits]
+
+    def byte_line_hits(self, data: bytes) -> Iterator[Tuple[int, int, _Pattern]]:
+        """(line start, line end, pattern) for every line of `data` each pattern matches.
+
+        Lines are separated by b"\\n", and every matching line is reported,
+        not only the first. Matching is the ASCII half of search(). Bytes
+        are lowercased and searched with the folded patterns, so a line
+        containing non-ASCII bytes may match differently than its decoded
+        text. Callers re-check such lines with match().
+        """
+        if self._byte_regexes is None:
+            self._byte_regexes = [
+                (re.compile(source.pattern.encode(), (source.flags & ~re.UNICODE) | re.MULTILINE),
+                 folded is not None,
+                 None if literals is None else [literal.encode() for literal in literals])
+                for _, regex, folded, literals in self._entries
+                for source in [folded or regex]
+            ]
+        lowered = data.lower()
+        offsets: Dict[bytes, int] = {}
+
+        def locate(literal: bytes) -> int:
+            if literal not in offsets:
+                absent = any(locate(part.encode()) < 0 for part in self._parts[literal.decode()])
+                offsets[literal] = -1 if absent else lowered.find(literal)
+            return offsets[literal]
+
+        for (pattern, *_), (regex, folded, literals) in zip(self._entries, self._byte_regexes):
+            found = None if literals is None else {literal: locate(literal) for literal in literals}
+            haystack = lowered if folded else data
+            for start, end, _ in _line_matches(regex, haystack, lowered, found, len(data), b"\n"):
+                yield start, end, pattern
+
+
+def _line_matches(regex, haystack, lowered, found, limit: int, newline="\n"):
+    """(line start, line end, match) for each line starting before `limit` that `regex` matches.
+
+    Works on str or bytes; `newline` is "\\n" or b"\\n". `found` maps each
+    required literal to its first offset in `lowered` (-1 if absent), and
+    only lines containing one are searched. None searches every line. A
+    line's end excludes its newline and a trailing "\\r".
+    """
+    cr = b"\r" if isinstance(newline, bytes) else "\r"
+
+    def line_end(at):
+        end = lowered.find(newline, at)
+        return len(lowered) if end < 0 else end
+
+    if found is None:
+        start = 0
+        while start < limit:
+            end = line_end(start)
+            stop = end - 1 if haystack.endswith(cr, start, end) else end
+            m = regex.search(haystack, start, stop)
+            if m:
+                yield start, stop, m
+            start = end + 1
+        return
+    while True:
+        offsets = [offset for offset in found.values() if offset >= 0]
+        if not offsets:
+            return
+        at = min(offsets)
+        start = lowered.rfind(newline, 0, at) + 1
+        end = line_end(at)
+        stop = end - 1 if haystack.endswith(cr, start, end) else end
+        m = regex.search(haystack, start, stop)
+        if m:
+            yield start, stop, m
+        for literal, offset in found.items():
+            if 0 <= offset <= end:
+                found[literal] = lowered.find(literal, end + 1, limit)
+
+
+_ENGINE = _PatternSet(_COMPILED)
+
 # Layer label map for human output
 LAYER_LABELS = {
     "layer1": "Layer 1 — Pod Lifecycle",
@@ -725,32 +1153,200 @@ def match(text: str) -> List[PatternMatch]:
         List of PatternMatch objects, most specific first (preserves pattern order).
         Empty list if no pattern matched.
     """
+    return _first_per_class(text, _ENGINE.search_indexed(text))[1]
+
+
+def _first_per_class(
+    text: str, hits: Iterable[Tuple[int, _Pattern, str]]
+) -> Tuple[Tuple[int, ...], List[PatternMatch]]:
+    """Entry indexes and PatternMatches of each error class's first hit."""
+    indexes = []
     results = []
     seen_classes = set()
-    for compiled, pattern in _COMPILED:
-        m = compiled.search(text)
-        if m and pattern.error_class not in seen_classes:
+    for index, pattern, signal in hits:
+        if pattern.error_class not in seen_classes:
             seen_classes.add(pattern.error_class)
-            results.append(PatternMatch(
-                layer=pattern.layer,
-                error_class=pattern.error_class,
-                severity=pattern.severity,
-                signal=m.group(0),
-                root_cause=pattern.root_cause,
-                next_command=pattern.next_command,
-                fix_command=pattern.fix_command,
-                fix_description=pattern.fix_description,
-                confidence=pattern.confidence,
-                matched_text=text[:200],
-            ))
-    return results
+            indexes.append(index)
+            results.append(_pattern_match(pattern, signal, text[:200]))
+    return tuple(indexes), results
+
+
+def _pattern_match(pattern: _Pattern, signal: str, matched_text: str,
+                   line_number: Optional[int] = None) -> PatternMatch:
+    return PatternMatch(
+        layer=pattern.layer,
+        error_class=pattern.error_class,
+        severity=pattern.severity,
+        signal=signal,
+        root_cause=pattern.root_cause,
+        next_command=pattern.next_command,
+        fix_command=pattern.fix_command,
+        fix_description=pattern.fix_description,
+        confidence=pattern.confidence,
+        matched_text=matched_text,
+        line_number=line_number,
+    )
+
+
+# Tokens MatchCache masks in lowercased messages, in masking order: (name, regex,
+# characters the token is made of, characters that let a literal reach into it,
+# (separator, count) a message needs to contain one). Each regex checks its left
+# boundary after the first character, so `re` can skip ahead to candidate starts.
+_TEMPLATE_TOKENS = [
+    ("uid", r"[0-9a-f](?<![a-z0-9-].)[0-9a-f]{7}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}(?![a-z0-9-])",
+     "0123456789abcdef-", "", ("-", 4)),
+    ("ip", r"[0-9](?<![a-z0-9.].)[0-9]{0,2}\.[0-9]{1,3}\.[0-9]{1,3}\.[0-9]{1,3}(?![a-z0-9.])",
+     "0123456789.", "", (".", 3)),
+    # ReplicaSet hash and pod suffix after the "-" of a pod name, e.g. web-7d9f8b6c5-x2k4q
+    ("pod", r"(?<=-)(?:[bcdfghjklmnpqrstvwxz2456789]{6,10}-)?[bcdfghjklmnpqrstvwxz2456789]{5}(?![a-z0-9-])",
+     "bcdfghjklmnpqrstvwxz2456789-", "-", ("-", 1)),
+    ("num", r"[0-9](?<![a-z0-9].)[0-9]*(?![a-z0-9])", "0123456789", "", ("", 0)),
+]
+
+
+def _may_overlap(literal: str, alphabet: str, reach: str) -> bool:
+    """Whether an occurrence of `literal` can overlap a token made of `alphabet`.
+
+    Tokens are bounded by characters that are neither alphanumeric nor
+    in `alphabet`. So the part of a literal inside a token is a run of
+    `alphabet` characters whose neighbours in the literal are not
+    alphanumeric. The one exception is a literal containing a `reach`
+    character.
+    """
+    if any(c in literal for c in reach):
+        return True
+    for run in re.finditer(f"[{re.escape(alphabet)}]+", literal):
+        left = literal[run.start() - 1:run.start()]
+        right = literal[run.end():run.end() + 1]
+        if not (left.isalnum() or right.isalnum()):
+            return True
+    return False
+
+
+class MatchCache:
+    """Bounded LRU of match() results, keyed on message templates.
+
+    Warning events repeat. Thousands of "Back-off restarting failed
+    container" or "0/3000 nodes are available" messages differ only in pod
+    names, UIDs, IPs and counts. The cache masks those tokens, so a repeat
+    costs a few token scans instead of the pattern library.
+
+    Masking never changes which patterns match. Every pattern is
+    IGNORECASE, so messages are lowercased first. A token stays unmasked
+    when a literal of a pattern that could match the message overlaps
+    it. "Could match" means one of the pattern's required literals
+    occurs. The library's other constructs (`.*`, `\\S+`, `\\d+`,
+    `[a-z0-9-]+`) treat every token of a kind alike. The cache keeps
+    which patterns matched a template. On a hit only those patterns run
+    again, on the message itself, so every PatternMatch is new and its
+    `signal` and `matched_text` are the message's own. Non-ASCII messages
+    are matched directly.
+    """
+
+    def __init__(self, maxsize: int = 4096):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        # template -> _ENGINE entry indexes of the patterns that matched it
+        self._entries: "OrderedDict[str, Tuple[int, ...]]" = OrderedDict()
+        self._lock = threading.Lock()
+        # "‹" and "›" are non-ASCII, so no cached (ASCII) message contains a placeholder
+        self._tokens = [
+            (name, re.compile(regex), f"\u2039{name}\u203a", needs) for name, regex, _, _, needs in _TEMPLATE_TOKENS
+        ]
+        # literal -> (token kinds it may overlap, required literals of each pattern using it)
+        observers: Dict[str, Tuple[FrozenSet[str], List[Optional[FrozenSet[str]]]]] = {}
+        for pattern, _, _, required in _ENGINE._entries:
+            for literal in _literal_runs(pattern.regex):
+                kinds = frozenset(
+                    name for name, _, alphabet, reach, _ in _TEMPLATE_TOKENS
+                    if _may_overlap(literal, alphabet, reach)
+                )
+                if kinds:
+                    observers.setdefault(literal, (kinds, []))[1].append(required)
+        self._observers = observers
+
+    def template(self, text: str) -> str:
+        """`text` lowercased, with every token no pattern can tell apart masked."""
+        lowered = text.lower()
+        watched = []
+        for literal in [literal for literal in self._observers if literal in lowered]:
+            kinds, owners = self._observers[literal]
+            if any(required is None or any(r in lowered for r in required) for required in owners):
+                watched.append((literal, kinds))
+        for name, regex, placeholder, (separator, count) in self._tokens:
+            if count and lowered.count(separator) < count:
+                continue
+            observed = [literal for literal, kinds in watched if name in kinds]
+            if not observed:
+                lowered = regex.sub(placeholder, lowered)
+                continue
+
+            def mask(token, text=lowered, observed=observed, placeholder=placeholder):
+                start, end = token.span()
+                for literal in observed:
+                    if text.find(literal, max(0, start - len(literal) + 1), end + len(literal) - 1) >= 0:
+                        return token.group()
+                return placeholder
+
+            lowered = regex.sub(mask, lowered)
+        return lowered
+
+    def match(self, text: str) -> List[PatternMatch]:
+        """match(text), or the cached result for a message with the same template."""
+        if not text.isascii():
+            with self._lock:
+                self.misses += 1
+            return match(text)
+        key = self.template(text)
+        with self._lock:
+            cached = self._entries.get(key)
+            if cached is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+            else:
+                self.misses += 1
+        if cached is not None:
+            return _first_per_class(text, _ENGINE.search_indexed(text, cached))[1]
+        indexes, result = _first_per_class(text, _ENGINE.search_indexed(text))
+        with self._lock:
+            self._entries[key] = indexes
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+        return result
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def stats(self) -> Dict[str, float]:
+        with self._lock:
+            return {
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hit_rate,
+            }
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = 0
+
+
+# Shared by every match_events() call; see event_cache.stats() for its hit rate
+event_cache = MatchCache()
 
 
 def match_events(events: list) -> List[PatternMatch]:
     """Match patterns against a list of Kubernetes Event objects or event dicts.
 
     Accepts either kubernetes-client V1Event objects or dicts with 'message' key.
-    Returns deduplicated list of PatternMatch, one per error class.
+    Returns deduplicated list of PatternMatch, one per error class. Messages go
+    through `event_cache`, so repeated event text is matched once per template.
     """
     results = []
     seen_classes = set()
@@ -761,27 +1357,54 @@ def match_events(events: list) -> List[PatternMatch]:
             text = (event.get("message") or "") + " " + (event.get("reason") or "")
         else:
             continue
-        for pm in match(text):
+        for pm in event_cache.match(text):
             if pm.error_class not in seen_classes:
                 seen_classes.add(pm.error_class)
                 results.append(pm)
     return results
 
 
+# Line boundaries str.splitlines() honours besides "\n" (ASCII only)
+_LINE_BREAKS = ("\r", "\x0b", "\x0c", "\x1c", "\x1d", "\x1e")
+
+
 def match_log_lines(log_text: str) -> List[PatternMatch]:
     """Match patterns against multi-line container log output.
 
-    Splits on newlines and runs match() on each line, deduplicating by error_class.
+    Returns one PatternMatch per error_class, for its first matching line,
+    in line order. Each match carries its 1-based `line_number` and the
+    stripped line as `matched_text`.
+
+    ASCII logs are matched as one buffer. Each pattern is searched once,
+    and a PatternMatch is built only for each class's first hit. Other
+    logs are split into lines and run through match() one line at a time.
     """
+    if not log_text.isascii():
+        return _match_lines(log_text)
+    buffer = log_text
+    if any(brk in buffer for brk in _LINE_BREAKS):
+        buffer = "\n".join(buffer.splitlines())
+    results = []
+    for start, pattern, begin, end in _ENGINE.first_hits(buffer):
+        line_end = buffer.find("\n", start)
+        line = buffer[start:line_end if line_end >= 0 else len(buffer)]
+        results.append(_pattern_match(
+            pattern, buffer[begin:end], line.strip()[:200], buffer.count("\n", 0, start) + 1,
+        ))
+    return results
+
+
+def _match_lines(log_text: str) -> List[PatternMatch]:
     results = []
     seen_classes = set()
-    for line in log_text.splitlines():
+    for number, line in enumerate(log_text.splitlines(), 1):
         line = line.strip()
         if not line:
             continue
         for pm in match(line):
             if pm.error_class not in seen_classes:
                 seen_classes.add(pm.error_class)
+                pm.line_number = number
                 results.append(pm)
     return results
 
@@ -804,4 +1427,6 @@ def format_match(pm: PatternMatch, verbose: bool = False) -> dict:
     }
     if verbose:
         out["matched_text"] = pm.matched_text
+        if pm.line_number is not None:
+            out["line_number"] = pm.line_number
     return out
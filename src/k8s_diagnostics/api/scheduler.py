@@ -0,0 +1,149 @@
+"""Background cluster scan for the API server.
+
+Prometheus scrapes, dashboards and /ai/predict all want the same answer:
+what is wrong with the cluster right now. Rather than each request listing
+the whole cluster, ScanScheduler runs one scan per interval. It publishes
+the result as a single immutable ScanResult, so readers always see a
+complete scan and never a mix of two.
+"""
+
+import asyncio
+import threading
+import time
+from dataclasses import dataclass
+from typing import Dict, Optional
+
+from ..core.executor import BlockingExecutor, run_coroutine_sync
+from ..automation.registry import required_kinds
+from ..core.snapshot import SNAPSHOT_KINDS, ClusterSnapshot
+
+
+@dataclass(frozen=True)
+class ScanResult:
+    generation: int
+    started_at: float
+    completed_at: float
+    issues: Dict
+    risk: Dict
+    nodes: Dict
+    pods: Dict
+
+    @property
+    def age_seconds(self) -> float:
+        return max(0.0, time.time() - self.completed_at)
+
+    @property
+    def duration_seconds(self) -> float:
+        return self.completed_at - self.started_at
+
+    def describe(self) -> Dict:
+        return {
+            "generation": self.generation,
+            "age_seconds": round(self.age_seconds, 3),
+            "duration_seconds": round(self.duration_seconds, 3),
+            "completed_at": self.completed_at,
+        }
+
+
+class ScanScheduler:
+    """Runs detect_common_issues() on an interval and keeps the latest ScanResult.
+
+    A background scan that runs past `scan_timeout_seconds` (e.g. a hung list
+    call) is abandoned and recorded in `last_error`. The next scan starts on
+    a fresh worker, so one stuck call cannot freeze `latest`.
+    """
+
+    def __init__(
+        self,
+        k8s,
+        diagnostics,
+        interval_seconds: float = 60.0,
+        scan_timeout_seconds: Optional[float] = 300.0,
+    ):
+        self.k8s = k8s
+        self.diagnostics = diagnostics
+        self.interval_seconds = interval_seconds
+        self.scan_timeout_seconds = scan_timeout_seconds
+        self.last_error: Optional[str] = None
+        self._latest: Optional[ScanResult] = None
+        self._generation = 0
+        self._lock = threading.Lock()
+        self._executor: Optional[BlockingExecutor] = None
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def enabled(self) -> bool:
+        return self.interval_seconds > 0
+
+    @property
+    def latest(self) -> Optional[ScanResult]:
+        return self._latest
+
+    def scan_once(self) -> ScanResult:
+        """Run a full scan synchronously and publish it. Raises if the scan fails."""
+        started_at = time.time()
+        try:
+            # The enabled detectors' kinds, plus nodes and pods for the summary gauges
+            kinds = set(required_kinds(self.diagnostics.plan_detectors())) | {"nodes", "pods"}
+            snapshot = ClusterSnapshot.fetch(
+                self.k8s,
+                kinds=[kind for kind in SNAPSHOT_KINDS if kind in kinds],
+                pod_page_size=self.diagnostics.pod_page_size,
+            )
+            issues = run_coroutine_sync(self.diagnostics.detect_common_issues(snapshot))
+            nodes = self.k8s._check_nodes(snapshot.nodes)
+            # With pod streaming on, the pod summary takes its own paginated pass.
+            pods = self.k8s._check_pods(snapshot.pods if snapshot.has("pods") else None)
+        except Exception as exc:
+            self.last_error = str(exc)
+            raise
+
+        with self._lock:
+            self._generation += 1
+            result = ScanResult(
+                generation=self._generation,
+                started_at=started_at,
+                completed_at=time.time(),
+                issues=issues,
+                risk=self.diagnostics.score_risk(issues),
+                nodes=nodes,
+                pods=pods,
+            )
+            # A forced rescan may finish before an older background scan; keep the newest.
+            if self._latest is None or self._latest.started_at <= result.started_at:
+                self._latest = result
+            self.last_error = None
+        return result
+
+    def start(self) -> None:
+        if not self.enabled or self._task is not None:
+            return
+        self._executor = BlockingExecutor(max_workers=1, timeout_seconds=None, name="k8s-scan")
+        self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await self._executor.run(self.scan_once, timeout=self.scan_timeout_seconds)
+            except asyncio.CancelledError:
+                raise
+            except asyncio.TimeoutError:
+                self.last_error = f"scan timed out after {self.scan_timeout_seconds}s"
+                # The abandoned scan still holds the only worker
+                self._executor.shutdown()
+                self._executor = BlockingExecutor(max_workers=1, timeout_seconds=None, name="k8s-scan")
+            except Exception:
+                pass  # recorded in last_error; keep serving the previous result
+            await asyncio.sleep(self.interval_seconds)
@@ -1,34 +1,94 @@
+import asyncio
 import os
-from typing import Optional
+from typing import List, Optional
 
-from fastapi import Depends, FastAPI, Header, HTTPException, Response, status
+from fastapi import Depends, FastAPI, Header, HTTPException, Query, Response, status
 from prometheus_client import CONTENT_TYPE_LATEST, Gauge, generate_latest
+from ..analysis.pattern_matcher import event_cache
 from ..core.client import K8sClient
+from ..core.executor import BlockingExecutor
 from ..automation.diagnostics import DiagnosticsEngine
 from ..automation.fixes import AutoFixer
+from ..automation.mutations import MutationExecutor
+from ..automation.registry import parse_detector_list
+from ..automation.runner import DetectorRunner
+from ..automation.simulator import Scenario
 from ..automation.chaos import ChaosEngine
+from .scheduler import ScanScheduler
+
+
+def _truthy(value: Optional[str]) -> bool:
+    return (value or "").strip().lower() in {"1", "true", "yes", "y", "on"}
+
 
 app = FastAPI(title="K8s Diagnostics API", version="1.1.0")
 k8s = K8sClient()
-diagnostics = DiagnosticsEngine(k8s)
+# Stream pods in pages of this size during scans (0 = list them in one call).
+diagnostics = DiagnosticsEngine(
+    k8s,
+    pod_page_size=int(os.getenv("K8S_DIAGNOSTICS_POD_PAGE_SIZE", "0")) or None,
+    detector_runner=DetectorRunner(
+        max_workers=int(os.getenv("K8S_DIAGNOSTICS_DETECTOR_CONCURRENCY", "8")),
+        timeout_seconds=float(os.getenv("K8S_DIAGNOSTICS_DETECTOR_TIMEOUT_SECONDS", "30")),
+    ),
+    # Comma-separated issue types; see automation.registry.DETECTORS
+    enabled_detectors=parse_detector_list(os.getenv("K8S_DIAGNOSTICS_DETECTORS")),
+    disabled_detectors=parse_detector_list(os.getenv("K8S_DIAGNOSTICS_SKIP_DETECTORS")),
+    # Re-evaluate only pods and kinds that changed since the previous scan
+    incremental=_truthy(os.getenv("K8S_DIAGNOSTICS_INCREMENTAL")),
+    # The shared pod scan feeds every pod-level detector, so it gets its own deadline
+    pod_scan_timeout_seconds=float(os.getenv("K8S_DIAGNOSTICS_POD_SCAN_TIMEOUT_SECONDS", "120")),
+)
 ALLOWED_NAMESPACES = {
     ns.strip()
     for ns in os.getenv("K8S_DIAGNOSTICS_ALLOWED_NAMESPACES", "").split(",")
     if ns.strip()
 }
-fixer = AutoFixer(k8s, allowed_namespaces=ALLOWED_NAMESPACES)
+# Fixer deletes/patches run concurrently, capped per namespace and by a QPS token bucket
+fixer = AutoFixer(
+    k8s,
+    allowed_namespaces=ALLOWED_NAMESPACES,
+    executor=MutationExecutor(
+        qps=float(os.getenv("K8S_DIAGNOSTICS_MUTATION_QPS", "20")),
+        burst=int(os.getenv("K8S_DIAGNOSTICS_MUTATION_BURST", "40")),
+        per_namespace=int(os.getenv("K8S_DIAGNOSTICS_MUTATION_NAMESPACE_CONCURRENCY", "4")),
+        pdb_wait_seconds=float(os.getenv("K8S_DIAGNOSTICS_PDB_WAIT_SECONDS", "60")),
+    ),
+)
 chaos = ChaosEngine(k8s, allowed_namespaces=ALLOWED_NAMESPACES)
 k8s.fixer = fixer  # provide fixer access for autonomous heal
 
+# All synchronous kubernetes work runs on these pools, never on the event loop.
+# Probes get their own small pool so a backlog of scans cannot delay /readyz.
+blocking = BlockingExecutor(
+    max_workers=int(os.getenv("K8S_DIAGNOSTICS_MAX_CONCURRENCY", "8")),
+    timeout_seconds=float(os.getenv("K8S_DIAGNOSTICS_REQUEST_TIMEOUT_SECONDS", "60")),
+)
+probes = BlockingExecutor(max_workers=2, timeout_seconds=2.5, name="k8s-probe")
+
+# Background scan shared by /issues/detect, /ai/predict and /metrics; 0 disables it.
+scheduler = ScanScheduler(
+    k8s,
+    diagnostics,
+    interval_seconds=float(os.getenv("K8S_DIAGNOSTICS_SCAN_INTERVAL_SECONDS", "60")),
+    scan_timeout_seconds=float(os.getenv("K8S_DIAGNOSTICS_SCAN_TIMEOUT_SECONDS", "300")),
+)
+
 API_UP = Gauge("k8s_diagnostics_api_up", "Whether the diagnostics API can reach Kubernetes.")
 TOTAL_NODES = Gauge("k8s_cluster_total_nodes", "Total nodes observed in the cluster.")
 READY_NODES = Gauge("k8s_cluster_ready_nodes", "Ready nodes observed in the cluster.")
 FAILED_PODS = Gauge("k8s_pod_failures_total", "Pods not in Running or Succeeded state.")
 CLUSTER_HEALTH_SCORE = Gauge("k8s_cluster_health_score", "Simple health score based on ready nodes.")
-
-
-def _truthy(value: Optional[str]) -> bool:
-    return (value or "").strip().lower() in {"1", "true", "yes", "y", "on"}
+SCAN_GENERATION = Gauge("k8s_diagnostics_scan_generation", "Generation of the latest published background scan.")
+SCAN_AGE = Gauge("k8s_diagnostics_scan_age_seconds", "Seconds since the latest background scan completed.")
+SCAN_DURATION = Gauge("k8s_diagnostics_scan_duration_seconds", "Wall-clock duration of the latest background scan.")
+SCAN_FAILING = Gauge(
+    "k8s_diagnostics_scan_failing",
+    "1 when the most recent background scan failed; the other gauges keep the latest successful scan.",
+)
+EVENT_CACHE_HITS = Gauge("k8s_diagnostics_event_match_cache_hits", "Event messages answered from the pattern match cache.")
+EVENT_CACHE_MISSES = Gauge("k8s_diagnostics_event_match_cache_misses", "Event messages run through the pattern library.")
+EVENT_CACHE_SIZE = Gauge("k8s_diagnostics_event_match_cache_templates", "Message templates held in the pattern match cache.")
 
 
 def _mutations_enabled() -> bool:
@@ -76,34 +136,121 @@ def require_allowed_namespace(namespace: str) -> None:
         )
 
 
+async def _run_blocking(func, *args, **kwargs):
+    try:
+        return await blocking.run(func, *args, **kwargs)
+    except asyncio.TimeoutError:
+        raise HTTPException(
+            status_code=status.HTTP_504_GATEWAY_TIMEOUT,
+            detail="Kubernetes request exceeded K8S_DIAGNOSTICS_REQUEST_TIMEOUT_SECONDS.",
+        )
+
+
+async def _run_engine(coro_func, *args, **kwargs):
+    """Await an engine coroutine (which makes blocking kubernetes calls) off the event loop."""
+    try:
+        return await blocking.run_coroutine(coro_func, *args, **kwargs)
+    except asyncio.TimeoutError:
+        raise HTTPException(
+            status_code=status.HTTP_504_GATEWAY_TIMEOUT,
+            detail="Kubernetes request exceeded K8S_DIAGNOSTICS_REQUEST_TIMEOUT_SECONDS.",
+        )
+
+
+def _clear_cluster_gauges() -> None:
+    API_UP.set(0)
+    TOTAL_NODES.set(0)
+    READY_NODES.set(0)
+    FAILED_PODS.set(0)
+    CLUSTER_HEALTH_SCORE.set(0)
+
+
+def _set_cluster_gauges(nodes: dict, pods: dict) -> None:
+    total_nodes = nodes.get("total", 0)
+    ready_nodes = nodes.get("ready", 0)
+    failed_pods = len(pods.get("failed", []))
+    score = ready_nodes / total_nodes if total_nodes else 0
+
+    API_UP.set(1)
+    TOTAL_NODES.set(total_nodes)
+    READY_NODES.set(ready_nodes)
+    FAILED_PODS.set(failed_pods)
+    CLUSTER_HEALTH_SCORE.set(score)
+
+
 def _refresh_metrics() -> None:
     if not k8s.available:
-        API_UP.set(0)
-        TOTAL_NODES.set(0)
-        READY_NODES.set(0)
-        FAILED_PODS.set(0)
-        CLUSTER_HEALTH_SCORE.set(0)
+        _clear_cluster_gauges()
         return
 
     try:
-        nodes = k8s._check_nodes()
-        pods = k8s._check_pods()
-        total_nodes = nodes.get("total", 0)
-        ready_nodes = nodes.get("ready", 0)
-        failed_pods = len(pods.get("failed", []))
-        score = ready_nodes / total_nodes if total_nodes else 0
-
-        API_UP.set(1)
-        TOTAL_NODES.set(total_nodes)
-        READY_NODES.set(ready_nodes)
-        FAILED_PODS.set(failed_pods)
-        CLUSTER_HEALTH_SCORE.set(score)
+        _set_cluster_gauges(k8s._check_nodes(), k8s._check_pods())
     except Exception:
-        API_UP.set(0)
-        TOTAL_NODES.set(0)
-        READY_NODES.set(0)
-        FAILED_PODS.set(0)
-        CLUSTER_HEALTH_SCORE.set(0)
+        _clear_cluster_gauges()
+
+
+def _publish_scan_metrics() -> None:
+    """Set gauges from the latest background scan without touching the cluster.
+
+    A failed scan leaves the latest successful one in place, as /issues/detect
+    keeps serving it; the failure shows in SCAN_FAILING and the scan's age.
+    """
+    latest = scheduler.latest
+    SCAN_FAILING.set(1 if scheduler.last_error else 0)
+    if latest is None:
+        _clear_cluster_gauges()
+    else:
+        _set_cluster_gauges(latest.nodes, latest.pods)
+        SCAN_GENERATION.set(latest.generation)
+        SCAN_AGE.set(latest.age_seconds)
+        SCAN_DURATION.set(latest.duration_seconds)
+
+
+def _publish_event_cache_metrics() -> None:
+    stats = event_cache.stats()
+    EVENT_CACHE_HITS.set(stats["hits"])
+    EVENT_CACHE_MISSES.set(stats["misses"])
+    EVENT_CACHE_SIZE.set(stats["size"])
+
+
+async def _scan_result(fresh: bool):
+    """Latest background scan, or a synchronous one when forced or none has finished yet."""
+    if fresh or not scheduler.enabled or scheduler.latest is None:
+        return await _run_blocking(scheduler.scan_once)
+    return scheduler.latest
+
+
+@app.on_event("startup")
+async def enable_raw_json():
+    """List pods, events and nodes as raw JSON views instead of client models when enabled."""
+    if _truthy(os.getenv("K8S_DIAGNOSTICS_RAW_JSON")):
+        k8s.enable_raw_json()
+
+
+@app.on_event("startup")
+async def start_informers():
+    """Serve detector and fixer list calls from list+watch stores when enabled."""
+    if not _truthy(os.getenv("K8S_DIAGNOSTICS_INFORMERS")):
+        return
+    kinds = [
+        kind.strip()
+        for kind in os.getenv("K8S_DIAGNOSTICS_INFORMER_KINDS", "").split(",")
+        if kind.strip()
+    ]
+    k8s.start_informers(kinds or None)
+
+
+@app.on_event("startup")
+async def start_scheduler():
+    scheduler.start()
+
+
+@app.on_event("shutdown")
+async def stop_informers():
+    await scheduler.stop()
+    k8s.stop_informers()
+    blocking.shutdown()
+    probes.shutdown()
 
 
 @app.get("/livez", include_in_schema=False)
@@ -115,7 +262,11 @@ async def livez():
 @app.get("/readyz", include_in_schema=False)
 async def readyz(response: Response):
     """Readiness probe based on lightweight API connectivity."""
-    if k8s.is_ready():
+    try:
+        ready = await probes.run(k8s.is_ready)
+    except asyncio.TimeoutError:
+        ready = False
+    if ready:
         return {"status": "ready"}
 
     response.status_code = status.HTTP_503_SERVICE_UNAVAILABLE
@@ -127,39 +278,43 @@ async def readyz(response: Response):
 @app.get("/health")
 async def cluster_health():
     """Get comprehensive cluster health"""
-    return k8s.get_cluster_health()
+    return await _run_blocking(k8s.get_cluster_health)
 
 
 @app.get("/metrics", include_in_schema=False)
 async def metrics():
     """Prometheus scrape endpoint."""
-    _refresh_metrics()
+    if scheduler.enabled and scheduler.latest is not None:
+        _publish_scan_metrics()
+    else:
+        await _run_blocking(_refresh_metrics)
+    _publish_event_cache_metrics()
     return Response(content=generate_latest(), media_type=CONTENT_TYPE_LATEST)
 
 @app.get("/diagnose/pod/{namespace}/{pod_name}")
 async def diagnose_pod(namespace: str, pod_name: str):
     """Diagnose specific pod issues"""
-    return await diagnostics.diagnose_pod(namespace, pod_name)
+    return await _run_engine(diagnostics.diagnose_pod, namespace, pod_name)
 
 @app.get("/diagnose/network")
 async def diagnose_network():
     """Run network diagnostics"""
-    return await diagnostics.check_network()
+    return await _run_engine(diagnostics.check_network)
 
 @app.post("/fix/restart-failed-pods")
 async def restart_failed_pods(_auth: bool = Depends(require_mutation_access)):
     """Auto-restart failed pods"""
-    return await fixer.restart_failed_pods()
+    return await _run_engine(fixer.restart_failed_pods)
 
 @app.post("/fix/cleanup-evicted")
 async def cleanup_evicted(_auth: bool = Depends(require_mutation_access)):
     """Remove evicted pods"""
-    return await fixer.cleanup_evicted_pods()
+    return await _run_engine(fixer.cleanup_evicted_pods)
 
 @app.post("/fix/dns")
 async def fix_dns(_auth: bool = Depends(require_mutation_access)):
     """Restart unhealthy CoreDNS pods"""
-    return await fixer.fix_dns_issues()
+    return await _run_engine(fixer.fix_dns_issues)
 
 @app.post("/fix/scale/{namespace}/{deployment}")
 async def scale_workload(
@@ -170,37 +325,68 @@ async def scale_workload(
 ):
     """Scale a deployment to a desired replica count"""
     require_allowed_namespace(namespace)
-    return await fixer.scale_resources(namespace, deployment, replicas)
+    return await _run_engine(fixer.scale_resources, namespace, deployment, replicas)
 
 @app.get("/metrics/resources")
 async def resource_metrics():
     """Get resource utilization metrics"""
-    return await diagnostics.get_resource_metrics()
+    return await _run_engine(diagnostics.get_resource_metrics)
 
 @app.get("/issues/detect")
-async def detect_issues():
-    """Auto-detect common issues"""
-    return await diagnostics.detect_common_issues()
+async def detect_issues(
+    fresh: bool = Query(default=False),
+    detectors: Optional[str] = Query(default=None),
+    skip: Optional[str] = Query(default=None),
+):
+    """Auto-detect common issues (latest background scan; ?fresh=true rescans now).
+
+    ?detectors=a,b and ?skip=c run a one-off scan with only those detectors.
+    """
+    if detectors or skip:
+        enabled, disabled = parse_detector_list(detectors), parse_detector_list(skip)
+        try:
+            diagnostics.plan_detectors(enabled, disabled)
+        except ValueError as e:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+        return await _run_engine(
+            diagnostics.detect_common_issues, enabled=enabled, disabled=disabled
+        )
+    result = await _scan_result(fresh)
+    return {**result.issues, "scan": result.describe()}
+
+@app.get("/capacity/simulate")
+async def simulate_capacity(
+    add_nodes: List[str] = Query(default=[]),
+    drain: Optional[str] = Query(default=None),
+    scale: List[str] = Query(default=[]),
+):
+    """What-if bin-packing, e.g. ?drain=node-a&add_nodes=2:like=node-b&scale=prod/web=10"""
+    try:
+        scenario = Scenario.parse(add_nodes=add_nodes, drain=drain, scale=scale)
+        return await _run_engine(diagnostics.simulate_capacity, scenario)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
 
 @app.get("/ai/predict")
-async def predict_risk():
+async def predict_risk(fresh: bool = Query(default=False)):
     """Heuristic risk prediction from current issues"""
-    return await diagnostics.predict_risk()
+    result = await _scan_result(fresh)
+    return {**result.risk, "scan": result.describe()}
 
 @app.post("/ai/heal")
 async def autonomous_healing(_auth: bool = Depends(require_mutation_access)):
     """Attempt autonomous healing for common issues"""
-    return await fixer.auto_remediate(diagnostics)
+    return await _run_engine(fixer.auto_remediate, diagnostics)
 
 @app.get("/ai/optimize")
 async def optimize_cluster():
     """Cost optimization recommendations (heuristic)"""
-    return diagnostics.optimize_costs()
+    return await _run_blocking(diagnostics.optimize_costs)
 
 @app.get("/diagnose/provider")
 async def provider_diagnostics():
     """Provider-aware diagnostics"""
-    return diagnostics.provider_diagnostics()
+    return await _run_blocking(diagnostics.provider_diagnostics)
 
 @app.post("/chaos/inject")
 async def inject_chaos(
@@ -211,7 +397,7 @@ async def inject_chaos(
 ):
     """Inject pod failure (dry-run by default)"""
     require_allowed_namespace(namespace)
-    return await chaos.inject_pod_failure(namespace, label_selector, dry_run)
+    return await _run_engine(chaos.inject_pod_failure, namespace, label_selector, dry_run)
 
 if __name__ == "__main__":
     import uvicorn
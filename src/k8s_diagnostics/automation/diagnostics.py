@@ -1,8 +1,21 @@
-from typing import Dict, List, Optional
+import functools
+from typing import Dict, Iterable, List, Optional, Tuple
 from datetime import datetime
 from kubernetes.client import V1Pod
 from kubernetes.client.rest import ApiException
 
+from ..core.client import iter_pages, list_metadata
+from .events import EventIndex, object_events
+from .incremental import IncrementalScan
+from .registry import Detector, ScanContext, plan_detectors, required_kinds
+from .runner import DetectorOutcome, DetectorRunner
+from .selectors import LabelIndex, Selector, pod_template_labels
+from .simulator import Scenario, run_scenario
+from .scheduling import (
+    NodeIndex, RequestLedger, parse_cpu_millis, parse_memory_bytes, tolerates_taint,
+)
+from ..core.snapshot import ClusterSnapshot, snapshot_items, snapshot_pages
+
 try:
     from ..analysis.pattern_matcher import match_events, match_log_lines, format_match
     _PM_AVAILABLE = True
@@ -37,8 +50,31 @@ EXIT_CODE_MAP: Dict[int, tuple] = {
 
 
 class DiagnosticsEngine:
-    def __init__(self, k8s_client):
+    def __init__(
+        self,
+        k8s_client,
+        pod_page_size: Optional[int] = None,
+        detector_runner: Optional[DetectorRunner] = None,
+        enabled_detectors: Optional[Iterable[str]] = None,
+        disabled_detectors: Optional[Iterable[str]] = None,
+        incremental: bool = False,
+        pod_scan_timeout_seconds: Optional[float] = 120.0,
+    ):
         self.k8s = k8s_client
+        # When set, cluster scans stream pods in pages of this size instead of
+        # holding the full pod list in memory.
+        self.pod_page_size = pod_page_size
+        self.detector_runner = detector_runner or DetectorRunner()
+        # Deadline for the shared pod scan, which every pod-level detector waits on
+        self.pod_scan_timeout_seconds = pod_scan_timeout_seconds
+        # Default detector selection (issue types) for detect_common_issues()
+        self.enabled_detectors = enabled_detectors
+        self.disabled_detectors = disabled_detectors
+        plan_detectors(enabled_detectors, disabled_detectors)  # reject unknown names early
+        # Repeated scans re-evaluate only pods and kinds that changed since the last one
+        self.incremental = IncrementalScan(self) if incremental else None
+        # (snapshot, ledger, NodeIndex, PVCs by namespace) for the most recent snapshot analysed
+        self._scheduling_cache: Optional[Tuple] = None
 
     # ─────────────────────────────────────────────────────────────
     # Public: Pod diagnosis (exit codes + probes + scheduling)
@@ -49,8 +85,7 @@ class DiagnosticsEngine:
         try:
             pod = self.k8s.v1.read_namespaced_pod(pod_name, namespace)
 
-            raw_events = self.k8s.v1.list_namespaced_event(namespace)
-            pod_event_objs = [e for e in raw_events.items if e.involved_object.name == pod_name]
+            pod_event_objs = object_events(self.k8s, "Pod", namespace, pod_name, pod.metadata.uid)
 
             diagnosis = {
                 "pod_info": {
@@ -67,14 +102,7 @@ class DiagnosticsEngine:
                     self._analyze_scheduling(pod) if pod.status.phase == "Pending" else None
                 ),
                 "resources": self._check_resources(pod),
-                "events": sorted(
-                    [
-                        {"type": e.type, "reason": e.reason,
-                         "message": e.message, "time": str(e.last_timestamp)}
-                        for e in pod_event_objs
-                    ],
-                    key=lambda x: x["time"], reverse=True
-                )[:10],
+                "events": self._format_pod_events(pod_event_objs),
                 "issues": self._detect_pod_issues(pod),
                 "pattern_analysis": self._pattern_analyse_pod(pod, pod_event_objs, namespace),
             }
@@ -219,31 +247,45 @@ class DiagnosticsEngine:
     # Gap 2: Scheduling analysis (why is this pod Pending?)
     # ─────────────────────────────────────────────────────────────
 
-    def _analyze_scheduling(self, pod) -> Dict:
+    def _analyze_scheduling(
+        self,
+        pod,
+        snapshot: Optional[ClusterSnapshot] = None,
+        ledger: Optional[RequestLedger] = None,
+        detailed: bool = True,
+    ) -> Dict:
         """
         Determine why a Pending pod cannot be scheduled.
         Checks: unbound PVCs, nodeSelector mismatch, taint/toleration mismatch,
-        and resource pressure (requests vs allocatable).
-        Note: resource comparison is against node allocatable, not remaining capacity.
+        and resource pressure (requests vs remaining node capacity).
+        Nodes are read through a NodeIndex built once per snapshot, so analysing
+        every pending pod of a scan costs one pass over the nodes in total.
+        `ledger` holds the requests already committed to each node (the pod
+        scan builds one); without it the pods are listed once to build it.
+        With `detailed=False` the reasons leave out the per-node capacity
+        table and taint examples, which cost a pass over the nodes each.
         """
         reasons = []
 
         try:
-            nodes = self.k8s.v1.list_node().items
+            nodes, pvcs_by_namespace = self._scheduling_inputs(snapshot, ledger)
         except Exception as e:
             return {"error": f"Could not list nodes: {e}"}
 
         # Check 1: Unbound or missing PVCs
         if pod.spec.volumes:
-            try:
-                pvcs = {
-                    p.metadata.name: p
-                    for p in self.k8s.v1.list_namespaced_persistent_volume_claim(
-                        pod.metadata.namespace
-                    ).items
-                }
-            except Exception:
-                pvcs = {}
+            if pvcs_by_namespace is not None:
+                pvcs = pvcs_by_namespace.get(pod.metadata.namespace, {})
+            else:
+                try:
+                    pvcs = {
+                        p.metadata.name: p
+                        for p in snapshot_items(
+                            self.k8s, snapshot, "pvcs", namespace=pod.metadata.namespace
+                        )
+                    }
+                except Exception:
+                    pvcs = {}
 
             for vol in pod.spec.volumes:
                 if not vol.persistent_volume_claim:
@@ -271,16 +313,12 @@ class DiagnosticsEngine:
                         ),
                     })
 
+        feasibility = nodes.feasibility(pod)
+
         # Check 2: nodeSelector — does any node match?
         if pod.spec.node_selector:
             selector = pod.spec.node_selector
-            matching = [
-                n.metadata.name for n in nodes
-                if n.metadata.labels and all(
-                    n.metadata.labels.get(k) == v for k, v in selector.items()
-                )
-            ]
-            if not matching:
+            if not feasibility.selector:
                 reasons.append({
                     "reason": "node_selector_no_match",
                     "detail": f"nodeSelector {selector} matches 0 of {len(nodes)} nodes",
@@ -293,23 +331,12 @@ class DiagnosticsEngine:
                 })
 
         # Check 3: Taints — can any node accept this pod?
-        tolerations = pod.spec.tolerations or []
-        taint_blocked: List[Dict] = []
-        for node in nodes:
-            for taint in (node.spec.taints or []):
-                if taint.effect in ("NoSchedule", "NoExecute"):
-                    if not self._pod_tolerates_taint(tolerations, taint):
-                        taint_blocked.append({
-                            "node": node.metadata.name,
-                            "taint": f"{taint.key}={taint.value}:{taint.effect}",
-                        })
-                        break  # one blocking taint per node is enough
-
-        if taint_blocked and len(taint_blocked) == len(nodes):
+        taint_blocked = nodes.all & ~feasibility.untainted
+        if taint_blocked and taint_blocked == nodes.all:
             reasons.append({
                 "reason": "taint_no_toleration",
                 "detail": f"All {len(nodes)} nodes have NoSchedule/NoExecute taints the pod does not tolerate",
-                "examples": taint_blocked[:3],
+                "examples": nodes.taint_examples(pod.spec.tolerations, taint_blocked) if detailed else [],
                 "layer": "layer1",
                 "suggested_action": (
                     "Add a toleration to the pod spec matching the taint key/effect shown above"
@@ -317,46 +344,28 @@ class DiagnosticsEngine:
             })
 
         # Check 4: Resource pressure — can any node fit the pod's requests?
-        cpu_req_m = 0.0
-        mem_req_bytes = 0.0
-        for container in pod.spec.containers:
-            if container.resources and container.resources.requests:
-                reqs = container.resources.requests
-                cpu_req_m += self._parse_cpu_millis(reqs.get("cpu"))
-                mem_req_bytes += self._parse_memory_bytes(reqs.get("memory"))
-
-        if cpu_req_m > 0 or mem_req_bytes > 0:
-            node_summaries = []
-            can_fit = False
-            for node in nodes:
-                alloc = node.status.allocatable or {}
-                cpu_alloc_m = self._parse_cpu_millis(alloc.get("cpu"))
-                mem_alloc_bytes = self._parse_memory_bytes(alloc.get("memory"))
-                fits = (cpu_req_m <= cpu_alloc_m) and (mem_req_bytes <= mem_alloc_bytes)
-                if fits:
-                    can_fit = True
-                node_summaries.append({
-                    "node": node.metadata.name,
-                    "allocatable_cpu_m": int(cpu_alloc_m),
-                    "allocatable_mem_mi": int(mem_alloc_bytes / (1024 * 1024)),
-                    "fits_pod_request": fits,
-                })
-
-            if not can_fit:
-                reasons.append({
-                    "reason": "insufficient_resources",
-                    "detail": (
-                        f"Pod requests cpu={int(cpu_req_m)}m "
-                        f"memory={int(mem_req_bytes / (1024*1024))}Mi — "
-                        "no node has enough allocatable capacity "
-                        "(note: this is total allocatable, not remaining)"
-                    ),
-                    "nodes": node_summaries,
-                    "layer": "layer1",
-                    "suggested_action": (
-                        "Lower resource requests, add a larger node pool, or scale out the cluster"
-                    ),
-                })
+        cpu_req_m, mem_req_bytes = feasibility.cpu_req_m, feasibility.mem_req_bytes
+        requests_something = cpu_req_m > 0 or mem_req_bytes > 0 or feasibility.ephemeral_req_bytes > 0
+        if (requests_something or nodes.remaining) and not feasibility.fits:
+            capacity = (
+                "no node has enough remaining capacity (CPU, memory, pod slots, ephemeral storage) "
+                "after the requests of pods already bound to it"
+                if nodes.remaining else
+                "no node has enough allocatable capacity "
+                "(note: this is total allocatable, not remaining)"
+            )
+            reasons.append({
+                "reason": "insufficient_resources",
+                "detail": (
+                    f"Pod requests cpu={int(cpu_req_m)}m "
+                    f"memory={int(mem_req_bytes / (1024*1024))}Mi — {capacity}"
+                ),
+                "nodes": nodes.capacity_summary(feasibility.fits) if detailed else [],
+                "layer": "layer1",
+                "suggested_action": (
+                    "Lower resource requests, add a larger node pool, or scale out the cluster"
+                ),
+            })
 
         if not reasons:
             reasons.append({
@@ -367,54 +376,56 @@ class DiagnosticsEngine:
                 ),
             })
 
-        return {"pending_reasons": reasons, "nodes_checked": len(nodes)}
+        return {
+            "pending_reasons": reasons,
+            "nodes_checked": len(nodes),
+            "feasible_nodes": NodeIndex.count(feasibility.feasible),
+        }
+
+    def _scheduling_inputs(
+        self, snapshot: Optional[ClusterSnapshot], ledger: Optional[RequestLedger] = None
+    ) -> Tuple[NodeIndex, Optional[Dict[str, Dict]]]:
+        """NodeIndex and PVCs by namespace/name for `snapshot`, built once per snapshot.
+
+        Without a `ledger`, the pods are streamed once to build one; if that
+        fails, capacity falls back to total allocatable. Without a snapshot
+        nothing is cached and PVCs are left to per-pod lookups (None).
+        """
+        cached = self._scheduling_cache
+        if (
+            snapshot is not None and cached is not None and cached[0] is snapshot
+            and (ledger is None or cached[1] is ledger)
+        ):
+            return cached[2], cached[3]
+        if ledger is None:
+            try:
+                ledger = RequestLedger.from_pods(
+                    pod for page in snapshot_pages(self.k8s, snapshot, "pods") for pod in page
+                )
+            except Exception:
+                ledger = None
+        nodes = NodeIndex(snapshot_items(self.k8s, snapshot, "nodes"), ledger)
+        if snapshot is None:
+            return nodes, None
+        pvcs_by_namespace: Optional[Dict[str, Dict]] = None
+        if snapshot.has("pvcs") and "pvcs" not in snapshot.errors:
+            pvcs_by_namespace = {}
+            for pvc in snapshot.items("pvcs"):
+                pvcs_by_namespace.setdefault(pvc.metadata.namespace, {})[pvc.metadata.name] = pvc
+        self._scheduling_cache = (snapshot, ledger, nodes, pvcs_by_namespace)
+        return nodes, pvcs_by_namespace
 
     def _pod_tolerates_taint(self, tolerations, taint) -> bool:
         """Return True if at least one toleration matches the taint."""
-        for t in tolerations:
-            key_match = (not t.key) or (t.key == taint.key) or (t.operator == "Exists" and not t.key)
-            if t.operator == "Exists":
-                key_match = (not t.key) or (t.key == taint.key)
-                value_match = True
-            else:
-                key_match = t.key == taint.key
-                value_match = t.value == taint.value
-            effect_match = (not t.effect) or (t.effect == taint.effect)
-            if key_match and value_match and effect_match:
-                return True
-        return False
+        return tolerates_taint(tolerations, taint)
 
     def _parse_cpu_millis(self, qty) -> float:
         """Parse a Kubernetes CPU quantity string to millicores."""
-        if not qty:
-            return 0.0
-        s = str(qty)
-        try:
-            if s.endswith("m"):
-                return float(s[:-1])
-            elif s.endswith("n"):          # nanocores → millicores
-                return float(s[:-1]) / 1_000_000
-            else:
-                return float(s) * 1000    # whole cores → millicores
-        except (ValueError, TypeError):
-            return 0.0
+        return parse_cpu_millis(qty)
 
     def _parse_memory_bytes(self, qty) -> float:
         """Parse a Kubernetes memory quantity string to bytes."""
-        if not qty:
-            return 0.0
-        s = str(qty)
-        suffixes = {
-            "Ki": 1024, "Mi": 1024**2, "Gi": 1024**3, "Ti": 1024**4,
-            "k": 1000,  "M": 1000**2,  "G": 1000**3,  "T": 1000**4,
-        }
-        try:
-            for suffix, mult in suffixes.items():
-                if s.endswith(suffix):
-                    return float(s[: -len(suffix)]) * mult
-            return float(s)
-        except (ValueError, TypeError):
-            return 0.0
+        return parse_memory_bytes(qty)
 
     # ─────────────────────────────────────────────────────────────
     # Existing helpers (retained, minor guard additions)
@@ -442,8 +453,11 @@ class DiagnosticsEngine:
                     resources["limits"][container.name] = dict(container.resources.limits)
         return resources
 
-    def _get_pod_events(self, namespace: str, pod_name: str) -> List[Dict]:
-        events = self.k8s.v1.list_namespaced_event(namespace)
+    def _get_pod_events(self, namespace: str, pod_name: str, uid: Optional[str] = None) -> List[Dict]:
+        return self._format_pod_events(object_events(self.k8s, "Pod", namespace, pod_name, uid))
+
+    @staticmethod
+    def _format_pod_events(events: List) -> List[Dict]:
         pod_events = [
             {
                 "type": e.type,
@@ -451,8 +465,7 @@ class DiagnosticsEngine:
                 "message": e.message,
                 "time": str(e.last_timestamp),
             }
-            for e in events.items
-            if e.involved_object.name == pod_name
+            for e in events
         ]
         return sorted(pod_events, key=lambda x: x["time"], reverse=True)[:10]
 
@@ -509,405 +522,252 @@ class DiagnosticsEngine:
     # ─────────────────────────────────────────────────────────────
 
     async def check_network(self) -> Dict:
+        snapshot = ClusterSnapshot.fetch(self.k8s, kinds=("pods", "services", "endpoints"))
         return {
-            "dns": await self._check_dns(),
-            "services": self._check_service_endpoints(),
-            "ingress": self._check_ingress_controllers(),
-            "load_balancers": self._check_pending_load_balancers(),
+            "dns": await self._check_dns(snapshot),
+            "services": self._check_service_endpoints(snapshot),
+            "ingress": self._check_ingress_controllers(snapshot),
+            "load_balancers": self._check_pending_load_balancers(snapshot),
         }
 
-    async def _check_dns(self) -> Dict:
-        pods = self.k8s.v1.list_namespaced_pod("kube-system", label_selector="k8s-app=kube-dns")
-        running = sum(1 for p in pods.items if p.status.phase == "Running")
+    async def _check_dns(self, snapshot: Optional[ClusterSnapshot] = None) -> Dict:
+        pods = snapshot_items(
+            self.k8s, snapshot, "pods",
+            namespace="kube-system", label_selector="k8s-app=kube-dns",
+        )
+        running = sum(1 for p in pods if p.status.phase == "Running")
         return {
-            "coredns_pods": len(pods.items),
+            "coredns_pods": len(pods),
             "running_pods": running,
             "status": "healthy" if running > 0 else "degraded",
         }
 
-    def _check_service_endpoints(self) -> Dict:
-        services = self.k8s.v1.list_service_for_all_namespaces()
-        endpoints = self.k8s.v1.list_endpoints_for_all_namespaces()
+    def _check_service_endpoints(self, snapshot: Optional[ClusterSnapshot] = None) -> Dict:
+        services = snapshot_items(self.k8s, snapshot, "services")
+        endpoints = {
+            (e.metadata.namespace, e.metadata.name): e
+            for e in snapshot_items(self.k8s, snapshot, "endpoints")
+        }
         no_ep = [
             f"{svc.metadata.namespace}/{svc.metadata.name}"
-            for svc in services.items
-            if (ep := next(
-                (e for e in endpoints.items
-                 if e.metadata.name == svc.metadata.name
-                 and e.metadata.namespace == svc.metadata.namespace), None
-            )) and not ep.subsets
+            for svc in services
+            if (ep := endpoints.get((svc.metadata.namespace, svc.metadata.name)))
+            and not ep.subsets
         ]
-        return {"total_services": len(services.items), "services_without_endpoints": no_ep}
+        return {"total_services": len(services), "services_without_endpoints": no_ep}
 
-    def _check_ingress_controllers(self) -> Dict:
-        pods = self.k8s.v1.list_pod_for_all_namespaces(
-            label_selector="app.kubernetes.io/name=ingress-nginx"
+    def _check_ingress_controllers(self, snapshot: Optional[ClusterSnapshot] = None) -> Dict:
+        pods = snapshot_items(
+            self.k8s, snapshot, "pods", label_selector="app.kubernetes.io/name=ingress-nginx"
         )
         return {
-            "nginx_ingress_pods": len(pods.items),
-            "running": sum(1 for p in pods.items if p.status.phase == "Running"),
+            "nginx_ingress_pods": len(pods),
+            "running": sum(1 for p in pods if p.status.phase == "Running"),
         }
 
-    async def detect_common_issues(self) -> Dict:
-        """Auto-detect cluster issues. Pending pods now include a scheduling breakdown."""
-        issues = []
-
-        # Nodes not ready + node pressure conditions
-        nodes = self.k8s.v1.list_node()
-        not_ready = [
-            n.metadata.name for n in nodes.items
-            if not any(
-                c.type == "Ready" and c.status == "True"
-                for c in (n.status.conditions or [])
+    async def detect_common_issues(
+        self,
+        snapshot: Optional[ClusterSnapshot] = None,
+        enabled: Optional[Iterable[str]] = None,
+        disabled: Optional[Iterable[str]] = None,
+    ) -> Dict:
+        """Auto-detect cluster issues with the detectors in automation.registry.
+
+        `enabled`/`disabled` pick detectors by issue type for this scan and
+        default to the engine's configuration. Only the resource kinds those
+        detectors declare are listed, once each, into a ClusterSnapshot they
+        all share. Pending pods include a scheduling breakdown. With
+        incremental scans enabled, the response also carries an "incremental"
+        block saying how many pods were re-evaluated.
+        """
+        detectors = self.plan_detectors(enabled, disabled)
+        if snapshot is None:
+            snapshot = ClusterSnapshot.fetch(
+                self.k8s, kinds=required_kinds(detectors), pod_page_size=self.pod_page_size
             )
-        ]
-        if not_ready:
-            issues.append({
-                "type": "nodes_not_ready",
-                "severity": "high",
-                "count": len(not_ready),
-                "details": not_ready[:5],
-            })
 
-        # Check 2a: Node pressure conditions (MemoryPressure, DiskPressure, PIDPressure, NetworkUnavailable)
-        node_pressure = self._check_node_pressure(nodes.items)
-        if node_pressure:
-            issues.append({
-                "type": "node_pressure",
-                "severity": "high",
-                "count": len(node_pressure),
-                "details": node_pressure[:5],
-                "hint": "kubectl describe node <node> — check Conditions and Allocatable",
-            })
-
-        # Failed / Pending pods — with scheduling breakdown for Pending ones
-        pods = self.k8s.v1.list_pod_for_all_namespaces()
-        active_pods = [p for p in pods.items if not p.metadata.deletion_timestamp]
-        failed_pods = [p for p in active_pods if p.status.phase == "Failed"]
-        pending_pods = [p for p in active_pods if p.status.phase == "Pending"]
-
-        if failed_pods:
-            issues.append({
-                "type": "failed_pods",
-                "severity": "high",
-                "count": len(failed_pods),
-                "details": [
-                    f"{p.metadata.namespace}/{p.metadata.name}" for p in failed_pods[:5]
-                ],
-            })
+        # Independent detectors run concurrently; every pod-level detector shares
+        # a single pass over the pod pages. A detector that fails or times out
+        # contributes no issues and is listed in the response's "detectors" block.
+        reducers = {d.pod_reducer for d in detectors if d.pod_reducer}
+        if self.incremental is not None:
+            scan_pods, detect = self.incremental.scan_pods, self.incremental.detect
+        else:
+            scan_pods, detect = self._scan_pods, lambda d, snap: d.detect(self, snap)
+
+        def pod_scan() -> ScanContext:
+            # Detectors' `prepare` work runs here, so the pod scan's deadline covers it
+            scan_ctx = ScanContext(snapshot, scan_pods(snapshot, reducers))
+            for d in detectors:
+                if d.pod_reducer and d.prepare:
+                    scan_ctx.prepared[d.issue_type] = d.prepare(self, d, scan_ctx)
+            return scan_ctx
+
+        tasks = [("pod_scan", pod_scan)] if reducers else []
+        tasks += [
+            (d.issue_type, functools.partial(detect, d, snapshot))
+            for d in detectors if d.detect
+        ]
+        timeouts = {d.issue_type: d.timeout_seconds for d in detectors if d.timeout_seconds}
+        timeouts["pod_scan"] = self.pod_scan_timeout_seconds
+        outcomes = await self.detector_runner.run(tasks, timeouts=timeouts)
+        results = {name: outcome.result for name, outcome in outcomes.items() if outcome.ok}
+        scan = outcomes.get("pod_scan")
+        if scan is not None and not scan.ok:
+            # Without the pod scan no pod-level detector ran; report each one
+            for d in detectors:
+                if d.pod_reducer:
+                    outcomes[d.issue_type] = DetectorOutcome(
+                        d.issue_type, scan.status, scan.duration_seconds, error=f"pod_scan: {scan.error}"
+                    )
 
-        if pending_pods:
-            scheduling_details = []
-            for pod in pending_pods[:5]:
-                analysis = self._analyze_scheduling(pod)
-                scheduling_details.append({
-                    "pod": f"{pod.metadata.namespace}/{pod.metadata.name}",
-                    "pending_reasons": analysis.get("pending_reasons", []),
-                })
-            issues.append({
-                "type": "pending_pods",
-                "severity": "high",
-                "count": len(pending_pods),
-                "scheduling_analysis": scheduling_details,
-            })
+        ctx = results.get("pod_scan") or ScanContext(snapshot, self._empty_pod_scan())
+        issues: List[Dict] = []
+        for detector in detectors:
+            source = "pod_scan" if detector.pod_reducer else detector.issue_type
+            if source not in results:
+                continue
+            findings = ctx.pod_scan[detector.pod_reducer] if detector.pod_reducer else results[source]
+            issues.extend(detector.issues(self, findings, ctx))
 
-        # ImagePullBackOff
-        image_pull = self._find_image_pull_errors(active_pods)
-        if image_pull:
-            issues.append({
-                "type": "image_pull_errors",
-                "severity": "high",
-                "count": len(image_pull),
-                "details": image_pull[:5],
-            })
+        # 5-layer pattern analysis on cluster Warning events
+        pattern_matches: List[Dict] = []
+        if _PM_AVAILABLE and ctx.active_warning_events:
+            try:
+                pattern_matches = [
+                    format_match(pm) for pm in match_events(ctx.active_warning_events)
+                ]
+            except Exception:
+                pass
 
-        selector_mismatches = self._detect_service_selector_mismatches()
-        if selector_mismatches:
-            issues.append({
-                "type": "service_selector_mismatch",
-                "severity": "high",
-                "count": len(selector_mismatches),
-                "details": selector_mismatches[:5],
-            })
+        report = {
+            "issues": issues,
+            "pattern_analysis": pattern_matches,
+            "detectors": DetectorRunner.summary(outcomes),
+            "timestamp": datetime.now().isoformat(),
+        }
+        if self.incremental is not None and reducers:
+            report["incremental"] = dict(self.incremental.stats)
+        return report
+
+    def plan_detectors(
+        self, enabled: Optional[Iterable[str]] = None, disabled: Optional[Iterable[str]] = None
+    ) -> Tuple[Detector, ...]:
+        """Detectors a scan runs; arguments override the engine's enabled/disabled sets."""
+        return plan_detectors(
+            self.enabled_detectors if enabled is None else enabled,
+            self.disabled_detectors if disabled is None else disabled,
+        )
 
-        config_key_mismatches = self._detect_configmap_key_mismatches(active_pods)
-        if config_key_mismatches:
-            issues.append({
-                "type": "configmap_key_mismatch",
-                "severity": "high",
-                "count": len(config_key_mismatches),
-                "details": config_key_mismatches[:5],
-            })
+    def _find_not_ready_nodes(self, snapshot: Optional[ClusterSnapshot] = None) -> List[str]:
+        return [
+            n.metadata.name for n in snapshot_items(self.k8s, snapshot, "nodes")
+            if not any(
+                c.type == "Ready" and c.status == "True"
+                for c in (n.status.conditions or [])
+            )
+        ]
 
-        # Pending PVCs
-        pending_pvcs = self.k8s.v1.list_persistent_volume_claim_for_all_namespaces()
-        stuck_pvcs = [
+    def _find_unbound_pvcs(self, snapshot: Optional[ClusterSnapshot] = None) -> List[str]:
+        return [
             f"{p.metadata.namespace}/{p.metadata.name}"
-            for p in pending_pvcs.items
+            for p in snapshot_items(self.k8s, snapshot, "pvcs")
             if p.status.phase != "Bound"
         ]
-        if stuck_pvcs:
-            issues.append({
-                "type": "pvc_not_bound",
-                "severity": "medium",
-                "count": len(stuck_pvcs),
-                "details": stuck_pvcs[:5],
-            })
-
-        # CoreDNS
-        dns_status = await self._check_dns()
-        if dns_status.get("running_pods", 0) == 0:
-            issues.append({
-                "type": "dns_unhealthy",
-                "severity": "high",
-                "details": ["CoreDNS pods not running"],
-            })
-
-        # Pending LoadBalancers
-        pending_lbs = self._check_pending_load_balancers().get("pending", [])
-        if pending_lbs:
-            issues.append({
-                "type": "load_balancer_pending",
-                "severity": "medium",
-                "count": len(pending_lbs),
-                "details": pending_lbs[:5],
-            })
-
-        ingress_backend_issues = self._detect_ingress_backend_missing_services()
-        if ingress_backend_issues:
-            issues.append({
-                "type": "ingress_backend_missing_service",
-                "severity": "high",
-                "count": len(ingress_backend_issues),
-                "details": ingress_backend_issues[:5],
-            })
-
-        # High restart counts
-        high_restart = [
-            f"{pod.metadata.namespace}/{pod.metadata.name}"
-            for pod in active_pods
-            for cs in (pod.status.container_statuses or [])
-            if cs.restart_count > 10
-        ]
-        if high_restart:
-            issues.append({
-                "type": "high_restart_count",
-                "severity": "medium",
-                "count": len(high_restart),
-                "details": high_restart[:5],
-            })
-
-        # Probe failures (running but not ready)
-        probe_failures = self._find_probe_failures(active_pods)
-        if probe_failures:
-            issues.append({
-                "type": "probe_failures",
-                "severity": "medium",
-                "count": len(probe_failures),
-                "details": probe_failures[:5],
-                "hint": "Use 'diagnose <ns> <pod>' for per-container probe analysis",
-            })
 
-        init_blockers = self._find_init_container_blockers(active_pods)
-        if init_blockers:
-            issues.append({
-                "type": "init_containers_blocked",
-                "severity": "high",
-                "count": len(init_blockers),
-                "details": init_blockers[:5],
-                "hint": (
-                    "kubectl logs <pod> -n <ns> -c <init-container>; "
-                    "then check any dependency Service/endpoints the init container waits for"
-                ),
-            })
+    def _run_provider_checks(self, snapshot: ClusterSnapshot) -> List[Dict]:
+        from ..providers.detector import run_provider_checks
+        return run_provider_checks(self.k8s, snapshot=snapshot)
 
-        aggressive_liveness = self._detect_aggressive_liveness_probes(active_pods)
-        if aggressive_liveness:
-            issues.append({
-                "type": "aggressive_liveness_probe",
-                "severity": "high",
-                "count": len(aggressive_liveness),
-                "details": aggressive_liveness[:5],
-            })
-
-        gitops_controller_issues = self._detect_gitops_controller_issues(active_pods)
-        if gitops_controller_issues:
-            issues.append({
-                "type": "gitops_controller_unhealthy",
-                "severity": "high",
-                "count": len(gitops_controller_issues),
-                "details": gitops_controller_issues[:10],
-                "hint": "kubectl get pods -n argocd; kubectl get pods -n flux-system",
-            })
-
-        gitops_crd_issues = self._detect_gitops_crd_issues()
-        if gitops_crd_issues:
-            issues.append({
-                "type": "gitops_crd_missing",
-                "severity": "high",
-                "count": len(gitops_crd_issues),
-                "details": gitops_crd_issues[:10],
-                "hint": "Reinstall the controller manifests; use server-side apply for large Argo CD CRDs.",
-            })
-
-        argocd_issues = self._detect_argocd_application_issues()
-        if argocd_issues:
-            issues.append({
-                "type": "argocd_application_unhealthy",
-                "severity": "medium",
-                "count": len(argocd_issues),
-                "details": argocd_issues[:10],
-                "hint": "kubectl get applications -A; kubectl describe application <name> -n <ns>",
-            })
-
-        flux_issues = self._detect_flux_resource_issues()
-        if flux_issues:
-            issues.append({
-                "type": "flux_resource_not_ready",
-                "severity": "medium",
-                "count": len(flux_issues),
-                "details": flux_issues[:10],
-                "hint": "kubectl get gitrepositories,kustomizations,helmreleases -A; describe the NotReady object.",
-            })
-
-        # Warning events cluster-wide (last 1 hour)
-        active_warning_events = self._active_warning_events(active_pods)
-        warning_events = self._format_warning_events(active_warning_events)
-        if warning_events:
-            issues.append({
-                "type": "warning_events",
-                "severity": "medium",
-                "count": len(warning_events),
-                "details": warning_events[:10],
-                "hint": "kubectl get events -A --field-selector type=Warning --sort-by=.lastTimestamp",
-            })
-
-        # Control plane component health (etcd, scheduler, controller-manager)
-        component_issues = self._check_component_health()
-        if component_issues:
-            issues.append({
-                "type": "control_plane_unhealthy",
-                "severity": "high",
-                "count": len(component_issues),
-                "details": component_issues,
-                "hint": "kubectl get componentstatuses",
-            })
-
-        # CrashLoopBackOff (phase=Running but waiting.reason=CrashLoopBackOff)
-        crashloop = self._find_crashloop_pods(active_pods)
-        if crashloop:
-            issues.append({
-                "type": "crashloop_backoff",
-                "severity": "high",
-                "count": len(crashloop),
-                "details": crashloop[:5],
-                "hint": "kubectl logs <pod> --previous -n <ns> — check exit code with diagnose <ns> <pod>",
-            })
-
-        # Terminating pods stuck with finalizers
-        stuck_terminating = self._find_stuck_terminating(pods.items)
-        if stuck_terminating:
-            issues.append({
-                "type": "stuck_terminating",
-                "severity": "medium",
-                "count": len(stuck_terminating),
-                "details": stuck_terminating[:5],
-                "hint": "kubectl get pod <pod> -o yaml | grep finalizers — remove finalizer to unblock",
-            })
-
-        # Missing ConfigMaps/Secrets referenced by pods
-        missing_refs = self._find_missing_config_refs(active_pods)
-        if missing_refs:
-            issues.append({
-                "type": "missing_config_refs",
-                "severity": "high",
-                "count": len(missing_refs),
-                "details": missing_refs[:5],
-                "hint": "Create the missing ConfigMap or Secret, or remove the reference from the pod spec",
-            })
-
-        # NetworkPolicy deny-all (ingress policyType with no ingress rules)
-        deny_all_ns = self._find_deny_all_networkpolicies()
-        if deny_all_ns:
-            issues.append({
-                "type": "networkpolicy_deny_all",
-                "severity": "medium",
-                "count": len(deny_all_ns),
-                "details": deny_all_ns[:5],
-                "hint": "kubectl get networkpolicy -n <ns> -o yaml — add ingress rules or an allow policy",
-            })
+    @staticmethod
+    def _empty_pod_scan() -> Dict:
+        return {
+            "failed_pods": [],
+            "pending_count": 0,
+            "pending_pods": [],
+            # Requests committed to each node, for scheduling analysis
+            "node_requests": RequestLedger(),
+            "image_pull": [],
+            "config_key_mismatches": [],
+            "high_restart": [],
+            "probe_failures": [],
+            "init_blockers": [],
+            "aggressive_liveness": [],
+            "gitops_controller_issues": [],
+            "crashloop": [],
+            "stuck_terminating": [],
+            "missing_refs": [],
+            "unready_pods": set(),
+        }
 
-        # HPA not scaling (metrics unavailable or misconfigured)
-        hpa_issues = self._find_hpa_issues()
-        if hpa_issues:
-            issues.append({
-                "type": "hpa_issues",
-                "severity": "medium",
-                "count": len(hpa_issues),
-                "details": hpa_issues[:5],
-                "hint": "kubectl describe hpa -n <ns> — check if metrics-server is running and metric name is correct",
-            })
+    def _scan_pods(self, snapshot: ClusterSnapshot, reducers: Optional[Iterable[str]] = None) -> Dict:
+        """Run the pod-level detectors over the cluster's pods, one page at a time.
 
-        # TLS Secret certificates expiring within 7 days or already expired
-        cert_issues = self._find_expiring_tls_certs()
-        if cert_issues:
-            issues.append({
-                "type": "tls_cert_expiring",
-                "severity": "high",
-                "count": len(cert_issues),
-                "details": cert_issues[:5],
-                "hint": "Renew TLS certificates; if using cert-manager: kubectl annotate certificate <name> -n <ns> cert-manager.io/renewal-reason=manual",
-            })
+        Each detector is a reducer over pages: per-page findings are appended and
+        the page is dropped. Only short finding strings, the Pending pods and
+        per-node committed requests (for scheduling analysis), and the keys of active-but-unready pods (used to
+        filter Warning events) outlive a page. `reducers` limits the pass to
+        those keys of the result (default: all of them).
+        """
+        scan = self._empty_pod_scan()
+        wanted = set(scan) if reducers is None else set(reducers)
+        page_reducers = self._pod_page_reducers(snapshot, wanted)
+
+        for page in snapshot_pages(self.k8s, snapshot, "pods"):
+            if "pending_count" in wanted:
+                # Terminating pods still hold their node's resources
+                for pod in page:
+                    scan["node_requests"].add(pod)
+            active_pods = [p for p in page if not p.metadata.deletion_timestamp]
+            for pod in active_pods:
+                ref = f"{pod.metadata.namespace}/{pod.metadata.name}"
+                if pod.status.phase == "Failed":
+                    scan["failed_pods"].append(ref)
+                elif pod.status.phase == "Pending":
+                    scan["pending_count"] += 1
+                    scan["pending_pods"].append(pod)
+                if "unready_pods" in wanted and not self._pod_is_ready(pod):
+                    scan["unready_pods"].add((pod.metadata.namespace, pod.metadata.name))
+                scan["high_restart"].extend(
+                    ref for cs in (pod.status.container_statuses or []) if cs.restart_count > 10
+                )
 
-        # Jobs/CronJobs stuck (backoffLimit exhausted or active+complete stalled)
-        job_issues = self._find_stuck_jobs()
-        if job_issues:
-            issues.append({
-                "type": "stuck_jobs",
-                "severity": "medium",
-                "count": len(job_issues),
-                "details": job_issues[:5],
-                "hint": "kubectl describe job <name> -n <ns> — check backoffLimit, pod logs, and whether the job command exits 0",
-            })
+            for key, reducer in page_reducers.items():
+                scan[key].extend(reducer(active_pods))
+            if "stuck_terminating" in wanted:
+                scan["stuck_terminating"].extend(self._find_stuck_terminating(page))
 
-        # DaemonSet pods not scheduled on all eligible nodes
-        ds_issues = self._find_daemonset_gaps()
-        if ds_issues:
-            issues.append({
-                "type": "daemonset_not_fully_scheduled",
-                "severity": "medium",
-                "count": len(ds_issues),
-                "details": ds_issues[:5],
-                "hint": "kubectl describe ds <name> -n <ns> — check nodeSelector and tolerations; new nodes may need labels",
-            })
+        return scan
 
-        # Phase 2: cloud provider layer (AKS/EKS/GKE)
-        try:
-            from ..providers.detector import run_provider_checks
-            provider_issues = run_provider_checks(self.k8s)
-            # Filter out info-level SDK-unavailable or provider-unknown notices.
-            # The explicit provider commands still expose those details, but the
-            # general detector should stay focused on active cluster failures.
-            actionable = [i for i in provider_issues if i.get("severity") != "info"]
-            issues.extend(actionable)
-        except Exception:
-            pass  # provider layer must never crash detect_common_issues()
+    def _pod_page_reducers(self, snapshot: ClusterSnapshot, wanted: Iterable[str]) -> Dict:
+        """Pod scan key -> detector over one page of active (not terminating) pods.
 
-        # 5-layer pattern analysis on cluster Warning events
-        pattern_matches: List[Dict] = []
-        if _PM_AVAILABLE and active_warning_events:
+        Only keys in `wanted` are returned. State shared across pages (the
+        Warning event index, ConfigMap/Secret names) is set up once here.
+        """
+        wanted = set(wanted)
+        config_name_cache: Dict[str, Dict[str, set]] = {}
+        warning_events = EventIndex()
+        if "aggressive_liveness" in wanted:
+            # Liveness failures are Warning events, already in the snapshot; index them once
             try:
-                pattern_matches = [
-                    format_match(pm) for pm in match_events(active_warning_events)
-                ]
+                warning_events = EventIndex.build(self.k8s, snapshot, "warning_events")
             except Exception:
                 pass
 
-        return {
-            "issues": issues,
-            "pattern_analysis": pattern_matches,
-            "timestamp": datetime.now().isoformat(),
+        page_reducers = {
+            "image_pull": self._find_image_pull_errors,
+            "config_key_mismatches": self._detect_configmap_key_mismatches,
+            "probe_failures": self._find_probe_failures,
+            "init_blockers": self._find_init_container_blockers,
+            "aggressive_liveness": lambda pods: self._detect_aggressive_liveness_probes(
+                pods, warning_events
+            ),
+            "gitops_controller_issues": self._detect_gitops_controller_issues,
+            "crashloop": self._find_crashloop_pods,
+            "missing_refs": lambda pods: self._find_missing_config_refs(pods, config_name_cache),
         }
+        return {key: func for key, func in page_reducers.items() if key in wanted}
 
     def _find_probe_failures(self, pods: List[V1Pod]) -> List[str]:
         failures = []
@@ -951,13 +811,22 @@ class DiagnosticsEngine:
                 break
         return blockers
 
-    def _detect_service_selector_mismatches(self) -> List[str]:
+    def _detect_service_selector_mismatches(
+        self, snapshot: Optional[ClusterSnapshot] = None
+    ) -> List[str]:
         issues = []
-        services = self.k8s.v1.list_service_for_all_namespaces().items
+        services = snapshot_items(self.k8s, snapshot, "services")
         endpoints = {
             (ep.metadata.namespace, ep.metadata.name): ep
-            for ep in self.k8s.v1.list_endpoints_for_all_namespaces().items
+            for ep in snapshot_items(self.k8s, snapshot, "endpoints")
         }
+        # One deployments list for all services, instead of a read per service
+        try:
+            deployments = snapshot_items(self.k8s, snapshot, "deployments")
+        except Exception:
+            deployments = ()
+        deployments_by_name = {(d.metadata.namespace, d.metadata.name): d for d in deployments}
+        templates = LabelIndex(deployments, labels_of=pod_template_labels)
 
         for svc in services:
             if not svc.spec.selector:
@@ -967,16 +836,16 @@ class DiagnosticsEngine:
             if ep and ep.subsets:
                 continue
 
-            try:
-                dep = self.k8s.apps_v1.read_namespaced_deployment(
-                    svc.metadata.name, svc.metadata.namespace
-                )
-            except Exception:
+            dep = deployments_by_name.get((svc.metadata.namespace, svc.metadata.name))
+            if dep is None:
                 continue
 
             expected = dep.spec.selector.match_labels or {}
             current = svc.spec.selector or {}
-            if expected and expected != current:
+            if not expected or expected == current:
+                continue
+            # A selector that still selects some deployment's pods is not the problem
+            if not templates.select(svc.metadata.namespace, Selector.compile(current)):
                 issues.append(
                     f"{svc.metadata.namespace}/{svc.metadata.name} — selector {current} does not match deployment selector {expected}"
                 )
@@ -1017,9 +886,11 @@ class DiagnosticsEngine:
 
         return issues
 
-    def _detect_ingress_backend_missing_services(self) -> List[str]:
+    def _detect_ingress_backend_missing_services(
+        self, snapshot: Optional[ClusterSnapshot] = None
+    ) -> List[str]:
         issues = []
-        ingresses = self.k8s.networking_v1.list_ingress_for_all_namespaces().items
+        ingresses = snapshot_items(self.k8s, snapshot, "ingresses")
         services_by_ns = {}
 
         for ingress in ingresses:
@@ -1027,7 +898,7 @@ class DiagnosticsEngine:
             if namespace not in services_by_ns:
                 services_by_ns[namespace] = {
                     svc.metadata.name
-                    for svc in self.k8s.v1.list_namespaced_service(namespace).items
+                    for svc in snapshot_items(self.k8s, snapshot, "services", namespace=namespace)
                 }
 
             for rule in ingress.spec.rules or []:
@@ -1045,7 +916,14 @@ class DiagnosticsEngine:
 
         return issues
 
-    def _detect_aggressive_liveness_probes(self, pods: List[V1Pod]) -> List[str]:
+    def _detect_aggressive_liveness_probes(
+        self, pods: List[V1Pod], events: Optional[EventIndex] = None
+    ) -> List[str]:
+        """Find restarting pods with liveness failures and a short initialDelaySeconds.
+
+        `events` should hold at least the cluster's Unhealthy events; when omitted
+        they are listed once, on the first restarting pod.
+        """
         issues = []
         for pod in pods:
             if pod.metadata.namespace in ("kube-system", "kube-public", "kube-node-lease"):
@@ -1054,10 +932,11 @@ class DiagnosticsEngine:
             if not any((cs.restart_count or 0) > 0 for cs in (pod.status.container_statuses or [])):
                 continue
 
-            pod_events = self._get_pod_events(pod.metadata.namespace, pod.metadata.name)
+            if events is None:
+                events = EventIndex.build(self.k8s, field_selector="reason=Unhealthy")
             if not any(
-                event["reason"] == "Unhealthy" and "Liveness probe failed" in event["message"]
-                for event in pod_events
+                event.reason == "Unhealthy" and "Liveness probe failed" in (event.message or "")
+                for event in events.for_pod(pod)
             ):
                 continue
 
@@ -1099,32 +978,29 @@ class DiagnosticsEngine:
                     pressured.append(f"{node.metadata.name}: {condition.type} ({condition.message or 'no message'})")
         return pressured
 
-    def _active_warning_events(self, active_pods: List[V1Pod] = None) -> List:
+    def _active_warning_events(
+        self, unready_pods: Optional[set] = None, snapshot: Optional[ClusterSnapshot] = None
+    ) -> List:
         """Return deduplicated Warning events from the last hour across all namespaces.
 
         Skips events with no timestamp (pre-existing, already-flushed events).
-        Skips pod events when the pod no longer exists or is already fully ready.
+        Skips pod events when the pod no longer exists or is already fully ready;
+        `unready_pods` holds the (namespace, name) of active pods that are not ready.
         """
         try:
-            events = self.k8s.v1.list_event_for_all_namespaces(
-                field_selector="type=Warning"
-            )
+            events = snapshot_items(self.k8s, snapshot, "warning_events")
         except Exception:
             return []
 
         from datetime import timezone
         now = datetime.now(tz=timezone.utc)
-        active_pod_map = {
-            (pod.metadata.namespace, pod.metadata.name): pod
-            for pod in (active_pods or [])
-        }
+        unready_pods = unready_pods or set()
         results = []
         seen = set()
-        for e in events.items:
+        for e in events:
             involved = e.involved_object
             if involved.kind == "Pod":
-                pod = active_pod_map.get((involved.namespace, involved.name))
-                if pod is None or self._pod_is_ready(pod):
+                if (involved.namespace, involved.name) not in unready_pods:
                     continue
 
             # Filter to last hour using last_timestamp or event_time
@@ -1364,22 +1240,26 @@ class DiagnosticsEngine:
                 )
         return stuck
 
-    def _find_missing_config_refs(self, pods: List[V1Pod]) -> List[str]:
+    def _find_missing_config_refs(
+        self, pods: List[V1Pod], name_cache: Optional[Dict[str, Dict[str, set]]] = None
+    ) -> List[str]:
         """Find pods referencing ConfigMaps or Secrets that do not exist.
 
         Checks env.valueFrom.configMapKeyRef, env.valueFrom.secretKeyRef,
         envFrom.configMapRef, envFrom.secretRef, and volume.configMap/secret sources.
         Only checks pods that are not Running (Pending/Init/etc.) to reduce noise.
+        Pass the same `name_cache` across pod pages to list each namespace once.
         """
         missing = []
         # Collect all existing configmaps and secrets per namespace (lazy, per namespace)
-        cm_cache: Dict[str, set] = {}
-        sec_cache: Dict[str, set] = {}
+        name_cache = {} if name_cache is None else name_cache
+        cm_cache: Dict[str, set] = name_cache.setdefault("configmaps", {})
+        sec_cache: Dict[str, set] = name_cache.setdefault("secrets", {})
 
         def _cms(ns: str) -> set:
             if ns not in cm_cache:
                 try:
-                    items = self.k8s.v1.list_namespaced_config_map(ns).items
+                    items = list_metadata(self.k8s, "configmaps", namespace=ns)
                     cm_cache[ns] = {i.metadata.name for i in items}
                 except Exception:
                     cm_cache[ns] = set()
@@ -1388,7 +1268,7 @@ class DiagnosticsEngine:
         def _secs(ns: str) -> set:
             if ns not in sec_cache:
                 try:
-                    items = self.k8s.v1.list_namespaced_secret(ns).items
+                    items = list_metadata(self.k8s, "secrets", namespace=ns)
                     sec_cache[ns] = {i.metadata.name for i in items}
                 except Exception:
                     sec_cache[ns] = set()
@@ -1447,7 +1327,7 @@ class DiagnosticsEngine:
 
         return missing
 
-    def _find_deny_all_networkpolicies(self) -> List[str]:
+    def _find_deny_all_networkpolicies(self, snapshot: Optional[ClusterSnapshot] = None) -> List[str]:
         """Detect NetworkPolicies that impose a deny-all by selecting all pods
         with an Ingress policyType but providing zero ingress rules.
 
@@ -1456,11 +1336,11 @@ class DiagnosticsEngine:
         """
         deny_all = []
         try:
-            policies = self.k8s.networking_v1.list_network_policy_for_all_namespaces()
+            policies = snapshot_items(self.k8s, snapshot, "networkpolicies")
         except Exception:
             return []
 
-        for np in policies.items:
+        for np in policies:
             spec = np.spec
             if not spec:
                 continue
@@ -1471,11 +1351,11 @@ class DiagnosticsEngine:
             if not spec.ingress:
                 deny_all.append(
                     f"{np.metadata.namespace}/{np.metadata.name} "
-                    f"(podSelector: {spec.pod_selector.match_labels or 'all pods'})"
+                    f"(podSelector: {str(Selector.compile(spec.pod_selector)) or 'all pods'})"
                 )
         return deny_all
 
-    def _find_hpa_issues(self) -> List[str]:
+    def _find_hpa_issues(self, snapshot: Optional[ClusterSnapshot] = None) -> List[str]:
         """Detect HPAs that are unable to scale.
 
         Looks for HPAs where currentReplicas == desiredReplicas == maxReplicas
@@ -1484,14 +1364,14 @@ class DiagnosticsEngine:
         """
         issues = []
         try:
-            hpas = self.k8s.autoscaling_v2.list_horizontal_pod_autoscaler_for_all_namespaces()
+            hpas = snapshot_items(self.k8s, snapshot, "hpas")
         except Exception:
             try:
-                hpas = self.k8s.autoscaling_v1.list_horizontal_pod_autoscaler_for_all_namespaces()
+                hpas = self.k8s.autoscaling_v1.list_horizontal_pod_autoscaler_for_all_namespaces().items
             except Exception:
                 return []
 
-        for hpa in hpas.items:
+        for hpa in hpas:
             ref = f"{hpa.metadata.namespace}/{hpa.metadata.name}"
             status = hpa.status
             if not status:
@@ -1529,14 +1409,16 @@ class DiagnosticsEngine:
         now = datetime.now(tz=timezone.utc)
         warn_threshold_days = 7
 
-        try:
-            secrets = self.k8s.v1.list_secret_for_all_namespaces(
-                field_selector="type=kubernetes.io/tls"
-            )
-        except Exception:
-            return []
+        # Certificate bodies are needed here, so page through them rather than
+        # holding every TLS secret in the cluster in memory at once.
+        def _tls_secrets():
+            try:
+                for page in iter_pages(self.k8s, "secrets", field_selector="type=kubernetes.io/tls"):
+                    yield from page
+            except Exception:
+                return
 
-        for secret in secrets.items:
+        for secret in _tls_secrets():
             cert_data = (secret.data or {}).get("tls.crt")
             if not cert_data:
                 continue
@@ -1565,19 +1447,19 @@ class DiagnosticsEngine:
 
         return expiring
 
-    def _find_stuck_jobs(self) -> List[str]:
+    def _find_stuck_jobs(self, snapshot: Optional[ClusterSnapshot] = None) -> List[str]:
         """Find Jobs where backoffLimit is exhausted or that have been active
         far longer than their activeDeadlineSeconds (if set).
         """
         from datetime import timezone
         stuck = []
         try:
-            jobs = self.k8s.batch_v1.list_job_for_all_namespaces()
+            jobs = snapshot_items(self.k8s, snapshot, "jobs")
         except Exception:
             return []
 
         now = datetime.now(tz=timezone.utc)
-        for job in jobs.items:
+        for job in jobs:
             ref = f"{job.metadata.namespace}/{job.metadata.name}"
             status = job.status
             spec = job.spec
@@ -1606,18 +1488,18 @@ class DiagnosticsEngine:
 
         return stuck
 
-    def _find_daemonset_gaps(self) -> List[str]:
+    def _find_daemonset_gaps(self, snapshot: Optional[ClusterSnapshot] = None) -> List[str]:
         """Find DaemonSets where desiredNumberScheduled != numberReady.
 
         This detects DaemonSet pods that are not scheduled on new/all eligible nodes.
         """
         gaps = []
         try:
-            daemonsets = self.k8s.apps_v1.list_daemon_set_for_all_namespaces()
+            daemonsets = snapshot_items(self.k8s, snapshot, "daemonsets")
         except Exception:
             return []
 
-        for ds in daemonsets.items:
+        for ds in daemonsets:
             status = ds.status
             if not status:
                 continue
@@ -1631,9 +1513,19 @@ class DiagnosticsEngine:
                 )
         return gaps
 
+    async def simulate_capacity(self, scenario: Scenario) -> Dict:
+        """What-if bin-packing: which pods would (stop) fitting after `scenario`."""
+        snapshot = ClusterSnapshot.fetch(
+            self.k8s, kinds=("nodes", "pods"), pod_page_size=self.pod_page_size
+        )
+        return run_scenario(self.k8s, scenario, snapshot)
+
     async def predict_risk(self) -> Dict:
         """Heuristic risk score from detected issues."""
-        issues = await self.detect_common_issues()
+        return self.score_risk(await self.detect_common_issues())
+
+    def score_risk(self, issues: Dict) -> Dict:
+        """Risk score for an already-computed detect_common_issues() result."""
         score = sum(
             3 if i["severity"] == "high" else 2 if i["severity"] == "medium" else 1
             for i in issues.get("issues", [])
@@ -1654,9 +1546,8 @@ class DiagnosticsEngine:
 
     def optimize_costs(self) -> Dict:
         recs = []
-        pods = self.k8s.v1.list_pod_for_all_namespaces().items
-        nodes = self.k8s.v1.list_node().items
-        services = self.k8s.v1.list_service_for_all_namespaces().items
+        snapshot = ClusterSnapshot.fetch(self.k8s, kinds=("pods", "nodes", "services"))
+        pods, nodes, services = snapshot.pods, snapshot.nodes, snapshot.services
         pod_density = len(pods) / max(len(nodes), 1)
         if pod_density < 5:
             recs.append("Pod density is low (<5 pods/node). Consider consolidating or using smaller nodes.")
@@ -1674,7 +1565,8 @@ class DiagnosticsEngine:
         }
 
     def provider_diagnostics(self) -> Dict:
-        nodes = self.k8s.v1.list_node().items
+        snapshot = ClusterSnapshot.fetch(self.k8s, kinds=("nodes", "pods", "services"))
+        nodes = snapshot.nodes
         provider = "unknown"
         if nodes:
             pid = nodes[0].spec.provider_id or ""
@@ -1686,13 +1578,13 @@ class DiagnosticsEngine:
                 provider = "gke"
         return {
             "provider": provider,
-            "cni": self._detect_cni(),
-            "load_balancers": self._check_pending_load_balancers(),
+            "cni": self._detect_cni(snapshot),
+            "load_balancers": self._check_pending_load_balancers(snapshot),
             "notes": "Heuristic provider detection based on node providerID and common CNI pods.",
         }
 
-    def _detect_cni(self) -> Dict:
-        pods = self.k8s.v1.list_pod_for_all_namespaces().items
+    def _detect_cni(self, snapshot: Optional[ClusterSnapshot] = None) -> Dict:
+        pods = snapshot_items(self.k8s, snapshot, "pods")
         known = {
             "aws-node": "aws-cni",
             "azure-cni": "azure-cni",
@@ -1725,14 +1617,16 @@ class DiagnosticsEngine:
                     )
         return errors
 
-    def _check_pending_load_balancers(self) -> Dict:
-        lbs = self.k8s.v1.list_service_for_all_namespaces(field_selector="spec.type=LoadBalancer")
+    def _check_pending_load_balancers(self, snapshot: Optional[ClusterSnapshot] = None) -> Dict:
+        lbs = snapshot_items(
+            self.k8s, snapshot, "services", field_selector="spec.type=LoadBalancer"
+        )
         pending = [
             f"{svc.metadata.namespace}/{svc.metadata.name}"
-            for svc in lbs.items
+            for svc in lbs
             if not (svc.status.load_balancer and svc.status.load_balancer.ingress)
         ]
-        return {"pending": pending, "total": len(lbs.items)}
+        return {"pending": pending, "total": len(lbs)}
 
     async def get_resource_metrics(self) -> Dict:
         try:
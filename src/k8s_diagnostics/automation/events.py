@@ -0,0 +1,86 @@
+"""Events indexed by the object they are about.
+
+Finding the events for one pod used to mean listing every event in its
+namespace and filtering by name, once per pod. EventIndex groups a single
+event list by involved object (kind, namespace, name) so each lookup is a
+dict hit; build one per scan and share it across detectors. For a single
+object, object_events() reads the informer's live index when it has synced
+and otherwise asks the API server for just that object's events with an
+involvedObject field selector.
+"""
+
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from ..core.client import involved_object_key, list_items
+from ..core.informer import InformerCache
+from ..core.snapshot import ClusterSnapshot, snapshot_items
+
+
+def _matches_uid(event, uid: Optional[str]) -> bool:
+    # Events recorded before the uid was known, or by old clients, carry none.
+    event_uid = event.involved_object.uid
+    return not uid or not event_uid or event_uid == uid
+
+
+class EventIndex:
+    """Events grouped by involved object."""
+
+    def __init__(self, events: Iterable = ()):
+        self._by_object: Dict[Tuple[str, str, str], List] = {}
+        for event in events:
+            self.add(event)
+
+    @classmethod
+    def build(
+        cls,
+        k8s,
+        snapshot: Optional[ClusterSnapshot] = None,
+        kind: str = "events",
+        namespace: Optional[str] = None,
+        **selectors,
+    ) -> "EventIndex":
+        """Index one list of events, read from the snapshot when it holds `kind`.
+
+        `kind` is a snapshot key, so "warning_events" reuses the scan's Warning
+        events; extra field selectors (e.g. reason=Unhealthy) narrow the list
+        server-side.
+        """
+        return cls(snapshot_items(k8s, snapshot, kind, namespace=namespace, **selectors))
+
+    def add(self, event) -> None:
+        if event.involved_object is None:
+            return
+        self._by_object.setdefault(involved_object_key(event), []).append(event)
+
+    def for_object(
+        self, kind: str, namespace: Optional[str], name: str, uid: Optional[str] = None
+    ) -> List:
+        """Events about one object; `uid` drops events for an earlier object of the same name."""
+        events = self._by_object.get((kind, namespace or "", name), [])
+        return [event for event in events if _matches_uid(event, uid)]
+
+    def for_pod(self, pod) -> List:
+        metadata = pod.metadata
+        return self.for_object("Pod", metadata.namespace, metadata.name, metadata.uid)
+
+    def __len__(self) -> int:
+        return sum(len(events) for events in self._by_object.values())
+
+
+def object_events(
+    k8s, kind: str, namespace: Optional[str], name: str, uid: Optional[str] = None
+) -> List:
+    """Events about one object, without listing the rest of its namespace."""
+    informers = getattr(k8s, "informers", None)
+    if isinstance(informers, InformerCache):
+        cached = informers.by_index("events", "involved_object", (kind, namespace or "", name))
+        if cached is not None:
+            return [event for event in cached if _matches_uid(event, uid)]
+
+    # The uid is checked locally: a server-side involvedObject.uid selector
+    # would drop the uid-less events the informer path keeps.
+    field_selector = f"involvedObject.kind={kind},involvedObject.name={name}"
+    return [
+        event for event in list_items(k8s, "events", namespace=namespace, field_selector=field_selector)
+        if _matches_uid(event, uid)
+    ]
@@ -1,14 +1,38 @@
+import asyncio
 import difflib
+import functools
 import json
-from typing import Dict, Iterable, List, Optional
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
 
 from kubernetes.client.rest import ApiException
 
+from ..core.client import list_items
+from ..core.views import parse_list
+from .events import EventIndex
+from .mutations import DisruptionBudgets, Mutation, MutationExecutor
+from .owners import OwnerGraph
+from .registry import DETECTORS_BY_TYPE
+from .remediation import PATCH_METHODS, RemediationPlan, TemplateChange, json_patch_ops, patch_workload
+from .selectors import LabelIndex, Selector, SelectorIndex, pod_template_labels
+
+
+# Fixers that propose workload changes to a RemediationPlan instead of patching
+_PLANNED_FIXERS = frozenset({
+    "fix_image_pull_errors", "fix_aggressive_liveness_probes", "fix_oomkilled_pods",
+})
+
 
 class AutoFixer:
-    def __init__(self, k8s_client, allowed_namespaces: Optional[Iterable[str]] = None):
+    def __init__(
+        self,
+        k8s_client,
+        allowed_namespaces: Optional[Iterable[str]] = None,
+        executor: Optional[MutationExecutor] = None,
+    ):
         self.k8s = k8s_client
         self.allowed_namespaces = self._normalize_allowed_namespaces(allowed_namespaces)
+        # Deletes and patches run through this: concurrent, rate-limited, PDB-paced
+        self.executor = executor or MutationExecutor()
 
     def _new_results(self, dry_run: bool, **fields) -> Dict:
         results = {"dry_run": dry_run, "operations": []}
@@ -41,9 +65,75 @@ class AutoFixer:
             operation["error"] = error
         results["operations"].append(operation)
 
-    def _json_arg(self, payload: Dict) -> str:
+    async def _settle_plan(self, results: Dict, plan: RemediationPlan, shared: bool, dry_run: bool) -> Dict:
+        """Apply a fixer's own plan, or list what it added to a caller's shared plan."""
+        if shared:
+            results["planned"] = sorted(workload.ref for workload in plan)
+            return results
+        await self._apply_plan(plan, results, dry_run)
+        return results
+
+    async def _apply_plan(self, plan: RemediationPlan, results: Dict, dry_run: bool) -> None:
+        """Patch each planned workload once, recording one operation per change."""
+        workloads = list(plan)
+        errors: Dict[str, str] = {}
+        if not dry_run:
+            outcomes = await self.executor.run([
+                Mutation(workload.ref, workload.namespace, functools.partial(patch_workload, self.k8s, workload))
+                for workload in workloads
+            ])
+            for outcome in outcomes:
+                if not outcome.ok:
+                    errors[outcome.mutation.ref] = str(outcome.error)
+                    results["failed"].append(f"{outcome.mutation.ref}: {outcome.error}")
+
+        for workload in workloads:
+            error = errors.get(workload.ref)
+            for change in workload.changes.values():
+                if dry_run:
+                    results["patched"].append(f"[DRY-RUN] would patch {workload.ref}: {change.summary}")
+                elif error is None:
+                    results["patched"].append(f"{workload.ref}: {change.summary}")
+                self._record_operation(
+                    results,
+                    dry_run=dry_run,
+                    status="failed" if error is not None else None,
+                    action=change.action,
+                    resource=workload.resource,
+                    api_call=workload.api_call,
+                    kubectl_equivalent=change.kubectl_equivalent,
+                    change={
+                        "field": change.field,
+                        "from": change.old,
+                        "to": change.new,
+                        "requested_by_pods": len(workload.sources),
+                    },
+                    error=error,
+                )
+
+    def _json_arg(self, payload) -> str:
         return json.dumps(payload, separators=(",", ":"))
 
+    def _json_patch(
+        self,
+        edits: Iterable[Tuple[str, object, object]],
+        resource_version: Optional[str] = None,
+    ) -> List[Dict]:
+        """RFC 6902 patch replacing only the given (path, old, new) fields.
+
+        Each replace is preceded by a test that the field still holds the
+        value the change was computed from, so the API server rejects the
+        patch instead of overwriting a concurrent edit to that field. Pass
+        `resource_version` to also require that nothing else has changed.
+        """
+        patch: List[Dict] = []
+        if resource_version:
+            patch.append({"op": "test", "path": "/metadata/resourceVersion", "value": resource_version})
+        for path, old, new in edits:
+            patch.append({"op": "test", "path": path, "value": old})
+            patch.append({"op": "replace", "path": path, "value": new})
+        return patch
+
     def _normalize_allowed_namespaces(
         self, allowed_namespaces: Optional[Iterable[str]]
     ) -> Optional[set]:
@@ -82,8 +172,14 @@ class AutoFixer:
         )
         return True
 
-    async def restart_failed_pods(self, dry_run: bool = False) -> Dict:
-        """Delete failed or crashlooping pods so their controller can recreate them."""
+    async def restart_failed_pods(
+        self, dry_run: bool = False, progress: Optional[Callable[[Dict], None]] = None
+    ) -> Dict:
+        """Delete failed or crashlooping pods so their controller can recreate them.
+
+        Deletions run concurrently through `self.executor`. Deletions under a
+        PodDisruptionBudget are paced against its remaining disruptions.
+        """
         results: Dict = self._new_results(
             dry_run,
             restarted=[],
@@ -91,13 +187,17 @@ class AutoFixer:
             failed=[],
         )
 
-        pods = self.k8s.v1.list_pod_for_all_namespaces()
+        pods = list_items(self.k8s, "pods")
         candidates = [
             p
-            for p in pods.items
+            for p in pods
             if (p.status.phase == "Failed" or self._pod_waiting_reason(p) == "CrashLoopBackOff")
             and self._is_safe_to_restart(p)
         ]
+        pdbs = self._pdb_index()
+        budgets = self._disruption_budgets()
+        queued: List = []
+        mutations: List[Mutation] = []
 
         for pod in candidates:
             ref = f"{pod.metadata.namespace}/{pod.metadata.name}"
@@ -119,7 +219,7 @@ class AutoFixer:
                 continue
 
             # PDB guard — never violate a PodDisruptionBudget
-            pdb_violation = self._pdb_would_be_violated(pod)
+            pdb_violation = self._pdb_would_be_violated(pod, pdbs)
             if pdb_violation:
                 results["skipped"].append(f"{ref} ({pdb_violation})")
                 self._record_operation(
@@ -147,63 +247,95 @@ class AutoFixer:
                 )
                 continue
 
-            try:
-                self.k8s.v1.delete_namespaced_pod(pod.metadata.name, pod.metadata.namespace)
+            queued.append(pod)
+            mutations.append(Mutation(
+                ref,
+                pod.metadata.namespace,
+                functools.partial(self.k8s.v1.delete_namespaced_pod, pod.metadata.name, pod.metadata.namespace),
+                budgets=tuple(filter(None, map(budgets.track, self._matching_pdbs(pod, pdbs)))),
+            ))
+
+        outcomes = await self.executor.run(mutations, budgets, progress)
+        for pod, outcome in zip(queued, outcomes):
+            ref = outcome.mutation.ref
+            operation = dict(
+                dry_run=dry_run,
+                action="delete_pod_for_controller_recreate",
+                resource=f"pod/{ref}",
+                api_call="CoreV1Api.delete_namespaced_pod",
+                kubectl_equivalent=f"kubectl delete pod {pod.metadata.name} -n {pod.metadata.namespace}",
+            )
+            if outcome.ok:
                 results["restarted"].append(ref)
                 self._record_operation(
-                    results,
-                    dry_run=dry_run,
-                    action="delete_pod_for_controller_recreate",
-                    resource=f"pod/{ref}",
-                    api_call="CoreV1Api.delete_namespaced_pod",
-                    kubectl_equivalent=f"kubectl delete pod {pod.metadata.name} -n {pod.metadata.namespace}",
-                    change={"reason": "controller-owned failed/crashlooping pod"},
+                    results, change={"reason": "controller-owned failed/crashlooping pod"}, **operation
                 )
-            except ApiException as e:
-                err = self._categorize_api_exception(e)
+            elif outcome.reason:
+                results["skipped"].append(f"{ref} ({outcome.reason})")
+                self._record_operation(results, status="skipped", change={"reason": outcome.reason}, **operation)
+            else:
+                err = self._categorize_mutation_error(outcome.error)
                 results["failed"].append({ref: err})
-                self._record_operation(
-                    results,
-                    dry_run=dry_run,
-                    status="failed",
-                    action="delete_pod_for_controller_recreate",
-                    resource=f"pod/{ref}",
-                    api_call="CoreV1Api.delete_namespaced_pod",
-                    kubectl_equivalent=f"kubectl delete pod {pod.metadata.name} -n {pod.metadata.namespace}",
-                    error=err,
-                )
+                self._record_operation(results, status="failed", error=err, **operation)
 
         return results
 
-    async def cleanup_evicted_pods(self, dry_run: bool = False) -> Dict:
-        """Remove evicted pods that are clogging namespace views."""
+    async def cleanup_evicted_pods(
+        self,
+        dry_run: bool = False,
+        progress: Optional[Callable[[Dict], None]] = None,
+        bulk: bool = True,
+    ) -> Dict:
+        """Remove evicted pods that are clogging namespace views.
+
+        Pod field selectors cannot match status.reason, so a namespace is
+        cleaned with one deletecollection on status.phase=Failed only when
+        every Failed pod in it is Evicted. The first list may come from a
+        lagging informer, so each bulk namespace is re-checked against the
+        API server and the deletecollection is pinned to that list (see
+        _delete_evicted_collection). Other namespaces, and any bulk call
+        that cannot go ahead, fall back to per-pod deletes.
+        """
         results: Dict = self._new_results(dry_run, cleaned=[], failed=[])
 
-        pods = self.k8s.v1.list_pod_for_all_namespaces()
-        evicted = [
-            p for p in pods.items if p.status.phase == "Failed" and p.status.reason == "Evicted"
-        ]
-
-        for pod in evicted:
-            ref = f"{pod.metadata.namespace}/{pod.metadata.name}"
-            if self._skip_disallowed_namespace(results, pod.metadata.namespace, f"pod/{ref}"):
+        failed_pods = list_items(self.k8s, "pods", field_selector="status.phase=Failed")
+        # namespace -> its evicted pods; `mixed` holds namespaces with other Failed pods
+        by_namespace: Dict[str, List] = {}
+        mixed = set()
+        for pod in failed_pods:
+            if pod.status.phase != "Failed":
                 continue
-
-            if dry_run:
-                results["cleaned"].append(f"[DRY-RUN] would delete evicted pod {ref}")
-                self._record_operation(
-                    results,
-                    dry_run=dry_run,
-                    action="delete_evicted_pod",
-                    resource=f"pod/{ref}",
-                    api_call="CoreV1Api.delete_namespaced_pod",
-                    kubectl_equivalent=f"kubectl delete pod {pod.metadata.name} -n {pod.metadata.namespace}",
-                    change={"reason": "pod status reason is Evicted"},
+            if pod.status.reason == "Evicted":
+                by_namespace.setdefault(pod.metadata.namespace, []).append(pod)
+            else:
+                mixed.add(pod.metadata.namespace)
+
+        bulk_namespaces: List[str] = []
+        single: List = []
+        for namespace, evicted in by_namespace.items():
+            allowed = [
+                pod for pod in evicted
+                if not self._skip_disallowed_namespace(
+                    results, namespace, f"pod/{namespace}/{pod.metadata.name}"
                 )
+            ]
+            if not allowed:
                 continue
-            try:
-                self.k8s.v1.delete_namespaced_pod(pod.metadata.name, pod.metadata.namespace)
-                results["cleaned"].append(ref)
+            if bulk and namespace not in mixed:
+                bulk_namespaces.append(namespace)
+            else:
+                single.extend(allowed)
+
+        if dry_run:
+            for namespace in bulk_namespaces:
+                evicted = by_namespace[namespace]
+                results["cleaned"].extend(
+                    f"[DRY-RUN] would delete evicted pod {namespace}/{pod.metadata.name}" for pod in evicted
+                )
+                self._record_bulk_eviction_cleanup(results, dry_run, namespace, len(evicted))
+            for pod in single:
+                ref = f"{pod.metadata.namespace}/{pod.metadata.name}"
+                results["cleaned"].append(f"[DRY-RUN] would delete evicted pod {ref}")
                 self._record_operation(
                     results,
                     dry_run=dry_run,
@@ -213,22 +345,113 @@ class AutoFixer:
                     kubectl_equivalent=f"kubectl delete pod {pod.metadata.name} -n {pod.metadata.namespace}",
                     change={"reason": "pod status reason is Evicted"},
                 )
-            except ApiException as e:
-                err = self._categorize_api_exception(e)
-                results["failed"].append({ref: err})
-                self._record_operation(
-                    results,
-                    dry_run=dry_run,
-                    status="failed",
-                    action="delete_evicted_pod",
-                    resource=f"pod/{ref}",
-                    api_call="CoreV1Api.delete_namespaced_pod",
-                    kubectl_equivalent=f"kubectl delete pod {pod.metadata.name} -n {pod.metadata.namespace}",
-                    error=err,
+            return results
+
+        outcomes = await self.executor.run([
+            Mutation(
+                namespace,
+                namespace,
+                functools.partial(self._delete_evicted_collection, namespace),
+            )
+            for namespace in bulk_namespaces
+        ], progress=progress)
+        for outcome in outcomes:
+            namespace = outcome.mutation.namespace
+            evicted = by_namespace[namespace]
+            if outcome.ok and outcome.result is not None:
+                results["cleaned"].extend(f"{namespace}/{name}" for name in outcome.result)
+                self._record_bulk_eviction_cleanup(results, dry_run, namespace, len(outcome.result))
+            elif outcome.ok:
+                self._record_bulk_eviction_cleanup(
+                    results, dry_run, namespace, 0,
+                    skipped="a Failed pod in the namespace is not Evicted on re-check",
                 )
+                single.extend(evicted)
+            else:
+                # e.g. RBAC grants delete but not deletecollection
+                self._record_bulk_eviction_cleanup(
+                    results, dry_run, namespace, len(evicted),
+                    error=self._categorize_mutation_error(outcome.error),
+                )
+                single.extend(evicted)
+
+        outcomes = await self.executor.run([
+            Mutation(
+                f"{pod.metadata.namespace}/{pod.metadata.name}",
+                pod.metadata.namespace,
+                # Evicted pods are already down, so they spend no disruption budget
+                functools.partial(self.k8s.v1.delete_namespaced_pod, pod.metadata.name, pod.metadata.namespace),
+            )
+            for pod in single
+        ], progress=progress)
+        for pod, outcome in zip(single, outcomes):
+            ref = outcome.mutation.ref
+            operation = dict(
+                dry_run=dry_run,
+                action="delete_evicted_pod",
+                resource=f"pod/{ref}",
+                api_call="CoreV1Api.delete_namespaced_pod",
+                kubectl_equivalent=f"kubectl delete pod {pod.metadata.name} -n {pod.metadata.namespace}",
+            )
+            if outcome.ok:
+                results["cleaned"].append(ref)
+                self._record_operation(results, change={"reason": "pod status reason is Evicted"}, **operation)
+            else:
+                err = self._categorize_mutation_error(outcome.error)
+                results["failed"].append({ref: err})
+                self._record_operation(results, status="failed", error=err, **operation)
 
         return results
 
+    def _delete_evicted_collection(self, namespace: str) -> Optional[List[str]]:
+        """Delete `namespace`'s Failed pods in one call if all are Evicted; the deleted names.
+
+        The Failed pods are listed straight from the API server, never from
+        the informer store. The deletecollection then lists at exactly that
+        resourceVersion. A pod that fails in between is therefore left alone,
+        and Failed is terminal, so every pod deleted was seen Evicted.
+        Returns None, deleting nothing, when a Failed pod is not Evicted. An
+        ApiException (e.g. 410 once the resourceVersion is compacted, or RBAC
+        without deletecollection) propagates so the caller deletes per pod.
+        """
+        listed = self.k8s.v1.list_namespaced_pod(namespace, field_selector="status.phase=Failed")
+        if any(pod.status.reason != "Evicted" for pod in listed.items or []):
+            return None
+        response = self.k8s.v1.delete_collection_namespaced_pod(
+            namespace,
+            field_selector="status.phase=Failed",
+            resource_version=listed.metadata.resource_version,
+            resource_version_match="Exact",
+            _preload_content=False,
+        )
+        # The API server answers with the list of pods it deleted
+        deleted, _ = parse_list(response.data)
+        return [pod.metadata.name for pod in deleted]
+
+    def _record_bulk_eviction_cleanup(
+        self,
+        results: Dict,
+        dry_run: bool,
+        namespace: str,
+        pods: int,
+        error: Optional[Dict] = None,
+        skipped: Optional[str] = None,
+    ) -> None:
+        change = {"reason": skipped or "every Failed pod in the namespace is Evicted", "pods": pods}
+        if error is not None or skipped:
+            change["fallback"] = "per-pod deletes"
+        self._record_operation(
+            results,
+            dry_run=dry_run,
+            status="failed" if error is not None else "skipped" if skipped else None,
+            action="delete_evicted_pods_bulk",
+            resource=f"namespace/{namespace}/pods",
+            api_call="CoreV1Api.delete_collection_namespaced_pod",
+            kubectl_equivalent=f"kubectl delete pods -n {namespace} --field-selector=status.phase=Failed",
+            change=change,
+            error=error,
+        )
+
     async def fix_dns_issues(self, dry_run: bool = False) -> Dict:
         """Restart unhealthy CoreDNS pods."""
         results: Dict = self._new_results(
@@ -238,11 +461,11 @@ class AutoFixer:
             status="ok",
         )
 
-        dns_pods = self.k8s.v1.list_namespaced_pod(
-            "kube-system", label_selector="k8s-app=kube-dns"
+        dns_pods = list_items(
+            self.k8s, "pods", namespace="kube-system", label_selector="k8s-app=kube-dns"
         )
         unhealthy = [
-            p for p in dns_pods.items if p.status.phase != "Running" or not self._pod_ready(p)
+            p for p in dns_pods if p.status.phase != "Running" or not self._pod_ready(p)
         ]
 
         if not unhealthy:
@@ -298,10 +521,16 @@ class AutoFixer:
 
         return results
 
-    async def fix_image_pull_errors(self, dry_run: bool = False) -> Dict:
+    async def fix_image_pull_errors(
+        self, dry_run: bool = False, plan: Optional[RemediationPlan] = None
+    ) -> Dict:
         """Patch known safe image replacements for bundled practice scenarios."""
         results: Dict = self._new_results(dry_run, patched=[], skipped=[], failed=[])
-        pods = self.k8s.v1.list_pod_for_all_namespaces().items
+        shared_plan = plan is not None
+        plan = plan if shared_plan else RemediationPlan()
+        pods = list_items(self.k8s, "pods")
+        deployments = self._deployment_index()
+        owners = OwnerGraph.build(self.k8s, lazy=True)
 
         for pod in pods:
             if not self._namespace_allowed(pod.metadata.namespace):
@@ -311,122 +540,48 @@ class AutoFixer:
             if waiting_reason not in ("ImagePullBackOff", "ErrImagePull"):
                 continue
 
-            deployment = self._find_matching_deployment_for_pod(pod)
-            if not deployment:
-                results["skipped"].append(
-                    f"{pod.metadata.namespace}/{pod.metadata.name} (no owning deployment found)"
-                )
-                continue
-
-            changes = []
-            for container in deployment.spec.template.spec.containers or []:
-                replacement = self._suggest_fixed_image(
-                    deployment.metadata.namespace,
-                    deployment.metadata.name,
-                    container.image,
-                )
-                if replacement:
-                    changes.append((container, container.image, replacement))
-
-            if not changes:
-                results["skipped"].append(
-                    f"{deployment.metadata.namespace}/{deployment.metadata.name} (no safe image replacement found)"
-                )
+            owner = self._find_patchable_workload(pod, deployments, owners)
+            if not owner:
+                reason = self._unpatchable_owner(pod, owners) or "no owning workload found"
+                results["skipped"].append(f"{pod.metadata.namespace}/{pod.metadata.name} ({reason})")
                 continue
 
-            for container, current, replacement in changes:
-                ref = f"{deployment.metadata.namespace}/{deployment.metadata.name}"
-                kubectl_cmd = (
-                    f"kubectl set image deployment/{deployment.metadata.name} "
-                    f"{container.name}={replacement} -n {deployment.metadata.namespace}"
-                )
-                if dry_run:
-                    results["patched"].append(
-                        f"[DRY-RUN] would patch image on {deployment.metadata.namespace}/{deployment.metadata.name}: {current} -> {replacement}"
-                    )
-                    self._record_operation(
-                        results,
-                        dry_run=dry_run,
-                        action="patch_deployment_image",
-                        resource=f"deployment/{ref}",
-                        api_call="AppsV1Api.patch_namespaced_deployment",
-                        kubectl_equivalent=kubectl_cmd,
-                        change={
-                            "field": f"spec.template.spec.containers[{container.name}].image",
-                            "from": current,
-                            "to": replacement,
-                        },
-                    )
-                else:
-                    container.image = replacement
-
-            if dry_run:
-                continue
+            kind, workload = owner
+            namespace, name = workload.metadata.namespace, workload.metadata.name
+            proposed = False
+            for container in workload.spec.template.spec.containers or []:
+                replacement = self._suggest_fixed_image(namespace, name, container.image)
+                if not replacement:
+                    continue
+                proposed = True
+                plan.propose(kind, workload, TemplateChange(
+                    container=container.name,
+                    path=("image",),
+                    old=container.image,
+                    new=replacement,
+                    action="patch_deployment_image",
+                    kubectl_equivalent=(
+                        f"kubectl set image {kind.lower()}/{name} {container.name}={replacement} -n {namespace}"
+                    ),
+                    summary=f"container {container.name} image {container.image} -> {replacement}",
+                ), source=f"{pod.metadata.namespace}/{pod.metadata.name}")
 
-            try:
-                self.k8s.apps_v1.patch_namespaced_deployment(
-                    deployment.metadata.name,
-                    deployment.metadata.namespace,
-                    deployment,
-                )
-                for _, current, replacement in changes:
-                    container_name = next(
-                        container.name for container, old, new in changes
-                        if old == current and new == replacement
-                    )
-                    results["patched"].append(
-                        f"{deployment.metadata.namespace}/{deployment.metadata.name}: {current} -> {replacement}"
-                    )
-                    self._record_operation(
-                        results,
-                        dry_run=dry_run,
-                        action="patch_deployment_image",
-                        resource=f"deployment/{deployment.metadata.namespace}/{deployment.metadata.name}",
-                        api_call="AppsV1Api.patch_namespaced_deployment",
-                        kubectl_equivalent=(
-                            f"kubectl set image deployment/{deployment.metadata.name} "
-                            f"{container_name}={replacement} -n {deployment.metadata.namespace}"
-                        ),
-                        change={
-                            "field": f"spec.template.spec.containers[{container_name}].image",
-                            "from": current,
-                            "to": replacement,
-                        },
-                    )
-            except ApiException as e:
-                results["failed"].append(
-                    f"{deployment.metadata.namespace}/{deployment.metadata.name}: {str(e)}"
-                )
-                for container, current, replacement in changes:
-                    self._record_operation(
-                        results,
-                        dry_run=dry_run,
-                        status="failed",
-                        action="patch_deployment_image",
-                        resource=f"deployment/{deployment.metadata.namespace}/{deployment.metadata.name}",
-                        api_call="AppsV1Api.patch_namespaced_deployment",
-                        kubectl_equivalent=(
-                            f"kubectl set image deployment/{deployment.metadata.name} "
-                            f"{container.name}={replacement} -n {deployment.metadata.namespace}"
-                        ),
-                        change={
-                            "field": f"spec.template.spec.containers[{container.name}].image",
-                            "from": current,
-                            "to": replacement,
-                        },
-                        error=str(e),
-                    )
+            if not proposed:
+                results["skipped"].append(f"{namespace}/{name} (no safe image replacement found)")
 
-        return results
+        return await self._settle_plan(results, plan, shared_plan, dry_run)
 
     async def fix_service_selector_mismatches(self, dry_run: bool = False) -> Dict:
         """Patch Services with empty endpoints to match their same-name Deployment selector."""
         results: Dict = self._new_results(dry_run, patched=[], skipped=[], failed=[])
-        services = self.k8s.v1.list_service_for_all_namespaces().items
+        services = list_items(self.k8s, "services")
         endpoints = {
             (ep.metadata.namespace, ep.metadata.name): ep
-            for ep in self.k8s.v1.list_endpoints_for_all_namespaces().items
+            for ep in list_items(self.k8s, "endpoints")
         }
+        deployments = list_items(self.k8s, "deployments")
+        deployments_by_name = {(d.metadata.namespace, d.metadata.name): d for d in deployments}
+        templates = LabelIndex(deployments, labels_of=pod_template_labels)
 
         for svc in services:
             if not self._namespace_allowed(svc.metadata.namespace):
@@ -439,11 +594,8 @@ class AutoFixer:
             if ep and ep.subsets:
                 continue
 
-            try:
-                dep = self.k8s.apps_v1.read_namespaced_deployment(
-                    svc.metadata.name, svc.metadata.namespace
-                )
-            except ApiException:
+            dep = deployments_by_name.get((svc.metadata.namespace, svc.metadata.name))
+            if dep is None:
                 results["skipped"].append(
                     f"{svc.metadata.namespace}/{svc.metadata.name} (no same-name deployment to infer selector from)"
                 )
@@ -453,6 +605,9 @@ class AutoFixer:
             current = svc.spec.selector or {}
             if not expected or expected == current:
                 continue
+            # Still selects some deployment's pods: the endpoints are empty for another reason
+            if templates.select(svc.metadata.namespace, Selector.compile(current)):
+                continue
 
             if dry_run:
                 results["patched"].append(
@@ -515,7 +670,7 @@ class AutoFixer:
     async def fix_configmap_key_mismatches(self, dry_run: bool = False) -> Dict:
         """Add missing ConfigMap keys when a close or single source key exists."""
         results: Dict = self._new_results(dry_run, patched=[], skipped=[], failed=[])
-        pods = self.k8s.v1.list_pod_for_all_namespaces().items
+        pods = list_items(self.k8s, "pods")
 
         for pod in pods:
             if not self._namespace_allowed(pod.metadata.namespace):
@@ -629,16 +784,17 @@ class AutoFixer:
     async def fix_ingress_backends(self, dry_run: bool = False) -> Dict:
         """Patch ingresses that reference a missing backend service when a safe replacement is inferable."""
         results: Dict = self._new_results(dry_run, patched=[], skipped=[], failed=[])
-        ingresses = self.k8s.networking_v1.list_ingress_for_all_namespaces().items
+        ingresses = list_items(self.k8s, "ingresses")
 
         for ingress in ingresses:
             if not self._namespace_allowed(ingress.metadata.namespace):
                 continue
 
-            services = self.k8s.v1.list_namespaced_service(ingress.metadata.namespace).items
+            services = list_items(self.k8s, "services", namespace=ingress.metadata.namespace)
             service_names = {svc.metadata.name for svc in services}
-            modified = False
-            pending_operations = []
+            ref = f"{ingress.metadata.namespace}/{ingress.metadata.name}"
+            # (rule index, path index, current backend, replacement backend)
+            edits = []
 
             for rule_index, rule in enumerate(ingress.spec.rules or []):
                 http = getattr(rule, "http", None)
@@ -656,102 +812,57 @@ class AutoFixer:
                     )
                     if not replacement:
                         results["skipped"].append(
-                            f"{ingress.metadata.namespace}/{ingress.metadata.name} (cannot infer replacement for backend {service_name})"
+                            f"{ref} (cannot infer replacement for backend {service_name})"
                         )
                         continue
+                    edits.append((rule_index, path_index, service_name, replacement))
 
-                    if dry_run:
-                        results["patched"].append(
-                            f"[DRY-RUN] would patch ingress {ingress.metadata.namespace}/{ingress.metadata.name}: {service_name} -> {replacement}"
-                        )
-                        patch = [{
-                            "op": "replace",
-                            "path": f"/spec/rules/{rule_index}/http/paths/{path_index}/backend/service/name",
-                            "value": replacement,
-                        }]
-                        self._record_operation(
-                            results,
-                            dry_run=dry_run,
-                            action="patch_ingress_backend_service",
-                            resource=f"ingress/{ingress.metadata.namespace}/{ingress.metadata.name}",
-                            api_call="NetworkingV1Api.patch_namespaced_ingress",
-                            kubectl_equivalent=(
-                                f"kubectl patch ingress {ingress.metadata.name} -n {ingress.metadata.namespace} "
-                                f"--type=json -p '{self._json_arg(patch)}'"
-                            ),
-                            change={
-                                "field": f"spec.rules[{rule_index}].http.paths[{path_index}].backend.service.name",
-                                "from": service_name,
-                                "to": replacement,
-                            },
-                        )
-                        modified = True
-                        continue
-
-                    path.backend.service.name = replacement
-                    modified = True
-                    pending_operations.append((rule_index, path_index, service_name, replacement))
+            if not edits:
+                continue
 
-            if modified and not dry_run:
+            # Only the backend names, each guarded by a test of its current value
+            patch = self._json_patch(
+                (f"/spec/rules/{rule_index}/http/paths/{path_index}/backend/service/name", old, new)
+                for rule_index, path_index, old, new in edits
+            )
+            kubectl_cmd = (
+                f"kubectl patch ingress {ingress.metadata.name} -n {ingress.metadata.namespace} "
+                f"--type=json -p '{self._json_arg(patch)}'"
+            )
+            error = None
+            if not dry_run:
                 try:
                     self.k8s.networking_v1.patch_namespaced_ingress(
                         ingress.metadata.name,
                         ingress.metadata.namespace,
-                        ingress,
+                        patch,
                     )
-                    for rule_index, path_index, service_name, replacement in pending_operations:
-                        results["patched"].append(
-                            f"{ingress.metadata.namespace}/{ingress.metadata.name}: {service_name} -> {replacement}"
-                        )
-                        patch = [{
-                            "op": "replace",
-                            "path": f"/spec/rules/{rule_index}/http/paths/{path_index}/backend/service/name",
-                            "value": replacement,
-                        }]
-                        self._record_operation(
-                            results,
-                            dry_run=dry_run,
-                            action="patch_ingress_backend_service",
-                            resource=f"ingress/{ingress.metadata.namespace}/{ingress.metadata.name}",
-                            api_call="NetworkingV1Api.patch_namespaced_ingress",
-                            kubectl_equivalent=(
-                                f"kubectl patch ingress {ingress.metadata.name} -n {ingress.metadata.namespace} "
-                                f"--type=json -p '{self._json_arg(patch)}'"
-                            ),
-                            change={
-                                "field": f"spec.rules[{rule_index}].http.paths[{path_index}].backend.service.name",
-                                "from": service_name,
-                                "to": replacement,
-                            },
-                        )
                 except ApiException as e:
-                    results["failed"].append(
-                        f"{ingress.metadata.namespace}/{ingress.metadata.name}: {str(e)}"
+                    error = str(e)
+                    results["failed"].append(f"{ref}: {error}")
+
+            for rule_index, path_index, service_name, replacement in edits:
+                if dry_run:
+                    results["patched"].append(
+                        f"[DRY-RUN] would patch ingress {ref}: {service_name} -> {replacement}"
                     )
-                    for rule_index, path_index, service_name, replacement in pending_operations:
-                        patch = [{
-                            "op": "replace",
-                            "path": f"/spec/rules/{rule_index}/http/paths/{path_index}/backend/service/name",
-                            "value": replacement,
-                        }]
-                        self._record_operation(
-                            results,
-                            dry_run=dry_run,
-                            status="failed",
-                            action="patch_ingress_backend_service",
-                            resource=f"ingress/{ingress.metadata.namespace}/{ingress.metadata.name}",
-                            api_call="NetworkingV1Api.patch_namespaced_ingress",
-                            kubectl_equivalent=(
-                                f"kubectl patch ingress {ingress.metadata.name} -n {ingress.metadata.namespace} "
-                                f"--type=json -p '{self._json_arg(patch)}'"
-                            ),
-                            change={
-                                "field": f"spec.rules[{rule_index}].http.paths[{path_index}].backend.service.name",
-                                "from": service_name,
-                                "to": replacement,
-                            },
-                            error=str(e),
-                        )
+                elif error is None:
+                    results["patched"].append(f"{ref}: {service_name} -> {replacement}")
+                self._record_operation(
+                    results,
+                    dry_run=dry_run,
+                    status="failed" if error is not None else None,
+                    action="patch_ingress_backend_service",
+                    resource=f"ingress/{ref}",
+                    api_call="NetworkingV1Api.patch_namespaced_ingress",
+                    kubectl_equivalent=kubectl_cmd,
+                    change={
+                        "field": f"spec.rules[{rule_index}].http.paths[{path_index}].backend.service.name",
+                        "from": service_name,
+                        "to": replacement,
+                    },
+                    error=error,
+                )
 
         return results
 
@@ -760,12 +871,12 @@ class AutoFixer:
         results: Dict = self._new_results(dry_run, patched=[], skipped=[], failed=[])
 
         try:
-            policies = self.k8s.networking_v1.list_network_policy_for_all_namespaces()
+            policies = list_items(self.k8s, "networkpolicies")
         except Exception as e:
             results["failed"].append(f"list_network_policy_for_all_namespaces: {e}")
             return results
 
-        for np in policies.items:
+        for np in policies:
             if not self._namespace_allowed(np.metadata.namespace):
                 continue
             
@@ -826,10 +937,17 @@ class AutoFixer:
 
         return results
 
-    async def fix_aggressive_liveness_probes(self, dry_run: bool = False) -> Dict:
+    async def fix_aggressive_liveness_probes(
+        self, dry_run: bool = False, plan: Optional[RemediationPlan] = None
+    ) -> Dict:
         """Increase liveness probe initial delay for restarting workloads with liveness failures."""
         results: Dict = self._new_results(dry_run, patched=[], skipped=[], failed=[])
-        pods = self.k8s.v1.list_pod_for_all_namespaces().items
+        shared_plan = plan is not None
+        plan = plan if shared_plan else RemediationPlan()
+        pods = list_items(self.k8s, "pods")
+        unhealthy_events: Optional[EventIndex] = None
+        deployments = self._deployment_index()
+        owners = OwnerGraph.build(self.k8s, lazy=True)
 
         for pod in pods:
             if not self._namespace_allowed(pod.metadata.namespace):
@@ -839,25 +957,25 @@ class AutoFixer:
             if not any((cs.restart_count or 0) > 0 for cs in (pod.status.container_statuses or [])):
                 continue
 
-            pod_events = self.k8s.v1.list_namespaced_event(pod.metadata.namespace).items
+            # One list of Unhealthy events for the whole pass, not one per pod
+            if unhealthy_events is None:
+                unhealthy_events = EventIndex.build(self.k8s, field_selector="reason=Unhealthy")
             has_liveness_failure = any(
-                event.involved_object.name == pod.metadata.name
-                and event.reason == "Unhealthy"
-                and "Liveness probe failed" in (event.message or "")
-                for event in pod_events
+                event.reason == "Unhealthy" and "Liveness probe failed" in (event.message or "")
+                for event in unhealthy_events.for_pod(pod)
             )
             if not has_liveness_failure:
                 continue
 
-            deployment = self._find_matching_deployment_for_pod(pod)
-            if not deployment:
-                results["skipped"].append(
-                    f"{pod.metadata.namespace}/{pod.metadata.name} (no owning deployment found)"
-                )
+            owner = self._find_patchable_workload(pod, deployments, owners)
+            if not owner:
+                reason = self._unpatchable_owner(pod, owners) or "no owning workload found"
+                results["skipped"].append(f"{pod.metadata.namespace}/{pod.metadata.name} ({reason})")
                 continue
 
-            changed = []
-            for container_index, container in enumerate(deployment.spec.template.spec.containers or []):
+            kind, workload = owner
+            namespace, name = workload.metadata.namespace, workload.metadata.name
+            for container in workload.spec.template.spec.containers or []:
                 probe = container.liveness_probe
                 if not probe:
                     continue
@@ -865,102 +983,26 @@ class AutoFixer:
                 target_delay = min(120, initial_delay + 30)
                 if target_delay == initial_delay:
                     continue
-                if dry_run:
-                    results["patched"].append(
-                        f"[DRY-RUN] would patch livenessProbe.initialDelaySeconds on {deployment.metadata.namespace}/{deployment.metadata.name}: {initial_delay} -> {target_delay}"
-                    )
-                    patch = [{
-                        "op": "replace",
-                        "path": f"/spec/template/spec/containers/{container_index}/livenessProbe/initialDelaySeconds",
-                        "value": target_delay,
-                    }]
-                    self._record_operation(
-                        results,
-                        dry_run=dry_run,
-                        action="patch_liveness_probe_delay",
-                        resource=f"deployment/{deployment.metadata.namespace}/{deployment.metadata.name}",
-                        api_call="AppsV1Api.patch_namespaced_deployment",
-                        kubectl_equivalent=(
-                            f"kubectl patch deployment {deployment.metadata.name} -n {deployment.metadata.namespace} "
-                            f"--type=json -p '{self._json_arg(patch)}'"
-                        ),
-                        change={
-                            "field": f"spec.template.spec.containers[{container.name}].livenessProbe.initialDelaySeconds",
-                            "from": initial_delay,
-                            "to": target_delay,
-                        },
-                    )
-                else:
-                    probe.initial_delay_seconds = target_delay
-                changed.append((container_index, container.name, initial_delay, target_delay))
-
-            if not changed:
-                continue
-
-            if dry_run:
-                continue
-
-            try:
-                self.k8s.apps_v1.patch_namespaced_deployment(
-                    deployment.metadata.name,
-                    deployment.metadata.namespace,
-                    deployment,
-                )
-                for container_index, container_name, initial_delay, target_delay in changed:
-                    results["patched"].append(
-                        f"{deployment.metadata.namespace}/{deployment.metadata.name}: livenessProbe.initialDelaySeconds {initial_delay} -> {target_delay}"
-                    )
-                    patch = [{
-                        "op": "replace",
-                        "path": f"/spec/template/spec/containers/{container_index}/livenessProbe/initialDelaySeconds",
-                        "value": target_delay,
-                    }]
-                    self._record_operation(
-                        results,
-                        dry_run=dry_run,
-                        action="patch_liveness_probe_delay",
-                        resource=f"deployment/{deployment.metadata.namespace}/{deployment.metadata.name}",
-                        api_call="AppsV1Api.patch_namespaced_deployment",
-                        kubectl_equivalent=(
-                            f"kubectl patch deployment {deployment.metadata.name} -n {deployment.metadata.namespace} "
-                            f"--type=json -p '{self._json_arg(patch)}'"
-                        ),
-                        change={
-                            "field": f"spec.template.spec.containers[{container_name}].livenessProbe.initialDelaySeconds",
-                            "from": initial_delay,
-                            "to": target_delay,
-                        },
-                    )
-            except ApiException as e:
-                results["failed"].append(
-                    f"{deployment.metadata.namespace}/{deployment.metadata.name}: {str(e)}"
-                )
-                for container_index, container_name, initial_delay, target_delay in changed:
-                    patch = [{
-                        "op": "replace",
-                        "path": f"/spec/template/spec/containers/{container_index}/livenessProbe/initialDelaySeconds",
-                        "value": target_delay,
-                    }]
-                    self._record_operation(
-                        results,
-                        dry_run=dry_run,
-                        status="failed",
-                        action="patch_liveness_probe_delay",
-                        resource=f"deployment/{deployment.metadata.namespace}/{deployment.metadata.name}",
-                        api_call="AppsV1Api.patch_namespaced_deployment",
-                        kubectl_equivalent=(
-                            f"kubectl patch deployment {deployment.metadata.name} -n {deployment.metadata.namespace} "
-                            f"--type=json -p '{self._json_arg(patch)}'"
-                        ),
-                        change={
-                            "field": f"spec.template.spec.containers[{container_name}].livenessProbe.initialDelaySeconds",
-                            "from": initial_delay,
-                            "to": target_delay,
-                        },
-                        error=str(e),
-                    )
+                path = ("livenessProbe", "initialDelaySeconds")
+                # The same ops the plan sends for this change
+                patch = json_patch_ops(workload, container.name, path, probe.initial_delay_seconds, target_delay)
+                plan.propose(kind, workload, TemplateChange(
+                    container=container.name,
+                    path=path,
+                    old=probe.initial_delay_seconds,
+                    new=target_delay,
+                    action="patch_liveness_probe_delay",
+                    kubectl_equivalent=(
+                        f"kubectl patch {kind.lower()} {name} -n {namespace} "
+                        f"--type=json -p '{self._json_arg(patch)}'"
+                    ),
+                    summary=(
+                        f"container {container.name} livenessProbe.initialDelaySeconds "
+                        f"{initial_delay} -> {target_delay}"
+                    ),
+                ), source=f"{pod.metadata.namespace}/{pod.metadata.name}")
 
-        return results
+        return await self._settle_plan(results, plan, shared_plan, dry_run)
 
     async def restart_unhealthy_gitops_controllers(self, dry_run: bool = False) -> Dict:
         """Restart unhealthy Argo CD / Flux controller pods when a controller will recreate them."""
@@ -972,7 +1014,7 @@ class AutoFixer:
             failed=[],
             status="ok",
         )
-        pods = self.k8s.v1.list_pod_for_all_namespaces().items
+        pods = list_items(self.k8s, "pods")
         candidates = []
 
         for pod in pods:
@@ -1078,8 +1120,9 @@ class AutoFixer:
                     "would_set_replicas": replicas,
                 }
 
-            dep.spec.replicas = replicas
-            self.k8s.apps_v1.patch_namespaced_deployment(deployment, namespace, dep)
+            self.k8s.apps_v1.patch_namespaced_deployment(
+                deployment, namespace, self._json_patch([("/spec/replicas", current, replicas)])
+            )
             return {
                 "dry_run": False,
                 "deployment": f"{namespace}/{deployment}",
@@ -1120,15 +1163,28 @@ class AutoFixer:
                     "containers_affected": containers,
                 }
 
+            # JSON patch of only the two limits, each tested against the value read
+            plan = RemediationPlan()
             for container in dep.spec.template.spec.containers:
-                if not container.resources:
-                    container.resources = {}
-                if not container.resources.limits:
-                    container.resources.limits = {}
-                container.resources.limits["cpu"] = cpu_limit
-                container.resources.limits["memory"] = memory_limit
-
-            self.k8s.apps_v1.patch_namespaced_deployment(deployment, namespace, dep)
+                limits = container.resources.limits if container.resources and container.resources.limits else {}
+                for resource, limit in (("cpu", cpu_limit), ("memory", memory_limit)):
+                    plan.propose("Deployment", dep, TemplateChange(
+                        container=container.name,
+                        path=("resources", "limits", resource),
+                        old=limits.get(resource),
+                        new=limit,
+                        action="set_resource_limits",
+                        kubectl_equivalent=(
+                            f"kubectl set resources deployment {deployment} -n {namespace} "
+                            f"-c {container.name} --limits={resource}={limit}"
+                        ),
+                        summary=(
+                            f"container {container.name} {resource} limit "
+                            f"{limits.get(resource) or 'unset'} -> {limit}"
+                        ),
+                    ))
+            for workload in plan:
+                patch_workload(self.k8s, workload)
             return {
                 "dry_run": False,
                 "deployment": f"{namespace}/{deployment}",
@@ -1138,47 +1194,56 @@ class AutoFixer:
         except ApiException as e:
             return {"error": self._categorize_api_exception(e)}
 
-    async def fix_oomkilled_pods(self, dry_run: bool = False) -> Dict:
-        """Automatically increase memory limits by 256Mi for OOMKilled containers."""
+    async def fix_oomkilled_pods(
+        self, dry_run: bool = False, plan: Optional[RemediationPlan] = None
+    ) -> Dict:
+        """Increase memory limits of OOMKilled containers by 256Mi, once per workload."""
         results: Dict = self._new_results(dry_run, patched=[], skipped=[], failed=[])
-        pods = self.k8s.v1.list_pod_for_all_namespaces().items
+        shared_plan = plan is not None
+        plan = plan if shared_plan else RemediationPlan()
+        pods = list_items(self.k8s, "pods")
+        deployments = self._deployment_index()
+        owners = OwnerGraph.build(self.k8s, lazy=True)
 
         for pod in pods:
             if not self._namespace_allowed(pod.metadata.namespace):
                 continue
-            
+
             oom_containers = []
             for cs in (pod.status.container_statuses or []):
                 state = cs.state.terminated if cs.state and cs.state.terminated else None
                 last_state = cs.last_state.terminated if cs.last_state and cs.last_state.terminated else None
-                
+
                 is_oom = False
                 for st in (state, last_state):
                     if st:
                         if st.reason == "OOMKilled" or st.exit_code == 137:
                             is_oom = True
-                
+
                 if is_oom:
                     oom_containers.append(cs.name)
-            
+
             if not oom_containers:
                 continue
 
-            deployment = self._find_matching_deployment_for_pod(pod)
-            if not deployment:
-                results["skipped"].append(
-                    f"{pod.metadata.namespace}/{pod.metadata.name} (no owning deployment found for OOMKilled pod)"
+            owner = self._find_patchable_workload(pod, deployments, owners)
+            if not owner:
+                reason = (
+                    self._unpatchable_owner(pod, owners)
+                    or "no owning workload found for OOMKilled pod"
                 )
+                results["skipped"].append(f"{pod.metadata.namespace}/{pod.metadata.name} ({reason})")
                 continue
 
-            changed = []
-            for container_index, container in enumerate(deployment.spec.template.spec.containers or []):
+            kind, workload = owner
+            namespace, name = workload.metadata.namespace, workload.metadata.name
+            for container in workload.spec.template.spec.containers or []:
                 if container.name not in oom_containers:
                     continue
-                
+
                 limits = container.resources.limits if container.resources and container.resources.limits else {}
-                current_mem = limits.get("memory", "256Mi")
-                
+                current_mem = limits.get("memory") or "256Mi"
+
                 try:
                     if current_mem.endswith("Mi"):
                         val = int(current_mem[:-2])
@@ -1191,75 +1256,21 @@ class AutoFixer:
                 except Exception:
                     new_mem = "512Mi"
 
-                if dry_run:
-                    results["patched"].append(
-                        f"[DRY-RUN] would patch memory limit on {deployment.metadata.namespace}/{deployment.metadata.name} container {container.name}: {current_mem} -> {new_mem}"
-                    )
-                else:
-                    # In python client, resources might be None
-                    if not container.resources:
-                        # Depending on the client version, we might need to set a V1ResourceRequirements object
-                        # However, dict assignment is usually safer in the python k8s client if we just patch
-                        pass 
-                    if not container.resources.limits:
-                        container.resources.limits = {}
-                    container.resources.limits["memory"] = new_mem
-                
-                changed.append((container_index, container.name, current_mem, new_mem))
-
-            if not changed:
-                continue
-                
-            if dry_run:
-                for container_index, c_name, old_mem, new_mem in changed:
-                    self._record_operation(
-                        results,
-                        dry_run=dry_run,
-                        action="patch_oom_memory_limit",
-                        resource=f"deployment/{deployment.metadata.namespace}/{deployment.metadata.name}",
-                        api_call="AppsV1Api.patch_namespaced_deployment",
-                        kubectl_equivalent=f"kubectl set resources deployment {deployment.metadata.name} -n {deployment.metadata.namespace} -c {c_name} --limits=memory={new_mem}",
-                        change={"field": f"spec.template.spec.containers[{c_name}].resources.limits.memory", "from": old_mem, "to": new_mem}
-                    )
-                continue
+                # Every OOMKilled replica proposes the same bump; the plan keeps one
+                plan.propose(kind, workload, TemplateChange(
+                    container=container.name,
+                    path=("resources", "limits", "memory"),
+                    old=limits.get("memory"),
+                    new=new_mem,
+                    action="patch_oom_memory_limit",
+                    kubectl_equivalent=(
+                        f"kubectl set resources {kind.lower()} {name} -n {namespace} "
+                        f"-c {container.name} --limits=memory={new_mem}"
+                    ),
+                    summary=f"container {container.name} memory limit {current_mem} -> {new_mem}",
+                ), source=f"{pod.metadata.namespace}/{pod.metadata.name}")
 
-            try:
-                self.k8s.apps_v1.patch_namespaced_deployment(
-                    deployment.metadata.name,
-                    deployment.metadata.namespace,
-                    deployment,
-                )
-                for container_index, c_name, old_mem, new_mem in changed:
-                    results["patched"].append(
-                        f"{deployment.metadata.namespace}/{deployment.metadata.name}: container {c_name} memory limit {old_mem} -> {new_mem}"
-                    )
-                    self._record_operation(
-                        results,
-                        dry_run=dry_run,
-                        action="patch_oom_memory_limit",
-                        resource=f"deployment/{deployment.metadata.namespace}/{deployment.metadata.name}",
-                        api_call="AppsV1Api.patch_namespaced_deployment",
-                        kubectl_equivalent=f"kubectl set resources deployment {deployment.metadata.name} -n {deployment.metadata.namespace} -c {c_name} --limits=memory={new_mem}",
-                        change={"field": f"spec.template.spec.containers[{c_name}].resources.limits.memory", "from": old_mem, "to": new_mem}
-                    )
-            except ApiException as e:
-                results["failed"].append(
-                    f"{deployment.metadata.namespace}/{deployment.metadata.name}: {str(e)}"
-                )
-                for container_index, c_name, old_mem, new_mem in changed:
-                    self._record_operation(
-                        results,
-                        dry_run=dry_run,
-                        status="failed",
-                        action="patch_oom_memory_limit",
-                        resource=f"deployment/{deployment.metadata.namespace}/{deployment.metadata.name}",
-                        api_call="AppsV1Api.patch_namespaced_deployment",
-                        kubectl_equivalent=f"kubectl set resources deployment {deployment.metadata.name} -n {deployment.metadata.namespace} -c {c_name} --limits=memory={new_mem}",
-                        change={"field": f"spec.template.spec.containers[{c_name}].resources.limits.memory", "from": old_mem, "to": new_mem},
-                        error=str(e)
-                    )
-                    
-        return results
+        return await self._settle_plan(results, plan, shared_plan, dry_run)
 
     async def auto_remediate(self, diagnostics_engine, dry_run: bool = False) -> Dict:
         """Detect issues and apply safe remediations."""
@@ -1269,40 +1280,27 @@ class AutoFixer:
         if not issues:
             return {"dry_run": dry_run, "status": "no_issues_detected", "actions": []}
 
+        # Fixers linked to each issue type in the detector registry; a fixer shared
+        # by several issue types (e.g. restart_failed_pods) runs once per pass.
+        # Workload changes from all fixers go into one plan, so a Deployment
+        # that needs both a memory bump and a probe delay is patched once.
         actions = []
+        ran = set()
+        plan = RemediationPlan()
         for issue in issues:
-            if issue["type"] == "failed_pods":
-                result = await self.restart_failed_pods(dry_run=dry_run)
-                actions.append({"issue": "failed_pods", "result": result})
-            elif issue["type"] == "dns_unhealthy":
-                result = await self.fix_dns_issues(dry_run=dry_run)
-                actions.append({"issue": "dns_unhealthy", "result": result})
-            elif issue["type"] == "image_pull_errors":
-                result = await self.fix_image_pull_errors(dry_run=dry_run)
-                actions.append({"issue": "image_pull_errors", "result": result})
-            elif issue["type"] == "service_selector_mismatch":
-                result = await self.fix_service_selector_mismatches(dry_run=dry_run)
-                actions.append({"issue": "service_selector_mismatch", "result": result})
-            elif issue["type"] == "configmap_key_mismatch":
-                result = await self.fix_configmap_key_mismatches(dry_run=dry_run)
-                actions.append({"issue": "configmap_key_mismatch", "result": result})
-            elif issue["type"] == "ingress_backend_missing_service":
-                result = await self.fix_ingress_backends(dry_run=dry_run)
-                actions.append({"issue": "ingress_backend_missing_service", "result": result})
-            elif issue["type"] == "networkpolicy_deny_all":
-                result = await self.fix_networkpolicy_deny_all(dry_run=dry_run)
-                actions.append({"issue": "networkpolicy_deny_all", "result": result})
-            elif issue["type"] == "aggressive_liveness_probe":
-                result = await self.fix_aggressive_liveness_probes(dry_run=dry_run)
-                actions.append({"issue": "aggressive_liveness_probe", "result": result})
-            elif issue["type"] == "high_restart_count":
-                result = await self.fix_oomkilled_pods(dry_run=dry_run)
-                actions.append({"issue": "high_restart_count_oom", "result": result})
-                result2 = await self.fix_aggressive_liveness_probes(dry_run=dry_run)
-                actions.append({"issue": "high_restart_count_liveness", "result": result2})
-            elif issue["type"] == "gitops_controller_unhealthy":
-                result = await self.restart_unhealthy_gitops_controllers(dry_run=dry_run)
-                actions.append({"issue": "gitops_controller_unhealthy", "result": result})
+            detector = DETECTORS_BY_TYPE.get(issue["type"])
+            for label, method in (detector.fixers if detector else ()):
+                if method in ran:
+                    continue
+                ran.add(method)
+                kwargs = {"plan": plan} if method in _PLANNED_FIXERS else {}
+                result = await getattr(self, method)(dry_run=dry_run, **kwargs)
+                actions.append({"issue": label, "result": result})
+
+        if len(plan):
+            applied = self._new_results(dry_run, patched=[], failed=[])
+            await self._apply_plan(plan, applied, dry_run)
+            actions.append({"issue": "workload_patches", "result": applied})
 
         return {
             "dry_run": dry_run,
@@ -1351,15 +1349,40 @@ class AutoFixer:
                 return cs.state.waiting.reason
         return None
 
-    def _find_matching_deployment_for_pod(self, pod):
-        labels = pod.metadata.labels or {}
-        deployments = self.k8s.apps_v1.list_namespaced_deployment(pod.metadata.namespace).items
-        matches = []
+    def _deployment_index(self) -> SelectorIndex:
+        """Deployments by selector, listed per namespace on first use; one per fix pass."""
+        return SelectorIndex(
+            loader=lambda namespace: list_items(self.k8s, "deployments", namespace=namespace)
+        )
 
-        for deployment in deployments:
-            selector = deployment.spec.selector.match_labels or {}
-            if selector and all(labels.get(key) == value for key, value in selector.items()):
-                matches.append(deployment)
+    def _pdb_index(self) -> SelectorIndex:
+        """PodDisruptionBudgets by selector, listed per namespace on first use."""
+        return SelectorIndex(
+            loader=lambda namespace: self.k8s.policy_v1.list_namespaced_pod_disruption_budget(
+                namespace
+            ).items
+        )
+
+    def _find_matching_deployment_for_pod(
+        self,
+        pod,
+        deployments: Optional[SelectorIndex] = None,
+        owners: Optional[OwnerGraph] = None,
+    ):
+        """The Deployment that manages `pod`.
+
+        Follows the pod's controller ownerReferences through `owners` when
+        they resolve; only pods without a resolvable controller fall back
+        to matching Deployment selectors against the pod's labels.
+        """
+        if owners is not None and owners.resolves(pod):
+            kind, workload = owners.workload(pod)
+            return workload if kind == "Deployment" else None
+
+        labels = pod.metadata.labels or {}
+        if deployments is None:
+            deployments = self._deployment_index()
+        matches = deployments.matching(pod.metadata.namespace, labels)
 
         if len(matches) == 1:
             return matches[0]
@@ -1371,6 +1394,34 @@ class AutoFixer:
 
         return None
 
+    def _find_patchable_workload(
+        self,
+        pod,
+        deployments: Optional[SelectorIndex] = None,
+        owners: Optional[OwnerGraph] = None,
+    ) -> Optional[Tuple[str, object]]:
+        """(kind, object) of the workload a RemediationPlan would patch for `pod`.
+
+        A resolvable controller chain yields its top-level workload when
+        PATCH_METHODS can patch that kind (Deployment, StatefulSet,
+        DaemonSet); pods without one fall back to Deployment selectors.
+        """
+        if owners is not None and owners.resolves(pod):
+            owner = owners.workload(pod)
+            return owner if owner is not None and owner[0] in PATCH_METHODS else None
+
+        deployment = self._find_matching_deployment_for_pod(pod, deployments)
+        return ("Deployment", deployment) if deployment is not None else None
+
+    @staticmethod
+    def _unpatchable_owner(pod, owners: Optional[OwnerGraph]) -> Optional[str]:
+        """Skip reason for a pod whose top-level controller has no patch method."""
+        owner = owners.workload(pod) if owners is not None else None
+        if owner is None or owner[0] in PATCH_METHODS:
+            return None
+        kind, workload = owner
+        return f"owned by {kind} {workload.metadata.namespace}/{workload.metadata.name}, which cannot be patched"
+
     def _suggest_fixed_image(
         self, namespace: str, deployment_name: str, current_image: str
     ) -> Optional[str]:
@@ -1445,34 +1496,58 @@ class AutoFixer:
             "detail": body if isinstance(body, str) else json.dumps(body),
         }
 
-    def _pdb_would_be_violated(self, pod) -> Optional[str]:
-        """Return a human-readable reason string if deleting this pod would violate a PDB.
+    def _disruption_budgets(self) -> DisruptionBudgets:
+        """Per-pass PDB allowances, re-read while a deletion waits for budget."""
+        return DisruptionBudgets(
+            lambda namespace, name: self.k8s.policy_v1.read_namespaced_pod_disruption_budget(
+                name, namespace
+            ),
+            wait_seconds=self.executor.pdb_wait_seconds,
+            poll_seconds=self.executor.pdb_poll_seconds,
+        )
 
-        Returns None if it is safe to delete the pod (no matching PDB, or disruption budget
-        has remaining capacity).  Returns a non-empty string with the violation reason if
-        the deletion should be skipped to protect availability.
-        """
-        namespace = pod.metadata.namespace
-        pod_labels = pod.metadata.labels or {}
+    def _categorize_mutation_error(self, error: BaseException) -> Dict:
+        """_categorize_api_exception, extended to executor timeouts and other errors."""
+        if isinstance(error, ApiException):
+            return self._categorize_api_exception(error)
+        if isinstance(error, asyncio.TimeoutError):
+            return {
+                "http_status": None,
+                "category": "timeout",
+                "hint": "The API call did not finish before the executor deadline — retry.",
+                "detail": f"timed out after {self.executor.timeout_seconds}s",
+            }
+        return {
+            "http_status": None,
+            "category": "unknown",
+            "hint": "Inspect the error body for details.",
+            "detail": str(error),
+        }
 
+    def _matching_pdbs(self, pod, pdbs: Optional[SelectorIndex] = None) -> List:
+        """PodDisruptionBudgets selecting `pod`; empty when PDBs cannot be read."""
+        if pdbs is None:
+            pdbs = self._pdb_index()
         try:
-            pdbs = self.k8s.policy_v1.list_namespaced_pod_disruption_budget(namespace).items
+            # PDBs with an empty selector are not indexed, so they never match.
+            return pdbs.matching(pod.metadata.namespace, pod.metadata.labels)
         except ApiException:
             # If we can't read PDBs (e.g. old cluster without the API), allow the deletion.
-            return None
+            return []
         except AttributeError:
             # k8s client doesn't expose policy_v1 — skip PDB check gracefully.
-            return None
+            return []
 
-        for pdb in pdbs:
-            selector = (pdb.spec.selector or {})
-            match_labels = getattr(selector, "match_labels", None) or {}
-            if not match_labels:
-                continue
-            # Does the pod's label set satisfy the PDB selector?
-            if not all(pod_labels.get(k) == v for k, v in match_labels.items()):
-                continue
+    def _pdb_would_be_violated(self, pod, pdbs: Optional[SelectorIndex] = None) -> Optional[str]:
+        """Return a human-readable reason string if deleting this pod would violate a PDB.
 
+        Returns None if it is safe to delete the pod (no matching PDB, or disruption budget
+        has remaining capacity).  Returns a non-empty string with the violation reason if
+        the deletion should be skipped to protect availability. Pass one `pdbs` index
+        per pass so each namespace's PDBs are listed once.
+        """
+        namespace = pod.metadata.namespace
+        for pdb in self._matching_pdbs(pod, pdbs):
             # Pod matches this PDB — check disruption budget.
             status = pdb.status
             disruptions_allowed = getattr(status, "disruptions_allowed", None)
@@ -0,0 +1,239 @@
+"""Incremental detection for repeated detect_common_issues() scans.
+
+A full scan re-evaluates every pod, even though between two scans of a large
+cluster only a few pods change. IncrementalScan keeps each pod's findings
+keyed by (namespace, name) together with the resourceVersion they were
+computed from. On the next scan it re-evaluates only pods whose
+resourceVersion changed, drops pods that are gone, and merges the kept
+findings into the usual pod scan result:
+
+* with a synced pods informer, the changed pods come from the informer's
+  change log (ResourceInformer.changes_since), so an idle cluster costs no
+  per-pod work at all;
+* otherwise the pod list is diffed against the kept resourceVersions, which
+  still skips the detectors for every unchanged pod.
+
+Some pod findings also depend on other objects or on the clock (ConfigMap
+keys, missing ConfigMaps/Secrets, Unhealthy events, how long a pod has been
+terminating). Those detectors run on every scan, but only over the pods that
+can produce them (not Running, restarting, waiting, or terminating), which
+are tracked alongside the findings.
+
+Detectors marked `snapshot_only` in the registry are reused whole while the
+informer revisions of all their kinds are the same as at their last run.
+"""
+
+import threading
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from ..core.informer import InformerCache
+from ..core.snapshot import ClusterSnapshot, snapshot_pages
+from .registry import Detector
+from .scheduling import RequestLedger
+
+PodKey = Tuple[str, str]
+
+# Pod scan keys whose findings depend only on the pod object itself.
+# failed_pods and high_restart are computed inline; the others are page reducers.
+_LOCAL_KEYS = (
+    "failed_pods", "high_restart", "image_pull", "probe_failures", "init_blockers",
+    "gitops_controller_issues", "crashloop",
+)
+_LOCAL_PAGE_REDUCERS = _LOCAL_KEYS[2:]
+# Pod scan keys that also read other objects or the clock
+_VOLATILE_KEYS = ("config_key_mismatches", "missing_refs", "aggressive_liveness", "stuck_terminating")
+
+
+def _pod_key(pod) -> PodKey:
+    return (pod.metadata.namespace or "", pod.metadata.name)
+
+
+def _needs_recheck(pod) -> bool:
+    """Whether any volatile pod detector can report this pod."""
+    if pod.metadata.deletion_timestamp or pod.status.phase != "Running":
+        return True
+    return any(
+        (cs.restart_count or 0) > 0 or (cs.state and cs.state.waiting)
+        for cs in (pod.status.container_statuses or [])
+    )
+
+
+@dataclass
+class _PodEntry:
+    resource_version: Optional[str]
+    findings: Dict[str, List[str]] = field(default_factory=dict)
+    # What the pod added to the request ledger, subtracted again on change
+    requests: Optional[Tuple] = None
+
+
+class IncrementalScan:
+    """Per-engine state for incremental scans; safe to share between threads."""
+
+    def __init__(self, engine):
+        self.engine = engine
+        self._entries: Dict[PodKey, _PodEntry] = {}
+        self._findings: Dict[str, Dict[PodKey, List[str]]] = {key: {} for key in _LOCAL_KEYS}
+        self._pending: Dict[PodKey, object] = {}
+        self._unready: Set[PodKey] = set()
+        self._recheck: Dict[PodKey, object] = {}
+        self._ledger = RequestLedger()
+        # The informer (and its revision) the entries were last synced from
+        self._informer = None
+        self._cursor: Optional[int] = None
+        self._lock = threading.Lock()
+        # issue type -> (informer revisions of its kinds, findings)
+        self._detector_results: Dict[str, Tuple[Tuple[int, ...], object]] = {}
+        self._detector_lock = threading.Lock()
+        self.stats: Dict = {}
+
+    # ─────────────────────────────────────────────────────────────
+    # Pod scan
+    # ─────────────────────────────────────────────────────────────
+
+    def scan_pods(self, snapshot: ClusterSnapshot, reducers: Optional[Iterable[str]] = None) -> Dict:
+        """Same result as DiagnosticsEngine._scan_pods(), from the kept per-pod findings."""
+        with self._lock:
+            local_reducers = self.engine._pod_page_reducers(snapshot, _LOCAL_PAGE_REDUCERS)
+            source, evaluated, removed = self._sync(snapshot, local_reducers)
+            self.stats = {
+                "source": source,
+                "pods": len(self._entries),
+                "pods_evaluated": evaluated,
+                "pods_removed": removed,
+                "pods_rechecked": len(self._recheck),
+            }
+            return self._merge(snapshot, reducers)
+
+    def _sync(self, snapshot: ClusterSnapshot, local_reducers: Dict) -> Tuple[str, int, int]:
+        informers = getattr(self.engine.k8s, "informers", None)
+        informer = informers.informer("pods") if isinstance(informers, InformerCache) else None
+        if informer is None:
+            self._informer = self._cursor = None
+            pods = (pod for page in snapshot_pages(self.engine.k8s, snapshot, "pods") for pod in page)
+            return ("list",) + self._diff(pods, local_reducers)
+
+        if informer is self._informer and self._cursor is not None:
+            revision, changed = informer.changes_since(self._cursor)
+            if changed is not None:
+                evaluated = removed = 0
+                for namespace, name in changed:
+                    pod = informer.get(namespace, name)
+                    if pod is None:
+                        removed += self._remove((namespace, name))
+                    else:
+                        evaluated += self._apply(pod, local_reducers)
+                self._cursor = revision
+                return "informer", evaluated, removed
+
+        # First sync, a new informer, or the change log no longer reaches back: diff the store
+        revision = informer.revision
+        self._informer = informer
+        evaluated, removed = self._diff(informer.items(), local_reducers)
+        self._cursor = revision
+        return "informer_resync", evaluated, removed
+
+    def _diff(self, pods: Iterable, local_reducers: Dict) -> Tuple[int, int]:
+        seen: Set[PodKey] = set()
+        evaluated = 0
+        for pod in pods:
+            seen.add(_pod_key(pod))
+            evaluated += self._apply(pod, local_reducers)
+        gone = [key for key in self._entries if key not in seen]
+        for key in gone:
+            self._remove(key)
+        return evaluated, len(gone)
+
+    def _apply(self, pod, local_reducers: Dict) -> int:
+        """Re-evaluate `pod` unless its resourceVersion is unchanged; 1 if evaluated."""
+        key = _pod_key(pod)
+        resource_version = pod.metadata.resource_version
+        entry = self._entries.get(key)
+        if entry is not None and resource_version and entry.resource_version == resource_version:
+            return 0
+        self._remove(key)
+
+        entry = self._entries[key] = _PodEntry(resource_version)
+        entry.requests = self._ledger.add(pod)
+        if _needs_recheck(pod):
+            self._recheck[key] = pod
+        if pod.metadata.deletion_timestamp:
+            return 1
+
+        ref = f"{pod.metadata.namespace}/{pod.metadata.name}"
+        findings = {
+            "failed_pods": [ref] if pod.status.phase == "Failed" else [],
+            "high_restart": [
+                ref for cs in (pod.status.container_statuses or []) if cs.restart_count > 10
+            ],
+        }
+        for name, reducer in local_reducers.items():
+            findings[name] = reducer([pod])
+        entry.findings = {name: found for name, found in findings.items() if found}
+        for name, found in entry.findings.items():
+            self._findings[name][key] = found
+        if pod.status.phase == "Pending":
+            self._pending[key] = pod
+        if not self.engine._pod_is_ready(pod):
+            self._unready.add(key)
+        return 1
+
+    def _remove(self, key: PodKey) -> int:
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return 0
+        for name in entry.findings:
+            self._findings[name].pop(key, None)
+        self._ledger.remove(entry.requests)
+        self._pending.pop(key, None)
+        self._unready.discard(key)
+        self._recheck.pop(key, None)
+        return 1
+
+    def _merge(self, snapshot: ClusterSnapshot, reducers: Optional[Iterable[str]]) -> Dict:
+        scan = self.engine._empty_pod_scan()
+        wanted = set(scan) if reducers is None else set(reducers)
+        # Pods are reported in (namespace, name) order, as the API server lists them
+        for name in _LOCAL_KEYS:
+            by_pod = self._findings[name]
+            scan[name] = [finding for key in sorted(by_pod) for finding in by_pod[key]]
+        scan["pending_count"] = len(self._pending)
+        scan["pending_pods"] = [self._pending[key] for key in sorted(self._pending)]
+        scan["node_requests"] = self._ledger.copy()
+        if "unready_pods" in wanted:
+            scan["unready_pods"] = set(self._unready)
+
+        candidates = [self._recheck[key] for key in sorted(self._recheck)]
+        active_pods = [pod for pod in candidates if not pod.metadata.deletion_timestamp]
+        volatile = self.engine._pod_page_reducers(snapshot, wanted.intersection(_VOLATILE_KEYS))
+        for name, reducer in volatile.items():
+            scan[name] = reducer(active_pods)
+        if "stuck_terminating" in wanted:
+            scan["stuck_terminating"] = self.engine._find_stuck_terminating(candidates)
+        return scan
+
+    # ─────────────────────────────────────────────────────────────
+    # Snapshot-only detectors
+    # ─────────────────────────────────────────────────────────────
+
+    def detect(self, detector: Detector, snapshot: ClusterSnapshot):
+        """Run `detector`, reusing its last findings while its kinds are unchanged."""
+        revisions = self._revisions(detector, snapshot)
+        if revisions is None:
+            return detector.detect(self.engine, snapshot)
+        with self._detector_lock:
+            cached = self._detector_results.get(detector.issue_type)
+        if cached is not None and cached[0] == revisions:
+            return cached[1]
+        findings = detector.detect(self.engine, snapshot)
+        with self._detector_lock:
+            self._detector_results[detector.issue_type] = (revisions, findings)
+        return findings
+
+    @staticmethod
+    def _revisions(detector: Detector, snapshot: ClusterSnapshot) -> Optional[Tuple[int, ...]]:
+        if not detector.snapshot_only or not detector.kinds:
+            return None
+        if any(kind not in snapshot.revisions or kind in snapshot.errors for kind in detector.kinds):
+            return None
+        return tuple(snapshot.revisions[kind] for kind in detector.kinds)
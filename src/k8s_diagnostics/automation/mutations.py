@@ -0,0 +1,283 @@
+"""Concurrent, rate-limited execution of fixer mutations.
+
+The fixers used to delete and patch one object at a time in a synchronous
+loop, so cleaning up 8k evicted pods after a node-pressure incident took as
+long as 8k sequential round trips. MutationExecutor runs the calls on a
+bounded thread pool instead. It has three limits:
+
+* a token bucket caps the request rate (QPS, with a burst allowance), so a
+  large clean-up does not flood the API server;
+* a per-namespace cap keeps one busy namespace from taking every worker;
+* PDB-protected deletions spend DisruptionBudgets. A PodDisruptionBudget
+  that allows two disruptions lets two deletions through. Later deletions
+  under it wait, re-reading the PDB, until the budget recovers. A deletion
+  whose budget stays exhausted for `wait_seconds` is skipped, not forced.
+
+Outcomes come back in submission order, so fixer results stay
+deterministic. An optional `progress` callback sees a running tally after
+every call.
+"""
+
+import asyncio
+import time
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from ..core.executor import BlockingExecutor
+
+OK = "ok"
+FAILED = "failed"
+SKIPPED = "skipped"
+
+
+@dataclass(frozen=True)
+class Mutation:
+    """One blocking API call, e.g. deleting one pod."""
+
+    ref: str
+    namespace: str
+    call: Callable[[], Any]
+    # DisruptionBudgets keys ("namespace/name") the call spends one disruption from
+    budgets: Tuple[str, ...] = ()
+
+
+@dataclass(frozen=True)
+class MutationOutcome:
+    mutation: Mutation
+    status: str
+    result: Any = None
+    error: Optional[BaseException] = None
+    # Why a mutation was skipped
+    reason: Optional[str] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.status == OK
+
+
+class TokenBucket:
+    """Allows `qps` acquisitions per second on average and `burst` at once.
+
+    A `qps` of None (or 0) disables the limit.
+    """
+
+    def __init__(
+        self,
+        qps: Optional[float],
+        burst: int = 1,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], Awaitable] = asyncio.sleep,
+    ):
+        self.qps = qps
+        self.burst = max(1, burst)
+        self._clock = clock
+        self._sleep = sleep
+        self._tokens = float(self.burst)
+        self._updated = clock()
+
+    def _refill(self) -> None:
+        now = self._clock()
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.qps)
+        self._updated = now
+
+    async def acquire(self) -> None:
+        if not self.qps:
+            return
+        while True:
+            self._refill()
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return
+            await self._sleep((1 - self._tokens) / self.qps)
+
+
+class DisruptionBudgets:
+    """Voluntary disruptions left per PodDisruptionBudget during one pass.
+
+    `track()` seeds a PDB's allowance from its listed status. Each deletion
+    spends one. When a PDB is spent, `acquire()` re-reads it through
+    `reader(namespace, name)` every `poll_seconds`. A re-read only raises
+    the allowance once the disruption controller has recomputed the status
+    (see `_observation`); until then the server still counts the pods this
+    pass deleted as healthy, so its allowance can only lower ours. Once a
+    PDB has stayed spent for `wait_seconds`, that acquire and every later
+    one for the same PDB give up, so a stuck budget does not hold each
+    remaining pod for the full wait.
+    """
+
+    def __init__(
+        self,
+        reader: Callable[[str, str], Any],
+        wait_seconds: float = 60.0,
+        poll_seconds: float = 5.0,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], Awaitable] = asyncio.sleep,
+    ):
+        self._reader = reader
+        self.wait_seconds = wait_seconds
+        self.poll_seconds = poll_seconds
+        self._clock = clock
+        self._sleep = sleep
+        self._remaining: Dict[str, int] = {}
+        # Status observation each key's allowance was last taken from
+        self._observed: Dict[str, Tuple] = {}
+        self._exhausted: Dict[str, str] = {}
+        self._locks: Dict[str, asyncio.Lock] = {}
+
+    @staticmethod
+    def _allowance(pdb) -> Optional[int]:
+        allowed = getattr(getattr(pdb, "status", None), "disruptions_allowed", None)
+        return allowed if isinstance(allowed, int) else None
+
+    @staticmethod
+    def _observation(pdb) -> Tuple:
+        """Status fields the disruption controller changes when it recomputes `pdb`."""
+        status = getattr(pdb, "status", None)
+        conditions = tuple(
+            (c.type, c.status, str(c.last_transition_time))
+            for c in (getattr(status, "conditions", None) or [])
+        )
+        return (
+            getattr(status, "observed_generation", None),
+            getattr(status, "current_healthy", None),
+            conditions,
+        )
+
+    def track(self, pdb) -> Optional[str]:
+        """Key for `pdb`, or None if its status reports no allowance to pace."""
+        allowed = self._allowance(pdb)
+        if allowed is None:
+            return None
+        key = f"{pdb.metadata.namespace}/{pdb.metadata.name}"
+        if key not in self._remaining:
+            self._remaining[key] = allowed
+            self._observed[key] = self._observation(pdb)
+        return key
+
+    def remaining(self, key: str) -> int:
+        return self._remaining[key]
+
+    async def acquire(self, keys: Iterable[str]) -> Optional[str]:
+        """Spend one disruption from each PDB; the reason if any stays exhausted."""
+        spent: List[str] = []
+        for key in sorted(keys):
+            reason = await self._acquire_one(key)
+            if reason:
+                self.release(spent)
+                return reason
+            spent.append(key)
+        return None
+
+    def release(self, keys: Iterable[str]) -> None:
+        """Refund disruptions spent by a call that did not go through."""
+        for key in keys:
+            self._remaining[key] += 1
+
+    async def _acquire_one(self, key: str) -> Optional[str]:
+        lock = self._locks.setdefault(key, asyncio.Lock())
+        async with lock:
+            if self._remaining[key] < 1 and key not in self._exhausted:
+                deadline = self._clock() + self.wait_seconds
+                while self._remaining[key] < 1:
+                    if self._clock() >= deadline:
+                        self._exhausted[key] = (
+                            f"PDB '{key}' disruption budget stayed exhausted for "
+                            f"{self.wait_seconds:g}s; skipping to protect availability"
+                        )
+                        break
+                    await self._sleep(self.poll_seconds)
+                    self._refresh(key)
+            if self._remaining[key] < 1:
+                return self._exhausted[key]
+            self._remaining[key] -= 1
+            return None
+
+    def _refresh(self, key: str) -> None:
+        namespace, name = key.split("/", 1)
+        try:
+            pdb = self._reader(namespace, name)
+        except Exception:
+            return
+        allowed = self._allowance(pdb)
+        if allowed is None:
+            return
+        observation = self._observation(pdb)
+        if observation == self._observed.get(key):
+            # Same status as before our deletions: never trust it above what is left
+            self._remaining[key] = min(self._remaining[key], allowed)
+        else:
+            self._observed[key] = observation
+            self._remaining[key] = allowed
+
+
+class MutationExecutor:
+    """Runs Mutations concurrently under a QPS limit and a per-namespace cap.
+
+    The token bucket belongs to the executor rather than to one run, so
+    back-to-back fixer passes (e.g. in auto_remediate) share one rate limit.
+    """
+
+    def __init__(
+        self,
+        qps: Optional[float] = 20.0,
+        burst: int = 40,
+        max_concurrency: int = 16,
+        per_namespace: int = 4,
+        timeout_seconds: Optional[float] = 30.0,
+        pdb_wait_seconds: float = 60.0,
+        pdb_poll_seconds: float = 5.0,
+    ):
+        self.max_concurrency = max_concurrency
+        self.per_namespace = per_namespace
+        self.timeout_seconds = timeout_seconds
+        # DisruptionBudgets settings for fixers that pace PDB-protected deletions
+        self.pdb_wait_seconds = pdb_wait_seconds
+        self.pdb_poll_seconds = pdb_poll_seconds
+        self.bucket = TokenBucket(qps, burst)
+
+    async def run(
+        self,
+        mutations: Sequence[Mutation],
+        budgets: Optional[DisruptionBudgets] = None,
+        progress: Optional[Callable[[Dict], None]] = None,
+    ) -> List[MutationOutcome]:
+        """Run every mutation; return outcomes in the order given."""
+        if not mutations:
+            return []
+        executor = BlockingExecutor(
+            max_workers=max(1, min(self.max_concurrency, len(mutations))),
+            timeout_seconds=self.timeout_seconds,
+            name="k8s-mutation",
+        )
+        namespaces: Dict[str, asyncio.Semaphore] = defaultdict(
+            lambda: asyncio.Semaphore(max(1, self.per_namespace))
+        )
+        tally = {"total": len(mutations), "done": 0, OK: 0, FAILED: 0, SKIPPED: 0}
+
+        def _report(outcome: MutationOutcome) -> MutationOutcome:
+            tally["done"] += 1
+            tally[outcome.status] += 1
+            if progress is not None:
+                progress(dict(tally))
+            return outcome
+
+        async def _run_one(mutation: Mutation) -> MutationOutcome:
+            if mutation.budgets and budgets is not None:
+                reason = await budgets.acquire(mutation.budgets)
+                if reason:
+                    return _report(MutationOutcome(mutation, SKIPPED, reason=reason))
+            async with namespaces[mutation.namespace]:
+                await self.bucket.acquire()
+                try:
+                    result = await executor.run(mutation.call)
+                except Exception as e:
+                    if mutation.budgets and budgets is not None:
+                        budgets.release(mutation.budgets)
+                    return _report(MutationOutcome(mutation, FAILED, error=e))
+            return _report(MutationOutcome(mutation, OK, result=result))
+
+        try:
+            return list(await asyncio.gather(*(_run_one(m) for m in mutations)))
+        finally:
+            executor.shutdown()
@@ -0,0 +1,117 @@
+"""ownerReference graph for resolving a pod's workload.
+
+Fixers that patch "the Deployment behind this pod" used to guess it by
+matching the pod's labels against every Deployment in its namespace, once
+per pod. That is slow and wrong when two selectors overlap. The API server
+already records the answer: a pod's controller ownerReference names its
+ReplicaSet (or StatefulSet, DaemonSet, Job), whose own reference names the
+Deployment (or CronJob).
+
+OwnerGraph lists the workload kinds once and keys every object by uid, so
+resolving a pod is a walk of at most a few dict hits up its controller
+references. Pods without a controller reference, or whose owner was not
+listed (RBAC, an unknown kind), are left for the caller's fallback.
+"""
+
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from ..core.client import list_items
+
+# list_items kind -> the `kind` that ownerReferences use for it
+WORKLOAD_KINDS: Dict[str, str] = {
+    "replicasets": "ReplicaSet",
+    "deployments": "Deployment",
+    "statefulsets": "StatefulSet",
+    "daemonsets": "DaemonSet",
+    "jobs": "Job",
+    "cronjobs": "CronJob",
+}
+
+# A controller chain longer than this means a reference cycle in bad data
+_MAX_DEPTH = 8
+
+Owner = Tuple[str, object]
+
+
+def controller_ref(obj):
+    """The ownerReference with controller=true, if any."""
+    for ref in obj.metadata.owner_references or []:
+        if ref.controller:
+            return ref
+    return None
+
+
+class OwnerGraph:
+    """Workload objects by uid, walked through their controller references.
+
+    With a `loader`, the objects are listed on the first lookup, so a graph
+    created for a fix pass that finds nothing to fix costs no API calls.
+    """
+
+    def __init__(
+        self,
+        owners: Iterable[Owner] = (),
+        loader: Optional[Callable[[], Iterable[Owner]]] = None,
+    ):
+        self._by_uid: Dict[str, Owner] = {}
+        self._loader = loader
+        for kind, obj in owners:
+            self.add(kind, obj)
+
+    @classmethod
+    def build(cls, k8s, namespace: Optional[str] = None, lazy: bool = False) -> "OwnerGraph":
+        """One list per workload kind; kinds that cannot be listed are left out."""
+
+        def _load() -> Iterable[Owner]:
+            for kind, owner_kind in WORKLOAD_KINDS.items():
+                try:
+                    objects = list_items(k8s, kind, namespace=namespace)
+                except Exception:
+                    continue
+                for obj in objects:
+                    yield owner_kind, obj
+
+        if lazy:
+            return cls(loader=_load)
+        return cls(_load())
+
+    def add(self, kind: str, obj) -> None:
+        uid = obj.metadata.uid
+        if uid:
+            self._by_uid[uid] = (kind, obj)
+
+    def _ensure_loaded(self) -> None:
+        if self._loader is not None:
+            loader, self._loader = self._loader, None
+            for kind, obj in loader():
+                self.add(kind, obj)
+
+    def get(self, uid: Optional[str]) -> Optional[Owner]:
+        self._ensure_loaded()
+        return self._by_uid.get(uid) if uid else None
+
+    def chain(self, obj) -> List[Owner]:
+        """Controllers of `obj`, nearest first (e.g. ReplicaSet, then Deployment)."""
+        chain: List[Owner] = []
+        ref = controller_ref(obj)
+        while ref is not None and len(chain) < _MAX_DEPTH:
+            owner = self.get(ref.uid)
+            if owner is None:
+                break
+            chain.append(owner)
+            ref = controller_ref(owner[1])
+        return chain
+
+    def workload(self, obj) -> Optional[Owner]:
+        """The top-level controller of `obj` (e.g. the Deployment of a ReplicaSet pod)."""
+        chain = self.chain(obj)
+        return chain[-1] if chain else None
+
+    def resolves(self, obj) -> bool:
+        """Whether `obj` has a controller and the graph holds it."""
+        ref = controller_ref(obj)
+        return ref is not None and self.get(ref.uid) is not None
+
+    def __len__(self) -> int:
+        self._ensure_loaded()
+        return len(self._by_uid)
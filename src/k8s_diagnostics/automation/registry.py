@@ -0,0 +1,466 @@
+"""Registry of the detectors behind detect_common_issues().
+
+Each Detector declares the issue type it reports, its severity, the
+snapshot kinds it reads (core.snapshot.SNAPSHOT_KINDS) and the AutoFixer
+methods that remediate it. The planner uses those declarations to list only
+the kinds the enabled detectors need: a scan limited to node and pod checks
+costs two list calls. Auto-remediation and the CLI's `suggest` command look
+up fixers and manual hints here instead of keeping their own chains.
+
+A detector gets its findings in one of two ways:
+
+* `detect(engine, snapshot)` runs on the DetectorRunner pool alongside the
+  other detectors;
+* `pod_reducer` names a key of the single streaming pod scan
+  (DiagnosticsEngine._scan_pods), which only runs the reducers that enabled
+  detectors ask for.
+
+`build` turns findings into issue dicts; by default one issue with a
+count and the first `details_limit` findings, or none when nothing was found.
+Builders run after the DetectorRunner has finished, outside any deadline.
+Per-pod work a pod-level detector's builder needs goes in `prepare`
+instead. It runs on the pod scan's task right after the scan, and its
+result is in `ctx.prepared[issue_type]`.
+
+`snapshot_only` marks detectors whose findings depend on nothing but their
+`kinds` in the snapshot (no extra API reads, no clock). Incremental scans
+reuse their last findings while those kinds are unchanged.
+"""
+
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, FrozenSet, Iterable, List, Optional, Tuple
+
+from ..core.snapshot import SNAPSHOT_KINDS, ClusterSnapshot, snapshot_items
+
+
+@dataclass
+class ScanContext:
+    """What issue builders can read besides their own findings."""
+
+    snapshot: ClusterSnapshot
+    pod_scan: Dict
+    # Set by the warning_events builder; feeds the scan's pattern analysis.
+    active_warning_events: List = field(default_factory=list)
+    # issue_type -> result of the detector's `prepare`
+    prepared: Dict = field(default_factory=dict)
+
+
+@dataclass(frozen=True)
+class Detector:
+    issue_type: str
+    severity: str
+    kinds: Tuple[str, ...] = ()
+    detect: Optional[Callable[[Any, ClusterSnapshot], Any]] = None
+    pod_reducer: Optional[str] = None
+    build: Optional[Callable[[Any, "Detector", Any, ScanContext], List[Dict]]] = None
+    prepare: Optional[Callable[[Any, "Detector", ScanContext], Any]] = None
+    details_limit: Optional[int] = 5
+    hint: Optional[str] = None
+    # (action label, AutoFixer method name); each takes dry_run=
+    fixers: Tuple[Tuple[str, str], ...] = ()
+    # Manual guidance shown by `suggest`, alongside any dry-run fix
+    remediation: Optional[str] = None
+    timeout_seconds: Optional[float] = None
+    snapshot_only: bool = False
+
+    def issues(self, engine, findings, ctx: ScanContext) -> List[Dict]:
+        return (self.build or count_issue)(engine, self, findings, ctx)
+
+
+def count_issue(engine, detector: Detector, findings, ctx: ScanContext) -> List[Dict]:
+    if not findings:
+        return []
+    issue = {
+        "type": detector.issue_type,
+        "severity": detector.severity,
+        "count": len(findings),
+        "details": findings[:detector.details_limit],
+    }
+    if detector.hint:
+        issue["hint"] = detector.hint
+    return [issue]
+
+
+def _analyze_pending_pods(engine, detector: Detector, ctx: ScanContext) -> Dict:
+    # Every pending pod is analysed against the snapshot's NodeIndex; the first
+    # `details_limit` are reported in full. The rest only feed the reason counts,
+    # so they skip the per-node capacity table.
+    scheduling_details = []
+    reason_counts: Dict[str, int] = {}
+    unschedulable = 0
+    for pod in ctx.pod_scan["pending_pods"]:
+        detailed = len(scheduling_details) < detector.details_limit
+        analysis = engine._analyze_scheduling(
+            pod, ctx.snapshot, ctx.pod_scan.get("node_requests"), detailed=detailed
+        )
+        reasons = analysis.get("pending_reasons", [])
+        for reason in reasons:
+            reason_counts[reason["reason"]] = reason_counts.get(reason["reason"], 0) + 1
+        if analysis.get("feasible_nodes") == 0:
+            unschedulable += 1
+        if detailed:
+            scheduling_details.append({
+                "pod": f"{pod.metadata.namespace}/{pod.metadata.name}",
+                "pending_reasons": reasons,
+            })
+    return {
+        "scheduling_analysis": scheduling_details,
+        "pending_reason_counts": reason_counts,
+        "no_feasible_node": unschedulable,
+    }
+
+
+def _pending_pods_issue(engine, detector: Detector, pending_count: int, ctx: ScanContext) -> List[Dict]:
+    if not pending_count:
+        return []
+    analysis = ctx.prepared.get(detector.issue_type)
+    if analysis is None:
+        analysis = _analyze_pending_pods(engine, detector, ctx)
+    return [{
+        "type": detector.issue_type,
+        "severity": detector.severity,
+        "count": pending_count,
+        **analysis,
+    }]
+
+
+def _dns_issue(engine, detector: Detector, dns_status: Dict, ctx: ScanContext) -> List[Dict]:
+    if dns_status.get("running_pods", 0) != 0:
+        return []
+    return [{
+        "type": detector.issue_type,
+        "severity": detector.severity,
+        "details": ["CoreDNS pods not running"],
+    }]
+
+
+def _warning_events_issue(engine, detector: Detector, unready_pods: set, ctx: ScanContext) -> List[Dict]:
+    ctx.active_warning_events = engine._active_warning_events(unready_pods, ctx.snapshot)
+    return count_issue(engine, detector, engine._format_warning_events(ctx.active_warning_events), ctx)
+
+
+def _provider_issues(engine, detector: Detector, provider_issues: List[Dict], ctx: ScanContext) -> List[Dict]:
+    # Filter out info-level SDK-unavailable or provider-unknown notices.
+    # The explicit provider commands still expose those details, but the
+    # general detector should stay focused on active cluster failures.
+    return [i for i in provider_issues or [] if i.get("severity") != "info"]
+
+
+# In report order.
+DETECTORS: Tuple[Detector, ...] = (
+    Detector(
+        "nodes_not_ready", "high", kinds=("nodes",),
+        detect=lambda engine, snapshot: engine._find_not_ready_nodes(snapshot),
+        snapshot_only=True,
+        remediation=(
+            "kubectl describe node <node> — check Conditions section; "
+            "journalctl -u kubelet on the node"
+        ),
+    ),
+    Detector(
+        "node_pressure", "high", kinds=("nodes",),
+        detect=lambda engine, snapshot: engine._check_node_pressure(
+            snapshot_items(engine.k8s, snapshot, "nodes")
+        ),
+        snapshot_only=True,
+        hint="kubectl describe node <node> — check Conditions and Allocatable",
+        remediation=(
+            "kubectl describe node <node> — check Conditions and Allocatable. "
+            "MemoryPressure: free memory or evict pods. "
+            "DiskPressure: clear logs/images with 'crictl rmi --prune'. "
+            "PIDPressure: check for fork-bombing processes on node. "
+            "NetworkUnavailable: check CNI plugin pods in kube-system."
+        ),
+    ),
+    Detector(
+        "failed_pods", "high", kinds=("pods",), pod_reducer="failed_pods",
+        fixers=(("failed_pods", "restart_failed_pods"),),
+    ),
+    Detector(
+        "pending_pods", "high", kinds=("pods", "nodes", "pvcs"), pod_reducer="pending_count",
+        build=_pending_pods_issue,
+        prepare=lambda engine, detector, ctx: (
+            _analyze_pending_pods(engine, detector, ctx) if ctx.pod_scan["pending_count"] else None
+        ),
+        remediation=(
+            "Each pending pod's root cause is in scheduling_analysis above. "
+            "Use 'diagnose <ns> <pod>' for full detail."
+        ),
+    ),
+    Detector(
+        "image_pull_errors", "high", kinds=("pods",), pod_reducer="image_pull",
+        fixers=(("image_pull_errors", "fix_image_pull_errors"),),
+    ),
+    Detector(
+        "service_selector_mismatch", "high", kinds=("services", "endpoints", "deployments"),
+        detect=lambda engine, snapshot: engine._detect_service_selector_mismatches(snapshot),
+        fixers=(("service_selector_mismatch", "fix_service_selector_mismatches"),),
+    ),
+    Detector(
+        "configmap_key_mismatch", "high", kinds=("pods",), pod_reducer="config_key_mismatches",
+        fixers=(("configmap_key_mismatch", "fix_configmap_key_mismatches"),),
+    ),
+    Detector(
+        "pvc_not_bound", "medium", kinds=("pvcs",),
+        detect=lambda engine, snapshot: engine._find_unbound_pvcs(snapshot),
+        snapshot_only=True,
+        remediation="kubectl describe pvc <name> — check StorageClass and provisioner",
+    ),
+    Detector(
+        "dns_unhealthy", "high", kinds=("pods",),
+        detect=lambda engine, snapshot: engine._check_dns(snapshot),
+        build=_dns_issue,
+        fixers=(("dns_unhealthy", "fix_dns_issues"),),
+    ),
+    Detector(
+        "load_balancer_pending", "medium", kinds=("services",),
+        detect=lambda engine, snapshot: engine._check_pending_load_balancers(snapshot).get("pending", []),
+        snapshot_only=True,
+        remediation=(
+            "Check Azure/AWS LB quota and cloud-controller-manager logs: "
+            "kubectl logs -n kube-system -l component=cloud-controller-manager"
+        ),
+    ),
+    Detector(
+        "ingress_backend_missing_service", "high", kinds=("ingresses", "services"),
+        detect=lambda engine, snapshot: engine._detect_ingress_backend_missing_services(snapshot),
+        snapshot_only=True,
+        fixers=(("ingress_backend_missing_service", "fix_ingress_backends"),),
+    ),
+    Detector(
+        "high_restart_count", "medium", kinds=("pods",), pod_reducer="high_restart",
+        fixers=(
+            ("high_restart_count_oom", "fix_oomkilled_pods"),
+            ("high_restart_count_liveness", "fix_aggressive_liveness_probes"),
+        ),
+        remediation=(
+            "Use 'diagnose <ns> <pod>' to see exit code analysis. "
+            "Exit 137=OOMKill (raise memory limits), "
+            "Exit 143=SIGTERM (fix liveness probe initialDelaySeconds)"
+        ),
+    ),
+    Detector(
+        "probe_failures", "medium", kinds=("pods",), pod_reducer="probe_failures",
+        hint="Use 'diagnose <ns> <pod>' for per-container probe analysis",
+        remediation=(
+            "Use 'diagnose <ns> <pod>' to get per-container probe analysis "
+            "showing mismatched ports, wrong paths, and low initialDelaySeconds"
+        ),
+    ),
+    Detector(
+        "init_containers_blocked", "high", kinds=("pods",), pod_reducer="init_blockers",
+        hint=(
+            "kubectl logs <pod> -n <ns> -c <init-container>; "
+            "then check any dependency Service/endpoints the init container waits for"
+        ),
+        remediation=(
+            "Run: kubectl logs <pod> -n <ns> -c <init-container>. "
+            "If logs say a service is not ready, verify it with: "
+            "kubectl get svc,endpoints,endpointslice -n <ns> | grep <service>. "
+            "Fix the missing Service/endpoints; remove initContainers only as a lab workaround."
+        ),
+    ),
+    Detector(
+        "aggressive_liveness_probe", "high", kinds=("pods", "warning_events"),
+        pod_reducer="aggressive_liveness",
+        fixers=(("aggressive_liveness_probe", "fix_aggressive_liveness_probes"),),
+    ),
+    Detector(
+        "gitops_controller_unhealthy", "high", kinds=("pods",),
+        pod_reducer="gitops_controller_issues", details_limit=10,
+        hint="kubectl get pods -n argocd; kubectl get pods -n flux-system",
+        fixers=(("gitops_controller_unhealthy", "restart_unhealthy_gitops_controllers"),),
+    ),
+    Detector(
+        "gitops_crd_missing", "high",
+        detect=lambda engine, snapshot: engine._detect_gitops_crd_issues(),
+        details_limit=10,
+        hint="Reinstall the controller manifests; use server-side apply for large Argo CD CRDs.",
+        remediation=(
+            "Reapply the GitOps controller install manifests. "
+            "For Argo CD CRD annotation errors, use: "
+            "kubectl apply --server-side --force-conflicts -n argocd "
+            "-f https://raw.githubusercontent.com/argoproj/argo-cd/stable/manifests/install.yaml"
+        ),
+    ),
+    Detector(
+        "argocd_application_unhealthy", "medium",
+        detect=lambda engine, snapshot: engine._detect_argocd_application_issues(),
+        details_limit=10,
+        hint="kubectl get applications -A; kubectl describe application <name> -n <ns>",
+        remediation=(
+            "kubectl describe application <name> -n <ns>; "
+            "inspect repo/auth/path errors, then fix Git or sync/revert in Argo CD. "
+            "The CLI does not patch Application state because Git should remain the source of truth."
+        ),
+    ),
+    Detector(
+        "flux_resource_not_ready", "medium",
+        detect=lambda engine, snapshot: engine._detect_flux_resource_issues(),
+        details_limit=10,
+        hint="kubectl get gitrepositories,kustomizations,helmreleases -A; describe the NotReady object.",
+        remediation=(
+            "kubectl describe gitrepository <name> -n <ns> "
+            "(or describe the affected kustomization/helmrelease); "
+            "fix source auth, path, dependency, or Helm values in Git, then reconcile. "
+            "The CLI does not patch Flux custom resources because Git should remain the source of truth."
+        ),
+    ),
+    Detector(
+        # Warning events from the last hour; pod events only for active, unready pods
+        "warning_events", "medium", kinds=("pods", "warning_events"),
+        pod_reducer="unready_pods", build=_warning_events_issue, details_limit=10,
+        hint="kubectl get events -A --field-selector type=Warning --sort-by=.lastTimestamp",
+        remediation=(
+            "kubectl get events -A --field-selector type=Warning "
+            "--sort-by=.lastTimestamp | tail -30 — "
+            "then use 'diagnose <ns> <pod>' for any affected pod"
+        ),
+    ),
+    Detector(
+        # etcd, scheduler, controller-manager
+        "control_plane_unhealthy", "high",
+        detect=lambda engine, snapshot: engine._check_component_health(),
+        details_limit=None,
+        hint="kubectl get componentstatuses",
+        remediation=(
+            "kubectl get componentstatuses — "
+            "etcd: check etcd pod logs and disk space. "
+            "scheduler/controller-manager: check kube-system pod logs. "
+            "Note: on AKS/EKS/GKE the control plane is managed and not visible here."
+        ),
+    ),
+    Detector(
+        # phase=Running but waiting.reason=CrashLoopBackOff
+        "crashloop_backoff", "high", kinds=("pods",), pod_reducer="crashloop",
+        hint="kubectl logs <pod> --previous -n <ns> — check exit code with diagnose <ns> <pod>",
+        fixers=(("crashloop_backoff", "restart_failed_pods"),),
+        remediation=(
+            "kubectl logs <pod> -n <ns> --previous for root cause; "
+            "Exit 137=OOMKill (raise memory limits), "
+            "Exit 127=bad command (check entrypoint), Exit 1=app error"
+        ),
+    ),
+    Detector(
+        # Terminating pods stuck with finalizers
+        "stuck_terminating", "medium", kinds=("pods",), pod_reducer="stuck_terminating",
+        hint="kubectl get pod <pod> -o yaml | grep finalizers — remove finalizer to unblock",
+        remediation=(
+            "kubectl patch pod <pod> -n <ns> "
+            "-p '{\"metadata\":{\"finalizers\":[]}}' --type=merge — "
+            "WARNING: only do this after confirming the finalizer owner is gone"
+        ),
+    ),
+    Detector(
+        # ConfigMaps/Secrets referenced by pods that do not exist
+        "missing_config_refs", "high", kinds=("pods",), pod_reducer="missing_refs",
+        hint="Create the missing ConfigMap or Secret, or remove the reference from the pod spec",
+        remediation=(
+            "Create the missing ConfigMap or Secret shown above, "
+            "or set optional=true in the pod spec if the ref is non-critical"
+        ),
+    ),
+    Detector(
+        # Ingress policyType with no ingress rules
+        "networkpolicy_deny_all", "medium", kinds=("networkpolicies",),
+        detect=lambda engine, snapshot: engine._find_deny_all_networkpolicies(snapshot),
+        snapshot_only=True,
+        hint="kubectl get networkpolicy -n <ns> -o yaml — add ingress rules or an allow policy",
+        fixers=(("networkpolicy_deny_all", "fix_networkpolicy_deny_all"),),
+        remediation=(
+            "kubectl get networkpolicy -n <ns> -o yaml — "
+            "add an ingress allow rule, or create a second NetworkPolicy "
+            "that explicitly allows traffic from the required sources"
+        ),
+    ),
+    Detector(
+        # HPA not scaling (metrics unavailable or misconfigured)
+        "hpa_issues", "medium", kinds=("hpas",),
+        detect=lambda engine, snapshot: engine._find_hpa_issues(snapshot),
+        snapshot_only=True,
+        hint="kubectl describe hpa -n <ns> — check if metrics-server is running and metric name is correct",
+        remediation=(
+            "kubectl describe hpa -n <ns> — "
+            "ScalingActive=False usually means metrics-server is down or "
+            "the metric name in the HPA spec does not match what is exposed. "
+            "Check: kubectl top pods -n <ns>"
+        ),
+    ),
+    Detector(
+        # TLS Secret certificates expiring within 7 days or already expired
+        "tls_cert_expiring", "high",
+        detect=lambda engine, snapshot: engine._find_expiring_tls_certs(),
+        hint="Renew TLS certificates; if using cert-manager: kubectl annotate certificate <name> -n <ns> cert-manager.io/renewal-reason=manual",
+        remediation=(
+            "If using cert-manager: "
+            "kubectl annotate certificate <name> -n <ns> "
+            "cert-manager.io/renewal-reason=manual-$(date +%s). "
+            "If manual: replace tls.crt and tls.key in the Secret."
+        ),
+    ),
+    Detector(
+        # backoffLimit exhausted or active far past activeDeadlineSeconds
+        "stuck_jobs", "medium", kinds=("jobs",),
+        detect=lambda engine, snapshot: engine._find_stuck_jobs(snapshot),
+        hint="kubectl describe job <name> -n <ns> — check backoffLimit, pod logs, and whether the job command exits 0",
+        remediation=(
+            "kubectl describe job <name> -n <ns> — check pod logs for exit reason. "
+            "To retry: kubectl delete job <name> -n <ns> and recreate. "
+            "Note: Jobs are immutable — you must delete and recreate to change spec."
+        ),
+    ),
+    Detector(
+        "daemonset_not_fully_scheduled", "medium", kinds=("daemonsets",),
+        detect=lambda engine, snapshot: engine._find_daemonset_gaps(snapshot),
+        snapshot_only=True,
+        hint="kubectl describe ds <name> -n <ns> — check nodeSelector and tolerations; new nodes may need labels",
+        remediation=(
+            "kubectl describe ds <name> -n <ns> — "
+            "check nodeSelector and tolerations match all target nodes. "
+            "New nodes may need labels: kubectl label node <node> <key>=<value>"
+        ),
+    ),
+    Detector(
+        # Cloud provider layer (AKS/EKS/GKE); reports provider-specific issue types
+        "provider_checks", "medium", kinds=("nodes", "pods", "services", "persistentvolumes"),
+        detect=lambda engine, snapshot: engine._run_provider_checks(snapshot),
+        build=_provider_issues,
+    ),
+)
+
+DETECTORS_BY_TYPE: Dict[str, Detector] = {d.issue_type: d for d in DETECTORS}
+
+
+def plan_detectors(
+    enabled: Optional[Iterable[str]] = None, disabled: Optional[Iterable[str]] = None
+) -> Tuple[Detector, ...]:
+    """Detectors to run, in report order: `enabled` (default all) minus `disabled`.
+
+    Raises ValueError for unknown issue types so a typo does not silently
+    turn a detector off.
+    """
+    enabled_set = _known(enabled) if enabled is not None else frozenset(DETECTORS_BY_TYPE)
+    disabled_set = _known(disabled) if disabled is not None else frozenset()
+    return tuple(
+        d for d in DETECTORS if d.issue_type in enabled_set and d.issue_type not in disabled_set
+    )
+
+
+def _known(names: Iterable[str]) -> FrozenSet[str]:
+    names = frozenset(names)
+    unknown = names - set(DETECTORS_BY_TYPE)
+    if unknown:
+        raise ValueError(f"unknown detector(s): {', '.join(sorted(unknown))}")
+    return names
+
+
+def required_kinds(detectors: Iterable[Detector]) -> Tuple[str, ...]:
+    """Snapshot kinds the given detectors read, in SNAPSHOT_KINDS order."""
+    needed = {kind for d in detectors for kind in d.kinds}
+    return tuple(kind for kind in SNAPSHOT_KINDS if kind in needed)
+
+
+def parse_detector_list(value: Optional[str]) -> Optional[FrozenSet[str]]:
+    """Parse a comma-separated detector list (env var / query string); empty -> None."""
+    names = frozenset(name.strip() for name in (value or "").split(",") if name.strip())
+    return names or None
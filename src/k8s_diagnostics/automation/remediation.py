@@ -0,0 +1,190 @@
+"""Remediation planning: one patch, and one rollout, per workload.
+
+The pod-driven fixers (OOMKilled, image pull, liveness probes) find work one
+pod at a time. Patching the owning Deployment from inside that loop meant a
+Deployment with 40 OOMKilled replicas was patched 40 times, its memory limit
+raised by +256Mi on each pass over the already-bumped object, and rolled
+out 40 times; auto_remediate could then patch it again for a liveness probe.
+
+Fixers instead propose TemplateChanges to a RemediationPlan. The plan keys
+them by workload and by (container, field), so the same change proposed by
+many pods is kept once, always computed from the unmodified object. Each
+workload's changes are merged into one RFC 6902 JSON patch that touches
+only the changed container fields, and patch_workload() sends it once.
+Every replace is preceded by a test of the value the change was computed
+from, so a concurrent edit makes the API server reject the patch (422)
+rather than have the fixer overwrite it.
+"""
+
+import re
+from dataclasses import dataclass, field
+from typing import Dict, Iterator, List, Optional, Set, Tuple
+
+# workload kind -> (K8sClient API attribute, patch method)
+PATCH_METHODS: Dict[str, Tuple[str, str]] = {
+    "Deployment": ("apps_v1", "patch_namespaced_deployment"),
+    "StatefulSet": ("apps_v1", "patch_namespaced_stateful_set"),
+    "DaemonSet": ("apps_v1", "patch_namespaced_daemon_set"),
+}
+
+_API_CLASSES = {"apps_v1": "AppsV1Api"}
+
+
+def _snake(key: str) -> str:
+    return re.sub(r"(?<!^)(?=[A-Z])", "_", key).lower()
+
+
+def _member(obj, key: str):
+    """`obj`'s camelCase `key`, from a kubernetes model or a plain dict."""
+    if obj is None:
+        return None
+    if isinstance(obj, dict):
+        return obj.get(key)
+    return getattr(obj, _snake(key), None)
+
+
+def json_patch_ops(workload, container: str, path: Tuple[str, ...], old, new) -> List[Dict]:
+    """RFC 6902 ops setting `path` under `container` in `workload`'s pod template.
+
+    The container is addressed by its index in the object that was read,
+    guarded by a test of its name. A field that was set is tested against
+    `old` and replaced; a field that was absent (old is None) cannot be
+    tested, so it is added under its nearest existing parent behind a test
+    of the workload's resourceVersion.
+    """
+    containers = workload.spec.template.spec.containers or []
+    index = next((i for i, c in enumerate(containers) if c.name == container), None)
+    if index is None:
+        raise ValueError(f"container {container!r} not found in {workload.metadata.name}")
+    base = f"/spec/template/spec/containers/{index}"
+    ops: List[Dict] = [{"op": "test", "path": f"{base}/name", "value": container}]
+    if old is not None:
+        pointer = f"{base}/{'/'.join(path)}"
+        ops.append({"op": "test", "path": pointer, "value": old})
+        ops.append({"op": "replace", "path": pointer, "value": new})
+        return ops
+
+    if workload.metadata.resource_version:
+        ops.insert(0, {"op": "test", "path": "/metadata/resourceVersion",
+                       "value": workload.metadata.resource_version})
+    node, depth = containers[index], 0
+    while depth < len(path) - 1 and _member(node, path[depth]) is not None:
+        node = _member(node, path[depth])
+        depth += 1
+    value = new
+    for key in reversed(path[depth + 1:]):
+        value = {key: value}
+    ops.append({"op": "add", "path": f"{base}/{'/'.join(path[:depth + 1])}", "value": value})
+    return ops
+
+
+def _merge(into: Dict, other: Dict) -> None:
+    for key, value in other.items():
+        if isinstance(value, dict) and isinstance(into.get(key), dict):
+            _merge(into[key], value)
+        else:
+            into[key] = value
+
+
+@dataclass(frozen=True)
+class TemplateChange:
+    """Set one field of one container in a workload's pod template."""
+
+    container: str
+    # camelCase path under the container, e.g. ("resources", "limits", "memory")
+    path: Tuple[str, ...]
+    # Value in the object the change was computed from; None if the field was unset
+    old: object
+    new: object
+    action: str
+    kubectl_equivalent: str
+    # Human-readable change, e.g. "container app memory limit 256Mi -> 512Mi"
+    summary: str
+
+    @property
+    def field(self) -> str:
+        return f"spec.template.spec.containers[{self.container}].{'.'.join(self.path)}"
+
+
+@dataclass
+class WorkloadPlan:
+    """Every change planned for one workload, and the pods that asked for them."""
+
+    kind: str
+    namespace: str
+    name: str
+    # The object the changes were computed from
+    workload: object = field(default=None, repr=False)
+    changes: Dict[Tuple[str, Tuple[str, ...]], TemplateChange] = field(default_factory=dict)
+    sources: Set[str] = field(default_factory=set)
+
+    @property
+    def ref(self) -> str:
+        return f"{self.namespace}/{self.name}"
+
+    @property
+    def resource(self) -> str:
+        return f"{self.kind.lower()}/{self.ref}"
+
+    @property
+    def api_call(self) -> str:
+        api, method = PATCH_METHODS[self.kind]
+        return f"{_API_CLASSES.get(api, api)}.{method}"
+
+    def patch(self) -> List[Dict]:
+        """JSON patch with only the changed container fields, each guarded by a test.
+
+        Untouched containers and fields keep whatever the live object has;
+        a changed field that no longer holds its `old` value fails the patch.
+        """
+        ops: List[Dict] = []
+        adds: Dict[str, Dict] = {}
+        for change in self.changes.values():
+            for op in json_patch_ops(self.workload, change.container, change.path, change.old, change.new):
+                if op["op"] == "add" and op["path"] in adds:
+                    # Two unset fields under the same missing parent: add it once with both
+                    _merge(adds[op["path"]]["value"], op["value"])
+                elif op not in ops:
+                    ops.append(op)
+                    if op["op"] == "add":
+                        adds[op["path"]] = op
+        return ops
+
+
+class RemediationPlan:
+    """Proposed workload changes, grouped so each workload is patched once."""
+
+    def __init__(self):
+        self._workloads: Dict[Tuple[str, str, str], WorkloadPlan] = {}
+
+    def propose(self, kind: str, workload, change: TemplateChange, source: Optional[str] = None) -> bool:
+        """Add `change` for `workload`; False if that field is already planned.
+
+        The first proposal for a (container, field) wins, so a change that
+        many pods ask for is applied once and never compounded.
+        """
+        if kind not in PATCH_METHODS:
+            raise ValueError(f"cannot patch workload kind {kind!r}")
+        key = (kind, workload.metadata.namespace, workload.metadata.name)
+        plan = self._workloads.get(key)
+        if plan is None:
+            plan = self._workloads[key] = WorkloadPlan(*key, workload=workload)
+        if source:
+            plan.sources.add(source)
+        change_key = (change.container, change.path)
+        if change_key in plan.changes:
+            return False
+        plan.changes[change_key] = change
+        return True
+
+    def __iter__(self) -> Iterator[WorkloadPlan]:
+        return iter(self._workloads.values())
+
+    def __len__(self) -> int:
+        return len(self._workloads)
+
+
+def patch_workload(k8s, plan: WorkloadPlan):
+    """Send `plan`'s merged JSON patch: one API write, one rollout."""
+    api, method = PATCH_METHODS[plan.kind]
+    return getattr(getattr(k8s, api), method)(plan.name, plan.namespace, plan.patch())
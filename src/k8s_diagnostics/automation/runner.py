@@ -0,0 +1,113 @@
+"""Concurrent detector execution for detect_common_issues().
+
+Most detectors are independent list calls against the API server (HPAs,
+Jobs, TLS secrets, Argo CD/Flux CRDs, provider checks). Run one after
+another, a scan takes as long as all of them combined. DetectorRunner runs
+them on a bounded pool instead, so a scan takes about as long as its slowest
+detector. Every detector has its own deadline. A detector that raises or
+misses its deadline is recorded in its DetectorOutcome and does not affect
+the others.
+"""
+
+import asyncio
+import inspect
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from ..core.executor import BlockingExecutor, run_coroutine_sync
+
+OK = "ok"
+TIMEOUT = "timeout"
+ERROR = "error"
+
+
+@dataclass(frozen=True)
+class DetectorOutcome:
+    name: str
+    status: str
+    duration_seconds: float
+    result: Any = None
+    error: Optional[str] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.status == OK
+
+
+def _call(func: Callable[[], Any]) -> Any:
+    result = func()
+    if inspect.isawaitable(result):
+        result = run_coroutine_sync(result)
+    return result
+
+
+class DetectorRunner:
+    """Runs named detector callables concurrently, each with its own deadline.
+
+    Detectors are zero-argument callables. They may return a coroutine that
+    makes blocking calls (e.g. a bound `async def`), and either way they run
+    on worker threads. As with BlockingExecutor, the deadline covers time
+    spent queued for a worker, and a timed-out detector is abandoned rather
+    than interrupted.
+    """
+
+    def __init__(self, max_workers: int = 8, timeout_seconds: Optional[float] = 30.0):
+        self.max_workers = max_workers
+        self.timeout_seconds = timeout_seconds
+
+    async def run(
+        self,
+        detectors: Sequence[Tuple[str, Callable[[], Any]]],
+        timeouts: Optional[Dict[str, Optional[float]]] = None,
+    ) -> Dict[str, DetectorOutcome]:
+        """Run every detector; return outcomes keyed by name, in the order given."""
+        timeouts = timeouts or {}
+        executor = BlockingExecutor(
+            max_workers=max(1, min(self.max_workers, len(detectors))),
+            timeout_seconds=self.timeout_seconds,
+            name="k8s-detector",
+        )
+        try:
+            outcomes = await asyncio.gather(*(
+                self._run_one(executor, name, func, timeouts.get(name, self.timeout_seconds))
+                for name, func in detectors
+            ))
+        finally:
+            executor.shutdown()
+        return {outcome.name: outcome for outcome in outcomes}
+
+    async def _run_one(
+        self, executor: BlockingExecutor, name: str, func: Callable, timeout: Optional[float]
+    ) -> DetectorOutcome:
+        started = time.monotonic()
+        try:
+            result = await executor.run(_call, func, timeout=timeout)
+        except asyncio.TimeoutError:
+            return DetectorOutcome(
+                name, TIMEOUT, time.monotonic() - started, error=f"timed out after {timeout}s"
+            )
+        except Exception as e:
+            return DetectorOutcome(name, ERROR, time.monotonic() - started, error=str(e))
+        return DetectorOutcome(name, OK, time.monotonic() - started, result=result)
+
+    @staticmethod
+    def summary(outcomes: Dict[str, DetectorOutcome]) -> Dict:
+        """The `detectors` block of a detect_common_issues() response."""
+        timed_out: List[str] = []
+        failed: List[Dict] = []
+        for outcome in outcomes.values():
+            if outcome.status == TIMEOUT:
+                timed_out.append(outcome.name)
+            elif outcome.status == ERROR:
+                failed.append({"detector": outcome.name, "error": outcome.error})
+        slowest = max(outcomes.values(), key=lambda o: o.duration_seconds, default=None)
+        return {
+            "ran": len(outcomes),
+            "timed_out": timed_out,
+            "failed": failed,
+            "slowest": slowest.name if slowest else None,
+            "durations_seconds": {
+                name: round(outcome.duration_seconds, 3) for name, outcome in outcomes.items()
+            },
+        }
@@ -0,0 +1,358 @@
+"""Node feasibility index for scheduling analysis.
+
+Explaining why a Pending pod cannot be scheduled compares it against every
+node: nodeSelector labels, NoSchedule/NoExecute taints, and requests vs.
+allocatable. Done naively, that re-lists and re-parses every node for every
+pod, which is quadratic during a scale-up storm. NodeIndex does the per-node
+work once per snapshot:
+
+* allocatable CPU/memory are parsed into arrays (NumPy when installed, so
+  the resource check is one vectorized comparison over all nodes). Without
+  NumPy, each resource's nodes are sorted by free capacity. A pod's fit is
+  then one bisect per resource plus an AND of precomputed bitsets;
+* node labels are inverted into (key, value) -> node bitset;
+* each distinct blocking taint maps to the bitset of nodes carrying it, so a
+  pod's tolerations are checked once per distinct taint, not once per node.
+
+Given a RequestLedger (requests already committed to each node, aggregated
+from the pod list in one pass), resource fit is judged against remaining
+CPU, memory, pod slots and ephemeral storage rather than total allocatable.
+
+Node sets are Python ints used as bitsets (bit i = i-th node), which keeps
+the selector and taint checks to a handful of AND/OR operations per pod.
+"""
+
+import math
+from bisect import bisect_left
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # optional: pip install numpy
+    np = None
+
+_BLOCKING_EFFECTS = ("NoSchedule", "NoExecute")
+# Pods in these phases no longer hold their node's resources
+_TERMINAL_PHASES = ("Succeeded", "Failed")
+
+# (cpu millicores, memory bytes, ephemeral-storage bytes)
+Requests = Tuple[float, float, float]
+
+_MEMORY_SUFFIXES = {
+    "Ki": 1024, "Mi": 1024**2, "Gi": 1024**3, "Ti": 1024**4,
+    "k": 1000,  "M": 1000**2,  "G": 1000**3,  "T": 1000**4,
+}
+
+
+def parse_cpu_millis(qty) -> float:
+    """Parse a Kubernetes CPU quantity string to millicores."""
+    if not qty:
+        return 0.0
+    s = str(qty)
+    try:
+        if s.endswith("m"):
+            return float(s[:-1])
+        elif s.endswith("n"):          # nanocores → millicores
+            return float(s[:-1]) / 1_000_000
+        else:
+            return float(s) * 1000    # whole cores → millicores
+    except (ValueError, TypeError):
+        return 0.0
+
+
+def parse_memory_bytes(qty) -> float:
+    """Parse a Kubernetes memory quantity string to bytes."""
+    if not qty:
+        return 0.0
+    s = str(qty)
+    try:
+        for suffix, mult in _MEMORY_SUFFIXES.items():
+            if s.endswith(suffix):
+                return float(s[: -len(suffix)]) * mult
+        return float(s)
+    except (ValueError, TypeError):
+        return 0.0
+
+
+def tolerates_taint(tolerations, taint) -> bool:
+    """Return True if at least one toleration matches the taint."""
+    for t in tolerations:
+        if t.operator == "Exists":
+            key_match = (not t.key) or (t.key == taint.key)
+            value_match = True
+        else:
+            key_match = t.key == taint.key
+            value_match = t.value == taint.value
+        effect_match = (not t.effect) or (t.effect == taint.effect)
+        if key_match and value_match and effect_match:
+            return True
+    return False
+
+
+def _container_requests(container) -> Requests:
+    reqs = (container.resources.requests if container.resources else None) or {}
+    return (
+        parse_cpu_millis(reqs.get("cpu")),
+        parse_memory_bytes(reqs.get("memory")),
+        parse_memory_bytes(reqs.get("ephemeral-storage")),
+    )
+
+
+def pod_requests(pod) -> Requests:
+    """Effective requests as the scheduler counts them.
+
+    The sum over app containers, raised to any single init container's
+    request (init containers run one at a time), plus the pod overhead.
+    """
+    total = [0.0, 0.0, 0.0]
+    for container in pod.spec.containers or []:
+        for i, value in enumerate(_container_requests(container)):
+            total[i] += value
+    for container in pod.spec.init_containers or []:
+        for i, value in enumerate(_container_requests(container)):
+            total[i] = max(total[i], value)
+    overhead = getattr(pod.spec, "overhead", None) or {}
+    total[0] += parse_cpu_millis(overhead.get("cpu"))
+    total[1] += parse_memory_bytes(overhead.get("memory"))
+    total[2] += parse_memory_bytes(overhead.get("ephemeral-storage"))
+    return total[0], total[1], total[2]
+
+
+class RequestLedger:
+    """Requests committed to each node: node name -> [cpu_m, memory, pods, ephemeral].
+
+    Built with one add() per pod, so it costs a single linear pass over the
+    pod list. Only pods bound to a node and not in a terminal phase count.
+    add() returns the pod's contribution so incremental callers can later
+    subtract exactly that with remove().
+    """
+
+    def __init__(self):
+        self.committed: Dict[str, List[float]] = {}
+
+    @classmethod
+    def from_pods(cls, pods: Iterable) -> "RequestLedger":
+        ledger = cls()
+        for pod in pods:
+            ledger.add(pod)
+        return ledger
+
+    def add(self, pod) -> Optional[Tuple[str, Requests]]:
+        node_name = pod.spec.node_name if pod.spec else None
+        if not node_name or pod.status.phase in _TERMINAL_PHASES:
+            return None
+        requests = pod_requests(pod)
+        self._apply(node_name, requests, 1)
+        return node_name, requests
+
+    def remove(self, contribution: Optional[Tuple[str, Requests]]) -> None:
+        if contribution is not None:
+            self._apply(contribution[0], contribution[1], -1)
+
+    def _apply(self, node_name: str, requests: Requests, sign: int) -> None:
+        entry = self.committed.setdefault(node_name, [0.0, 0.0, 0.0, 0.0])
+        entry[0] += sign * requests[0]
+        entry[1] += sign * requests[1]
+        entry[2] += sign
+        entry[3] += sign * requests[2]
+        if entry[2] <= 0:
+            del self.committed[node_name]
+
+    def copy(self) -> "RequestLedger":
+        ledger = RequestLedger()
+        ledger.committed = {name: list(entry) for name, entry in self.committed.items()}
+        return ledger
+
+    def get(self, node_name: str) -> List[float]:
+        return self.committed.get(node_name, [0.0, 0.0, 0.0, 0.0])
+
+
+def _bit_count(mask: int) -> int:
+    return bin(mask).count("1")
+
+
+def _bits(mask: int) -> Iterable[int]:
+    """Positions of set bits, lowest first."""
+    while mask:
+        low = mask & -mask
+        yield low.bit_length() - 1
+        mask ^= low
+
+
+@dataclass(frozen=True)
+class Feasibility:
+    """Node bitsets describing where one pod could go."""
+
+    selector: int    # nodes matching the pod's nodeSelector
+    untainted: int   # nodes without a blocking taint the pod does not tolerate
+    fits: int        # nodes whose remaining (or, without a ledger, allocatable) capacity covers the requests
+    cpu_req_m: float
+    mem_req_bytes: float
+    ephemeral_req_bytes: float = 0.0
+
+    @property
+    def feasible(self) -> int:
+        return self.selector & self.untainted & self.fits
+
+
+def _allocatable(node) -> List[float]:
+    """[cpu_m, memory, pods, ephemeral]; unreported pods/ephemeral are unlimited."""
+    alloc = node.status.allocatable or {}
+    pods = alloc.get("pods")
+    ephemeral = alloc.get("ephemeral-storage")
+    return [
+        parse_cpu_millis(alloc.get("cpu")),
+        parse_memory_bytes(alloc.get("memory")),
+        float(pods) if pods else math.inf,
+        parse_memory_bytes(ephemeral) if ephemeral else math.inf,
+    ]
+
+
+class NodeIndex:
+    """Per-node scheduling facts for one set of nodes, parsed once.
+
+    With a `ledger`, capacity checks use what is left after the requests
+    already committed to each node; without one, total allocatable.
+    """
+
+    def __init__(self, nodes: Iterable, ledger: Optional[RequestLedger] = None):
+        self.nodes = list(nodes)
+        self.names = [n.metadata.name for n in self.nodes]
+        self.all = (1 << len(self.nodes)) - 1
+        self.remaining = ledger is not None
+
+        # One row per node: [cpu_m, memory, pods, ephemeral]
+        alloc = [_allocatable(n) for n in self.nodes]
+        free = alloc
+        if ledger is not None:
+            free = [
+                [a - c for a, c in zip(row, ledger.get(name))]
+                for row, name in zip(alloc, self.names)
+            ]
+        if np is not None:
+            self.allocatable = np.asarray(alloc, dtype=float).reshape(len(alloc), 4)
+            self.free = np.asarray(free, dtype=float).reshape(len(free), 4)
+        else:
+            self.allocatable, self.free = alloc, free
+
+        # (cpu, memory, ephemeral) requests -> fitting() mask; pending pods of one
+        # workload share their requests, so a scheduling storm computes each once
+        self._fits: Dict[Tuple[float, float, float], int] = {}
+        # Per resource: free values ascending, and for each position the nodes
+        # with at least that value (built on first use without NumPy)
+        self._thresholds: Optional[List[Tuple[List[float], List[int]]]] = None
+        self._labels: Dict[Tuple[str, str], int] = {}
+        # (key, value, effect) -> (a taint object, nodes carrying it)
+        self._taints: Dict[Tuple, Tuple[object, int]] = {}
+        # per node, its blocking taints in spec order (for examples)
+        self._node_taints: List[List[object]] = []
+        for i, node in enumerate(self.nodes):
+            bit = 1 << i
+            for key, value in (node.metadata.labels or {}).items():
+                self._labels[(key, value)] = self._labels.get((key, value), 0) | bit
+            blocking = [t for t in (node.spec.taints or []) if t.effect in _BLOCKING_EFFECTS]
+            self._node_taints.append(blocking)
+            for taint in blocking:
+                taint_key = (taint.key, taint.value, taint.effect)
+                sample, carriers = self._taints.get(taint_key, (taint, 0))
+                self._taints[taint_key] = (sample, carriers | bit)
+
+    def __len__(self) -> int:
+        return len(self.nodes)
+
+    def matching_selector(self, selector: Optional[Dict[str, str]]) -> int:
+        mask = self.all
+        for item in (selector or {}).items():
+            mask &= self._labels.get(item, 0)
+        return mask
+
+    def untainted_for(self, tolerations) -> int:
+        """Nodes with no blocking taint outside `tolerations`."""
+        tolerations = tolerations or []
+        blocked = 0
+        for sample, carriers in self._taints.values():
+            if not tolerates_taint(tolerations, sample):
+                blocked |= carriers
+        return self.all & ~blocked
+
+    def fitting(self, cpu_req_m: float, mem_req_bytes: float, ephemeral_req_bytes: float = 0.0) -> int:
+        """Nodes with room for the requests and one more pod."""
+        key = (cpu_req_m, mem_req_bytes, ephemeral_req_bytes)
+        mask = self._fits.get(key)
+        if mask is not None:
+            return mask
+        demand = (cpu_req_m, mem_req_bytes, 1.0, ephemeral_req_bytes)
+        if np is not None and len(self.nodes):
+            fits = (self.free >= np.asarray(demand)).all(axis=1)
+            mask = int.from_bytes(np.packbits(fits, bitorder="little").tobytes(), "little")
+        else:
+            mask = self.all
+            for need, (values, at_least) in zip(demand, self._threshold_masks()):
+                mask &= at_least[bisect_left(values, need)]
+        self._fits[key] = mask
+        return mask
+
+    def _threshold_masks(self) -> List[Tuple[List[float], List[int]]]:
+        if self._thresholds is None:
+            self._thresholds = []
+            for column in range(4):
+                order = sorted(range(len(self.nodes)), key=lambda i: self.free[i][column])
+                at_least = [0] * (len(order) + 1)
+                for k in range(len(order) - 1, -1, -1):
+                    at_least[k] = at_least[k + 1] | 1 << order[k]
+                self._thresholds.append(([self.free[i][column] for i in order], at_least))
+        return self._thresholds
+
+    def feasibility(self, pod) -> Feasibility:
+        cpu_req_m, mem_req_bytes, ephemeral_req_bytes = pod_requests(pod)
+        return Feasibility(
+            selector=self.matching_selector(pod.spec.node_selector),
+            untainted=self.untainted_for(pod.spec.tolerations),
+            fits=self.fitting(cpu_req_m, mem_req_bytes, ephemeral_req_bytes),
+            cpu_req_m=cpu_req_m,
+            mem_req_bytes=mem_req_bytes,
+            ephemeral_req_bytes=ephemeral_req_bytes,
+        )
+
+    def taint_examples(self, tolerations, blocked: int, limit: int = 3) -> List[Dict]:
+        """First blocking taint of up to `limit` of the `blocked` nodes."""
+        tolerations = tolerations or []
+        examples = []
+        for i in _bits(blocked):
+            for taint in self._node_taints[i]:
+                if not tolerates_taint(tolerations, taint):
+                    examples.append({
+                        "node": self.names[i],
+                        "taint": f"{taint.key}={taint.value}:{taint.effect}",
+                    })
+                    break
+            if len(examples) >= limit:
+                break
+        return examples
+
+    def capacity_summary(self, fits: int) -> List[Dict]:
+        summaries = []
+        for i, name in enumerate(self.names):
+            alloc, free = self.allocatable[i], self.free[i]
+            summary = {
+                "node": name,
+                "allocatable_cpu_m": int(alloc[0]),
+                "allocatable_mem_mi": int(alloc[1] / (1024 * 1024)),
+            }
+            if self.remaining:
+                summary.update({
+                    "remaining_cpu_m": int(free[0]),
+                    "remaining_mem_mi": int(free[1] / (1024 * 1024)),
+                    "remaining_pods": None if math.isinf(free[2]) else int(free[2]),
+                    "remaining_ephemeral_mi": (
+                        None if math.isinf(free[3]) else int(free[3] / (1024 * 1024))
+                    ),
+                })
+            summary["fits_pod_request"] = bool(fits >> i & 1)
+            summaries.append(summary)
+        return summaries
+
+    @staticmethod
+    def count(mask: int) -> int:
+        return _bit_count(mask)
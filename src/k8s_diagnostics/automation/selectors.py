@@ -0,0 +1,226 @@
+"""Compiled label selectors and the indexes that answer selector queries.
+
+Matching selectors to labels used to be a nested loop at every call site:
+each pod against every Deployment or PodDisruptionBudget in its namespace,
+each Service against a Deployment read just for it. Two indexes turn those
+into set operations:
+
+* LabelIndex inverts objects' labels, per namespace, into
+  (key, value) -> names and key -> names. Selecting with a compiled Selector
+  intersects those sets, smallest first, and subtracts the NotIn and
+  DoesNotExist sets; no object is visited that cannot match.
+* SelectorIndex goes the other way, from one object's labels to the
+  selectors that select it. Each selector is filed under one of its
+  equality requirements, so a lookup only checks the selectors filed under
+  the labels the object actually has (plus the few with no equality
+  requirement at all).
+
+Selector compiles matchLabels and matchExpressions (In, NotIn, Exists,
+DoesNotExist) once, from a V1LabelSelector or a plain Service-style
+label map.
+"""
+
+from typing import Callable, Dict, Iterable, List, Mapping, Optional, Set, Tuple
+
+# (key, operator, values)
+Requirement = Tuple[str, str, frozenset]
+
+
+class Selector:
+    """A label selector compiled to a tuple of requirements, all of which must hold."""
+
+    __slots__ = ("requirements",)
+
+    def __init__(self, requirements: Iterable[Requirement] = ()):
+        self.requirements: Tuple[Requirement, ...] = tuple(requirements)
+
+    @classmethod
+    def compile(cls, selector) -> "Selector":
+        """Compile a V1LabelSelector, or a {key: value} map as Services use."""
+        if selector is None:
+            return cls()
+        if isinstance(selector, Mapping):
+            match_labels, expressions = selector, ()
+        else:
+            match_labels = getattr(selector, "match_labels", None) or {}
+            expressions = getattr(selector, "match_expressions", None) or ()
+        requirements = [
+            (key, "In", frozenset((value,))) for key, value in sorted(match_labels.items())
+        ]
+        for expression in expressions:
+            # An unknown operator is kept so matches() rejects every object,
+            # as the API server would refuse the selector outright
+            requirements.append((expression.key, expression.operator, frozenset(expression.values or ())))
+        return cls(requirements)
+
+    @property
+    def empty(self) -> bool:
+        return not self.requirements
+
+    def equalities(self) -> List[Tuple[str, str]]:
+        """(key, value) pairs every selected object must carry."""
+        return [
+            (key, next(iter(values)))
+            for key, operator, values in self.requirements
+            if operator == "In" and len(values) == 1
+        ]
+
+    def matches(self, labels: Optional[Mapping[str, str]]) -> bool:
+        labels = labels or {}
+        for key, operator, values in self.requirements:
+            if operator == "In":
+                ok = key in labels and labels[key] in values
+            elif operator == "NotIn":
+                ok = key not in labels or labels[key] not in values
+            elif operator == "Exists":
+                ok = key in labels
+            elif operator == "DoesNotExist":
+                ok = key not in labels
+            else:
+                ok = False
+            if not ok:
+                return False
+        return True
+
+    def __str__(self) -> str:
+        """kubectl -l syntax, e.g. 'app=web,tier in (api,web),!canary'."""
+        terms = []
+        for key, operator, values in self.requirements:
+            if operator == "In" and len(values) == 1:
+                terms.append(f"{key}={next(iter(values))}")
+            elif operator in ("In", "NotIn"):
+                terms.append(f"{key} {operator.lower()} ({','.join(sorted(values))})")
+            elif operator == "Exists":
+                terms.append(key)
+            elif operator == "DoesNotExist":
+                terms.append(f"!{key}")
+            else:
+                terms.append(f"{key} {operator} ({','.join(sorted(values))})")
+        return ",".join(terms)
+
+    def __repr__(self) -> str:
+        return f"Selector({str(self)!r})"
+
+
+def _metadata_labels(obj) -> Optional[Mapping[str, str]]:
+    return obj.metadata.labels
+
+
+def _spec_selector(obj):
+    return obj.spec.selector
+
+
+def pod_template_labels(workload) -> Optional[Mapping[str, str]]:
+    """Labels a Deployment/DaemonSet/StatefulSet stamps on its pods."""
+    template = workload.spec.template
+    return template.metadata.labels if template and template.metadata else None
+
+
+class LabelIndex:
+    """Objects per namespace, inverted by label, for selector -> objects queries."""
+
+    def __init__(
+        self,
+        objects: Iterable = (),
+        labels_of: Callable[[object], Optional[Mapping[str, str]]] = _metadata_labels,
+    ):
+        self._labels_of = labels_of
+        self._objects: Dict[str, Dict[str, object]] = {}
+        self._by_label: Dict[Tuple[str, str, str], Set[str]] = {}
+        self._by_key: Dict[Tuple[str, str], Set[str]] = {}
+        for obj in objects:
+            self.add(obj)
+
+    def add(self, obj) -> None:
+        namespace, name = obj.metadata.namespace or "", obj.metadata.name
+        self._objects.setdefault(namespace, {})[name] = obj
+        for key, value in (self._labels_of(obj) or {}).items():
+            self._by_label.setdefault((namespace, key, value), set()).add(name)
+            self._by_key.setdefault((namespace, key), set()).add(name)
+
+    def select(self, namespace: Optional[str], selector: Selector) -> List:
+        """Objects in `namespace` that `selector` selects (an empty selector selects all), by name."""
+        namespace = namespace or ""
+        objects = self._objects.get(namespace, {})
+        required: List[Set[str]] = []
+        excluded: List[Set[str]] = []
+        for key, operator, values in selector.requirements:
+            if operator in ("In", "NotIn"):
+                names = set().union(*(self._by_label.get((namespace, key, v), ()) for v in values))
+            elif operator in ("Exists", "DoesNotExist"):
+                names = self._by_key.get((namespace, key), set())
+            else:
+                return []
+            (required if operator in ("In", "Exists") else excluded).append(names)
+
+        if required:
+            required.sort(key=len)
+            names = set(required[0])
+            for other in required[1:]:
+                names &= other
+        else:
+            names = set(objects)
+        for other in excluded:
+            names -= other
+        return [objects[name] for name in sorted(names)]
+
+    def __len__(self) -> int:
+        return sum(len(objects) for objects in self._objects.values())
+
+
+class SelectorIndex:
+    """Objects that carry a label selector, for labels -> selecting objects queries.
+
+    Objects with an empty selector are left out: every caller here treats an
+    empty selector as "not set" rather than "select everything". With a
+    `loader`, each namespace's objects are listed the first time it is asked
+    about, so an index built once per pass costs one list per namespace.
+    """
+
+    def __init__(
+        self,
+        objects: Iterable = (),
+        selector_of: Callable[[object], object] = _spec_selector,
+        loader: Optional[Callable[[str], Iterable]] = None,
+    ):
+        self._selector_of = selector_of
+        self._loader = loader
+        self._loaded: Set[str] = set()
+        # (namespace, key, value) -> [(position, selector, object)]
+        self._by_label: Dict[Tuple[str, str, str], List[Tuple[int, Selector, object]]] = {}
+        # namespace -> entries with no equality requirement to file them under
+        self._unfiled: Dict[str, List[Tuple[int, Selector, object]]] = {}
+        self._count = 0
+        for obj in objects:
+            self.add(obj)
+
+    def add(self, obj, namespace: Optional[str] = None) -> None:
+        selector = Selector.compile(self._selector_of(obj))
+        if selector.empty:
+            return
+        namespace = namespace if namespace is not None else obj.metadata.namespace or ""
+        entry = (self._count, selector, obj)
+        self._count += 1
+        equalities = selector.equalities()
+        if equalities:
+            key, value = equalities[0]
+            self._by_label.setdefault((namespace, key, value), []).append(entry)
+        else:
+            self._unfiled.setdefault(namespace, []).append(entry)
+
+    def matching(self, namespace: Optional[str], labels: Optional[Mapping[str, str]]) -> List:
+        """Objects in `namespace` whose selector selects `labels`, in the order they were added."""
+        namespace = namespace or ""
+        if self._loader is not None and namespace not in self._loaded:
+            for obj in self._loader(namespace):
+                self.add(obj, namespace)
+            self._loaded.add(namespace)
+        labels = labels or {}
+        candidates = list(self._unfiled.get(namespace, ()))
+        for key, value in labels.items():
+            candidates.extend(self._by_label.get((namespace, key, value), ()))
+        candidates.sort(key=lambda entry: entry[0])
+        return [obj for _, selector, obj in candidates if selector.matches(labels)]
+
+    def __len__(self) -> int:
+        return self._count
@@ -0,0 +1,382 @@
+"""What-if capacity simulation: will the pods still fit after a change?
+
+Answers questions like "will draining node-7 succeed?" or "is there room to
+scale web to 40 replicas if we add three more nodes like node-2?" before
+anyone touches the cluster. A Scenario combines any of:
+
+* add N nodes of a shape (copied from an existing node and/or given
+  cpu/memory/pods/ephemeral-storage);
+* drain nodes: cordon them and evict their controller-managed pods;
+* scale deployments to a replica count.
+
+The pod list is reduced in one pass to a per-node RequestLedger plus compact
+records for the few pods that must be (re)placed: Pending pods, pods evicted
+by a drain, and new replicas. Those are packed first-fit-decreasing (largest
+dominant resource share first) onto the nodes' remaining capacity, using the
+NodeIndex feasibility masks for nodeSelector/taints and the same fit rule
+as scheduling analysis. The packer runs twice, on the current cluster and on
+the changed one, and the report lists the pods whose outcome differs.
+
+It is a static model: it ignores affinity/anti-affinity, topology spread,
+PodDisruptionBudgets, volume topology and preemption, and matches a
+pod to the first scaled deployment whose selector selects it.
+"""
+
+from dataclasses import dataclass, field
+from types import SimpleNamespace
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from kubernetes.client import V1Node, V1NodeSpec, V1NodeStatus, V1ObjectMeta
+from kubernetes.client.rest import ApiException
+
+from ..core.snapshot import ClusterSnapshot, snapshot_items, snapshot_pages
+from .scheduling import NodeIndex, RequestLedger, Requests, np, pod_requests
+from .selectors import SelectorIndex
+
+_TERMINAL_PHASES = ("Succeeded", "Failed")
+_SHAPE_KEYS = ("cpu", "memory", "pods", "ephemeral-storage")
+_MIRROR_ANNOTATION = "kubernetes.io/config.mirror"
+
+
+@dataclass(frozen=True)
+class NodeShape:
+    count: int
+    like: Optional[str] = None
+    # allocatable overrides, Kubernetes quantities keyed as in node.status.allocatable
+    allocatable: Dict[str, str] = field(default_factory=dict)
+
+
+@dataclass(frozen=True)
+class Scenario:
+    add_nodes: Tuple[NodeShape, ...] = ()
+    drain: Tuple[str, ...] = ()
+    # (namespace, deployment) -> replicas
+    scale: Dict[Tuple[str, str], int] = field(default_factory=dict)
+
+    @classmethod
+    def parse(
+        cls,
+        add_nodes: Iterable[str] = (),
+        drain: Optional[str] = None,
+        scale: Iterable[str] = (),
+    ) -> "Scenario":
+        """Build a scenario from CLI/query strings; raises ValueError on bad input.
+
+        add_nodes: "3:like=node-a", "2:cpu=8,memory=32Gi,pods=110" (combinable)
+        drain:     "node-a,node-b"
+        scale:     "namespace/deployment=replicas"
+        """
+        shapes = []
+        for spec in add_nodes:
+            count, _, fields = spec.partition(":")
+            try:
+                count = int(count)
+            except ValueError:
+                raise ValueError(f"add-nodes '{spec}': expected <count>:<key>=<value>,...")
+            like, allocatable = None, {}
+            for item in filter(None, (part.strip() for part in fields.split(","))):
+                key, sep, value = item.partition("=")
+                if not sep or not value:
+                    raise ValueError(f"add-nodes '{spec}': expected <key>=<value>, got '{item}'")
+                if key == "like":
+                    like = value
+                elif key in _SHAPE_KEYS:
+                    allocatable[key] = value
+                else:
+                    raise ValueError(
+                        f"add-nodes '{spec}': unknown key '{key}' "
+                        f"(expected like, {', '.join(_SHAPE_KEYS)})"
+                    )
+            if count < 1 or not (like or allocatable):
+                raise ValueError(f"add-nodes '{spec}': need a positive count and a shape")
+            shapes.append(NodeShape(count, like, allocatable))
+
+        targets: Dict[Tuple[str, str], int] = {}
+        for spec in scale:
+            workload, sep, replicas = spec.partition("=")
+            namespace, slash, name = workload.partition("/")
+            try:
+                replicas = int(replicas)
+            except ValueError:
+                replicas = -1
+            if not sep or not slash or not namespace or not name or replicas < 0:
+                raise ValueError(f"scale '{spec}': expected <namespace>/<deployment>=<replicas>")
+            targets[(namespace, name)] = replicas
+
+        drained = tuple(name.strip() for name in (drain or "").split(",") if name.strip())
+        return cls(add_nodes=tuple(shapes), drain=drained, scale=targets)
+
+
+@dataclass(frozen=True)
+class _Workload:
+    """A pod to place: what it needs and where it may go."""
+
+    ref: str
+    requests: Requests
+    node_selector: Optional[Dict[str, str]]
+    tolerations: Tuple
+    # "pending", "evicted" or "new"
+    origin: str
+
+    @property
+    def constraint_key(self) -> Tuple:
+        return (
+            tuple(sorted((self.node_selector or {}).items())),
+            tuple((t.key, t.operator, t.value, t.effect) for t in self.tolerations),
+        )
+
+
+def _workload(pod, origin: str, ref: Optional[str] = None) -> _Workload:
+    return _Workload(
+        ref=ref or f"{pod.metadata.namespace}/{pod.metadata.name}",
+        requests=pod_requests(pod),
+        node_selector=pod.spec.node_selector,
+        tolerations=tuple(pod.spec.tolerations or ()),
+        origin=origin,
+    )
+
+
+def _controller_kind(pod) -> Optional[str]:
+    for ref in pod.metadata.owner_references or []:
+        if ref.controller:
+            return ref.kind
+    return None
+
+
+def synthetic_nodes(shapes: Sequence[NodeShape], nodes: Sequence) -> List:
+    """V1Node objects for the hypothetical nodes of `shapes`."""
+    by_name = {n.metadata.name: n for n in nodes}
+    created = []
+    for shape_number, shape in enumerate(shapes):
+        template = by_name.get(shape.like) if shape.like else None
+        if shape.like and template is None:
+            raise ValueError(f"add-nodes: no node named '{shape.like}' to copy")
+        for i in range(shape.count):
+            name = f"simulated-{shape.like or 'node'}-{shape_number}-{i}"
+            labels = dict(template.metadata.labels or {}) if template else {}
+            if "kubernetes.io/hostname" in labels:
+                labels["kubernetes.io/hostname"] = name
+            allocatable = dict(template.status.allocatable or {}) if template else {}
+            allocatable.update(shape.allocatable)
+            created.append(V1Node(
+                metadata=V1ObjectMeta(name=name, labels=labels),
+                spec=V1NodeSpec(taints=list(template.spec.taints or []) if template else None),
+                status=V1NodeStatus(allocatable=allocatable),
+            ))
+    return created
+
+
+class _Packer:
+    """First-fit-decreasing placement onto a NodeIndex's remaining capacity."""
+
+    def __init__(self, index: NodeIndex, usable: int):
+        self.index = index
+        self.usable = usable
+        self._masks: Dict[Tuple, object] = {}
+        alloc = index.allocatable
+        # Normalise by the mean node so CPU and memory shares are comparable
+        count = max(len(index), 1)
+        self._scale = (
+            max(sum(row[0] for row in alloc) / count, 1.0),
+            max(sum(row[1] for row in alloc) / count, 1.0),
+        )
+
+    def _allowed(self, workload: _Workload):
+        key = workload.constraint_key
+        if key not in self._masks:
+            mask = (
+                self.index.matching_selector(workload.node_selector)
+                & self.index.untainted_for(workload.tolerations)
+                & self.usable
+            )
+            if np is not None:
+                size = len(self.index)
+                raw = np.frombuffer(mask.to_bytes((size + 7) // 8 or 1, "little"), dtype=np.uint8)
+                mask = np.unpackbits(raw, bitorder="little")[:size].astype(bool)
+            self._masks[key] = mask
+        return self._masks[key]
+
+    def _size(self, workload: _Workload) -> float:
+        cpu, mem, _ = workload.requests
+        return max(cpu / self._scale[0], mem / self._scale[1])
+
+    def pack(self, workloads: Sequence[_Workload]) -> Dict[str, Optional[str]]:
+        """Pod ref -> node name (None when it fits nowhere)."""
+        free = np.array(self.index.free, copy=True) if np is not None else [
+            list(row) for row in self.index.free
+        ]
+        placements: Dict[str, Optional[str]] = {}
+        for workload in sorted(workloads, key=self._size, reverse=True):
+            cpu, mem, ephemeral = workload.requests
+            demand = (cpu, mem, 1.0, ephemeral)
+            allowed = self._allowed(workload)
+            node = None
+            if np is not None:
+                candidates = np.flatnonzero(allowed & (free >= np.asarray(demand)).all(axis=1))
+                if candidates.size:
+                    node = int(candidates[0])
+                    free[node] -= demand
+            else:
+                mask = allowed
+                while mask:
+                    low = mask & -mask
+                    i = low.bit_length() - 1
+                    if all(need <= have for need, have in zip(demand, free[i])):
+                        node = i
+                        free[i] = [have - need for have, need in zip(free[i], demand)]
+                        break
+                    mask ^= low
+            placements[workload.ref] = self.index.names[node] if node is not None else None
+        return placements
+
+
+def simulate(nodes: Sequence, pods: Iterable, scenario: Scenario, deployments: Optional[Dict] = None) -> Dict:
+    """Pack the cluster before and after `scenario` and report what changes.
+
+    `pods` may be any iterable (e.g. streamed pages); it is read once.
+    `deployments` maps (namespace, name) to the Deployment objects named in
+    `scenario.scale`.
+    """
+    nodes = list(nodes)
+    deployments = deployments or {}
+    drained = set(scenario.drain)
+    unknown = drained - {n.metadata.name for n in nodes}
+    if unknown:
+        raise ValueError(f"drain: unknown node(s): {', '.join(sorted(unknown))}")
+    missing = set(scenario.scale) - set(deployments)
+    if missing:
+        raise ValueError(
+            "scale: unknown deployment(s): " + ", ".join(f"{ns}/{name}" for ns, name in sorted(missing))
+        )
+    selectors = SelectorIndex()
+    for (namespace, _), deployment in deployments.items():
+        selectors.add(deployment, namespace)
+    keys = {id(deployment): key for key, deployment in deployments.items()}
+
+    ledger = RequestLedger()
+    pending: List[Tuple[object, _Workload]] = []
+    evicted: List[_Workload] = []
+    drain_removed: List[Tuple] = []        # ledger contributions leaving with drained nodes
+    unmanaged: List[str] = []
+    daemon_pods = 0
+    # deployment -> ledger contributions of its bound pods (scale-down candidates)
+    replicas: Dict[Tuple[str, str], List[Tuple]] = {key: [] for key in deployments}
+
+    for pod in pods:
+        if pod.status.phase in _TERMINAL_PHASES or pod.metadata.deletion_timestamp:
+            continue
+        owners = selectors.matching(pod.metadata.namespace, pod.metadata.labels)
+        owner_deployment = keys[id(owners[0])] if owners else None
+        if not pod.spec.node_name:
+            pending.append((owner_deployment, _workload(pod, "pending")))
+            continue
+        contribution = ledger.add(pod)
+        if pod.spec.node_name in drained:
+            drain_removed.append(contribution)
+            kind = _controller_kind(pod)
+            if kind == "DaemonSet" or _MIRROR_ANNOTATION in (pod.metadata.annotations or {}):
+                daemon_pods += 1
+            elif kind is None:
+                unmanaged.append(f"{pod.metadata.namespace}/{pod.metadata.name}")
+            else:
+                evicted.append(_workload(pod, "evicted"))
+        elif owner_deployment is not None:
+            replicas[owner_deployment].append(contribution)
+
+    # Before: today's nodes and pods; only Pending pods need a place
+    before_index = NodeIndex(nodes, ledger)
+    usable = sum(1 << i for i, n in enumerate(nodes) if not n.spec.unschedulable)
+    before = _Packer(before_index, usable).pack([w for _, w in pending])
+
+    # After: scale, drain, add nodes, then place everything that needs a node
+    after_ledger = ledger.copy()
+    for contribution in drain_removed:
+        after_ledger.remove(contribution)
+    scale_report: Dict[str, Dict] = {}
+    new_replicas: List[_Workload] = []
+    for key, target in scenario.scale.items():
+        deployment = deployments[key]
+        current = deployment.spec.replicas or 0
+        ref = f"{key[0]}/{key[1]}"
+        scale_report[ref] = {"from": current, "to": target}
+        if target > current:
+            template_pod = SimpleNamespace(spec=deployment.spec.template.spec)
+            new_replicas.extend(
+                _workload(template_pod, "new", ref=f"{ref} (new replica {i + 1})")
+                for i in range(target - current)
+            )
+        else:
+            # The ReplicaSet controller removes unscheduled pods first
+            surplus = current - target
+            kept_pending = []
+            for owner, workload in pending:
+                if owner == key and surplus:
+                    surplus -= 1
+                else:
+                    kept_pending.append((owner, workload))
+            pending = kept_pending
+            for contribution in replicas[key][:surplus]:
+                after_ledger.remove(contribution)
+
+    all_nodes = nodes + synthetic_nodes(scenario.add_nodes, nodes)
+    after_usable = sum(
+        1 << i for i, n in enumerate(all_nodes)
+        if not n.spec.unschedulable and n.metadata.name not in drained
+    )
+    after_index = NodeIndex(all_nodes, after_ledger)
+    to_place = [w for _, w in pending] + evicted + new_replicas
+    after = _Packer(after_index, after_usable).pack(to_place)
+
+    became_schedulable = sorted(ref for ref, node in after.items() if node and before.get(ref, "") is None)
+    became_unschedulable = sorted(
+        ref for ref, node in after.items() if node is None and before.get(ref, "placed") is not None
+    )
+    still_unschedulable = sorted(ref for ref, node in after.items() if node is None and before.get(ref, "") is None)
+    stranded = sorted(w.ref for w in evicted if after[w.ref] is None)
+    for ref, report in scale_report.items():
+        report["unschedulable_new_replicas"] = sum(
+            1 for w in new_replicas if w.ref.startswith(ref + " ") and after[w.ref] is None
+        )
+
+    return {
+        "scenario": {
+            "add_nodes": sum(shape.count for shape in scenario.add_nodes),
+            "drain": sorted(drained),
+            "scale": {f"{ns}/{name}": replicas for (ns, name), replicas in scenario.scale.items()},
+        },
+        "nodes": {"before": len(nodes), "after": len(all_nodes) - len(drained)},
+        "pods_to_place": len(to_place),
+        "placed": sum(1 for node in after.values() if node),
+        "became_schedulable": became_schedulable,
+        "became_unschedulable": became_unschedulable,
+        "still_unschedulable": still_unschedulable,
+        "drain": {
+            "nodes": sorted(drained),
+            "evicted": len(evicted),
+            "rescheduled": {w.ref: after[w.ref] for w in evicted if after[w.ref]},
+            "stranded": stranded,
+            # no controller: kubectl drain refuses without --force, which deletes them for good
+            "unmanaged_pods": sorted(unmanaged),
+            "daemonset_or_mirror_pods": daemon_pods,
+            "would_succeed": not stranded and not unmanaged,
+        } if drained else None,
+        "scale": scale_report,
+        "model": (
+            "first-fit-decreasing on remaining requests; ignores affinity, topology spread, "
+            "PodDisruptionBudgets, volume topology and preemption"
+        ),
+    }
+
+
+def run_scenario(k8s, scenario: Scenario, snapshot: Optional[ClusterSnapshot] = None) -> Dict:
+    """Read nodes, pods and the scaled deployments, then simulate()."""
+    deployments = {}
+    for namespace, name in scenario.scale:
+        try:
+            deployments[(namespace, name)] = k8s.apps_v1.read_namespaced_deployment(name, namespace)
+        except ApiException as e:
+            if e.status != 404:
+                raise
+            # left out: simulate() rejects the scenario with a ValueError
+    pods = (pod for page in snapshot_pages(k8s, snapshot, "pods") for pod in page)
+    return simulate(snapshot_items(k8s, snapshot, "nodes"), pods, scenario, deployments)
@@ -1,7 +1,277 @@
 from kubernetes import client, config
 from kubernetes.config.config_exception import ConfigException
-from typing import Dict, List, Optional
+from typing import Dict, FrozenSet, Iterable, Iterator, List, Optional, Tuple
 import json
+import re
+
+from .informer import InformerCache
+from .views import parse_list
+
+# kind -> (K8sClient API attribute, all-namespaces list method, namespaced list method)
+RESOURCE_KINDS: Dict[str, tuple] = {
+    "pods": ("v1", "list_pod_for_all_namespaces", "list_namespaced_pod"),
+    "nodes": ("v1", "list_node", None),
+    "services": ("v1", "list_service_for_all_namespaces", "list_namespaced_service"),
+    "endpoints": ("v1", "list_endpoints_for_all_namespaces", "list_namespaced_endpoints"),
+    "events": ("v1", "list_event_for_all_namespaces", "list_namespaced_event"),
+    "configmaps": ("v1", "list_config_map_for_all_namespaces", "list_namespaced_config_map"),
+    "secrets": ("v1", "list_secret_for_all_namespaces", "list_namespaced_secret"),
+    "pvcs": (
+        "v1",
+        "list_persistent_volume_claim_for_all_namespaces",
+        "list_namespaced_persistent_volume_claim",
+    ),
+    "persistentvolumes": ("v1", "list_persistent_volume", None),
+    "deployments": ("apps_v1", "list_deployment_for_all_namespaces", "list_namespaced_deployment"),
+    "replicasets": ("apps_v1", "list_replica_set_for_all_namespaces", "list_namespaced_replica_set"),
+    "statefulsets": ("apps_v1", "list_stateful_set_for_all_namespaces", "list_namespaced_stateful_set"),
+    "daemonsets": ("apps_v1", "list_daemon_set_for_all_namespaces", "list_namespaced_daemon_set"),
+    "jobs": ("batch_v1", "list_job_for_all_namespaces", "list_namespaced_job"),
+    "cronjobs": ("batch_v1", "list_cron_job_for_all_namespaces", "list_namespaced_cron_job"),
+    "hpas": (
+        "autoscaling_v2",
+        "list_horizontal_pod_autoscaler_for_all_namespaces",
+        "list_namespaced_horizontal_pod_autoscaler",
+    ),
+    "ingresses": ("networking_v1", "list_ingress_for_all_namespaces", "list_namespaced_ingress"),
+    "networkpolicies": (
+        "networking_v1",
+        "list_network_policy_for_all_namespaces",
+        "list_namespaced_network_policy",
+    ),
+}
+
+# kind -> (API path prefix, resource plural) for metadata-only list requests
+METADATA_PATHS: Dict[str, tuple] = {
+    "pods": ("/api/v1", "pods"),
+    "services": ("/api/v1", "services"),
+    "configmaps": ("/api/v1", "configmaps"),
+    "secrets": ("/api/v1", "secrets"),
+    "serviceaccounts": ("/api/v1", "serviceaccounts"),
+    "pvcs": ("/api/v1", "persistentvolumeclaims"),
+    "deployments": ("/apis/apps/v1", "deployments"),
+}
+
+# Asks the API server for PartialObjectMetadataList: each item carries only
+# apiVersion/kind/metadata, never spec, status or (for Secrets) data.
+METADATA_ACCEPT = "application/json;as=PartialObjectMetadataList;g=meta.k8s.io;v=v1"
+
+# Kinds the long-running API server keeps in informer stores by default.
+DEFAULT_INFORMER_KINDS = (
+    "pods", "nodes", "services", "endpoints", "events", "pvcs",
+    "deployments", "jobs", "daemonsets", "hpas",
+)
+
+# Kinds read through the raw-JSON fast path once enable_raw_json() is called.
+# Only kinds that callers never modify and send back to the API belong here:
+# views are read-only, so e.g. deployments (patched in place by fixers) stay
+# on the model path.
+RAW_JSON_KINDS = ("pods", "events", "nodes")
+
+# Objects per list call when paginating with limit/continue.
+DEFAULT_PAGE_SIZE = 500
+
+_SELECTOR_TERM = re.compile(r"^(!?)([^=!]+?)\s*(?:(==|=|!=)\s*(.*))?$")
+
+
+def _snake_case(segment: str) -> str:
+    return re.sub(r"(?<!^)(?=[A-Z])", "_", segment).lower()
+
+
+def _field_value(obj, path: str):
+    value = obj
+    for segment in path.split("."):
+        value = getattr(value, _snake_case(segment), None)
+        if value is None:
+            return None
+    return value
+
+
+def _selector_terms(selector: str) -> List[tuple]:
+    """Parse a comma-separated equality selector into (negate, key, op, value) terms.
+
+    Set-based syntax ("env in (a,b)") is not evaluated locally; it raises
+    ValueError so callers fall back to a server-side list.
+    """
+    terms = []
+    for raw in selector.split(","):
+        raw = raw.strip()
+        if not raw:
+            continue
+        if "(" in raw:
+            raise ValueError(f"unsupported selector term: {raw}")
+        m = _SELECTOR_TERM.match(raw)
+        if not m:
+            raise ValueError(f"unsupported selector term: {raw}")
+        negate, key, op, value = m.groups()
+        terms.append((bool(negate), key.strip(), op, (value or "").strip()))
+    return terms
+
+
+def _term_matches(actual, negate: bool, op: Optional[str], value: str) -> bool:
+    if op is None:
+        present = actual is not None
+        return not present if negate else present
+    if actual is None:
+        return op == "!="
+    matched = str(actual) == value
+    return not matched if op == "!=" else matched
+
+
+def involved_object_key(event) -> Tuple[str, str, str]:
+    """(kind, namespace, name) of the object an Event is about."""
+    involved = event.involved_object
+    return (involved.kind or "", involved.namespace or "", involved.name or "")
+
+
+# kind -> {index name: key function} maintained by the informers
+INFORMER_INDEXERS: Dict[str, Dict] = {
+    "events": {"involved_object": involved_object_key},
+}
+
+
+def filter_by_selectors(
+    items: Iterable, field_selector: Optional[str] = None, label_selector: Optional[str] = None
+) -> List:
+    """Apply Kubernetes-style field/label selectors to already-fetched objects."""
+    field_terms = _selector_terms(field_selector) if field_selector else []
+    label_terms = _selector_terms(label_selector) if label_selector else []
+    matched = []
+    for obj in items:
+        if not all(
+            _term_matches(_field_value(obj, key), negate, op, value)
+            for negate, key, op, value in field_terms
+        ):
+            continue
+        labels = (obj.metadata.labels or {}) if label_terms else {}
+        if not all(
+            _term_matches(labels.get(key), negate, op, value)
+            for negate, key, op, value in label_terms
+        ):
+            continue
+        matched.append(obj)
+    return matched
+
+
+def _list_call(k8s, kind: str, namespace: Optional[str]) -> Tuple:
+    api_attr, all_namespaces_method, namespaced_method = RESOURCE_KINDS[kind]
+    api = getattr(k8s, api_attr)
+    if namespace is not None and namespaced_method:
+        return getattr(api, namespaced_method), (namespace,)
+    return getattr(api, all_namespaces_method), ()
+
+
+def _fetch_page(k8s, kind: str, list_func, args: tuple, kwargs: Dict) -> Tuple:
+    """Call a typed list method; return (items, list metadata).
+
+    For kinds in k8s.raw_json_kinds the body is fetched undecoded and parsed
+    into read-only ObjectViews, skipping the client's model deserialization.
+    """
+    raw_kinds = getattr(k8s, "raw_json_kinds", None)
+    if isinstance(raw_kinds, frozenset) and kind in raw_kinds:
+        response = list_func(*args, _preload_content=False, **kwargs)
+        return parse_list(response.data)
+    response = list_func(*args, **kwargs)
+    return response.items, response.metadata
+
+
+def list_items(k8s, kind: str, namespace: Optional[str] = None, **selectors) -> List:
+    """List every object of `kind`, reading the informer store when one has synced.
+
+    Falls back to the typed list call (e.g. CoreV1Api.list_pod_for_all_namespaces)
+    when the client has no informer for the kind, so callers behave the same
+    whether or not informers are running.
+    """
+    selectors = {key: value for key, value in selectors.items() if value}
+    informers = getattr(k8s, "informers", None)
+    if isinstance(informers, InformerCache):
+        cached = informers.items(kind)
+        if cached is not None:
+            if namespace is not None:
+                cached = [obj for obj in cached if obj.metadata.namespace == namespace]
+            try:
+                return filter_by_selectors(cached, **selectors)
+            except ValueError:
+                pass
+
+    list_func, args = _list_call(k8s, kind, namespace)
+    items, _ = _fetch_page(k8s, kind, list_func, args, selectors)
+    return items
+
+
+def list_metadata(
+    k8s, kind: str, namespace: Optional[str] = None, page_size: int = DEFAULT_PAGE_SIZE, **selectors
+) -> List:
+    """List only the metadata of `kind` (name, namespace, labels, ...) as read-only views.
+
+    Meant for existence checks: the response omits object bodies, so listing
+    Secrets this way never pulls secret material into the process.
+    """
+    prefix, plural = METADATA_PATHS[kind]
+    path = f"{prefix}/namespaces/{namespace}/{plural}" if namespace else f"{prefix}/{plural}"
+    query = [
+        (_camel_query_param(key), value) for key, value in selectors.items() if value
+    ] + [("limit", page_size)]
+    api_client = k8s.v1.api_client
+
+    items: List = []
+    continue_token = None
+    while True:
+        params = query + ([("continue", continue_token)] if continue_token else [])
+        response = api_client.call_api(
+            path, "GET",
+            query_params=params,
+            header_params={"Accept": METADATA_ACCEPT},
+            auth_settings=["BearerToken"],
+            _return_http_data_only=True,
+            _preload_content=False,
+        )
+        page, metadata = parse_list(response.data)
+        items.extend(page)
+        continue_token = metadata._continue
+        if not continue_token:
+            return items
+
+
+def _camel_query_param(name: str) -> str:
+    head, *rest = name.split("_")
+    return head + "".join(part.capitalize() for part in rest)
+
+
+def iter_pages(
+    k8s,
+    kind: str,
+    page_size: int = DEFAULT_PAGE_SIZE,
+    namespace: Optional[str] = None,
+    **selectors,
+) -> Iterator[List]:
+    """Yield `kind` one page at a time using the API server's limit/continue pagination.
+
+    Only the current page is held by this generator, so a caller that reduces
+    each page before asking for the next uses memory proportional to
+    `page_size` rather than to the size of the cluster. Synced informer
+    stores are already in memory and are simply sliced into pages.
+    """
+    selectors = {key: value for key, value in selectors.items() if value}
+    informers = getattr(k8s, "informers", None)
+    if isinstance(informers, InformerCache) and informers.items(kind) is not None:
+        items = list_items(k8s, kind, namespace=namespace, **selectors)
+        for start in range(0, len(items), page_size):
+            yield items[start:start + page_size]
+        return
+
+    list_func, args = _list_call(k8s, kind, namespace)
+    continue_token = None
+    while True:
+        kwargs = dict(selectors, limit=page_size)
+        if continue_token:
+            kwargs["_continue"] = continue_token
+        items, metadata = _fetch_page(k8s, kind, list_func, args, kwargs)
+        continue_token = metadata._continue
+        yield items
+        if not continue_token:
+            return
+
 
 class K8sClient:
     def __init__(self):
@@ -12,9 +282,14 @@ class K8sClient:
         self.autoscaling_v1 = None
         self.autoscaling_v2 = None
         self.batch_v1 = None
+        self.policy_v1 = None
         self.metrics = None
         # Fixer is injected later to break cycles
         self.fixer = None
+        # Populated by start_informers(); list_items() reads from it once synced
+        self.informers: Optional[InformerCache] = None
+        # Kinds listed via the raw-JSON fast path; see enable_raw_json()
+        self.raw_json_kinds: FrozenSet[str] = frozenset()
 
         try:
             config.load_incluster_config()
@@ -31,6 +306,7 @@ class K8sClient:
         self.autoscaling_v1 = client.AutoscalingV1Api()
         self.autoscaling_v2 = client.AutoscalingV2Api()
         self.batch_v1 = client.BatchV1Api()
+        self.policy_v1 = client.PolicyV1Api()
         self.metrics = client.CustomObjectsApi()
 
     @property
@@ -38,6 +314,45 @@ class K8sClient:
         # Only core APIs are required; extended APIs (autoscaling, batch) are optional
         return self.v1 is not None and self.apps_v1 is not None and self.metrics is not None
 
+    def start_informers(
+        self, kinds: Optional[Iterable[str]] = None, watch_timeout_seconds: int = 300
+    ) -> Optional[InformerCache]:
+        """Start list+watch informers so list_items() serves these kinds from memory."""
+        if not self.available:
+            return None
+        if self.informers is not None:
+            return self.informers
+
+        list_funcs = {}
+        for kind in (kinds or DEFAULT_INFORMER_KINDS):
+            api_attr, all_namespaces_method, _ = RESOURCE_KINDS[kind]
+            api = getattr(self, api_attr, None)
+            if api is not None:
+                list_funcs[kind] = getattr(api, all_namespaces_method)
+        self.informers = InformerCache(
+            list_funcs, watch_timeout_seconds=watch_timeout_seconds, indexers=INFORMER_INDEXERS
+        )
+        self.informers.start()
+        return self.informers
+
+    def enable_raw_json(self, kinds: Iterable[str] = RAW_JSON_KINDS) -> None:
+        """List these kinds as raw JSON wrapped in read-only views instead of models."""
+        self.raw_json_kinds = frozenset(kinds)
+
+    def stop_informers(self) -> None:
+        if self.informers is not None:
+            self.informers.stop()
+            self.informers = None
+
+    def iter_pod_pages(self, page_size: int = DEFAULT_PAGE_SIZE, **selectors) -> Iterator[List]:
+        """Yield all pods as pages of at most `page_size` V1Pod objects."""
+        return iter_pages(self, "pods", page_size=page_size, **selectors)
+
+    def iter_pods(self, page_size: int = DEFAULT_PAGE_SIZE, **selectors) -> Iterator:
+        """Yield all pods one at a time, fetching them `page_size` at a time."""
+        for page in self.iter_pod_pages(page_size, **selectors):
+            yield from page
+
     def is_ready(self, request_timeout: int = 2) -> bool:
         if not self.available:
             return False
@@ -84,40 +399,45 @@ class K8sClient:
                 "events": [],
             }
 
-    def _check_nodes(self) -> Dict:
-        nodes = self.v1.list_node()
-        total = len(nodes.items)
-        ready = sum(1 for node in nodes.items 
-                   if any(c.status == "True" and c.type == "Ready" 
-                         for c in node.status.conditions))
+    def _check_nodes(self, nodes: Optional[List] = None) -> Dict:
+        if nodes is None:
+            nodes = list_items(self, "nodes")
+        total = len(nodes)
+        ready = sum(1 for node in nodes
+                   if any(c.status == "True" and c.type == "Ready"
+                         for c in (node.status.conditions or [])))
         return {"total": total, "ready": ready, "status": "healthy" if ready == total else "degraded"}
 
-    def _check_pods(self) -> Dict:
-        pods = self.v1.list_pod_for_all_namespaces()
-        total = len(pods.items)
-        running = sum(1 for pod in pods.items if pod.status.phase == "Running")
-        failed = [{"name": p.metadata.name, "namespace": p.metadata.namespace, 
-                  "phase": p.status.phase} for p in pods.items 
-                 if p.status.phase not in ["Running", "Succeeded"]]
+    def _check_pods(self, pods: Optional[Iterable] = None) -> Dict:
+        # Reduce pod by pod so an unpaged cluster-wide list is never held in memory.
+        total = running = 0
+        failed = []
+        for p in (self.iter_pods() if pods is None else pods):
+            total += 1
+            if p.status.phase == "Running":
+                running += 1
+            elif p.status.phase != "Succeeded":
+                failed.append({"name": p.metadata.name, "namespace": p.metadata.namespace,
+                               "phase": p.status.phase})
         return {"total": total, "running": running, "failed": failed}
 
     def _check_services(self) -> Dict:
-        services = self.v1.list_service_for_all_namespaces()
-        endpoints = self.v1.list_endpoints_for_all_namespaces()
-        
+        services = list_items(self, "services")
+        endpoints = {
+            (e.metadata.namespace, e.metadata.name): e for e in list_items(self, "endpoints")
+        }
+
         no_endpoints = []
-        for svc in services.items:
-            ep = next((e for e in endpoints.items 
-                      if e.metadata.name == svc.metadata.name 
-                      and e.metadata.namespace == svc.metadata.namespace), None)
+        for svc in services:
+            ep = endpoints.get((svc.metadata.namespace, svc.metadata.name))
             if ep and not ep.subsets:
                 no_endpoints.append(f"{svc.metadata.namespace}/{svc.metadata.name}")
-        
-        return {"total": len(services.items), "without_endpoints": no_endpoints}
+
+        return {"total": len(services), "without_endpoints": no_endpoints}
 
     def _get_recent_events(self) -> List[Dict]:
-        events = self.v1.list_event_for_all_namespaces()
-        warnings = [{"namespace": e.namespace, "object": e.involved_object.name,
+        events = list_items(self, "events", field_selector="type=Warning")
+        warnings = [{"namespace": e.metadata.namespace, "object": e.involved_object.name,
                     "reason": e.reason, "message": e.message, "time": str(e.last_timestamp)}
-                   for e in events.items if e.type == "Warning"]
+                   for e in events]
         return warnings[-10:]  # Last 10 warnings
@@ -0,0 +1,64 @@
+"""Bounded thread pool for running blocking Kubernetes calls off the event loop.
+
+The kubernetes Python client is synchronous, and the diagnostics/fixer
+engines call it from inside `async def` methods. Awaiting those directly in
+a FastAPI handler blocks the event loop, so a slow scan would also stall
+/livez and /readyz. BlockingExecutor runs that work in a fixed-size pool
+and applies a deadline to each call. The deadline covers time spent queued
+as well as time spent running.
+"""
+
+import asyncio
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Awaitable, Callable, Optional
+
+
+def run_coroutine_sync(coro: Awaitable) -> Any:
+    """Drive `coro` to completion on a private event loop in the calling thread.
+
+    Unlike asyncio.run(), this leaves the thread's current event loop alone.
+    """
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(coro)
+    finally:
+        loop.close()
+
+
+class BlockingExecutor:
+    """Runs synchronous callables (or whole coroutines) on a bounded thread pool."""
+
+    def __init__(
+        self,
+        max_workers: int = 8,
+        timeout_seconds: Optional[float] = 60.0,
+        name: str = "k8s-blocking",
+    ):
+        self.max_workers = max_workers
+        self.timeout_seconds = timeout_seconds
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=name)
+
+    async def run(
+        self, func: Callable[..., Any], *args, timeout: Optional[float] = None, **kwargs
+    ) -> Any:
+        """Run `func(*args, **kwargs)` in the pool; raise asyncio.TimeoutError past the deadline.
+
+        A timed-out call is abandoned, not interrupted: its worker thread finishes
+        the underlying request in the background and then frees its slot.
+        """
+        loop = asyncio.get_running_loop()
+        future = loop.run_in_executor(self._pool, functools.partial(func, *args, **kwargs))
+        deadline = self.timeout_seconds if timeout is None else timeout
+        return await asyncio.wait_for(future, deadline)
+
+    async def run_coroutine(
+        self, coro_func: Callable[..., Awaitable], *args, timeout: Optional[float] = None, **kwargs
+    ) -> Any:
+        """Run an `async def` that makes blocking calls on its own event loop in the pool."""
+        return await self.run(
+            lambda: run_coroutine_sync(coro_func(*args, **kwargs)), timeout=timeout
+        )
+
+    def shutdown(self) -> None:
+        self._pool.shutdown(wait=False, cancel_futures=True)
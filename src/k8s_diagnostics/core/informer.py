@@ -0,0 +1,288 @@
+"""List+watch informer cache.
+
+Each informer lists its resource kind once, then keeps an in-memory store
+current from a watch that resumes at the last seen resourceVersion. Watch
+bookmarks advance that version on quiet kinds, so a reconnect rarely needs a
+full relist; a 410 Gone (version compacted away) falls back to one.
+
+Detectors and fixers read these stores through core.client.list_items(), so
+repeated scans cost nothing on the API server once the stores have synced.
+Named indexers (e.g. events by involved object) are kept current alongside
+the store, so keyed lookups stay O(1) as objects come and go. Every change
+also bumps the informer's `revision` and is recorded in a bounded change
+log, so incremental consumers can ask which objects changed since the
+revision they last saw instead of diffing the whole store.
+"""
+
+import itertools
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from kubernetes import watch
+from kubernetes.client.rest import ApiException
+
+HTTP_GONE = 410
+# The change log keeps at least this many entries (and at least one per stored object)
+MIN_CHANGE_LOG = 10000
+# Revisions are unique across informers, so (kind, revision) identifies one
+# state of one store even after informers are restarted.
+_REVISIONS = itertools.count(1)
+
+
+def _object_key(obj) -> Tuple[str, str]:
+    metadata = obj.metadata
+    return (metadata.namespace or "", metadata.name)
+
+
+class ResourceInformer:
+    """Keeps one resource kind in memory via list + watch."""
+
+    def __init__(
+        self,
+        kind: str,
+        list_func: Callable,
+        watch_timeout_seconds: int = 300,
+        retry_backoff_seconds: float = 5.0,
+        indexers: Optional[Dict[str, Callable]] = None,
+    ):
+        self.kind = kind
+        self._list_func = list_func
+        self.watch_timeout_seconds = watch_timeout_seconds
+        self.retry_backoff_seconds = retry_backoff_seconds
+        self.resource_version: Optional[str] = None
+        self.last_error: Optional[str] = None
+        self._store: Dict[Tuple[str, str], object] = {}
+        # index name -> key function, and index name -> key -> {store key: object}
+        self._indexers: Dict[str, Callable] = dict(indexers or {})
+        self._indices: Dict[str, Dict[Any, Dict[Tuple[str, str], object]]] = {
+            name: {} for name in self._indexers
+        }
+        # store key -> revision of its last change, oldest first
+        self.revision = 0
+        self._changes: "OrderedDict[Tuple[str, str], int]" = OrderedDict()
+        self._log_start = 0  # changes at or before this revision are not in the log
+        self._lock = threading.Lock()
+        self._synced = threading.Event()
+        self._stopped = threading.Event()
+        self._watch: Optional[watch.Watch] = None
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def has_synced(self) -> bool:
+        return self._synced.is_set()
+
+    def start(self) -> None:
+        if self._thread and self._thread.is_alive():
+            return
+        self._stopped.clear()
+        self._thread = threading.Thread(
+            target=self._run, name=f"informer-{self.kind}", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stopped.set()
+        if self._watch is not None:
+            self._watch.stop()
+
+    def wait_for_sync(self, timeout: Optional[float] = None) -> bool:
+        return self._synced.wait(timeout)
+
+    def items(self) -> List:
+        with self._lock:
+            return list(self._store.values())
+
+    def get(self, namespace: Optional[str], name: str):
+        with self._lock:
+            return self._store.get((namespace or "", name))
+
+    def changes_since(self, revision: int) -> Tuple[int, Optional[List[Tuple[str, str]]]]:
+        """(current revision, keys of objects added/modified/deleted after `revision`).
+
+        The key list is None when the log no longer reaches back that far
+        (a relist replaced the store, or old entries were trimmed); the caller
+        must then resync from items().
+        """
+        with self._lock:
+            if revision < self._log_start:
+                return self.revision, None
+            changed = []
+            for key, changed_at in reversed(self._changes.items()):
+                if changed_at <= revision:
+                    break
+                changed.append(key)
+            return self.revision, changed
+
+    def by_index(self, index_name: str, key) -> List:
+        """Objects whose `index_name` indexer returned `key`."""
+        with self._lock:
+            return list(self._indices[index_name].get(key, {}).values())
+
+    def status(self) -> Dict:
+        with self._lock:
+            count = len(self._store)
+        return {
+            "synced": self.has_synced,
+            "objects": count,
+            "resource_version": self.resource_version,
+            "last_error": self.last_error,
+        }
+
+    # ── list + watch loop ────────────────────────────────────────────────────
+
+    def _run(self) -> None:
+        while not self._stopped.is_set():
+            try:
+                if self.resource_version is None:
+                    self._relist()
+                self._watch_once()
+            except ApiException as e:
+                if e.status == HTTP_GONE:
+                    # Our resourceVersion was compacted away; start over from a fresh list.
+                    self.resource_version = None
+                    continue
+                self._record_error(e)
+            except Exception as e:
+                self._record_error(e)
+
+    def _record_error(self, error: Exception) -> None:
+        self.last_error = str(error)
+        self._stopped.wait(self.retry_backoff_seconds)
+
+    def _relist(self) -> None:
+        response = self._list_func()
+        store = {_object_key(obj): obj for obj in (response.items or [])}
+        indices = {name: {} for name in self._indexers}
+        for store_key, obj in store.items():
+            self._index(indices, store_key, obj)
+        with self._lock:
+            self._store = store
+            self._indices = indices
+            self.revision = next(_REVISIONS)
+            self._changes.clear()
+            self._log_start = self.revision
+        self.resource_version = response.metadata.resource_version
+        self.last_error = None
+        self._synced.set()
+
+    def _watch_once(self) -> None:
+        self._watch = watch.Watch()
+        stream = self._watch.stream(
+            self._list_func,
+            resource_version=self.resource_version,
+            allow_watch_bookmarks=True,
+            timeout_seconds=self.watch_timeout_seconds,
+        )
+        for event in stream:
+            self.apply_event(event)
+            if self._stopped.is_set():
+                self._watch.stop()
+                break
+
+    def apply_event(self, event: Dict) -> None:
+        """Apply one watch event (ADDED / MODIFIED / DELETED / BOOKMARK) to the store."""
+        event_type = event.get("type")
+        raw_metadata = (event.get("raw_object") or {}).get("metadata") or {}
+        if event_type in ("ADDED", "MODIFIED"):
+            obj = event["object"]
+            store_key = _object_key(obj)
+            with self._lock:
+                self._unindex(store_key)
+                self._store[store_key] = obj
+                self._index(self._indices, store_key, obj)
+                self._record_change(store_key)
+        elif event_type == "DELETED":
+            store_key = _object_key(event["object"])
+            with self._lock:
+                self._unindex(store_key)
+                self._store.pop(store_key, None)
+                self._record_change(store_key)
+
+        resource_version = raw_metadata.get("resourceVersion")
+        if resource_version:
+            self.resource_version = resource_version
+
+    def _record_change(self, store_key: Tuple[str, str]) -> None:
+        """Log a change to `store_key` (caller holds the lock)."""
+        self.revision = next(_REVISIONS)
+        self._changes[store_key] = self.revision
+        self._changes.move_to_end(store_key)
+        while len(self._changes) > max(MIN_CHANGE_LOG, len(self._store)):
+            _, self._log_start = self._changes.popitem(last=False)
+
+    def _index(self, indices: Dict, store_key: Tuple[str, str], obj) -> None:
+        for name, key_func in self._indexers.items():
+            indices[name].setdefault(key_func(obj), {})[store_key] = obj
+
+    def _unindex(self, store_key: Tuple[str, str]) -> None:
+        """Drop the stored object at `store_key` from every index (caller holds the lock)."""
+        previous = self._store.get(store_key)
+        if previous is None:
+            return
+        for name, key_func in self._indexers.items():
+            bucket = self._indices[name].get(key_func(previous))
+            if bucket is not None:
+                bucket.pop(store_key, None)
+                if not bucket:
+                    del self._indices[name][key_func(previous)]
+
+
+class InformerCache:
+    """A set of ResourceInformers, one per resource kind."""
+
+    def __init__(
+        self,
+        list_funcs: Dict[str, Callable],
+        watch_timeout_seconds: int = 300,
+        indexers: Optional[Dict[str, Dict[str, Callable]]] = None,
+    ):
+        indexers = indexers or {}
+        self._informers: Dict[str, ResourceInformer] = {
+            kind: ResourceInformer(
+                kind, func,
+                watch_timeout_seconds=watch_timeout_seconds,
+                indexers=indexers.get(kind),
+            )
+            for kind, func in list_funcs.items()
+        }
+
+    @property
+    def kinds(self) -> List[str]:
+        return list(self._informers)
+
+    def start(self) -> None:
+        for informer in self._informers.values():
+            informer.start()
+
+    def stop(self) -> None:
+        for informer in self._informers.values():
+            informer.stop()
+
+    def wait_for_sync(self, timeout: Optional[float] = None, kinds: Optional[Iterable[str]] = None) -> bool:
+        selected = [self._informers[k] for k in (kinds or self._informers) if k in self._informers]
+        return all(informer.wait_for_sync(timeout) for informer in selected)
+
+    def informer(self, kind: str) -> Optional[ResourceInformer]:
+        """The synced informer for `kind`, or None."""
+        informer = self._informers.get(kind)
+        if informer is None or not informer.has_synced:
+            return None
+        return informer
+
+    def items(self, kind: str) -> Optional[List]:
+        """Objects of `kind`, or None when the kind is not cached or not yet synced."""
+        informer = self._informers.get(kind)
+        if informer is None or not informer.has_synced:
+            return None
+        return informer.items()
+
+    def by_index(self, kind: str, index_name: str, key) -> Optional[List]:
+        """Indexed objects of `kind`, or None when that index is not cached or not yet synced."""
+        informer = self._informers.get(kind)
+        if informer is None or not informer.has_synced or index_name not in informer._indexers:
+            return None
+        return informer.by_index(index_name, key)
+
+    def status(self) -> Dict[str, Dict]:
+        return {kind: informer.status() for kind, informer in self._informers.items()}
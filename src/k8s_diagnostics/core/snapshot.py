@@ -0,0 +1,166 @@
+"""Point-in-time view of the cluster shared by one detection pass.
+
+ClusterSnapshot.fetch() issues one list call per resource kind, concurrently,
+so a scan costs exactly one list per kind and its wall-clock time is bounded
+by the slowest list rather than the sum of all of them. Detectors and
+provider checkers read from the snapshot instead of listing again.
+
+Pods are the one kind that can outgrow memory. With `pod_page_size` set, the
+snapshot leaves them out, and snapshot_pages()/snapshot_iter() stream them
+from the API server a page at a time instead.
+
+Kinds served from a synced informer also record the informer's revision, so
+incremental scans can tell whether a kind changed since an earlier snapshot.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime
+from types import MappingProxyType
+from typing import Dict, Iterable, Iterator, List, Mapping, Optional, Tuple
+
+from .client import DEFAULT_PAGE_SIZE, filter_by_selectors, iter_pages, list_items
+from .informer import InformerCache
+
+# snapshot key -> (list_items kind, selectors)
+SNAPSHOT_KINDS: Dict[str, Tuple[str, Dict[str, str]]] = {
+    "nodes": ("nodes", {}),
+    "pods": ("pods", {}),
+    "services": ("services", {}),
+    "endpoints": ("endpoints", {}),
+    "pvcs": ("pvcs", {}),
+    "persistentvolumes": ("persistentvolumes", {}),
+    "ingresses": ("ingresses", {}),
+    "networkpolicies": ("networkpolicies", {}),
+    "hpas": ("hpas", {}),
+    "jobs": ("jobs", {}),
+    "daemonsets": ("daemonsets", {}),
+    "deployments": ("deployments", {}),
+    "warning_events": ("events", {"field_selector": "type=Warning"}),
+}
+
+
+@dataclass(frozen=True)
+class ClusterSnapshot:
+    """Immutable lists of cluster objects, keyed by snapshot kind.
+
+    A kind whose list call failed is recorded in `errors`; reading it via
+    items() re-raises that error so detectors keep their existing
+    try/except fallbacks.
+    """
+
+    resources: Mapping[str, Tuple] = field(default_factory=dict)
+    errors: Mapping[str, Exception] = field(default_factory=dict)
+    fetched_at: datetime = field(default_factory=datetime.now)
+    # Set when pods were left out to be streamed in pages of this size.
+    pod_page_size: Optional[int] = None
+    # kind -> informer revision read before the kind was listed (informer-backed kinds only)
+    revisions: Mapping[str, int] = field(default_factory=dict)
+
+    @classmethod
+    def fetch(
+        cls,
+        k8s,
+        kinds: Optional[Iterable[str]] = None,
+        max_workers: Optional[int] = None,
+        pod_page_size: Optional[int] = None,
+    ) -> "ClusterSnapshot":
+        selected = list(kinds or SNAPSHOT_KINDS)
+        if pod_page_size:
+            selected = [key for key in selected if key != "pods"]
+        resources: Dict[str, Tuple] = {}
+        errors: Dict[str, Exception] = {}
+        revisions: Dict[str, int] = {}
+        informers = getattr(k8s, "informers", None)
+
+        def _list(key: str):
+            kind, selectors = SNAPSHOT_KINDS[key]
+            informer = informers.informer(kind) if isinstance(informers, InformerCache) else None
+            if informer is not None:
+                revisions[key] = informer.revision
+            return tuple(list_items(k8s, kind, **selectors))
+
+        with ThreadPoolExecutor(max_workers=max_workers or len(selected) or 1) as pool:
+            futures = {key: pool.submit(_list, key) for key in selected}
+            for key, future in futures.items():
+                try:
+                    resources[key] = future.result()
+                except Exception as exc:
+                    errors[key] = exc
+
+        return cls(
+            resources=MappingProxyType(resources),
+            errors=MappingProxyType(errors),
+            pod_page_size=pod_page_size or None,
+            revisions=MappingProxyType(revisions),
+        )
+
+    def has(self, kind: str) -> bool:
+        return kind in self.resources or kind in self.errors
+
+    def items(self, kind: str) -> List:
+        if kind in self.errors:
+            raise self.errors[kind]
+        if kind not in self.resources:
+            raise KeyError(f"kind '{kind}' was not fetched into this snapshot")
+        return list(self.resources[kind])
+
+    @property
+    def nodes(self) -> List:
+        return self.items("nodes")
+
+    @property
+    def pods(self) -> List:
+        return self.items("pods")
+
+    @property
+    def services(self) -> List:
+        return self.items("services")
+
+
+def snapshot_items(
+    k8s,
+    snapshot: Optional[ClusterSnapshot],
+    kind: str,
+    namespace: Optional[str] = None,
+    **selectors,
+) -> List:
+    """Read `kind` from the snapshot when it holds it, otherwise list it directly.
+
+    Lets detectors and provider checks keep working when called on their own
+    (e.g. from the CLI's provider command) without a snapshot.
+    """
+    selectors = {key: value for key, value in selectors.items() if value}
+    if snapshot is not None and snapshot.has(kind):
+        items = snapshot.items(kind)
+        if namespace is not None:
+            items = [obj for obj in items if obj.metadata.namespace == namespace]
+        return filter_by_selectors(items, **selectors) if selectors else items
+    list_kind, default_selectors = SNAPSHOT_KINDS.get(kind, (kind, {}))
+    return list_items(k8s, list_kind, namespace=namespace, **{**default_selectors, **selectors})
+
+
+def snapshot_pages(
+    k8s,
+    snapshot: Optional[ClusterSnapshot],
+    kind: str,
+    namespace: Optional[str] = None,
+    **selectors,
+) -> Iterator[List]:
+    """Yield `kind` in pages: the snapshot's list as a single page when it holds
+    the kind, otherwise pages streamed from the API server."""
+    if snapshot is not None and snapshot.has(kind):
+        yield snapshot_items(k8s, snapshot, kind, namespace=namespace, **selectors)
+        return
+    list_kind, default_selectors = SNAPSHOT_KINDS.get(kind, (kind, {}))
+    page_size = (snapshot.pod_page_size if snapshot is not None else None) or DEFAULT_PAGE_SIZE
+    yield from iter_pages(
+        k8s, list_kind, page_size=page_size, namespace=namespace,
+        **{**default_selectors, **selectors},
+    )
+
+
+def snapshot_iter(k8s, snapshot: Optional[ClusterSnapshot], kind: str, **selectors) -> Iterator:
+    """Yield objects of `kind` one at a time; see snapshot_pages()."""
+    for page in snapshot_pages(k8s, snapshot, kind, **selectors):
+        yield from page
@@ -0,0 +1,140 @@
+"""Read-only attribute views over raw Kubernetes JSON.
+
+Deserializing a large list into V1Pod/V1Event model trees dominates the CPU
+cost of a scan. The raw-JSON fast path in core.client skips it: the response
+is requested with `_preload_content=False` and parsed with orjson when it is
+installed. Each item is then wrapped in an ObjectView, which resolves the
+same snake_case attribute names the kubernetes models expose
+(`pod.status.container_statuses[0].state.waiting.reason`) lazily against the
+camelCase dict. Unset fields read as None and timestamps come back as
+datetimes, as they do with the models.
+"""
+
+import inspect
+import json
+import re
+from collections.abc import Mapping
+from datetime import datetime
+from typing import Any, Dict, FrozenSet, Tuple
+
+try:
+    import orjson
+
+    def loads(data) -> Any:
+        return orjson.loads(data)
+except ImportError:  # optional: pip install orjson
+    def loads(data) -> Any:
+        return json.loads(data)
+
+
+def _camel_case(name: str) -> str:
+    head, *rest = name.lstrip("_").split("_")
+    return head + "".join(part[:1].upper() + part[1:] for part in rest)
+
+
+def _model_schema() -> Tuple[Dict[str, str], FrozenSet[str], FrozenSet[str]]:
+    """Derive attribute→JSON key overrides, datetime fields and map fields from the models."""
+    from kubernetes.client import models
+
+    keys: Dict[str, set] = {}
+    datetimes, maps = set(), set()
+    for model in vars(models).values():
+        if not (inspect.isclass(model) and hasattr(model, "attribute_map")):
+            continue
+        for attr, key in model.attribute_map.items():
+            keys.setdefault(attr, set()).add(key)
+        for attr, type_name in getattr(model, "openapi_types", {}).items():
+            if type_name == "datetime":
+                datetimes.add(attr)
+            elif type_name.startswith("dict("):
+                maps.add(attr)
+    # Keep only unambiguous renames (e.g. _continue -> continue, uid -> uid is implicit)
+    overrides = {
+        attr: next(iter(names))
+        for attr, names in keys.items()
+        if len(names) == 1 and next(iter(names)) != _camel_case(attr)
+    }
+    return overrides, frozenset(datetimes), frozenset(maps)
+
+
+_KEY_OVERRIDES, _DATETIME_FIELDS, _MAP_FIELDS = _model_schema()
+_KEY_CACHE: Dict[str, str] = {}
+_ISO_Z = re.compile(r"Z$")
+
+
+def _json_key(attr: str) -> str:
+    key = _KEY_CACHE.get(attr)
+    if key is None:
+        key = _KEY_OVERRIDES.get(attr) or _camel_case(attr)
+        _KEY_CACHE[attr] = key
+    return key
+
+
+def _parse_datetime(value: str):
+    try:
+        return datetime.fromisoformat(_ISO_Z.sub("+00:00", value))
+    except ValueError:
+        return value
+
+
+def _wrap(attr: str, value):
+    if value is None:
+        return None
+    if isinstance(value, dict):
+        return MapView(value) if attr in _MAP_FIELDS else ObjectView(value)
+    if isinstance(value, list):
+        return [ObjectView(v) if isinstance(v, dict) else v for v in value]
+    if attr in _DATETIME_FIELDS and isinstance(value, str):
+        return _parse_datetime(value)
+    return value
+
+
+class ObjectView:
+    """Attribute access over one Kubernetes object dict, mirroring the model API."""
+
+    __slots__ = ("_data",)
+
+    def __init__(self, data: Dict):
+        object.__setattr__(self, "_data", data)
+
+    def __getattr__(self, attr: str):
+        if attr.startswith("__"):
+            raise AttributeError(attr)
+        return _wrap(attr, self._data.get(_json_key(attr)))
+
+    def __setattr__(self, attr: str, value):
+        raise AttributeError(f"{type(self).__name__} is read-only")
+
+    def to_dict(self) -> Dict:
+        """The underlying JSON dict (camelCase keys)."""
+        return self._data
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self._data!r})"
+
+
+class MapView(ObjectView, Mapping):
+    """Free-form map fields (labels, annotations, resource limits, selectors).
+
+    Behaves as a read-only dict, and still allows attribute access for fields
+    that are a plain map in one resource but an object in another (e.g.
+    Service.spec.selector vs Deployment.spec.selector).
+    """
+
+    __slots__ = ()
+
+    def __getitem__(self, key):
+        return self._data[key]
+
+    def __iter__(self):
+        return iter(self._data)
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+def parse_list(data) -> Tuple[list, ObjectView]:
+    """Parse a raw `*List` response body into (item views, list metadata view)."""
+    payload = loads(data)
+    items = [ObjectView(item) for item in (payload.get("items") or [])]
+    return items, ObjectView(payload.get("metadata") or {})
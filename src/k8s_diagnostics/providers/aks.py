@@ -17,6 +17,8 @@ How Azure metadata is resolved:
 """
 
 from typing import Dict, List, Optional
+
+from ..core.snapshot import ClusterSnapshot, snapshot_items, snapshot_iter
 from .base import BaseProviderChecker, ProviderIssue
 
 # Minimum IPs to consider a subnet healthy
@@ -39,9 +41,11 @@ class AKSChecker(BaseProviderChecker):
     def provider_name(self) -> str:
         return "aks"
 
-    def run_all_checks(self, k8s_client) -> List[ProviderIssue]:
+    def run_all_checks(
+        self, k8s_client, snapshot: Optional[ClusterSnapshot] = None
+    ) -> List[ProviderIssue]:
         """Auto-discover cluster metadata from nodes, then run all Azure checks."""
-        meta = self._get_cluster_metadata(k8s_client)
+        meta = self._get_cluster_metadata(k8s_client, snapshot)
         if meta is None:
             return [ProviderIssue(
                 "aks_metadata_unavailable", "low",
@@ -54,20 +58,22 @@ class AKSChecker(BaseProviderChecker):
         issues.extend(self._check_cni_ip_exhaustion(meta))
         issues.extend(self._check_nsg_rules(meta))
         issues.extend(self._check_acr_pull_role(meta, k8s_client))
-        issues.extend(self._check_lb_health_probes(meta, k8s_client))
+        issues.extend(self._check_lb_health_probes(meta, k8s_client, snapshot))
         issues.extend(self._check_vmss_provisioning(meta))
         issues.extend(self._check_private_dns(meta))
-        issues.extend(self._check_disk_zone_mismatch(meta, k8s_client))
+        issues.extend(self._check_disk_zone_mismatch(meta, k8s_client, snapshot))
         return issues
 
     # ─────────────────────────────────────────────────────────────
     # Metadata extraction
     # ─────────────────────────────────────────────────────────────
 
-    def _get_cluster_metadata(self, k8s_client) -> Optional[Dict]:
+    def _get_cluster_metadata(
+        self, k8s_client, snapshot: Optional[ClusterSnapshot] = None
+    ) -> Optional[Dict]:
         """Extract Azure subscription, node resource group, and cluster info from nodes."""
         try:
-            nodes = k8s_client.v1.list_node().items
+            nodes = snapshot_items(k8s_client, snapshot, "nodes")
             if not nodes:
                 return None
 
@@ -293,7 +299,9 @@ class AKSChecker(BaseProviderChecker):
     # Check 4: Azure LB health probe vs K8s readiness mismatch
     # ─────────────────────────────────────────────────────────────
 
-    def _check_lb_health_probes(self, meta: Dict, k8s_client) -> List[ProviderIssue]:
+    def _check_lb_health_probes(
+        self, meta: Dict, k8s_client, snapshot: Optional[ClusterSnapshot] = None
+    ) -> List[ProviderIssue]:
         """Find Azure LBs whose health probe port does not match a NodePort service."""
         clients = self._get_azure_clients(meta["subscription_id"])
         if clients is None:
@@ -306,10 +314,10 @@ class AKSChecker(BaseProviderChecker):
             lbs = list(network_client.load_balancers.list(meta["node_resource_group"]))
 
             # Get all NodePort services
-            svc_list = k8s_client.v1.list_service_for_all_namespaces()
+            svc_list = snapshot_items(k8s_client, snapshot, "services")
             node_ports = {
                 svc.spec.ports[0].node_port
-                for svc in svc_list.items
+                for svc in svc_list
                 if svc.spec.type in ("LoadBalancer", "NodePort")
                 and svc.spec.ports
                 and svc.spec.ports[0].node_port
@@ -425,13 +433,16 @@ class AKSChecker(BaseProviderChecker):
     # Check 7: Azure Disk PV zone mismatch
     # ─────────────────────────────────────────────────────────────
 
-    def _check_disk_zone_mismatch(self, meta: Dict, k8s_client) -> List[ProviderIssue]:
+    def _check_disk_zone_mismatch(
+        self, meta: Dict, k8s_client, snapshot: Optional[ClusterSnapshot] = None
+    ) -> List[ProviderIssue]:
         """Detect pods stuck because their Azure Disk PV is in a different zone."""
         issues = []
         try:
-            pvs = k8s_client.v1.list_persistent_volume().items
-            pods = k8s_client.v1.list_pod_for_all_namespaces().items
-            pending_pods = [p for p in pods if p.status.phase == "Pending"]
+            pvs = snapshot_items(k8s_client, snapshot, "persistentvolumes")
+            pending_pods = list(snapshot_iter(
+                k8s_client, snapshot, "pods", field_selector="status.phase=Pending"
+            ))
 
             # Build map: pvc name → PV zone label
             pv_zones: Dict[str, str] = {}
@@ -44,9 +44,12 @@ class BaseProviderChecker(ABC):
         """Short name: 'aks', 'eks', 'gke'."""
 
     @abstractmethod
-    def run_all_checks(self, k8s_client) -> List[ProviderIssue]:
+    def run_all_checks(self, k8s_client, snapshot=None) -> List[ProviderIssue]:
         """Run all provider checks and return a flat list of issues.
 
         Args:
             k8s_client: The K8sClient instance (for reading cluster metadata).
+            snapshot: Optional ClusterSnapshot shared with the calling scan;
+                when given, checks read nodes/pods/services from it instead
+                of listing them again.
         """
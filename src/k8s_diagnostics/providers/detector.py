@@ -6,16 +6,18 @@ detect_common_issues() issues list format.
 """
 
 from typing import Dict, List, Optional
+
+from ..core.snapshot import ClusterSnapshot, snapshot_items
 from .aks import AKSChecker
 from .eks import EKSChecker
 from .gke import GKEChecker
 from .base import BaseProviderChecker, ProviderIssue
 
 
-def detect_provider(k8s_client) -> Optional[str]:
+def detect_provider(k8s_client, snapshot: Optional[ClusterSnapshot] = None) -> Optional[str]:
     """Return 'aks', 'eks', 'gke', or None based on node providerIDs."""
     try:
-        nodes = k8s_client.v1.list_node().items
+        nodes = snapshot_items(k8s_client, snapshot, "nodes")
         if not nodes:
             return None
         pid = nodes[0].spec.provider_id or ""
@@ -37,7 +39,7 @@ _CHECKERS: Dict[str, BaseProviderChecker] = {
 }
 
 
-def run_provider_checks(k8s_client) -> List[Dict]:
+def run_provider_checks(k8s_client, snapshot: Optional[ClusterSnapshot] = None) -> List[Dict]:
     """Auto-detect provider and run all cloud-layer checks.
 
     Returns a list of issue dicts in the same format as detect_common_issues(),
@@ -45,8 +47,10 @@ def run_provider_checks(k8s_client) -> List[Dict]:
 
     Issues with severity='info' (SDK not available) are included so the caller
     can choose to filter them from the output.
+
+    Pass the scan's ClusterSnapshot to reuse its node/pod/service lists.
     """
-    provider = detect_provider(k8s_client)
+    provider = detect_provider(k8s_client, snapshot)
     if provider is None:
         return [{
             "type": "provider_unknown",
@@ -63,7 +67,7 @@ def run_provider_checks(k8s_client) -> List[Dict]:
     if checker is None:
         return []
 
-    raw_issues: List[ProviderIssue] = checker.run_all_checks(k8s_client)
+    raw_issues: List[ProviderIssue] = checker.run_all_checks(k8s_client, snapshot)
 
     return [
         {
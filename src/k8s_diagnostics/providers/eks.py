@@ -18,6 +18,8 @@ How AWS metadata is resolved:
 """
 
 from typing import Dict, List, Optional
+
+from ..core.snapshot import ClusterSnapshot, snapshot_items, snapshot_iter
 from .base import BaseProviderChecker, ProviderIssue
 
 
@@ -28,8 +30,10 @@ class EKSChecker(BaseProviderChecker):
     def provider_name(self) -> str:
         return "eks"
 
-    def run_all_checks(self, k8s_client) -> List[ProviderIssue]:
-        meta = self._get_cluster_metadata(k8s_client)
+    def run_all_checks(
+        self, k8s_client, snapshot: Optional[ClusterSnapshot] = None
+    ) -> List[ProviderIssue]:
+        meta = self._get_cluster_metadata(k8s_client, snapshot)
         if meta is None:
             return [ProviderIssue(
                 "eks_metadata_unavailable", "low",
@@ -44,17 +48,19 @@ class EKSChecker(BaseProviderChecker):
         issues.extend(self._check_ecr_pull_permission(meta))
         issues.extend(self._check_security_groups(meta, k8s_client))
         issues.extend(self._check_target_group_health(meta, k8s_client))
-        issues.extend(self._check_irsa_token_volume(k8s_client))
-        issues.extend(self._check_fargate_profiles(meta, k8s_client))
+        issues.extend(self._check_irsa_token_volume(k8s_client, snapshot))
+        issues.extend(self._check_fargate_profiles(meta, k8s_client, snapshot))
         return issues
 
     # ─────────────────────────────────────────────────────────────
     # Metadata extraction
     # ─────────────────────────────────────────────────────────────
 
-    def _get_cluster_metadata(self, k8s_client) -> Optional[Dict]:
+    def _get_cluster_metadata(
+        self, k8s_client, snapshot: Optional[ClusterSnapshot] = None
+    ) -> Optional[Dict]:
         try:
-            nodes = k8s_client.v1.list_node().items
+            nodes = snapshot_items(k8s_client, snapshot, "nodes")
             if not nodes:
                 return None
 
@@ -355,7 +361,9 @@ class EKSChecker(BaseProviderChecker):
     # Check 6: IRSA token volume not mounting
     # ─────────────────────────────────────────────────────────────
 
-    def _check_irsa_token_volume(self, k8s_client) -> List[ProviderIssue]:
+    def _check_irsa_token_volume(
+        self, k8s_client, snapshot: Optional[ClusterSnapshot] = None
+    ) -> List[ProviderIssue]:
         """Detect pods that reference an IRSA ServiceAccount but lack the token volume.
 
         IRSA works by projecting a service account token into the pod via a volume.
@@ -365,7 +373,7 @@ class EKSChecker(BaseProviderChecker):
         """
         issues = []
         try:
-            pods = k8s_client.v1.list_pod_for_all_namespaces().items
+            pods = snapshot_iter(k8s_client, snapshot, "pods")
             # Cache service account annotations per namespace
             sa_cache: Dict[str, Dict[str, str]] = {}
 
@@ -413,7 +421,9 @@ class EKSChecker(BaseProviderChecker):
     # Check 7: Fargate profile coverage
     # ─────────────────────────────────────────────────────────────
 
-    def _check_fargate_profiles(self, meta: Dict, k8s_client) -> List[ProviderIssue]:
+    def _check_fargate_profiles(
+        self, meta: Dict, k8s_client, snapshot: Optional[ClusterSnapshot] = None
+    ) -> List[ProviderIssue]:
         """Find Pending pods in namespaces with no matching Fargate profile."""
         if meta["cluster_name"] == "unknown":
             return []
@@ -440,7 +450,9 @@ class EKSChecker(BaseProviderChecker):
                     covered_namespaces.add(sel.get("namespace"))
 
             # Check for Pending pods in namespaces not covered by any profile
-            pods = k8s_client.v1.list_pod_for_all_namespaces().items
+            pods = snapshot_iter(
+                k8s_client, snapshot, "pods", field_selector="status.phase=Pending"
+            )
             pending = [
                 f"{p.metadata.namespace}/{p.metadata.name}"
                 for p in pods
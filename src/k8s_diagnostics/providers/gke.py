@@ -14,6 +14,9 @@ How GCP metadata is resolved:
 """
 
 from typing import Dict, List, Optional
+
+from ..automation.events import EventIndex
+from ..core.snapshot import ClusterSnapshot, snapshot_items, snapshot_iter
 from .base import BaseProviderChecker, ProviderIssue
 
 
@@ -24,8 +27,10 @@ class GKEChecker(BaseProviderChecker):
     def provider_name(self) -> str:
         return "gke"
 
-    def run_all_checks(self, k8s_client) -> List[ProviderIssue]:
-        meta = self._get_cluster_metadata(k8s_client)
+    def run_all_checks(
+        self, k8s_client, snapshot: Optional[ClusterSnapshot] = None
+    ) -> List[ProviderIssue]:
+        meta = self._get_cluster_metadata(k8s_client, snapshot)
         if meta is None:
             return [ProviderIssue(
                 "gke_metadata_unavailable", "low",
@@ -37,18 +42,20 @@ class GKEChecker(BaseProviderChecker):
         issues: List[ProviderIssue] = []
         issues.extend(self._check_firewall_rules(meta, k8s_client))
         issues.extend(self._check_workload_identity(meta, k8s_client))
-        issues.extend(self._check_artifact_registry_auth(meta, k8s_client))
-        issues.extend(self._check_neg_sync(meta, k8s_client))
-        issues.extend(self._check_autopilot_resource_class(k8s_client))
+        issues.extend(self._check_artifact_registry_auth(meta, k8s_client, snapshot))
+        issues.extend(self._check_neg_sync(meta, k8s_client, snapshot))
+        issues.extend(self._check_autopilot_resource_class(k8s_client, snapshot))
         return issues
 
     # ─────────────────────────────────────────────────────────────
     # Metadata extraction
     # ─────────────────────────────────────────────────────────────
 
-    def _get_cluster_metadata(self, k8s_client) -> Optional[Dict]:
+    def _get_cluster_metadata(
+        self, k8s_client, snapshot: Optional[ClusterSnapshot] = None
+    ) -> Optional[Dict]:
         try:
-            nodes = k8s_client.v1.list_node().items
+            nodes = snapshot_items(k8s_client, snapshot, "nodes")
             if not nodes:
                 return None
 
@@ -245,7 +252,9 @@ class GKEChecker(BaseProviderChecker):
     # Check 3: Artifact Registry auth
     # ─────────────────────────────────────────────────────────────
 
-    def _check_artifact_registry_auth(self, meta: Dict, k8s_client) -> List[ProviderIssue]:
+    def _check_artifact_registry_auth(
+        self, meta: Dict, k8s_client, snapshot: Optional[ClusterSnapshot] = None
+    ) -> List[ProviderIssue]:
         """Detect ImagePullBackOff from Artifact Registry due to auth failure.
 
         For GKE with Workload Identity or default node service account,
@@ -255,7 +264,7 @@ class GKEChecker(BaseProviderChecker):
         """
         issues = []
         try:
-            pods = k8s_client.v1.list_pod_for_all_namespaces().items
+            pods = snapshot_iter(k8s_client, snapshot, "pods")
             ar_pull_errors = []
             for pod in pods:
                 for cs in (pod.status.container_statuses or []):
@@ -288,7 +297,9 @@ class GKEChecker(BaseProviderChecker):
     # Check 4: NEG (Network Endpoint Group) sync
     # ─────────────────────────────────────────────────────────────
 
-    def _check_neg_sync(self, meta: Dict, k8s_client) -> List[ProviderIssue]:
+    def _check_neg_sync(
+        self, meta: Dict, k8s_client, snapshot: Optional[ClusterSnapshot] = None
+    ) -> List[ProviderIssue]:
         """Detect Ingress services where the NEG is out of sync.
 
         GKE Ingress uses NEGs to route traffic directly to pods.
@@ -297,7 +308,7 @@ class GKEChecker(BaseProviderChecker):
         """
         issues = []
         try:
-            services = k8s_client.v1.list_service_for_all_namespaces().items
+            services = snapshot_items(k8s_client, snapshot, "services")
             for svc in services:
                 annotations = svc.metadata.annotations or {}
                 neg_status = annotations.get("cloud.google.com/neg-status")
@@ -331,7 +342,9 @@ class GKEChecker(BaseProviderChecker):
     # Check 5: GKE Autopilot resource class mismatch
     # ─────────────────────────────────────────────────────────────
 
-    def _check_autopilot_resource_class(self, k8s_client) -> List[ProviderIssue]:
+    def _check_autopilot_resource_class(
+        self, k8s_client, snapshot: Optional[ClusterSnapshot] = None
+    ) -> List[ProviderIssue]:
         """Detect Pending pods in Autopilot clusters due to unsupported resource requests.
 
         Autopilot enforces resource class constraints. Pods requesting resources
@@ -339,15 +352,15 @@ class GKEChecker(BaseProviderChecker):
         """
         issues = []
         try:
-            pods = k8s_client.v1.list_pod_for_all_namespaces().items
+            pods = snapshot_iter(
+                k8s_client, snapshot, "pods", field_selector="status.phase=Pending"
+            )
             pending = [p for p in pods if p.status.phase == "Pending"]
 
+            # Autopilot rejections are Warning events; index them once, not per pod
+            events = EventIndex.build(k8s_client, snapshot, "warning_events") if pending else None
             for pod in pending:
-                events = k8s_client.v1.list_namespaced_event(
-                    pod.metadata.namespace,
-                    field_selector=f"involvedObject.name={pod.metadata.name}"
-                )
-                for event in events.items:
+                for event in events.for_pod(pod):
                     msg = (event.message or "").lower()
                     if ("autopilot" in msg or "resource class" in msg or
                             "compute class" in msg):
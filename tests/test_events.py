@@ -0,0 +1,135 @@
+"""Tests for src/k8s_diagnostics/automation/events.py and informer indexers"""
+
+import asyncio
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+from k8s_diagnostics.automation.diagnostics import DiagnosticsEngine
+from k8s_diagnostics.automation.events import EventIndex, object_events
+from k8s_diagnostics.automation.fixes import AutoFixer
+from k8s_diagnostics.core.client import INFORMER_INDEXERS
+from k8s_diagnostics.core.informer import InformerCache, ResourceInformer
+
+
+def _event(name, pod, reason="Unhealthy", message="Liveness probe failed: timeout",
+           namespace="prod", uid=None, kind="Pod"):
+    return SimpleNamespace(
+        metadata=SimpleNamespace(name=name, namespace=namespace),
+        involved_object=SimpleNamespace(kind=kind, namespace=namespace, name=pod, uid=uid),
+        reason=reason,
+        message=message,
+        type="Warning",
+        last_timestamp=None,
+    )
+
+
+def _pod(name, namespace="prod", uid="uid-1", restarts=3, initial_delay=2):
+    return SimpleNamespace(
+        metadata=SimpleNamespace(name=name, namespace=namespace, uid=uid, owner_references=None),
+        spec=SimpleNamespace(containers=[SimpleNamespace(
+            name="web", liveness_probe=SimpleNamespace(initial_delay_seconds=initial_delay),
+        )]),
+        status=SimpleNamespace(container_statuses=[SimpleNamespace(restart_count=restarts)]),
+    )
+
+
+def _list_response(items, rv="100"):
+    return SimpleNamespace(items=items, metadata=SimpleNamespace(resource_version=rv))
+
+
+class TestEventIndex:
+    def test_lookup_by_involved_object(self):
+        index = EventIndex([
+            _event("e1", "web-1"),
+            _event("e2", "web-2"),
+            _event("e3", "web-1", kind="Deployment"),
+        ])
+
+        assert [e.metadata.name for e in index.for_object("Pod", "prod", "web-1")] == ["e1"]
+        assert index.for_object("Pod", "prod", "missing") == []
+        assert len(index) == 3
+
+    def test_uid_excludes_events_for_a_previous_pod_with_the_same_name(self):
+        index = EventIndex([
+            _event("old", "db-0", uid="uid-old"),
+            _event("new", "db-0", uid="uid-1"),
+            _event("unknown", "db-0"),
+        ])
+
+        assert [e.metadata.name for e in index.for_pod(_pod("db-0"))] == ["new", "unknown"]
+
+
+class TestObjectEvents:
+    def test_uses_server_side_field_selector_without_informers(self):
+        k8s = MagicMock()
+        k8s.informers = None
+        k8s.v1.list_namespaced_event.return_value.items = [
+            _event("old", "web-1", uid="uid-old"),
+            _event("new", "web-1", uid="uid-1"),
+            _event("unknown", "web-1"),
+        ]
+
+        events = object_events(k8s, "Pod", "prod", "web-1", uid="uid-1")
+
+        k8s.v1.list_namespaced_event.assert_called_once_with(
+            "prod", field_selector="involvedObject.kind=Pod,involvedObject.name=web-1",
+        )
+        # uid-less events are kept, as on the informer path
+        assert [e.metadata.name for e in events] == ["new", "unknown"]
+
+    def test_reads_live_informer_index(self):
+        k8s = MagicMock()
+        k8s.informers = InformerCache(
+            {"events": lambda: _list_response([_event("e1", "web-1"), _event("e2", "web-2")])},
+            indexers=INFORMER_INDEXERS,
+        )
+        k8s.informers._informers["events"]._relist()
+
+        events = object_events(k8s, "Pod", "prod", "web-2")
+
+        assert [e.metadata.name for e in events] == ["e2"]
+        k8s.v1.list_namespaced_event.assert_not_called()
+
+
+def test_informer_index_follows_watch_events():
+    informer = ResourceInformer(
+        "events", lambda: _list_response([_event("e1", "web-1")]),
+        indexers=INFORMER_INDEXERS["events"],
+    )
+    informer._relist()
+    key = ("Pod", "prod", "web-1")
+
+    moved = _event("e1", "web-2")
+    informer.apply_event({"type": "MODIFIED", "object": moved, "raw_object": {}})
+    assert informer.by_index("involved_object", key) == []
+    assert informer.by_index("involved_object", ("Pod", "prod", "web-2")) == [moved]
+
+    informer.apply_event({"type": "DELETED", "object": moved, "raw_object": {}})
+    assert informer.by_index("involved_object", ("Pod", "prod", "web-2")) == []
+
+
+def test_aggressive_liveness_detector_uses_shared_index():
+    k8s = MagicMock()
+    engine = DiagnosticsEngine(k8s)
+    index = EventIndex([_event("e1", "web-1", uid="uid-1")])
+
+    issues = engine._detect_aggressive_liveness_probes([_pod("web-1"), _pod("web-2")], index)
+
+    assert len(issues) == 1 and issues[0].startswith("prod/web-1")
+    k8s.v1.list_namespaced_event.assert_not_called()
+
+
+def test_liveness_fixer_lists_unhealthy_events_once():
+    k8s = MagicMock()
+    k8s.informers = None
+    k8s.v1.list_pod_for_all_namespaces.return_value.items = [
+        _pod(f"web-{i}", uid=f"uid-{i}") for i in range(5)
+    ]
+    k8s.v1.list_event_for_all_namespaces.return_value.items = []
+
+    asyncio.get_event_loop().run_until_complete(
+        AutoFixer(k8s).fix_aggressive_liveness_probes(dry_run=True)
+    )
+
+    k8s.v1.list_event_for_all_namespaces.assert_called_once_with(field_selector="reason=Unhealthy")
+    k8s.v1.list_namespaced_event.assert_not_called()
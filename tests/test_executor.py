@@ -0,0 +1,61 @@
+"""Tests for src/k8s_diagnostics/core/executor.py"""
+
+import asyncio
+import threading
+import time
+
+import pytest
+
+from k8s_diagnostics.core.executor import BlockingExecutor
+
+
+def test_run_returns_result_from_worker_thread():
+    executor = BlockingExecutor(max_workers=1)
+
+    async def main():
+        return await executor.run(threading.current_thread)
+
+    worker = asyncio.get_event_loop().run_until_complete(main())
+
+    assert worker is not threading.main_thread()
+    executor.shutdown()
+
+
+def test_run_coroutine_executes_engine_method_off_loop():
+    executor = BlockingExecutor(max_workers=1)
+
+    async def engine_method(value):
+        time.sleep(0.01)  # a blocking kubernetes call inside an async def
+        return value * 2
+
+    async def main():
+        return await executor.run_coroutine(engine_method, 21)
+
+    assert asyncio.get_event_loop().run_until_complete(main()) == 42
+    executor.shutdown()
+
+
+def test_deadline_raises_timeout():
+    executor = BlockingExecutor(max_workers=1, timeout_seconds=0.05)
+
+    async def main():
+        await executor.run(time.sleep, 0.5)
+
+    with pytest.raises(asyncio.TimeoutError):
+        asyncio.get_event_loop().run_until_complete(main())
+    executor.shutdown()
+
+
+def test_event_loop_stays_responsive_while_pool_is_busy():
+    executor = BlockingExecutor(max_workers=1, timeout_seconds=5)
+
+    async def main():
+        scan = asyncio.ensure_future(executor.run(time.sleep, 0.3))
+        started = time.monotonic()
+        await asyncio.sleep(0.01)  # stands in for /livez
+        probe_latency = time.monotonic() - started
+        await scan
+        return probe_latency
+
+    assert asyncio.get_event_loop().run_until_complete(main()) < 0.2
+    executor.shutdown()
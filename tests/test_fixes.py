@@ -1,8 +1,13 @@
 """Tests for src/k8s_diagnostics/automation/fixes.py"""
 
 import asyncio
+import json
 import pytest
-from unittest.mock import MagicMock, patch
+from unittest.mock import MagicMock
+from kubernetes.client import (
+    V1Container, V1Deployment, V1DeploymentSpec, V1LabelSelector, V1ObjectMeta, V1PodSpec,
+    V1PodTemplateSpec, V1ResourceRequirements,
+)
 from kubernetes.client.rest import ApiException
 
 from k8s_diagnostics.automation.fixes import AutoFixer
@@ -323,6 +328,24 @@ class TestFindBestSourceKey:
         assert result is None
 
 
+# ── _json_patch ──────────────────────────────────────────────────────────────
+
+
+class TestJsonPatch:
+    def test_each_replace_is_guarded_by_a_test_of_the_old_value(self):
+        fixer = _make_fixer()
+        assert fixer._json_patch([("/spec/replicas", 2, 5)]) == [
+            {"op": "test", "path": "/spec/replicas", "value": 2},
+            {"op": "replace", "path": "/spec/replicas", "value": 5},
+        ]
+
+    def test_resource_version_precondition_comes_first(self):
+        fixer = _make_fixer()
+        body = fixer._json_patch([("/data/key", "a", "b")], resource_version="42")
+        assert body[0] == {"op": "test", "path": "/metadata/resourceVersion", "value": "42"}
+        assert len(body) == 3
+
+
 # ── _infer_ingress_service_name ───────────────────────────────────────────────
 
 
@@ -478,6 +501,125 @@ class TestCleanupEvictedPodsDryRun:
         assert results["cleaned"] == []
 
 
+class TestCleanupEvictedPodsBulk:
+    def _pods(self):
+        return [
+            _make_pod(name=f"job-{i}", namespace="batch", phase="Failed", reason="Evicted") for i in range(3)
+        ] + [
+            _make_pod(name="web-0", namespace="web", phase="Failed", reason="Evicted"),
+            # a Failed pod that was not evicted rules out deletecollection in "web"
+            _make_pod(name="web-1", namespace="web", phase="Failed", reason="Error"),
+        ]
+
+    def _fixer(self, pods, allowed_namespaces=None, deleted=None):
+        fixer = _make_fixer(allowed_namespaces=allowed_namespaces)
+        fixer.k8s.v1.list_pod_for_all_namespaces.return_value.items = pods
+        fixer.k8s.v1.list_namespaced_pod.side_effect = lambda namespace, field_selector: MagicMock(
+            items=[p for p in pods if p.metadata.namespace == namespace],
+            metadata=MagicMock(resource_version="4711"),
+        )
+        names = deleted if deleted is not None else [p.metadata.name for p in pods if p.metadata.namespace == "batch"]
+        fixer.k8s.v1.delete_collection_namespaced_pod.return_value.data = json.dumps(
+            {"kind": "PodList", "items": [{"metadata": {"name": name, "namespace": "batch"}} for name in names]}
+        ).encode()
+        return fixer
+
+    def test_one_deletecollection_per_namespace_where_safe(self):
+        fixer = self._fixer(self._pods())
+
+        results = asyncio.get_event_loop().run_until_complete(fixer.cleanup_evicted_pods())
+
+        fixer.k8s.v1.list_pod_for_all_namespaces.assert_called_once_with(field_selector="status.phase=Failed")
+        fixer.k8s.v1.list_namespaced_pod.assert_called_once_with("batch", field_selector="status.phase=Failed")
+        fixer.k8s.v1.delete_collection_namespaced_pod.assert_called_once_with(
+            "batch", field_selector="status.phase=Failed",
+            resource_version="4711", resource_version_match="Exact", _preload_content=False,
+        )
+        fixer.k8s.v1.delete_namespaced_pod.assert_called_once_with("web-0", "web")
+        assert results["cleaned"] == ["batch/job-0", "batch/job-1", "batch/job-2", "web/web-0"]
+        assert [op["action"] for op in results["operations"]] == ["delete_evicted_pods_bulk", "delete_evicted_pod"]
+
+    def test_cleaned_lists_the_pods_the_api_server_deleted(self):
+        fixer = self._fixer(self._pods(), allowed_namespaces=["batch"], deleted=["job-0", "job-1", "job-3"])
+
+        results = asyncio.get_event_loop().run_until_complete(fixer.cleanup_evicted_pods())
+
+        assert results["cleaned"] == ["batch/job-0", "batch/job-1", "batch/job-3"]
+        bulk = next(op for op in results["operations"] if op["action"] == "delete_evicted_pods_bulk")
+        assert bulk["change"]["pods"] == 3
+
+    def test_pod_failing_after_the_first_list_blocks_the_bulk_delete(self):
+        pods = self._pods()
+        fixer = self._fixer(pods, allowed_namespaces=["batch"])
+        # the informer store has not seen this Job pod fail yet
+        fixer.k8s.v1.list_pod_for_all_namespaces.return_value.items = list(pods)
+        pods.append(_make_pod(name="job-9", namespace="batch", phase="Failed", reason="Error"))
+
+        results = asyncio.get_event_loop().run_until_complete(fixer.cleanup_evicted_pods())
+
+        fixer.k8s.v1.delete_collection_namespaced_pod.assert_not_called()
+        assert fixer.k8s.v1.delete_namespaced_pod.call_count == 3
+        assert results["cleaned"] == ["batch/job-0", "batch/job-1", "batch/job-2"]
+        bulk = next(op for op in results["operations"] if op["action"] == "delete_evicted_pods_bulk")
+        assert bulk["status"] == "skipped" and bulk["change"]["fallback"] == "per-pod deletes"
+
+    def test_rejected_deletecollection_falls_back_to_per_pod_deletes(self):
+        fixer = self._fixer(self._pods(), allowed_namespaces=["batch"])
+        fixer.k8s.v1.delete_collection_namespaced_pod.side_effect = _make_api_exception(410)
+
+        results = asyncio.get_event_loop().run_until_complete(fixer.cleanup_evicted_pods())
+
+        assert fixer.k8s.v1.delete_namespaced_pod.call_count == 3
+        assert results["cleaned"] == ["batch/job-0", "batch/job-1", "batch/job-2"]
+        assert results["failed"] == []
+        bulk = next(op for op in results["operations"] if op["action"] == "delete_evicted_pods_bulk")
+        assert bulk["status"] == "failed" and bulk["change"]["fallback"] == "per-pod deletes"
+
+
+# ── fix_ingress_backends ──────────────────────────────────────────────────────
+
+
+class TestFixIngressBackends:
+    def _fixer(self):
+        fixer = _make_fixer()
+        fixer.k8s.informers = None
+        ingress = MagicMock()
+        ingress.metadata.name = "shop"
+        ingress.metadata.namespace = "default"
+        path = MagicMock()
+        path.backend.service.name = "shop-old"
+        rule = MagicMock()
+        rule.http.paths = [path]
+        ingress.spec.rules = [rule]
+        service = MagicMock()
+        service.metadata.name = "shop-svc"
+        fixer.k8s.networking_v1.list_ingress_for_all_namespaces.return_value.items = [ingress]
+        fixer.k8s.v1.list_namespaced_service.return_value.items = [service]
+        return fixer, path
+
+    def test_sends_only_the_backend_name_with_a_precondition(self):
+        fixer, path = self._fixer()
+
+        results = asyncio.get_event_loop().run_until_complete(fixer.fix_ingress_backends())
+
+        fixer.k8s.networking_v1.patch_namespaced_ingress.assert_called_once_with("shop", "default", [
+            {"op": "test", "path": "/spec/rules/0/http/paths/0/backend/service/name", "value": "shop-old"},
+            {"op": "replace", "path": "/spec/rules/0/http/paths/0/backend/service/name", "value": "shop-svc"},
+        ])
+        assert results["patched"] == ["default/shop: shop-old -> shop-svc"]
+        # the listed object is not mutated
+        assert path.backend.service.name == "shop-old"
+
+    def test_rejected_patch_is_reported_as_failed(self):
+        fixer, _ = self._fixer()
+        fixer.k8s.networking_v1.patch_namespaced_ingress.side_effect = _make_api_exception(422)
+
+        results = asyncio.get_event_loop().run_until_complete(fixer.fix_ingress_backends())
+
+        assert results["patched"] == [] and len(results["failed"]) == 1
+        assert [op["status"] for op in results["operations"]] == ["failed"]
+
+
 # ── scale_resources ───────────────────────────────────────────────────────────
 
 
@@ -515,6 +657,22 @@ class TestScaleResources:
         assert "error" in result
         assert result["error"]["category"] == "not_found"
 
+    def test_patches_only_replicas(self):
+        fixer = _make_fixer()
+        dep = MagicMock()
+        dep.spec.replicas = 2
+        fixer.k8s.apps_v1.read_namespaced_deployment.return_value = dep
+
+        result = asyncio.get_event_loop().run_until_complete(
+            fixer.scale_resources("default", "myapp", 5)
+        )
+
+        assert result["status"] == "scaled"
+        fixer.k8s.apps_v1.patch_namespaced_deployment.assert_called_once_with("myapp", "default", [
+            {"op": "test", "path": "/spec/replicas", "value": 2},
+            {"op": "replace", "path": "/spec/replicas", "value": 5},
+        ])
+
 
 # ── apply_resource_limits ─────────────────────────────────────────────────────
 
@@ -543,6 +701,33 @@ class TestApplyResourceLimits:
         )
         assert result["status"] == "skipped"
 
+    def test_patches_only_the_limits_guarded_by_their_current_values(self):
+        fixer = _make_fixer()
+        dep = V1Deployment(
+            metadata=V1ObjectMeta(name="myapp", namespace="default", resource_version="7"),
+            spec=V1DeploymentSpec(selector=V1LabelSelector(), template=V1PodTemplateSpec(spec=V1PodSpec(containers=[
+                V1Container(name="app", resources=V1ResourceRequirements(limits={"cpu": "1"})),
+                V1Container(name="sidecar"),
+            ]))),
+        )
+        fixer.k8s.apps_v1.read_namespaced_deployment.return_value = dep
+
+        asyncio.get_event_loop().run_until_complete(
+            fixer.apply_resource_limits("default", "myapp", "500m", "512Mi")
+        )
+
+        containers = "/spec/template/spec/containers"
+        fixer.k8s.apps_v1.patch_namespaced_deployment.assert_called_once_with("myapp", "default", [
+            {"op": "test", "path": f"{containers}/0/name", "value": "app"},
+            {"op": "test", "path": f"{containers}/0/resources/limits/cpu", "value": "1"},
+            {"op": "replace", "path": f"{containers}/0/resources/limits/cpu", "value": "500m"},
+            {"op": "test", "path": "/metadata/resourceVersion", "value": "7"},
+            {"op": "add", "path": f"{containers}/0/resources/limits/memory", "value": "512Mi"},
+            {"op": "test", "path": f"{containers}/1/name", "value": "sidecar"},
+            {"op": "add", "path": f"{containers}/1/resources",
+             "value": {"limits": {"cpu": "500m", "memory": "512Mi"}}},
+        ])
+
 
 # ── fix_oomkilled_pods ────────────────────────────────────────────────────────
 
@@ -0,0 +1,159 @@
+"""Tests for src/k8s_diagnostics/automation/incremental.py and the informer change log"""
+
+import asyncio
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+from kubernetes.client import (
+    V1Container, V1ContainerState, V1ContainerStateWaiting, V1ContainerStatus,
+    V1ObjectMeta, V1Pod, V1PodSpec, V1PodStatus,
+)
+
+from k8s_diagnostics.automation.diagnostics import DiagnosticsEngine
+from k8s_diagnostics.automation.registry import DETECTORS_BY_TYPE
+from k8s_diagnostics.core.informer import InformerCache, ResourceInformer
+from k8s_diagnostics.core.snapshot import ClusterSnapshot
+
+
+def _pod(name, rv="1", phase="Running", waiting=None, restarts=0, namespace="prod"):
+    state = V1ContainerState(waiting=V1ContainerStateWaiting(reason=waiting)) if waiting else None
+    return V1Pod(
+        metadata=V1ObjectMeta(name=name, namespace=namespace, resource_version=rv, uid=f"uid-{name}"),
+        spec=V1PodSpec(containers=[V1Container(name="app", image="app:1")]),
+        status=V1PodStatus(phase=phase, container_statuses=[V1ContainerStatus(
+            name="app", image="app:1", image_id="", ready=not waiting,
+            restart_count=restarts, state=state,
+        )]),
+    )
+
+
+def _list_response(items, rv="100"):
+    return SimpleNamespace(items=items, metadata=SimpleNamespace(resource_version=rv, _continue=None))
+
+
+def _engine(pods):
+    k8s = MagicMock()
+    k8s.informers = None
+    k8s.v1.list_pod_for_all_namespaces.return_value = _list_response(pods)
+    return DiagnosticsEngine(k8s, incremental=True)
+
+
+def _snapshot(pods, **revisions):
+    return ClusterSnapshot(resources={"pods": tuple(pods)}, revisions=revisions)
+
+
+class TestIncrementalPodScan:
+    def test_matches_full_scan(self):
+        pods = [
+            _pod("a-ok"),
+            _pod("b-crash", waiting="CrashLoopBackOff", restarts=12),
+            _pod("c-pull", phase="Pending", waiting="ImagePullBackOff"),
+            _pod("d-failed", phase="Failed"),
+        ]
+        engine = _engine(pods)
+        reducers = ["failed_pods", "pending_count", "image_pull", "high_restart", "crashloop", "unready_pods"]
+
+        incremental = engine.incremental.scan_pods(_snapshot(pods), reducers)
+        full = engine._scan_pods(_snapshot(pods), reducers)
+
+        for key in ("failed_pods", "pending_count", "image_pull", "high_restart", "crashloop", "unready_pods"):
+            assert incremental[key] == full[key], key
+        assert [p.metadata.name for p in incremental["pending_pods"]] == ["c-pull"]
+
+    def test_only_changed_pods_are_reevaluated(self):
+        pods = [_pod(f"web-{i}") for i in range(50)]
+        engine = _engine(pods)
+        engine.incremental.scan_pods(_snapshot(pods))
+        engine._find_crashloop_pods = MagicMock(wraps=engine._find_crashloop_pods)
+
+        pods[7] = _pod("web-7", rv="2", waiting="CrashLoopBackOff", restarts=3)
+        scan = engine.incremental.scan_pods(_snapshot(pods))
+
+        assert scan["crashloop"] == ["prod/web-7 (container: app, restarts: 3)"]
+        assert engine._find_crashloop_pods.call_count == 1
+        assert engine.incremental.stats["pods_evaluated"] == 1
+
+    def test_deleted_pods_drop_their_findings(self):
+        pods = [_pod("ok"), _pod("broken", phase="Failed")]
+        engine = _engine(pods)
+        assert engine.incremental.scan_pods(_snapshot(pods))["failed_pods"] == ["prod/broken"]
+
+        scan = engine.incremental.scan_pods(_snapshot(pods[:1]))
+
+        assert scan["failed_pods"] == []
+        assert engine.incremental.stats["pods_removed"] == 1
+
+    def test_informer_change_log_drives_the_scan(self):
+        pods = [_pod("a"), _pod("b")]
+        engine = _engine(pods)
+        engine.k8s.informers = InformerCache({"pods": lambda: _list_response(pods)})
+        informer = engine.k8s.informers._informers["pods"]
+        informer._relist()
+        engine.incremental.scan_pods(_snapshot(pods))
+        assert engine.incremental.stats["source"] == "informer_resync"
+
+        informer.apply_event({"type": "MODIFIED", "object": _pod("b", rv="2", phase="Failed"), "raw_object": {}})
+        informer.apply_event({"type": "DELETED", "object": _pod("a"), "raw_object": {}})
+        scan = engine.incremental.scan_pods(_snapshot([]))
+
+        assert scan["failed_pods"] == ["prod/b"]
+        assert engine.incremental.stats == {
+            "source": "informer", "pods": 1, "pods_evaluated": 1, "pods_removed": 1, "pods_rechecked": 1,
+        }
+
+
+def test_change_log_reports_keys_and_requires_resync_after_relist():
+    informer = ResourceInformer("pods", lambda: _list_response([_pod("a")]))
+    informer._relist()
+    start = informer.revision
+
+    informer.apply_event({"type": "ADDED", "object": _pod("b"), "raw_object": {}})
+    informer.apply_event({"type": "MODIFIED", "object": _pod("a", rv="2"), "raw_object": {}})
+    revision, changed = informer.changes_since(start)
+
+    assert sorted(changed) == [("prod", "a"), ("prod", "b")]
+    assert informer.changes_since(revision) == (revision, [])
+    informer._relist()
+    assert informer.changes_since(revision)[1] is None
+
+
+def test_snapshot_only_detectors_are_reused_while_kinds_are_unchanged():
+    engine = _engine([])
+    engine._find_hpa_issues = MagicMock(return_value=["prod/web: ScalingActive=False"])
+    detector = DETECTORS_BY_TYPE["hpa_issues"]
+
+    def _hpa_snapshot(revision):
+        return ClusterSnapshot(resources={"hpas": ()}, revisions={"hpas": revision})
+
+    assert engine.incremental.detect(detector, _hpa_snapshot(5)) == ["prod/web: ScalingActive=False"]
+    engine.incremental.detect(detector, _hpa_snapshot(5))
+    assert engine._find_hpa_issues.call_count == 1
+
+    engine.incremental.detect(detector, _hpa_snapshot(9))
+    assert engine._find_hpa_issues.call_count == 2
+
+
+def test_detect_common_issues_reports_incremental_stats():
+    pods = [_pod("broken", phase="Failed")]
+    engine = _engine(pods)
+    engine.enabled_detectors = ["failed_pods"]
+
+    report = asyncio.get_event_loop().run_until_complete(engine.detect_common_issues())
+
+    assert [i["type"] for i in report["issues"]] == ["failed_pods"]
+    assert report["incremental"]["pods_evaluated"] == 1
+
+
+def test_request_ledger_follows_pod_changes():
+    pods = [_pod("a"), _pod("b")]
+    for pod in pods:
+        pod.spec.node_name = "node-1"
+        pod.spec.containers[0].resources = SimpleNamespace(requests={"cpu": "500m"})
+    engine = _engine(pods)
+    assert engine.incremental.scan_pods(_snapshot(pods))["node_requests"].get("node-1")[:3] == [1000.0, 0.0, 2]
+
+    moved = _pod("b", rv="2")
+    moved.spec.node_name = "node-2"
+    scan = engine.incremental.scan_pods(_snapshot([moved]))
+
+    assert scan["node_requests"].committed == {"node-2": [0.0, 0.0, 1, 0.0]}
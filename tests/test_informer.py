@@ -0,0 +1,138 @@
+"""Tests for src/k8s_diagnostics/core/informer.py and core.client.list_items"""
+
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+from k8s_diagnostics.core.client import filter_by_selectors, list_items
+from k8s_diagnostics.core.informer import InformerCache, ResourceInformer
+
+
+def _obj(name, namespace="default", labels=None, phase="Running", rv="1"):
+    return SimpleNamespace(
+        metadata=SimpleNamespace(
+            name=name, namespace=namespace, labels=labels or {}, resource_version=rv
+        ),
+        status=SimpleNamespace(phase=phase),
+    )
+
+
+def _list_response(items, rv="100"):
+    return SimpleNamespace(items=items, metadata=SimpleNamespace(resource_version=rv))
+
+
+def _synced_cache(kind, items):
+    cache = InformerCache({kind: lambda: _list_response(items)})
+    cache._informers[kind]._relist()
+    return cache
+
+
+class TestResourceInformer:
+    def test_relist_populates_store_and_marks_synced(self):
+        informer = ResourceInformer("pods", lambda: _list_response([_obj("a"), _obj("b")], rv="42"))
+        assert not informer.has_synced
+
+        informer._relist()
+
+        assert informer.has_synced
+        assert informer.resource_version == "42"
+        assert {p.metadata.name for p in informer.items()} == {"a", "b"}
+
+    def test_added_modified_deleted_events_update_store(self):
+        informer = ResourceInformer("pods", lambda: _list_response([]))
+        informer._relist()
+
+        informer.apply_event({
+            "type": "ADDED", "object": _obj("a"),
+            "raw_object": {"metadata": {"resourceVersion": "101"}},
+        })
+        informer.apply_event({
+            "type": "MODIFIED", "object": _obj("a", phase="Failed"),
+            "raw_object": {"metadata": {"resourceVersion": "102"}},
+        })
+        assert informer.get("default", "a").status.phase == "Failed"
+
+        informer.apply_event({
+            "type": "DELETED", "object": _obj("a"),
+            "raw_object": {"metadata": {"resourceVersion": "103"}},
+        })
+        assert informer.items() == []
+        assert informer.resource_version == "103"
+
+    def test_bookmark_advances_resource_version_only(self):
+        informer = ResourceInformer("pods", lambda: _list_response([_obj("a")]))
+        informer._relist()
+
+        informer.apply_event({
+            "type": "BOOKMARK", "object": None,
+            "raw_object": {"metadata": {"resourceVersion": "555"}},
+        })
+
+        assert informer.resource_version == "555"
+        assert len(informer.items()) == 1
+
+
+class TestInformerCache:
+    def test_items_is_none_until_synced(self):
+        cache = InformerCache({"pods": lambda: _list_response([_obj("a")])})
+        assert cache.items("pods") is None
+        assert cache.items("nodes") is None
+
+    def test_status_reports_each_kind(self):
+        cache = _synced_cache("pods", [_obj("a")])
+        assert cache.status()["pods"]["synced"] is True
+        assert cache.status()["pods"]["objects"] == 1
+
+
+class TestListItems:
+    def test_reads_from_synced_informer_without_api_call(self):
+        k8s = MagicMock()
+        k8s.informers = _synced_cache("pods", [_obj("a"), _obj("b", namespace="other")])
+
+        pods = list_items(k8s, "pods")
+
+        assert {p.metadata.name for p in pods} == {"a", "b"}
+        k8s.v1.list_pod_for_all_namespaces.assert_not_called()
+
+    def test_namespace_and_selectors_are_applied_to_cached_objects(self):
+        k8s = MagicMock()
+        k8s.informers = _synced_cache("pods", [
+            _obj("dns", namespace="kube-system", labels={"k8s-app": "kube-dns"}),
+            _obj("other", namespace="kube-system"),
+            _obj("failed", namespace="default", phase="Failed"),
+        ])
+
+        dns = list_items(k8s, "pods", namespace="kube-system", label_selector="k8s-app=kube-dns")
+        failed = list_items(k8s, "pods", field_selector="status.phase=Failed")
+
+        assert [p.metadata.name for p in dns] == ["dns"]
+        assert [p.metadata.name for p in failed] == ["failed"]
+
+    def test_falls_back_to_typed_list_call_without_informers(self):
+        k8s = MagicMock()
+        k8s.v1.list_pod_for_all_namespaces.return_value.items = [_obj("a")]
+
+        pods = list_items(k8s, "pods", field_selector="status.phase=Failed")
+
+        assert [p.metadata.name for p in pods] == ["a"]
+        k8s.v1.list_pod_for_all_namespaces.assert_called_once_with(
+            field_selector="status.phase=Failed"
+        )
+
+    def test_falls_back_to_namespaced_call(self):
+        k8s = MagicMock()
+        k8s.apps_v1.list_namespaced_deployment.return_value.items = []
+
+        list_items(k8s, "deployments", namespace="prod")
+
+        k8s.apps_v1.list_namespaced_deployment.assert_called_once_with("prod")
+
+
+class TestFilterBySelectors:
+    def test_not_equal_and_existence_terms(self):
+        items = [_obj("a", labels={"app": "x"}), _obj("b"), _obj("c", phase="Failed")]
+
+        assert [o.metadata.name for o in filter_by_selectors(items, label_selector="app")] == ["a"]
+        assert [o.metadata.name for o in filter_by_selectors(items, label_selector="!app")] == ["b", "c"]
+        assert [
+            o.metadata.name for o in filter_by_selectors(items, field_selector="status.phase!=Running")
+        ] == ["c"]
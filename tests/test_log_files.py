@@ -0,0 +1,95 @@
+"""Tests for src/k8s_diagnostics/analysis/log_files.py"""
+
+from k8s_diagnostics.analysis.log_files import analyze_files, line_aligned_chunks, match_chunk
+from k8s_diagnostics.analysis.pattern_matcher import match
+
+LOG_LINES = [
+    "2024-05-01T10:00:00.000Z INFO http method=GET path=/healthz status=200",
+    "2024-05-01T10:00:01.120Z ERROR dial tcp 10.0.3.7:5432: connect: connection refused",
+    "May  1 10:00:02 node-1 kubelet[812]: Container web was OOMKilled (exit code 137)",
+    "2024-05-01T10:00:03.000Z INFO retrying\r",
+    "E0501 10:00:04.512345  812 pod_workers.go:1298] DIAL TCP 10.0.3.7:5432: CONNECT: CONNECTION REFUSED\r",
+    "2024-05-01T10:00:05.000Z WARN réessai: dial tcp 10.0.3.7:5432: connect: connection refused",
+    "2024-05-01T10:00:06.000Z INFO x509: certificate has expired or is not yet valid\x1cafter rotation",
+    "2024-05-01T10:00:07.000Z INFO http method=GET path=/healthz status=200",
+]
+
+
+def _per_line_counts(text):
+    counts = {}
+    for line in text.split("\n"):
+        for pm in match(line.strip()):
+            counts[pm.error_class] = counts.get(pm.error_class, 0) + 1
+    return counts
+
+
+def _log(tmp_path, name="app.log", lines=LOG_LINES, repeat=1):
+    path = tmp_path / name
+    path.write_bytes(("\n".join(lines * repeat) + "\n").encode())
+    return str(path)
+
+
+def test_chunks_end_after_a_newline_and_cover_the_file(tmp_path):
+    path = _log(tmp_path, repeat=20)
+    data = open(path, "rb").read()
+
+    chunks = line_aligned_chunks(path, chunk_bytes=500)
+
+    assert chunks[0][0] == 0 and chunks[-1][1] == len(data)
+    assert all(a[1] == b[0] for a, b in zip(chunks, chunks[1:]))
+    assert all(data[end - 1:end] == b"\n" for _, end in chunks)
+
+
+def test_counts_each_class_once_per_line_like_match():
+    data = "\n".join(LOG_LINES).encode()
+
+    result = match_chunk(data)
+
+    counts = {cls: hit["count"] for cls, hit in result["classes"].items()}
+    assert counts == _per_line_counts(data.decode())
+    assert counts["connection_refused"] == 3
+    assert result["lines"] == len(LOG_LINES)
+
+
+def test_first_and_last_carry_offsets_line_and_timestamp(tmp_path):
+    path = _log(tmp_path)
+
+    result = analyze_files([path], workers=1)
+
+    refused = next(c for c in result["classes"] if c["error_class"] == "connection_refused")
+    assert refused["first"]["line"] == 2
+    assert refused["first"]["offset"] == len(LOG_LINES[0]) + 1
+    assert refused["first"]["timestamp"] == "2024-05-01T10:00:01.120Z"
+    assert refused["last"]["line"] == 6
+    assert refused["fix"]["command"] and refused["root_cause"]
+    oom = next(c for c in result["classes"] if c["error_class"] == "oomkilled")
+    assert oom["first"]["timestamp"] == "May  1 10:00:02"
+    assert oom["first"]["text"].endswith("(exit code 137)")
+
+
+def test_chunking_and_workers_do_not_change_the_result(tmp_path):
+    first = _log(tmp_path, "a.log", repeat=30)
+    second = _log(tmp_path, "b.log", repeat=7)
+
+    def summary(result):
+        return [(c["error_class"], c["count"], c["first"], c["last"]) for c in result["classes"]]
+
+    whole = analyze_files([first, second], workers=1)
+    chunked = analyze_files([first, second], workers=1, chunk_bytes=300)
+    pooled = analyze_files([first, second], workers=2, chunk_bytes=300)
+
+    assert chunked["chunks"] > whole["chunks"] == 2
+    assert pooled["workers"] == 2
+    assert summary(whole) == summary(chunked) == summary(pooled)
+    assert whole["lines"] == len(LOG_LINES) * 37
+    last = {c["error_class"]: c["last"] for c in whole["classes"]}["connection_refused"]
+    assert (last["path"], last["line"]) == (second, len(LOG_LINES) * 6 + 6)
+
+
+def test_empty_file_has_no_chunks(tmp_path):
+    path = tmp_path / "empty.log"
+    path.write_bytes(b"")
+
+    result = analyze_files([str(path)])
+
+    assert (result["chunks"], result["lines"], result["classes"]) == (0, 0, [])
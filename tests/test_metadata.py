@@ -0,0 +1,79 @@
+"""Tests for metadata-only listing (core.client.list_metadata) and its callers."""
+
+import json
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+from kubernetes.client import (
+    V1Container, V1EnvFromSource, V1ObjectMeta, V1Pod, V1PodSpec, V1PodStatus,
+    V1SecretEnvSource,
+)
+
+from k8s_diagnostics.automation.diagnostics import DiagnosticsEngine
+from k8s_diagnostics.core.client import METADATA_ACCEPT, list_metadata
+
+
+def _metadata_response(names, continue_token=None):
+    body = {
+        "kind": "PartialObjectMetadataList",
+        "apiVersion": "meta.k8s.io/v1",
+        "metadata": {"continue": continue_token} if continue_token else {},
+        "items": [{"metadata": {"name": name, "namespace": "prod"}} for name in names],
+    }
+    return SimpleNamespace(data=json.dumps(body).encode())
+
+
+def _k8s(*responses):
+    k8s = MagicMock()
+    k8s.informers = None
+    k8s.v1.api_client.call_api.side_effect = list(responses)
+    return k8s
+
+
+class TestListMetadata:
+    def test_requests_partial_object_metadata(self):
+        k8s = _k8s(_metadata_response(["db-creds"]))
+
+        items = list_metadata(k8s, "secrets", namespace="prod")
+
+        assert [i.metadata.name for i in items] == ["db-creds"]
+        args, kwargs = k8s.v1.api_client.call_api.call_args
+        assert args == ("/api/v1/namespaces/prod/secrets", "GET")
+        assert kwargs["header_params"] == {"Accept": METADATA_ACCEPT}
+        assert kwargs["_preload_content"] is False
+        k8s.v1.list_namespaced_secret.assert_not_called()
+
+    def test_follows_continue_and_sends_selectors(self):
+        k8s = _k8s(
+            _metadata_response(["a"], continue_token="next"),
+            _metadata_response(["b"]),
+        )
+
+        items = list_metadata(k8s, "configmaps", page_size=1, label_selector="app=web")
+
+        assert [i.metadata.name for i in items] == ["a", "b"]
+        first, second = k8s.v1.api_client.call_api.call_args_list
+        assert first.args[0] == "/api/v1/configmaps"
+        assert first.kwargs["query_params"] == [("labelSelector", "app=web"), ("limit", 1)]
+        assert ("continue", "next") in second.kwargs["query_params"]
+
+
+def test_missing_config_refs_use_metadata_listing():
+    k8s = _k8s(_metadata_response(["present"]))
+    pod = V1Pod(
+        metadata=V1ObjectMeta(name="web-1", namespace="prod"),
+        spec=V1PodSpec(containers=[V1Container(
+            name="web",
+            env_from=[
+                V1EnvFromSource(secret_ref=V1SecretEnvSource(name="present")),
+                V1EnvFromSource(secret_ref=V1SecretEnvSource(name="absent")),
+            ],
+        )]),
+        status=V1PodStatus(phase="Pending"),
+    )
+
+    missing = DiagnosticsEngine(k8s)._find_missing_config_refs([pod])
+
+    assert len(missing) == 1 and "absent" in missing[0]
+    assert "present" not in missing[0]
+    k8s.v1.list_namespaced_secret.assert_not_called()
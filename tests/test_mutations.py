@@ -0,0 +1,215 @@
+"""Tests for src/k8s_diagnostics/automation/mutations.py and executor-driven fixers"""
+
+import asyncio
+import threading
+import time
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+from kubernetes.client import (
+    V1LabelSelector, V1ObjectMeta, V1OwnerReference, V1Pod, V1PodDisruptionBudget,
+    V1PodDisruptionBudgetSpec, V1PodDisruptionBudgetStatus, V1PodSpec, V1PodStatus,
+)
+from kubernetes.client.rest import ApiException
+
+from k8s_diagnostics.automation.fixes import AutoFixer
+from k8s_diagnostics.automation.mutations import (
+    FAILED, OK, SKIPPED, DisruptionBudgets, Mutation, MutationExecutor, TokenBucket,
+)
+from k8s_diagnostics.core.client import K8sClient
+
+
+def _run(coro):
+    return asyncio.get_event_loop().run_until_complete(coro)
+
+
+class _FakeClock:
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps = []
+
+    def __call__(self):
+        return self.now
+
+    async def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+def _pdb(allowed, name="web", healthy=3):
+    return V1PodDisruptionBudget(
+        metadata=V1ObjectMeta(name=name, namespace="prod"),
+        spec=V1PodDisruptionBudgetSpec(selector=V1LabelSelector(match_labels={"app": "web"})),
+        status=V1PodDisruptionBudgetStatus(
+            disruptions_allowed=allowed, current_healthy=healthy, desired_healthy=2, expected_pods=3,
+        ),
+    )
+
+
+def test_token_bucket_allows_burst_then_paces_at_qps():
+    clock = _FakeClock()
+    bucket = TokenBucket(qps=10, burst=3, clock=clock, sleep=clock.sleep)
+
+    async def take(n):
+        for _ in range(n):
+            await bucket.acquire()
+
+    _run(take(3))
+    assert clock.now == 0
+    _run(take(5))
+    assert abs(clock.now - 0.5) < 1e-9
+
+
+class TestDisruptionBudgets:
+    def _budgets(self, reads, wait_seconds=30):
+        clock = _FakeClock()
+        reader = MagicMock(side_effect=[n if isinstance(n, V1PodDisruptionBudget) else _pdb(n) for n in reads])
+        budgets = DisruptionBudgets(reader, wait_seconds=wait_seconds, poll_seconds=5,
+                                    clock=clock, sleep=clock.sleep)
+        return budgets, reader, clock
+
+    def test_spent_budget_waits_for_the_pdb_to_recover(self):
+        # The controller sees the deleted pod go (2 healthy), then its replacement (3)
+        budgets, reader, clock = self._budgets(reads=[_pdb(0, healthy=2), _pdb(1, healthy=3)])
+        key = budgets.track(_pdb(1))
+
+        assert _run(budgets.acquire([key])) is None
+        assert _run(budgets.acquire([key])) is None
+
+        reader.assert_called_with("prod", "web")
+        assert clock.now == 10
+        assert budgets.remaining(key) == 0
+
+    def test_stale_status_does_not_refund_spent_disruptions(self):
+        # The PDB status still reports the allowance it had before our deletion
+        budgets, reader, clock = self._budgets(reads=[1] * 10, wait_seconds=15)
+        key = budgets.track(_pdb(1))
+
+        assert _run(budgets.acquire([key])) is None
+        assert "stayed exhausted" in _run(budgets.acquire([key]))
+        assert budgets.remaining(key) == 0
+        assert reader.call_count > 0
+
+    def test_budget_that_stays_exhausted_gives_up_once(self):
+        budgets, reader, clock = self._budgets(reads=[0] * 10, wait_seconds=15)
+        key = budgets.track(_pdb(0))
+
+        reason = _run(budgets.acquire([key]))
+        assert "stayed exhausted for 15s" in reason
+        calls = reader.call_count
+        # later deletions under the same PDB do not wait again
+        assert _run(budgets.acquire([key])) == reason
+        assert reader.call_count == calls
+
+    def test_pdbs_without_a_status_are_not_paced(self):
+        budgets, _, _ = self._budgets(reads=[])
+        assert budgets.track(V1PodDisruptionBudget(metadata=V1ObjectMeta(name="x", namespace="prod"))) is None
+
+
+class TestMutationExecutor:
+    def test_outcomes_keep_submission_order_and_report_progress(self):
+        def fail():
+            raise ApiException(status=409)
+
+        mutations = [
+            Mutation("prod/a", "prod", lambda: "a"),
+            Mutation("prod/b", "prod", fail),
+            Mutation("dev/c", "dev", lambda: "c"),
+        ]
+        progress = []
+
+        outcomes = _run(MutationExecutor(qps=None).run(mutations, progress=progress.append))
+
+        assert [o.status for o in outcomes] == [OK, FAILED, OK]
+        assert [o.result for o in outcomes] == ["a", None, "c"]
+        assert isinstance(outcomes[1].error, ApiException)
+        assert [p["done"] for p in progress] == [1, 2, 3]
+        assert progress[-1] == {"total": 3, "done": 3, OK: 2, FAILED: 1, SKIPPED: 0}
+
+    def test_per_namespace_cap_limits_concurrent_calls(self):
+        lock = threading.Lock()
+        active = {"prod": 0}
+        peak = {"prod": 0}
+
+        def call():
+            with lock:
+                active["prod"] += 1
+                peak["prod"] = max(peak["prod"], active["prod"])
+            time.sleep(0.02)
+            with lock:
+                active["prod"] -= 1
+
+        executor = MutationExecutor(qps=None, max_concurrency=8, per_namespace=2)
+        _run(executor.run([Mutation(f"prod/{i}", "prod", call) for i in range(8)]))
+
+        assert peak["prod"] == 2
+
+    def test_failed_call_refunds_its_disruption(self):
+        def fail():
+            raise ApiException(status=500)
+
+        budgets = DisruptionBudgets(MagicMock(), wait_seconds=0)
+        key = budgets.track(_pdb(1))
+
+        [outcome] = _run(MutationExecutor(qps=None).run([Mutation("prod/a", "prod", fail, (key,))], budgets))
+
+        assert outcome.status == FAILED
+        assert budgets.remaining(key) == 1
+
+
+def _failed_pod(i):
+    return V1Pod(
+        metadata=V1ObjectMeta(
+            name=f"web-{i}", namespace="prod", labels={"app": "web"},
+            owner_references=[V1OwnerReference(api_version="apps/v1", kind="ReplicaSet", name="web-7d9f",
+                                               uid="uid-rs", controller=True)],
+        ),
+        spec=V1PodSpec(containers=[]),
+        status=V1PodStatus(phase="Failed"),
+    )
+
+
+def test_restart_failed_pods_paces_deletions_against_the_pdb():
+    fixer = AutoFixer(MagicMock(), executor=MutationExecutor(qps=None, pdb_wait_seconds=0))
+    fixer.k8s.informers = None
+    fixer.k8s.v1.list_pod_for_all_namespaces.return_value.items = [_failed_pod(i) for i in range(3)]
+    fixer.k8s.policy_v1.list_namespaced_pod_disruption_budget.return_value.items = [_pdb(1)]
+    fixer.k8s.policy_v1.read_namespaced_pod_disruption_budget.return_value = _pdb(0)
+    progress = []
+
+    results = _run(fixer.restart_failed_pods(progress=progress.append))
+
+    assert results["restarted"] == ["prod/web-0"]
+    assert fixer.k8s.v1.delete_namespaced_pod.call_count == 1
+    assert [op["status"] for op in results["operations"]] == ["applied", "skipped", "skipped"]
+    assert "PDB 'prod/web' disruption budget stayed exhausted" in results["skipped"][0]
+    assert progress[-1]["skipped"] == 2
+
+
+def test_real_client_exposes_policy_v1_for_pdb_checks():
+    with patch("k8s_diagnostics.core.client.config.load_incluster_config"), \
+            patch("k8s_diagnostics.core.client.client.PolicyV1Api") as policy_api:
+        k8s = K8sClient()
+    policy_api.return_value.list_namespaced_pod_disruption_budget.return_value.items = [_pdb(0)]
+    pod = V1Pod(metadata=V1ObjectMeta(name="web-0", namespace="prod", labels={"app": "web"}))
+
+    reason = AutoFixer(k8s)._pdb_would_be_violated(pod)
+
+    assert k8s.policy_v1 is policy_api.return_value
+    assert "PDB 'prod/web' allows 0 disruptions" in reason
+
+
+def test_cleanup_evicted_pods_records_timeouts_as_failed():
+    fixer = AutoFixer(MagicMock(), executor=MutationExecutor(qps=None, timeout_seconds=0.01))
+    fixer.k8s.informers = None
+    pod = SimpleNamespace(
+        metadata=SimpleNamespace(name="web-0", namespace="prod"),
+        status=SimpleNamespace(phase="Failed", reason="Evicted"),
+    )
+    fixer.k8s.v1.list_pod_for_all_namespaces.return_value.items = [pod]
+    fixer.k8s.v1.delete_namespaced_pod.side_effect = lambda *args: time.sleep(0.2)
+
+    results = _run(fixer.cleanup_evicted_pods(bulk=False))
+
+    assert results["cleaned"] == []
+    assert results["failed"][0]["prod/web-0"]["category"] == "timeout"
@@ -0,0 +1,162 @@
+"""Tests for src/k8s_diagnostics/automation/owners.py"""
+
+import asyncio
+from unittest.mock import MagicMock
+
+from kubernetes.client import (
+    V1Container, V1ContainerState, V1ContainerStateTerminated, V1ContainerStatus, V1Deployment,
+    V1DeploymentSpec, V1LabelSelector, V1ObjectMeta, V1OwnerReference, V1Pod, V1PodSpec,
+    V1PodStatus, V1PodTemplateSpec, V1ReplicaSet, V1StatefulSet, V1StatefulSetSpec,
+)
+
+from k8s_diagnostics.automation.fixes import AutoFixer
+from k8s_diagnostics.automation.owners import OwnerGraph
+
+
+def _ref(kind, name, uid, controller=True):
+    return V1OwnerReference(api_version="apps/v1", kind=kind, name=name, uid=uid, controller=controller)
+
+
+def _meta(name, uid, labels=None, owner=None):
+    return V1ObjectMeta(
+        name=name, namespace="prod", uid=uid, labels=labels, owner_references=[owner] if owner else None,
+    )
+
+
+def _deployment(name, uid, labels):
+    return V1Deployment(
+        metadata=_meta(name, uid),
+        spec=V1DeploymentSpec(
+            selector=V1LabelSelector(match_labels=labels),
+            template=V1PodTemplateSpec(spec=V1PodSpec(containers=[V1Container(name="app")])),
+        ),
+    )
+
+
+def _pod(name, owner=None, labels=None):
+    return V1Pod(
+        metadata=_meta(name, f"uid-{name}", labels, owner),
+        spec=V1PodSpec(containers=[V1Container(name="app")]),
+        status=V1PodStatus(container_statuses=[V1ContainerStatus(
+            name="app", image="app:1", image_id="", ready=False, restart_count=1,
+            state=V1ContainerState(terminated=V1ContainerStateTerminated(exit_code=137, reason="OOMKilled")),
+        )]),
+    )
+
+
+# Two Deployments whose selectors both match app=web pods
+WEB = _deployment("web", "uid-web", {"app": "web"})
+WEB_CANARY = _deployment("web-canary", "uid-canary", {"app": "web"})
+WEB_RS = V1ReplicaSet(metadata=_meta("web-7d9f", "uid-web-rs", owner=_ref("Deployment", "web", "uid-web")))
+CANARY_RS = V1ReplicaSet(
+    metadata=_meta("web-canary-5c8b", "uid-canary-rs", owner=_ref("Deployment", "web-canary", "uid-canary")),
+)
+DB = V1StatefulSet(
+    metadata=_meta("db", "uid-db"),
+    spec=V1StatefulSetSpec(
+        selector=V1LabelSelector(match_labels={"app": "db"}),
+        service_name="db",
+        template=V1PodTemplateSpec(spec=V1PodSpec(containers=[V1Container(name="app")])),
+    ),
+)
+# A ReplicaSet with no controller of its own: the top-level workload, but not patchable
+BARE_RS = V1ReplicaSet(metadata=_meta("batch-rs", "uid-batch-rs"))
+
+
+def _graph():
+    return OwnerGraph([
+        ("Deployment", WEB), ("Deployment", WEB_CANARY),
+        ("ReplicaSet", WEB_RS), ("ReplicaSet", CANARY_RS), ("StatefulSet", DB),
+    ])
+
+
+class TestOwnerGraph:
+    def test_walks_controller_references_to_the_workload(self):
+        pod = _pod("web-7d9f-x", _ref("ReplicaSet", "web-7d9f", "uid-web-rs"))
+
+        assert [kind for kind, _ in _graph().chain(pod)] == ["ReplicaSet", "Deployment"]
+        assert _graph().workload(pod) == ("Deployment", WEB)
+
+    def test_unresolved_and_non_controller_references(self):
+        graph = _graph()
+
+        assert graph.workload(_pod("bare")) is None
+        assert graph.workload(_pod("orphan", _ref("ReplicaSet", "gone", "uid-gone"))) is None
+        assert not graph.resolves(_pod("adopted", _ref("ReplicaSet", "web-7d9f", "uid-web-rs", controller=False)))
+
+    def test_lazy_build_lists_each_kind_once_on_first_lookup(self):
+        k8s = MagicMock()
+        k8s.informers = None
+        k8s.apps_v1.list_replica_set_for_all_namespaces.return_value.items = [WEB_RS]
+        k8s.apps_v1.list_deployment_for_all_namespaces.return_value.items = [WEB]
+        k8s.batch_v1.list_cron_job_for_all_namespaces.side_effect = RuntimeError("forbidden")
+        graph = OwnerGraph.build(k8s, lazy=True)
+        k8s.apps_v1.list_replica_set_for_all_namespaces.assert_not_called()
+
+        pod = _pod("web-7d9f-x", _ref("ReplicaSet", "web-7d9f", "uid-web-rs"))
+        for _ in range(3):
+            assert graph.workload(pod) == ("Deployment", WEB)
+
+        k8s.apps_v1.list_replica_set_for_all_namespaces.assert_called_once()
+        assert len(graph) == 2
+
+
+class TestFixerOwnerResolution:
+    def _fixer(self, pods):
+        fixer = AutoFixer(MagicMock())
+        fixer.k8s.informers = None
+        fixer.k8s.v1.list_pod_for_all_namespaces.return_value.items = pods
+        fixer.k8s.apps_v1.list_replica_set_for_all_namespaces.return_value.items = [WEB_RS, CANARY_RS, BARE_RS]
+        fixer.k8s.apps_v1.list_deployment_for_all_namespaces.return_value.items = [WEB, WEB_CANARY]
+        fixer.k8s.apps_v1.list_stateful_set_for_all_namespaces.return_value.items = [DB]
+        fixer.k8s.apps_v1.list_namespaced_deployment.return_value.items = [WEB, WEB_CANARY]
+        return fixer
+
+    def test_overlapping_selectors_resolve_through_owner_references(self):
+        pod = _pod("web-canary-5c8b-x", _ref("ReplicaSet", "web-canary-5c8b", "uid-canary-rs"), {"app": "web"})
+        fixer = self._fixer([pod])
+
+        result = asyncio.get_event_loop().run_until_complete(fixer.fix_oomkilled_pods(dry_run=True))
+
+        assert [op["resource"] for op in result["operations"]] == ["deployment/prod/web-canary"]
+        fixer.k8s.apps_v1.list_namespaced_deployment.assert_not_called()
+
+    def test_statefulset_owned_oomkilled_pod_patches_the_statefulset(self):
+        pod = _pod("db-0", _ref("StatefulSet", "db", "uid-db"), {"app": "web"})
+        fixer = self._fixer([pod])
+
+        result = asyncio.get_event_loop().run_until_complete(fixer.fix_oomkilled_pods(dry_run=True))
+
+        assert result["skipped"] == []
+        [op] = result["operations"]
+        assert op["resource"] == "statefulset/prod/db"
+        assert op["api_call"] == "AppsV1Api.patch_namespaced_stateful_set"
+        assert op["kubectl_equivalent"].startswith("kubectl set resources statefulset db -n prod")
+
+    def test_statefulset_patch_goes_to_the_statefulset_api(self):
+        pod = _pod("db-0", _ref("StatefulSet", "db", "uid-db"))
+        fixer = self._fixer([pod])
+
+        asyncio.get_event_loop().run_until_complete(fixer.fix_oomkilled_pods(dry_run=False))
+
+        fixer.k8s.apps_v1.patch_namespaced_stateful_set.assert_called_once()
+        assert fixer.k8s.apps_v1.patch_namespaced_stateful_set.call_args[0][:2] == ("db", "prod")
+        fixer.k8s.apps_v1.patch_namespaced_deployment.assert_not_called()
+
+    def test_unpatchable_workload_kinds_are_named_in_the_skip_reason(self):
+        pod = _pod("batch-rs-x", _ref("ReplicaSet", "batch-rs", "uid-batch-rs"), {"app": "web"})
+        fixer = self._fixer([pod])
+
+        result = asyncio.get_event_loop().run_until_complete(fixer.fix_oomkilled_pods(dry_run=True))
+
+        assert result["skipped"] == ["prod/batch-rs-x (owned by ReplicaSet prod/batch-rs, which cannot be patched)"]
+        assert result["operations"] == []
+
+    def test_pods_without_a_controller_fall_back_to_selectors(self):
+        fixer = self._fixer([])
+        pod = _pod("static", labels={"app": "web"})
+        fixer.k8s.apps_v1.list_namespaced_deployment.return_value.items = [WEB]
+
+        owners = OwnerGraph.build(fixer.k8s, lazy=True)
+        assert fixer._find_patchable_workload(pod, owners=owners) == ("Deployment", WEB)
+        assert len(owners) == 6
@@ -0,0 +1,86 @@
+"""Tests for paginated pod listing (core.client.iter_pages) and streaming detection."""
+
+import asyncio
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+from kubernetes.client import V1Container, V1ObjectMeta, V1Pod, V1PodSpec, V1PodStatus
+
+from k8s_diagnostics.automation.diagnostics import DiagnosticsEngine
+from k8s_diagnostics.core.client import iter_pages
+from k8s_diagnostics.core.informer import InformerCache
+
+
+def _pod(name, phase="Running", namespace="default"):
+    return V1Pod(
+        metadata=V1ObjectMeta(name=name, namespace=namespace),
+        spec=V1PodSpec(containers=[V1Container(name="app")]),
+        status=V1PodStatus(phase=phase),
+    )
+
+
+def _page(items, continue_token=None):
+    return SimpleNamespace(items=items, metadata=SimpleNamespace(_continue=continue_token))
+
+
+def _paged_k8s(*pages):
+    k8s = MagicMock()
+    k8s.informers = None
+    responses = [
+        _page(items, continue_token=f"token-{i + 1}" if i + 1 < len(pages) else None)
+        for i, items in enumerate(pages)
+    ]
+    k8s.v1.list_pod_for_all_namespaces.side_effect = responses
+    k8s.v1.list_secret_for_all_namespaces.return_value = _page([])
+    return k8s
+
+
+class TestIterPages:
+    def test_follows_continue_token_until_exhausted(self):
+        k8s = _paged_k8s([_pod("a"), _pod("b")], [_pod("c")])
+
+        pages = list(iter_pages(k8s, "pods", page_size=2))
+
+        assert [[p.metadata.name for p in page] for page in pages] == [["a", "b"], ["c"]]
+        calls = k8s.v1.list_pod_for_all_namespaces.call_args_list
+        assert calls[0].kwargs == {"limit": 2}
+        assert calls[1].kwargs == {"limit": 2, "_continue": "token-1"}
+
+    def test_selectors_are_sent_with_every_page(self):
+        k8s = _paged_k8s([_pod("a")], [_pod("b")])
+
+        list(iter_pages(k8s, "pods", page_size=1, field_selector="status.phase=Pending"))
+
+        for call in k8s.v1.list_pod_for_all_namespaces.call_args_list:
+            assert call.kwargs["field_selector"] == "status.phase=Pending"
+
+    def test_synced_informer_store_is_sliced_without_api_calls(self):
+        k8s = MagicMock()
+        k8s.informers = InformerCache({
+            "pods": lambda: SimpleNamespace(
+                items=[_pod(str(i)) for i in range(5)],
+                metadata=SimpleNamespace(resource_version="1"),
+            )
+        })
+        k8s.informers._informers["pods"]._relist()
+
+        pages = list(iter_pages(k8s, "pods", page_size=2))
+
+        assert [len(page) for page in pages] == [2, 2, 1]
+        k8s.v1.list_pod_for_all_namespaces.assert_not_called()
+
+
+def test_detect_common_issues_streams_pods_across_pages():
+    k8s = _paged_k8s(
+        [_pod("ok"), _pod("broken-1", phase="Failed")],
+        [_pod("broken-2", phase="Failed"), _pod("waiting", phase="Pending")],
+    )
+    engine = DiagnosticsEngine(k8s, pod_page_size=2)
+
+    report = asyncio.get_event_loop().run_until_complete(engine.detect_common_issues())
+
+    by_type = {issue["type"]: issue for issue in report["issues"]}
+    assert by_type["failed_pods"]["details"] == ["default/broken-1", "default/broken-2"]
+    assert by_type["pending_pods"]["count"] == 1
+    pod_list_calls = k8s.v1.list_pod_for_all_namespaces.call_args_list
+    assert all(call.kwargs.get("limit") == 2 for call in pod_list_calls)
@@ -3,8 +3,18 @@
 import pytest
 from unittest.mock import MagicMock
 
+import re
+
 from k8s_diagnostics.analysis.pattern_matcher import (
+    _COMPILED,
+    _ENGINE,
+    MatchCache,
     PatternMatch,
+    _fold_case,
+    _literal_runs,
+    _required_literals,
+    event_cache,
+    format_match,
     match,
     match_events,
     match_log_lines,
@@ -137,6 +147,72 @@ class TestMatch:
         assert pm.confidence in ("high", "medium")
 
 
+# ── pattern engine ───────────────────────────────────────────────────────────
+
+
+def _reference(text):
+    """Every IGNORECASE regex, one at a time, as match() originally worked."""
+    found, seen = [], set()
+    for compiled, pattern in _COMPILED:
+        m = compiled.search(text)
+        if m and pattern.error_class not in seen:
+            seen.add(pattern.error_class)
+            found.append((pattern.error_class, m.group(0)))
+    return found
+
+
+class TestPatternEngine:
+    @pytest.mark.parametrize("text", [
+        "Warning BackOff: Back-off pulling image \"Registry.Example.com/Web:1.2\"",
+        "READINESS PROBE FAILED: dial tcp 10.0.0.7:8080: connect: CONNECTION REFUSED",
+        "Container App was OOMKilled; Killed process 4242 (java)",
+        "exec /App/Run.sh: Exec Format Error, executable file not found in $PATH",
+        "0/30 nodes are available: 30 Insufficient CPU, 3 node(s) had untolerated taint",
+        "Config-Service not ready, retrying",
+        "everything is fine",
+    ])
+    def test_matches_the_ignorecase_reference_and_keeps_signal_case(self, text):
+        assert [(pm.error_class, pm.signal) for pm in match(text)] == _reference(text)
+
+    def test_non_ascii_text_uses_the_ignorecase_patterns(self):
+        # "ſ" (long s) matches "s" only under IGNORECASE; lowercasing does not map it
+        text = "Secret \"db\" not found – ſecret \"x\" missing"
+        assert [(pm.error_class, pm.signal) for pm in match(text)] == _reference(text)
+
+    def test_fold_case_lowers_literals_but_not_escapes(self):
+        assert _fold_case(r"ErrImage\S+ in \$PATH") == r"errimage\S+ in \$path"
+
+    def test_healthy_log_line_runs_no_pattern(self):
+        line = "2024-05-01T10:00:01Z INFO http method=GET path=/api/v1/items/7 status=200 duration_ms=12"
+        assert _ENGINE.candidates(line.lower()) == []
+
+    def test_candidates_are_only_patterns_whose_literals_occur(self):
+        classes = {p.error_class for p in _ENGINE.candidates("container app was oomkilled")}
+        assert "oomkilled" in classes
+        assert "dns_nxdomain" not in classes
+
+
+class TestRequiredLiterals:
+    @pytest.mark.parametrize("regex, literals", [
+        (r"manifest unknown|tag does not exist", {"manifest unknown", "tag does not exist"}),
+        (r"OOMKilled|oom.kill", {"oomkilled", "kill"}),
+        (r"colou?r", {"colo"}),
+        (r"node\(s\) had untolerated taint", {"node(s) had untolerated taint"}),
+        (r"(?:alpha|beta)x", {"alpha", "beta"}),
+        (r"(?:alpha|beta)?gamma", {"gamma"}),
+        (r"[a-z0-9-]+-service\s+not ready", {"not ready"}),
+    ])
+    def test_extracts_one_required_literal_per_branch(self, regex, literals):
+        assert _required_literals(regex) == literals
+
+    def test_branch_without_a_required_literal_disables_the_prefilter(self):
+        assert _required_literals(r"timeout|\d+") is None
+        assert _required_literals(r"(?=x).*") is None
+
+    def test_every_library_pattern_has_literals(self):
+        assert all(literals for *_, literals in _ENGINE._entries)
+
+
 # ── match_events() ────────────────────────────────────────────────────────────
 
 
@@ -197,6 +273,100 @@ class TestMatchEvents:
         assert "liveness_killing_pod" in classes
 
 
+# ── MatchCache ────────────────────────────────────────────────────────────────
+
+
+class TestMatchCache:
+    def test_masks_pod_hashes_uids_ips_and_numbers(self):
+        template = MatchCache().template(
+            "Back-off restarting failed container app in pod web-7d9f8b6c5-x2k4q_prod"
+            "(5f0c1a2b-1111-2222-3333-444455556666), dial 10.0.3.7 after 12 retries"
+        )
+        assert template == (
+            "back-off restarting failed container app in pod web-\u2039pod\u203a_prod"
+            "(\u2039uid\u203a), dial \u2039ip\u203a after \u2039num\u203a retries"
+        )
+
+    @pytest.mark.parametrize("text, kept", [
+        # "0/" is read by the insufficient_resources pattern; 3000 is not
+        ("0/3000 nodes are available: 3000 Insufficient cpu", "0/\u2039num\u203a nodes"),
+        ("Failed to pull image: dial tcp 10.1.2.3:443: i/o timeout", ":443:"),
+        ("DNS lookup took 5 seconds", " 5 "),
+    ])
+    def test_keeps_tokens_a_pattern_literal_reads(self, text, kept):
+        assert kept in MatchCache().template(text)
+
+    def test_literal_of_a_pattern_that_cannot_match_does_not_block_masking(self):
+        # "5" belongs to dns_conntrack_race, which needs "dns", "second", ... to match
+        assert MatchCache().template("Back-off restarting failed container, 5 restarts") == (
+            "back-off restarting failed container, \u2039num\u203a restarts"
+        )
+
+    def test_messages_with_one_template_match_alike(self):
+        cache = MatchCache()
+        texts = [
+            f"0/{n} nodes are available: {n} Insufficient memory. pod web-7d9f8b6c5-x2k{c}q"
+            for c, n in zip("4567", [3, 40, 500, 3000])
+        ]
+        results = [cache.match(text) for text in texts]
+
+        assert cache.hits == 3 and cache.misses == 1
+        assert results == [match(text) for text in texts]
+
+    def test_hits_carry_the_messages_own_signal(self):
+        cache = MatchCache()
+        first, second = (
+            f'Readiness probe failed: Get "http://{ip}:8080/ready": dial tcp {ip}:8080: connect: connection refused'
+            for ip in ("10.0.0.5", "10.0.0.9")
+        )
+        cached = cache.match(first)
+
+        hit = cache.match(second)
+
+        assert cache.hits == 1
+        assert hit == match(second)
+        assert all("10.0.0.9" in pm.signal and pm.matched_text == second[:200] for pm in hit)
+        assert not any(a is b for a, b in zip(cached, hit))
+
+    def test_lru_evicts_least_recently_used_template(self):
+        cache = MatchCache(maxsize=2)
+        cache.match("OOMKilled")
+        cache.match("manifest unknown")
+        cache.match("OOMKilled")
+        cache.match("x509: certificate has expired")
+
+        assert cache.stats()["size"] == 2
+        cache.match("OOMKilled")
+        cache.match("manifest unknown")
+        assert cache.stats() == {"size": 2, "maxsize": 2, "hits": 2, "misses": 4, "hit_rate": 2 / 6}
+
+    def test_match_events_scales_with_templates(self):
+        event_cache.clear()
+        events = [
+            {"message": f"Back-off restarting failed container app in pod web-7d9f8b6c5-{i:05d}", "reason": "BackOff"}
+            for i in range(500)
+        ] + [{"message": "0/12 nodes are available: 12 Insufficient cpu", "reason": "FailedScheduling"}]
+
+        results = match_events(events)
+
+        assert event_cache.misses == 2 and event_cache.hits == 499
+        assert [pm.error_class for pm in results] == ["insufficient_resources"]
+
+    def test_literal_runs_cover_optional_characters(self):
+        assert _literal_runs(r"services? [\"']x") == {"service ", "services ", "x"}
+        assert _literal_runs(r"colou?r|ab+c") == {"color", "colour", "ab", "b", "c"}
+
+    def test_library_stays_maskable(self):
+        # Masking relies on case-insensitive patterns whose classes treat every
+        # token of a kind alike; a new construct needs MatchCache reviewed.
+        classes = set()
+        for compiled, pattern in _COMPILED:
+            assert compiled.flags & re.IGNORECASE and not compiled.flags & re.VERBOSE
+            assert not re.search(r"\{\d", pattern.regex)
+            classes |= set(re.findall(r"\[[^\]]*\]|\\[a-zA-Z]", pattern.regex))
+        assert classes <= {r"\d", r"\s", r"\S", "[a-z0-9-]", '[" ]', "[- ]", "[\"']", "[\\\"']"}
+
+
 # ── match_log_lines() ─────────────────────────────────────────────────────────
 
 
@@ -233,3 +403,34 @@ class TestMatchLogLines:
         log = "manifest unknown foo\nmanifest unknown bar\n"
         results = match_log_lines(log)
         assert sum(1 for pm in results if pm.error_class == "bad_image_tag") == 1
+
+    def test_reports_line_number_and_stripped_line(self):
+        log = "INFO ok\r\n\r\n   Container app was OOMKilled   \r\nINFO ok\n"
+        [pm] = match_log_lines(log)
+        assert pm.line_number == 3
+        assert pm.matched_text == "Container app was OOMKilled"
+        assert format_match(pm, verbose=True)["line_number"] == 3
+
+    @pytest.mark.parametrize("log", [
+        "\n".join([
+            "INFO Back-off pulling image nginx:99",
+            "ERROR dial tcp: lookup db on 10.96.0.10:53: no such host",
+            "ERROR manifest unknown for image nginx:99",
+            "INFO liveness probe failed: timeout",
+            "ERROR manifest unknown again",
+        ]),
+        "exec /app/run.sh: no such file\nContainer OOMKilled\x0cReadiness probe failed: connection refused",
+        "Secret \"db\" not found\nſecret \"x\" missing\nOOMKilled",
+    ])
+    def test_whole_buffer_matches_line_by_line_results(self, log):
+        expected = []
+        for number, line in enumerate(log.splitlines(), 1):
+            for pm in match(line.strip()):
+                if pm.error_class not in {e.error_class for e in expected}:
+                    pm.line_number = number
+                    expected.append(pm)
+        assert match_log_lines(log) == expected
+
+    def test_buffer_search_stays_within_one_line(self):
+        # `\s+` in "-service\s+not ready" would otherwise match the newline
+        assert match_log_lines("waiting for config-service\nnot ready yet") == []
@@ -0,0 +1,87 @@
+"""Tests for src/k8s_diagnostics/automation/registry.py"""
+
+import asyncio
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from k8s_diagnostics.automation.diagnostics import DiagnosticsEngine
+from k8s_diagnostics.automation.fixes import AutoFixer
+from k8s_diagnostics.automation.registry import (
+    DETECTORS, DETECTORS_BY_TYPE, parse_detector_list, plan_detectors, required_kinds,
+)
+from k8s_diagnostics.core.snapshot import SNAPSHOT_KINDS
+
+
+def _run(coro):
+    return asyncio.get_event_loop().run_until_complete(coro)
+
+
+def _pod(name, phase="Running"):
+    return SimpleNamespace(
+        metadata=SimpleNamespace(name=name, namespace="default", deletion_timestamp=None),
+        status=SimpleNamespace(phase=phase, container_statuses=[], conditions=[]),
+    )
+
+
+class TestRegistry:
+    def test_issue_types_are_unique_and_kinds_are_snapshot_kinds(self):
+        assert len(DETECTORS_BY_TYPE) == len(DETECTORS)
+        for detector in DETECTORS:
+            assert set(detector.kinds) <= set(SNAPSHOT_KINDS), detector.issue_type
+            assert bool(detector.detect) != bool(detector.pod_reducer), detector.issue_type
+
+    def test_fixers_name_auto_fixer_methods(self):
+        for detector in DETECTORS:
+            for _, method in detector.fixers:
+                assert callable(getattr(AutoFixer, method, None)), method
+
+    def test_plan_applies_enabled_and_disabled_in_report_order(self):
+        planned = plan_detectors(enabled=["stuck_jobs", "failed_pods", "hpa_issues"], disabled=["hpa_issues"])
+
+        assert [d.issue_type for d in planned] == ["failed_pods", "stuck_jobs"]
+
+    def test_unknown_detector_is_rejected(self):
+        with pytest.raises(ValueError, match="no_such_check"):
+            plan_detectors(enabled=["failed_pods", "no_such_check"])
+
+    def test_required_kinds_follow_enabled_detectors(self):
+        assert required_kinds(plan_detectors(["nodes_not_ready", "failed_pods"])) == ("nodes", "pods")
+
+    def test_parse_detector_list(self):
+        assert parse_detector_list(" failed_pods, ,stuck_jobs") == {"failed_pods", "stuck_jobs"}
+        assert parse_detector_list("") is None
+
+
+def test_lean_scan_issues_one_list_call_per_needed_kind():
+    k8s = MagicMock()
+    k8s.informers = None
+    k8s.v1.list_pod_for_all_namespaces.return_value.items = [_pod("broken", phase="Failed")]
+    k8s.v1.list_node.return_value.items = []
+    engine = DiagnosticsEngine(k8s, enabled_detectors=["nodes_not_ready", "failed_pods"])
+
+    report = _run(engine.detect_common_issues())
+
+    assert [i["type"] for i in report["issues"]] == ["failed_pods"]
+    list_calls = [
+        name for name, _, _ in k8s.mock_calls
+        if name.split(".")[-1].startswith("list_")
+    ]
+    assert sorted(list_calls) == ["v1.list_node", "v1.list_pod_for_all_namespaces"]
+
+
+def test_auto_remediate_runs_registry_fixers_once_per_pass():
+    fixer = AutoFixer(MagicMock())
+    fixer.restart_failed_pods = AsyncMock(return_value={"restarted": []})
+    diagnostics = MagicMock()
+    diagnostics.detect_common_issues = AsyncMock(return_value={"issues": [
+        {"type": "failed_pods", "severity": "high"},
+        {"type": "crashloop_backoff", "severity": "high"},
+        {"type": "stuck_jobs", "severity": "medium"},
+    ]})
+
+    result = _run(fixer.auto_remediate(diagnostics, dry_run=True))
+
+    assert [a["issue"] for a in result["actions"]] == ["failed_pods"]
+    fixer.restart_failed_pods.assert_awaited_once_with(dry_run=True)
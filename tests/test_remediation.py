@@ -0,0 +1,213 @@
+"""Tests for src/k8s_diagnostics/automation/remediation.py and plan-driven fixers"""
+
+import asyncio
+import copy
+from unittest.mock import AsyncMock, MagicMock
+
+from kubernetes.client import (
+    ApiClient, CoreV1Event, V1Container, V1ContainerState, V1ContainerStateTerminated, V1ContainerStatus,
+    V1Deployment, V1DeploymentSpec, V1LabelSelector, V1ObjectMeta, V1ObjectReference,
+    V1OwnerReference, V1Pod, V1PodSpec, V1PodStatus, V1PodTemplateSpec, V1Probe,
+    V1ReplicaSet, V1ResourceRequirements,
+)
+from kubernetes.client.rest import ApiException
+
+from k8s_diagnostics.automation.fixes import AutoFixer
+from k8s_diagnostics.automation.remediation import RemediationPlan, TemplateChange
+
+
+def _run(coro):
+    return asyncio.get_event_loop().run_until_complete(coro)
+
+
+def _deployment():
+    return V1Deployment(
+        metadata=V1ObjectMeta(name="web", namespace="prod", uid="uid-web"),
+        spec=V1DeploymentSpec(
+            selector=V1LabelSelector(match_labels={"app": "web"}),
+            template=V1PodTemplateSpec(spec=V1PodSpec(containers=[
+                V1Container(
+                    name="app",
+                    resources=V1ResourceRequirements(limits={"memory": "256Mi", "cpu": "1"}),
+                    liveness_probe=V1Probe(initial_delay_seconds=10),
+                ),
+                V1Container(name="sidecar"),
+            ])),
+        ),
+    )
+
+
+RS = V1ReplicaSet(metadata=V1ObjectMeta(
+    name="web-7d9f", namespace="prod", uid="uid-rs",
+    owner_references=[V1OwnerReference(api_version="apps/v1", kind="Deployment", name="web",
+                                       uid="uid-web", controller=True)],
+))
+
+
+def _replica(i):
+    return V1Pod(
+        metadata=V1ObjectMeta(
+            name=f"web-7d9f-{i}", namespace="prod", uid=f"uid-pod-{i}", labels={"app": "web"},
+            owner_references=[V1OwnerReference(api_version="apps/v1", kind="ReplicaSet", name="web-7d9f",
+                                               uid="uid-rs", controller=True)],
+        ),
+        spec=V1PodSpec(containers=[V1Container(name="app")]),
+        status=V1PodStatus(container_statuses=[V1ContainerStatus(
+            name="app", image="app:1", image_id="", ready=False, restart_count=3,
+            state=V1ContainerState(terminated=V1ContainerStateTerminated(exit_code=137, reason="OOMKilled")),
+        )]),
+    )
+
+
+def _fixer(pods, deployment):
+    fixer = AutoFixer(MagicMock())
+    fixer.k8s.informers = None
+    fixer.k8s.v1.list_pod_for_all_namespaces.return_value.items = pods
+    fixer.k8s.apps_v1.list_replica_set_for_all_namespaces.return_value.items = [RS]
+    fixer.k8s.apps_v1.list_deployment_for_all_namespaces.return_value.items = [deployment]
+    fixer.k8s.v1.list_event_for_all_namespaces.return_value.items = [
+        CoreV1Event(
+            metadata=V1ObjectMeta(name=f"ev-{pod.metadata.name}"), reason="Unhealthy",
+            message="Liveness probe failed: timeout",
+            involved_object=V1ObjectReference(kind="Pod", namespace="prod", name=pod.metadata.name,
+                                              uid=pod.metadata.uid),
+        )
+        for pod in pods
+    ]
+    return fixer
+
+
+class _AppsApi:
+    """Applies a JSON patch to a stored Deployment like the API server: all ops or none."""
+
+    def __init__(self, deployment):
+        self.live = ApiClient().sanitize_for_serialization(deployment)
+
+    def patch_namespaced_deployment(self, name, namespace, body):
+        doc = copy.deepcopy(self.live)
+        for op in body:
+            *parents, key = op["path"].strip("/").split("/")
+            node = doc
+            for part in parents:
+                node = node[int(part)] if isinstance(node, list) else node[part]
+            if op["op"] == "test":
+                if node.get(key) != op["value"]:
+                    raise ApiException(status=422, reason=f"test failed at {op['path']}")
+            else:
+                node[key] = op["value"]
+        self.live = doc
+
+
+def _live_memory(api):
+    return api.live["spec"]["template"]["spec"]["containers"][0]["resources"]["limits"]["memory"]
+
+
+def test_forty_oomkilled_replicas_patch_their_deployment_once():
+    deployment = _deployment()
+    fixer = _fixer([_replica(i) for i in range(40)], deployment)
+
+    result = _run(fixer.fix_oomkilled_pods())
+
+    memory = "/spec/template/spec/containers/0/resources/limits/memory"
+    fixer.k8s.apps_v1.patch_namespaced_deployment.assert_called_once_with("web", "prod", [
+        {"op": "test", "path": "/spec/template/spec/containers/0/name", "value": "app"},
+        {"op": "test", "path": memory, "value": "256Mi"},
+        {"op": "replace", "path": memory, "value": "512Mi"},
+    ])
+    assert result["patched"] == ["prod/web: container app memory limit 256Mi -> 512Mi"]
+    [operation] = result["operations"]
+    assert operation["change"]["requested_by_pods"] == 40
+    # the object the fixer read is left alone; the patch carries the change
+    assert deployment.spec.template.spec.containers[0].resources.limits["memory"] == "256Mi"
+
+
+def test_auto_remediate_merges_fixers_into_one_patch_per_workload():
+    fixer = _fixer([_replica(i) for i in range(3)], _deployment())
+    diagnostics = MagicMock()
+    diagnostics.detect_common_issues = AsyncMock(return_value={"issues": [
+        {"type": "high_restart_count", "severity": "medium"},
+    ]})
+
+    result = _run(fixer.auto_remediate(diagnostics))
+
+    app = "/spec/template/spec/containers/0"
+    fixer.k8s.apps_v1.patch_namespaced_deployment.assert_called_once_with("web", "prod", [
+        {"op": "test", "path": f"{app}/name", "value": "app"},
+        {"op": "test", "path": f"{app}/resources/limits/memory", "value": "256Mi"},
+        {"op": "replace", "path": f"{app}/resources/limits/memory", "value": "512Mi"},
+        {"op": "test", "path": f"{app}/livenessProbe/initialDelaySeconds", "value": 10},
+        {"op": "replace", "path": f"{app}/livenessProbe/initialDelaySeconds", "value": 40},
+    ])
+    assert [a["issue"] for a in result["actions"]] == [
+        "high_restart_count_oom", "high_restart_count_liveness", "workload_patches",
+    ]
+    assert result["actions"][0]["result"]["planned"] == ["prod/web"]
+    assert len(result["actions"][-1]["result"]["patched"]) == 2
+
+
+def test_failed_patch_records_every_change_as_failed():
+    fixer = _fixer([_replica(0)], _deployment())
+    fixer.k8s.apps_v1.patch_namespaced_deployment.side_effect = ApiException(status=422)
+
+    result = _run(fixer.fix_oomkilled_pods())
+
+    assert result["patched"] == [] and len(result["failed"]) == 1
+    assert [op["status"] for op in result["operations"]] == ["failed"]
+
+
+def test_patch_applies_when_the_live_value_still_matches():
+    deployment = _deployment()
+    fixer = _fixer([_replica(0)], deployment)
+    api = _AppsApi(deployment)
+    fixer.k8s.apps_v1.patch_namespaced_deployment.side_effect = api.patch_namespaced_deployment
+
+    result = _run(fixer.fix_oomkilled_pods())
+
+    assert result["failed"] == []
+    assert _live_memory(api) == "512Mi"
+
+
+def test_stale_old_value_is_rejected_with_422_and_nothing_is_written():
+    deployment = _deployment()
+    fixer = _fixer([_replica(0)], deployment)
+    api = _AppsApi(deployment)
+    # Someone raises the limit after the fixer read the Deployment at 256Mi
+    api.live["spec"]["template"]["spec"]["containers"][0]["resources"]["limits"]["memory"] = "1Gi"
+    fixer.k8s.apps_v1.patch_namespaced_deployment.side_effect = api.patch_namespaced_deployment
+
+    result = _run(fixer.fix_oomkilled_pods())
+
+    assert result["patched"] == [] and len(result["failed"]) == 1
+    assert "422" in result["failed"][0]
+    assert _live_memory(api) == "1Gi"
+
+
+def test_liveness_kubectl_equivalent_is_the_patch_that_is_sent():
+    fixer = _fixer([_replica(0)], _deployment())
+
+    result = _run(fixer.fix_aggressive_liveness_probes())
+
+    [operation] = result["operations"]
+    sent = fixer.k8s.apps_v1.patch_namespaced_deployment.call_args[0][2]
+    assert operation["kubectl_equivalent"] == (
+        f"kubectl patch deployment web -n prod --type=json -p '{fixer._json_arg(sent)}'"
+    )
+
+
+def test_first_proposal_for_a_field_wins():
+    plan = RemediationPlan()
+    deployment = _deployment()
+
+    def change(new):
+        return TemplateChange("app", ("image",), "app:1", new, "patch_deployment_image", "", "")
+
+    assert plan.propose("Deployment", deployment, change("app:2"), source="prod/a")
+    assert not plan.propose("Deployment", deployment, change("app:3"), source="prod/b")
+
+    [workload] = plan
+    assert workload.patch() == [
+        {"op": "test", "path": "/spec/template/spec/containers/0/name", "value": "app"},
+        {"op": "test", "path": "/spec/template/spec/containers/0/image", "value": "app:1"},
+        {"op": "replace", "path": "/spec/template/spec/containers/0/image", "value": "app:2"},
+    ]
+    assert workload.sources == {"prod/a", "prod/b"}
@@ -0,0 +1,84 @@
+"""Tests for src/k8s_diagnostics/automation/runner.py"""
+
+import asyncio
+import time
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+from k8s_diagnostics.automation.diagnostics import DiagnosticsEngine
+from k8s_diagnostics.automation.runner import DetectorRunner
+
+
+def _run(coro):
+    return asyncio.get_event_loop().run_until_complete(coro)
+
+
+def test_detectors_run_concurrently():
+    runner = DetectorRunner(max_workers=4, timeout_seconds=5)
+    started = time.monotonic()
+
+    outcomes = _run(runner.run([
+        (f"slow-{i}", lambda i=i: time.sleep(0.2) or i) for i in range(4)
+    ]))
+
+    assert time.monotonic() - started < 0.6
+    assert [o.result for o in outcomes.values()] == [0, 1, 2, 3]
+
+
+def test_failures_and_timeouts_are_isolated():
+    runner = DetectorRunner(max_workers=3, timeout_seconds=5)
+
+    def broken():
+        raise RuntimeError("forbidden")
+
+    outcomes = _run(runner.run(
+        [("ok", lambda: ["finding"]), ("broken", broken), ("hung", lambda: time.sleep(1))],
+        timeouts={"hung": 0.05},
+    ))
+
+    assert outcomes["ok"].ok and outcomes["ok"].result == ["finding"]
+    assert outcomes["broken"].status == "error"
+    assert outcomes["hung"].status == "timeout"
+    summary = DetectorRunner.summary(outcomes)
+    assert summary["timed_out"] == ["hung"]
+    assert summary["failed"] == [{"detector": "broken", "error": "forbidden"}]
+
+
+def test_coroutine_detectors_are_driven_on_the_worker():
+    async def check():
+        return "done"
+
+    outcomes = _run(DetectorRunner().run([("async", check)]))
+
+    assert outcomes["async"].result == "done"
+
+
+def test_detect_common_issues_reports_failed_detectors():
+    k8s = MagicMock()
+    k8s.informers = None
+    k8s.v1.list_secret_for_all_namespaces.return_value = SimpleNamespace(
+        items=[], metadata=SimpleNamespace(_continue=None)
+    )
+    engine = DiagnosticsEngine(k8s)
+    engine._find_hpa_issues = MagicMock(side_effect=RuntimeError("hpa api unavailable"))
+
+    report = _run(engine.detect_common_issues())
+
+    assert {"detector": "hpa_issues", "error": "hpa api unavailable"} in report["detectors"]["failed"]
+    assert "pod_scan" in report["detectors"]["durations_seconds"]
+    assert all(issue["type"] != "hpa_issues" for issue in report["issues"])
+
+
+def test_pod_scan_timeout_is_reported_for_each_pod_level_detector():
+    k8s = MagicMock()
+    k8s.informers = None
+    engine = DiagnosticsEngine(k8s, pod_scan_timeout_seconds=0.05)
+    engine._scan_pods = lambda snapshot, reducers: time.sleep(1)
+
+    report = _run(engine.detect_common_issues(
+        enabled=["pending_pods", "crashloop_backoff", "nodes_not_ready"]
+    ))
+
+    timed_out = report["detectors"]["timed_out"]
+    assert timed_out == ["pod_scan", "pending_pods", "crashloop_backoff"]
+    assert "nodes_not_ready" not in timed_out
@@ -0,0 +1,95 @@
+"""Tests for src/k8s_diagnostics/api/scheduler.py"""
+
+import asyncio
+import threading
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+import pytest
+
+from k8s_diagnostics.api.scheduler import ScanScheduler
+from k8s_diagnostics.automation.diagnostics import DiagnosticsEngine
+
+
+def _scheduler(interval_seconds=60):
+    k8s = MagicMock()
+    k8s.informers = None
+    k8s.v1.list_secret_for_all_namespaces.return_value = SimpleNamespace(
+        items=[], metadata=SimpleNamespace(_continue=None)
+    )
+    k8s._check_nodes.return_value = {"total": 3, "ready": 3, "status": "healthy"}
+    k8s._check_pods.return_value = {"total": 10, "running": 10, "failed": []}
+    return ScanScheduler(k8s, DiagnosticsEngine(k8s), interval_seconds=interval_seconds)
+
+
+def test_scan_once_publishes_result_with_increasing_generation():
+    scheduler = _scheduler()
+
+    first = scheduler.scan_once()
+    second = scheduler.scan_once()
+
+    assert first.generation == 1
+    assert second.generation == 2
+    assert scheduler.latest is second
+    assert "issues" in second.issues
+    assert second.risk["risk_level"] in ("low", "medium", "high")
+    assert second.nodes["ready"] == 3
+
+
+def test_scan_lists_each_kind_once_for_issues_and_gauges():
+    scheduler = _scheduler()
+
+    scheduler.scan_once()
+
+    assert scheduler.k8s.v1.list_pod_for_all_namespaces.call_count == 1
+    assert scheduler.k8s.v1.list_node.call_count == 1
+
+
+def test_failed_scan_keeps_previous_result_and_records_error():
+    scheduler = _scheduler()
+    previous = scheduler.scan_once()
+    scheduler.k8s._check_nodes.side_effect = RuntimeError("apiserver unavailable")
+
+    with pytest.raises(RuntimeError):
+        scheduler.scan_once()
+
+    assert scheduler.latest is previous
+    assert scheduler.last_error == "apiserver unavailable"
+
+
+def test_describe_reports_generation_and_age():
+    scheduler = _scheduler()
+    described = scheduler.scan_once().describe()
+
+    assert described["generation"] == 1
+    assert described["age_seconds"] >= 0
+
+
+def test_zero_interval_disables_background_scans():
+    assert not _scheduler(interval_seconds=0).enabled
+
+
+def test_hung_scan_times_out_and_the_loop_keeps_scanning():
+    scheduler = _scheduler(interval_seconds=0.01)
+    scheduler.scan_timeout_seconds = 0.05
+    release = threading.Event()
+    calls = []
+
+    def hung_scan():
+        calls.append(1)
+        release.wait(5)
+
+    scheduler.scan_once = hung_scan
+
+    async def run():
+        scheduler.start()
+        await asyncio.sleep(0.4)
+        await scheduler.stop()
+
+    try:
+        asyncio.get_event_loop().run_until_complete(run())
+    finally:
+        release.set()
+
+    assert len(calls) >= 2
+    assert scheduler.last_error == "scan timed out after 0.05s"
@@ -0,0 +1,190 @@
+"""Tests for src/k8s_diagnostics/automation/scheduling.py"""
+
+import asyncio
+from unittest.mock import MagicMock, patch
+
+from kubernetes.client import (
+    V1Container, V1NodeSpec, V1NodeStatus, V1Node, V1ObjectMeta, V1Pod, V1PodSpec,
+    V1PodStatus, V1ResourceRequirements, V1Taint, V1Toleration,
+)
+
+from k8s_diagnostics.automation import registry
+from k8s_diagnostics.automation.diagnostics import DiagnosticsEngine
+from k8s_diagnostics.automation.registry import DETECTORS_BY_TYPE, ScanContext
+from k8s_diagnostics.automation.scheduling import NodeIndex, RequestLedger, pod_requests
+from k8s_diagnostics.core.snapshot import ClusterSnapshot
+
+
+def _node(name, cpu="4", memory="16Gi", labels=None, taints=()):
+    return V1Node(
+        metadata=V1ObjectMeta(name=name, labels=labels or {}),
+        spec=V1NodeSpec(taints=[V1Taint(key=k, value=v, effect=e) for k, v, e in taints] or None),
+        status=V1NodeStatus(allocatable={"cpu": cpu, "memory": memory}),
+    )
+
+
+def _pod(name, cpu=None, memory=None, node_selector=None, tolerations=(), node_name=None,
+         phase="Pending", init_cpu=None):
+    requests = {k: v for k, v in (("cpu", cpu), ("memory", memory)) if v}
+    return V1Pod(
+        metadata=V1ObjectMeta(name=name, namespace="prod"),
+        spec=V1PodSpec(
+            containers=[V1Container(
+                name="app", resources=V1ResourceRequirements(requests=requests or None),
+            )],
+            init_containers=[V1Container(
+                name="init", resources=V1ResourceRequirements(requests={"cpu": init_cpu}),
+            )] if init_cpu else None,
+            node_selector=node_selector,
+            node_name=node_name,
+            tolerations=[V1Toleration(**t) for t in tolerations] or None,
+        ),
+        status=V1PodStatus(phase=phase),
+    )
+
+
+NODES = [
+    _node("small", cpu="2", memory="4Gi", labels={"pool": "general"}),
+    _node("big", cpu="16", memory="64Gi", labels={"pool": "general", "gpu": "true"},
+          taints=[("nvidia.com/gpu", "present", "NoSchedule")]),
+    _node("infra", cpu="4", memory="8Gi", labels={"pool": "infra"},
+          taints=[("dedicated", "infra", "NoExecute")]),
+]
+
+
+class TestNodeIndex:
+    def test_feasibility_combines_selector_taints_and_resources(self):
+        index = NodeIndex(NODES)
+
+        feasibility = index.feasibility(_pod("web", cpu="3", memory="2Gi", node_selector={"pool": "general"}))
+
+        assert feasibility.selector == 0b011
+        assert feasibility.untainted == 0b001
+        assert feasibility.fits == 0b110
+        assert feasibility.feasible == 0
+
+    def test_tolerations_are_checked_per_distinct_taint(self):
+        index = NodeIndex(NODES)
+        pod = _pod("trainer", cpu="8", tolerations=[{"key": "nvidia.com/gpu", "operator": "Exists"}])
+
+        assert NodeIndex.count(index.feasibility(pod).feasible) == 1
+        assert index.matching_selector({"gpu": "true", "pool": "general"}) == 0b010
+        assert index.matching_selector({"pool": "missing"}) == 0
+
+
+def test_analysis_reports_the_same_blockers():
+    engine = DiagnosticsEngine(MagicMock())
+    snapshot = ClusterSnapshot(resources={"nodes": tuple(NODES), "pvcs": (), "pods": ()})
+
+    analysis = engine._analyze_scheduling(_pod("huge", cpu="32", node_selector={"pool": "gpu"}), snapshot)
+
+    assert [r["reason"] for r in analysis["pending_reasons"]] == [
+        "node_selector_no_match", "insufficient_resources",
+    ]
+    assert analysis["nodes_checked"] == 3 and analysis["feasible_nodes"] == 0
+    fits = [n["fits_pod_request"] for n in analysis["pending_reasons"][1]["nodes"]]
+    assert fits == [False, False, False]
+
+
+def test_taint_examples_name_the_blocking_taint():
+    engine = DiagnosticsEngine(MagicMock())
+    nodes = (NODES[1], NODES[2])
+    snapshot = ClusterSnapshot(resources={"nodes": nodes, "pvcs": (), "pods": ()})
+
+    analysis = engine._analyze_scheduling(_pod("web"), snapshot)
+
+    reason = analysis["pending_reasons"][0]
+    assert reason["reason"] == "taint_no_toleration"
+    assert reason["examples"] == [
+        {"node": "big", "taint": "nvidia.com/gpu=present:NoSchedule"},
+        {"node": "infra", "taint": "dedicated=infra:NoExecute"},
+    ]
+
+
+def test_pending_issue_analyses_every_pending_pod_with_one_index():
+    k8s = MagicMock()
+    engine = DiagnosticsEngine(k8s)
+    snapshot = ClusterSnapshot(resources={"nodes": tuple(NODES), "pvcs": ()})
+    pending = [_pod(f"web-{i}", cpu="32") for i in range(20)]
+    ctx = ScanContext(snapshot, {**engine._empty_pod_scan(), "pending_pods": pending})
+
+    with patch("k8s_diagnostics.automation.diagnostics.NodeIndex", wraps=NodeIndex) as index_cls:
+        [issue] = DETECTORS_BY_TYPE["pending_pods"].issues(engine, 20, ctx)
+
+    assert index_cls.call_count == 1
+    assert issue["count"] == 20 and len(issue["scheduling_analysis"]) == 5
+    assert issue["pending_reason_counts"] == {"insufficient_resources": 20}
+    assert issue["no_feasible_node"] == 20
+
+
+def test_fitting_without_numpy_matches_a_per_node_check():
+    with patch("k8s_diagnostics.automation.scheduling.np", None):
+        index = NodeIndex(NODES, RequestLedger.from_pods([
+            _pod("hog", cpu="15", node_name="big", phase="Running"),
+        ]))
+        for cpu_m, mem in [(0, 0), (1000, 0), (2000, 4 * 1024**3), (3000, 0), (4000, 8 * 1024**3), (5000, 0)]:
+            expected = sum(
+                1 << i for i, row in enumerate(index.free)
+                if row[0] >= cpu_m and row[1] >= mem and row[2] >= 1
+            )
+            assert index.fitting(cpu_m, mem) == expected
+        assert index.fitting(3000, 0) == 0b100
+
+
+def test_pending_analysis_runs_in_the_pod_scan_and_details_only_the_first_pods():
+    k8s = MagicMock()
+    k8s.informers = None
+    engine = DiagnosticsEngine(k8s)
+    pending = [_pod(f"web-{i}", cpu="32") for i in range(8)]
+    snapshot = ClusterSnapshot(resources={"nodes": tuple(NODES), "pvcs": (), "pods": tuple(pending)})
+
+    with patch("k8s_diagnostics.automation.registry._analyze_pending_pods",
+               wraps=registry._analyze_pending_pods) as analyze:
+        report = asyncio.get_event_loop().run_until_complete(
+            engine.detect_common_issues(snapshot=snapshot, enabled=["pending_pods"])
+        )
+
+    assert analyze.call_count == 1
+    [issue] = report["issues"]
+    assert issue["pending_reason_counts"] == {"insufficient_resources": 8}
+    assert len(issue["scheduling_analysis"]) == 5
+    assert all(a["pending_reasons"][0]["nodes"] for a in issue["scheduling_analysis"])
+
+
+class TestRequestLedger:
+    def test_aggregates_bound_non_terminal_pods_per_node(self):
+        ledger = RequestLedger.from_pods([
+            _pod("a", cpu="500m", memory="1Gi", node_name="small", phase="Running"),
+            _pod("b", cpu="1", node_name="small", phase="Running"),
+            _pod("done", cpu="2", node_name="small", phase="Succeeded"),
+            _pod("unbound", cpu="2"),
+        ])
+
+        assert ledger.get("small") == [1500.0, 1024**3, 2, 0.0]
+        assert ledger.get("big") == [0.0, 0.0, 0.0, 0.0]
+
+    def test_remove_undoes_add(self):
+        ledger = RequestLedger()
+        contribution = ledger.add(_pod("a", cpu="1", node_name="big", phase="Running"))
+        ledger.remove(contribution)
+
+        assert ledger.committed == {}
+
+    def test_init_containers_raise_effective_requests(self):
+        assert pod_requests(_pod("a", cpu="250m", init_cpu="2")) == (2000.0, 0.0, 0.0)
+
+
+def test_fit_uses_remaining_capacity():
+    running = [_pod("hog", cpu="15", node_name="big", phase="Running")]
+    snapshot = ClusterSnapshot(resources={"nodes": tuple(NODES[:2]), "pvcs": (), "pods": tuple(running)})
+    engine = DiagnosticsEngine(MagicMock())
+    pod = _pod("web", cpu="3", tolerations=[{"operator": "Exists"}])
+
+    analysis = engine._analyze_scheduling(pod, snapshot)
+
+    [reason] = analysis["pending_reasons"]
+    assert reason["reason"] == "insufficient_resources"
+    assert "remaining capacity" in reason["detail"]
+    big = reason["nodes"][1]
+    assert (big["allocatable_cpu_m"], big["remaining_cpu_m"], big["fits_pod_request"]) == (16000, 1000, False)
+    assert NodeIndex(NODES[:2]).fitting(3000, 0) == 0b10
@@ -0,0 +1,153 @@
+"""Tests for src/k8s_diagnostics/automation/selectors.py"""
+
+import asyncio
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+from kubernetes.client import (
+    V1Deployment, V1DeploymentSpec, V1LabelSelector, V1LabelSelectorRequirement,
+    V1ObjectMeta, V1PodTemplateSpec, V1Service, V1ServiceSpec,
+)
+
+from k8s_diagnostics.automation.diagnostics import DiagnosticsEngine
+from k8s_diagnostics.automation.fixes import AutoFixer
+from k8s_diagnostics.automation.selectors import LabelIndex, Selector, SelectorIndex
+from k8s_diagnostics.core.snapshot import ClusterSnapshot
+
+
+def _meta(name, labels=None, namespace="prod"):
+    return V1ObjectMeta(name=name, namespace=namespace, labels=labels)
+
+
+def _obj(name, labels=None, namespace="prod"):
+    return MagicMock(metadata=_meta(name, labels, namespace))
+
+
+def _selector(match_labels=None, **expressions):
+    return V1LabelSelector(
+        match_labels=match_labels,
+        match_expressions=[
+            V1LabelSelectorRequirement(key=key, operator=op, values=values)
+            for key, (op, values) in expressions.items()
+        ] or None,
+    )
+
+
+def _deployment(name, selector_labels, template_labels=None):
+    return V1Deployment(
+        metadata=_meta(name),
+        spec=V1DeploymentSpec(
+            selector=V1LabelSelector(match_labels=selector_labels),
+            template=V1PodTemplateSpec(metadata=V1ObjectMeta(labels=template_labels or selector_labels)),
+        ),
+    )
+
+
+class TestSelector:
+    def test_match_labels_and_expressions(self):
+        selector = Selector.compile(_selector(
+            {"app": "web"}, tier=("In", ["api", "web"]), track=("NotIn", ["canary"]), debug=("DoesNotExist", None),
+        ))
+
+        assert selector.matches({"app": "web", "tier": "api"})
+        assert selector.matches({"app": "web", "tier": "web", "track": "stable"})
+        assert not selector.matches({"app": "web", "tier": "api", "track": "canary"})
+        assert not selector.matches({"app": "web", "tier": "db"})
+        assert not selector.matches({"app": "web", "tier": "api", "debug": "1"})
+        assert str(selector) == "app=web,tier in (api,web),track notin (canary),!debug"
+
+    def test_service_label_map_and_empty_selector(self):
+        assert Selector.compile({"app": "web"}).matches({"app": "web", "pod-template-hash": "x"})
+        assert Selector.compile(None).empty and Selector.compile(V1LabelSelector()).empty
+
+    def test_unknown_operator_matches_nothing(self):
+        assert not Selector.compile(_selector(app=("Like", ["web"]))).matches({"app": "web"})
+
+
+def test_label_index_selects_by_set_operations():
+    index = LabelIndex([
+        _obj("web-1", {"app": "web", "tier": "fe"}),
+        _obj("web-2", {"app": "web", "tier": "fe", "canary": "true"}),
+        _obj("api-1", {"app": "api", "tier": "be"}),
+        _obj("web-other", {"app": "web"}, namespace="staging"),
+    ])
+
+    def names(selector, namespace="prod"):
+        return [o.metadata.name for o in index.select(namespace, Selector.compile(selector))]
+
+    assert names({"app": "web"}) == ["web-1", "web-2"]
+    assert names(_selector(tier=("In", ["fe", "be"]), canary=("DoesNotExist", None))) == ["api-1", "web-1"]
+    assert names(_selector(app=("NotIn", ["web"]))) == ["api-1"]
+    assert names(_selector(canary=("Exists", None)), namespace="staging") == []
+    assert names(None) == ["api-1", "web-1", "web-2"]
+
+
+def _selecting(name, selector):
+    return SimpleNamespace(metadata=_meta(name), spec=SimpleNamespace(selector=selector))
+
+
+class TestSelectorIndex:
+    def test_matching_returns_selecting_objects_in_order(self):
+        objects = [
+            _selecting("by-app", _selector({"app": "web"})),
+            _selecting("by-expr", _selector(tier=("Exists", None))),
+            _selecting("other", _selector({"app": "api"})),
+            _selecting("empty", _selector()),
+        ]
+        index = SelectorIndex(objects)
+
+        matched = index.matching("prod", {"app": "web", "tier": "fe"})
+
+        assert [o.metadata.name for o in matched] == ["by-app", "by-expr"]
+        assert index.matching("staging", {"app": "web"}) == []
+        assert len(index) == 3
+
+    def test_loader_lists_each_namespace_once(self):
+        loader = MagicMock(return_value=[_deployment("web", {"app": "web"})])
+        index = SelectorIndex(loader=loader)
+
+        for _ in range(3):
+            assert len(index.matching("prod", {"app": "web"})) == 1
+
+        loader.assert_called_once_with("prod")
+
+
+def test_fixer_lists_deployments_once_per_pass():
+    fixer = AutoFixer(MagicMock())
+    pods = []
+    for i in range(5):
+        pod = MagicMock(metadata=_meta(f"web-{i}", {"app": "web"}))
+        cs = MagicMock()
+        cs.name = "app"
+        cs.state.terminated.reason = "OOMKilled"
+        pod.status.container_statuses = [cs]
+        pods.append(pod)
+    fixer.k8s.informers = None
+    fixer.k8s.v1.list_pod_for_all_namespaces.return_value.items = pods
+    fixer.k8s.apps_v1.list_namespaced_deployment.return_value.items = []
+
+    result = asyncio.get_event_loop().run_until_complete(fixer.fix_oomkilled_pods(dry_run=True))
+
+    assert len(result["skipped"]) == 5
+    fixer.k8s.apps_v1.list_namespaced_deployment.assert_called_once()
+
+
+def test_service_mismatch_reads_deployments_from_the_snapshot():
+    engine = DiagnosticsEngine(MagicMock())
+    services = (
+        V1Service(metadata=_meta("web"), spec=V1ServiceSpec(selector={"app": "web-old"})),
+        V1Service(metadata=_meta("api"), spec=V1ServiceSpec(selector={"app": "api"})),
+    )
+    deployments = (
+        _deployment("web", {"app": "web"}),
+        # selector differs, but the Service still selects its pods
+        _deployment("api", {"app": "api", "track": "stable"}),
+    )
+    snapshot = ClusterSnapshot(resources={"services": services, "endpoints": (), "deployments": deployments})
+
+    issues = engine._detect_service_selector_mismatches(snapshot)
+
+    assert issues == [
+        "prod/web — selector {'app': 'web-old'} does not match deployment selector {'app': 'web'}"
+    ]
+    engine.k8s.apps_v1.read_namespaced_deployment.assert_not_called()
@@ -0,0 +1,149 @@
+"""Tests for src/k8s_diagnostics/automation/simulator.py"""
+
+from unittest.mock import MagicMock
+
+import pytest
+from kubernetes.client import (
+    V1Container, V1Deployment, V1DeploymentSpec, V1LabelSelector, V1Node, V1NodeSpec,
+    V1NodeStatus, V1ObjectMeta, V1OwnerReference, V1Pod, V1PodSpec, V1PodStatus,
+    V1PodTemplateSpec, V1ResourceRequirements,
+)
+
+from k8s_diagnostics.automation.simulator import Scenario, run_scenario, simulate
+from k8s_diagnostics.core.snapshot import ClusterSnapshot
+
+
+def _node(name, cpu="4", memory="16Gi", labels=None):
+    return V1Node(
+        metadata=V1ObjectMeta(name=name, labels=labels or {"pool": "general"}),
+        spec=V1NodeSpec(),
+        status=V1NodeStatus(allocatable={"cpu": cpu, "memory": memory, "pods": "110"}),
+    )
+
+
+def _pod(name, cpu="1", node_name=None, owner="ReplicaSet", labels=None):
+    return V1Pod(
+        metadata=V1ObjectMeta(
+            name=name, namespace="prod", labels=labels,
+            owner_references=[V1OwnerReference(
+                api_version="apps/v1", kind=owner, name="owner", uid="uid", controller=True,
+            )] if owner else None,
+        ),
+        spec=V1PodSpec(
+            containers=[V1Container(name="app", resources=V1ResourceRequirements(requests={"cpu": cpu}))],
+            node_name=node_name,
+        ),
+        status=V1PodStatus(phase="Running" if node_name else "Pending"),
+    )
+
+
+def _deployment(name, replicas, cpu="1"):
+    labels = {"app": name}
+    return V1Deployment(
+        metadata=V1ObjectMeta(name=name, namespace="prod"),
+        spec=V1DeploymentSpec(
+            replicas=replicas,
+            selector=V1LabelSelector(match_labels=labels),
+            template=V1PodTemplateSpec(
+                metadata=V1ObjectMeta(labels=labels),
+                spec=V1PodSpec(containers=[V1Container(
+                    name="app", resources=V1ResourceRequirements(requests={"cpu": cpu}),
+                )]),
+            ),
+        ),
+    )
+
+
+class TestScenarioParse:
+    def test_parses_all_changes(self):
+        scenario = Scenario.parse(
+            add_nodes=["3:like=node-a", "2:cpu=8,memory=32Gi"], drain="node-b, node-c", scale=["prod/web=5"],
+        )
+
+        assert [(s.count, s.like, s.allocatable) for s in scenario.add_nodes] == [
+            (3, "node-a", {}), (2, None, {"cpu": "8", "memory": "32Gi"}),
+        ]
+        assert scenario.drain == ("node-b", "node-c")
+        assert scenario.scale == {("prod", "web"): 5}
+
+    @pytest.mark.parametrize("kwargs", [
+        {"add_nodes": ["x:like=a"]},
+        {"add_nodes": ["2:gpu=1"]},
+        {"add_nodes": ["2:"]},
+        {"scale": ["web=3"]},
+        {"scale": ["prod/web=-1"]},
+    ])
+    def test_rejects_malformed_input(self, kwargs):
+        with pytest.raises(ValueError):
+            Scenario.parse(**kwargs)
+
+
+class TestSimulate:
+    def test_drain_reschedules_onto_remaining_capacity(self):
+        nodes = [_node("a"), _node("b")]
+        pods = [_pod("a-1", "2", "a"), _pod("b-1", "1", "b"), _pod("b-2", "1", "b")]
+
+        report = simulate(nodes, pods, Scenario(drain=("b",)))
+
+        assert report["drain"]["would_succeed"] is True
+        assert report["drain"]["rescheduled"] == {"prod/b-1": "a", "prod/b-2": "a"}
+        assert report["became_unschedulable"] == []
+
+    def test_drain_reports_stranded_and_unmanaged_pods(self):
+        nodes = [_node("a"), _node("b")]
+        pods = [_pod("a-1", "3", "a"), _pod("b-1", "2", "b"), _pod("bare", "100m", "b", owner=None),
+                _pod("ds", "100m", "b", owner="DaemonSet")]
+
+        drain = simulate(nodes, pods, Scenario(drain=("b",)))["drain"]
+
+        assert drain["stranded"] == ["prod/b-1"]
+        assert drain["unmanaged_pods"] == ["prod/bare"]
+        assert drain["daemonset_or_mirror_pods"] == 1
+        assert drain["would_succeed"] is False
+
+    def test_added_nodes_make_pending_pods_schedulable(self):
+        nodes = [_node("a", cpu="2")]
+        pods = [_pod("a-1", "2", "a"), _pod("big", "6"), _pod("small", "1")]
+
+        report = simulate(nodes, pods, Scenario.parse(add_nodes=["1:like=a,cpu=8"]))
+
+        assert report["became_schedulable"] == ["prod/big", "prod/small"]
+        assert report["nodes"] == {"before": 1, "after": 2}
+
+    def test_scale_up_reports_replicas_that_do_not_fit(self):
+        nodes = [_node("a", cpu="4")]
+        pods = [_pod(f"web-{i}", "1", "a", labels={"app": "web"}) for i in range(2)]
+        deployments = {("prod", "web"): _deployment("web", 2)}
+
+        report = simulate(nodes, pods, Scenario(scale={("prod", "web"): 5}), deployments)
+
+        assert report["scale"]["prod/web"] == {"from": 2, "to": 5, "unschedulable_new_replicas": 1}
+        assert report["placed"] == 2
+
+    def test_scale_down_frees_capacity_for_pending_pods(self):
+        nodes = [_node("a", cpu="2")]
+        pods = [_pod(f"web-{i}", "1", "a", labels={"app": "web"}) for i in range(2)] + [_pod("batch", "1")]
+        deployments = {("prod", "web"): _deployment("web", 2)}
+
+        report = simulate(nodes, pods, Scenario(scale={("prod", "web"): 1}), deployments)
+
+        assert report["became_schedulable"] == ["prod/batch"]
+
+    def test_unknown_targets_are_rejected(self):
+        with pytest.raises(ValueError, match="unknown node"):
+            simulate([_node("a")], [], Scenario(drain=("z",)))
+        with pytest.raises(ValueError, match="unknown deployment"):
+            simulate([_node("a")], [], Scenario(scale={("prod", "web"): 3}))
+
+
+def test_run_scenario_reads_the_scaled_deployments():
+    k8s = MagicMock()
+    snapshot = ClusterSnapshot(resources={
+        "nodes": (_node("a"), _node("b")), "pods": (_pod("b-1", "1", "b"),),
+    })
+    k8s.apps_v1.read_namespaced_deployment.return_value = _deployment("web", 0)
+
+    report = run_scenario(k8s, Scenario(drain=("b",), scale={("prod", "web"): 2}), snapshot)
+
+    assert report["drain"]["rescheduled"] == {"prod/b-1": "a"}
+    assert report["scale"]["prod/web"]["unschedulable_new_replicas"] == 0
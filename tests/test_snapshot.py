@@ -0,0 +1,92 @@
+"""Tests for src/k8s_diagnostics/core/snapshot.py"""
+
+import asyncio
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+import pytest
+
+from k8s_diagnostics.automation.diagnostics import DiagnosticsEngine
+from k8s_diagnostics.core.snapshot import SNAPSHOT_KINDS, ClusterSnapshot, snapshot_items
+
+
+def _pod(name, namespace="default", labels=None, phase="Running"):
+    return SimpleNamespace(
+        metadata=SimpleNamespace(name=name, namespace=namespace, labels=labels or {}),
+        status=SimpleNamespace(phase=phase),
+    )
+
+
+def _k8s(pods=()):
+    k8s = MagicMock()
+    k8s.informers = None
+    k8s.v1.list_pod_for_all_namespaces.return_value.items = list(pods)
+    k8s.v1.list_secret_for_all_namespaces.return_value = SimpleNamespace(
+        items=[], metadata=SimpleNamespace(_continue=None)
+    )
+    return k8s
+
+
+class TestClusterSnapshotFetch:
+    def test_each_kind_is_listed_once(self):
+        k8s = _k8s([_pod("a")])
+
+        snapshot = ClusterSnapshot.fetch(k8s)
+
+        assert set(snapshot.resources) == set(SNAPSHOT_KINDS)
+        k8s.v1.list_pod_for_all_namespaces.assert_called_once_with()
+        k8s.v1.list_event_for_all_namespaces.assert_called_once_with(field_selector="type=Warning")
+        assert [p.metadata.name for p in snapshot.pods] == ["a"]
+
+    def test_failed_kind_is_recorded_and_reraised_on_read(self):
+        k8s = _k8s()
+        k8s.autoscaling_v2.list_horizontal_pod_autoscaler_for_all_namespaces.side_effect = (
+            RuntimeError("forbidden")
+        )
+
+        snapshot = ClusterSnapshot.fetch(k8s, kinds=("pods", "hpas"))
+
+        assert "hpas" in snapshot.errors
+        assert snapshot.pods == []
+        with pytest.raises(RuntimeError):
+            snapshot.items("hpas")
+
+    def test_resources_are_read_only(self):
+        snapshot = ClusterSnapshot.fetch(_k8s(), kinds=("pods",))
+        with pytest.raises(TypeError):
+            snapshot.resources["pods"] = ()
+
+
+class TestSnapshotItems:
+    def test_filters_snapshot_by_namespace_and_label(self):
+        k8s = _k8s([
+            _pod("coredns", namespace="kube-system", labels={"k8s-app": "kube-dns"}),
+            _pod("proxy", namespace="kube-system"),
+            _pod("app"),
+        ])
+        snapshot = ClusterSnapshot.fetch(k8s, kinds=("pods",))
+
+        pods = snapshot_items(
+            k8s, snapshot, "pods", namespace="kube-system", label_selector="k8s-app=kube-dns"
+        )
+
+        assert [p.metadata.name for p in pods] == ["coredns"]
+        assert k8s.v1.list_pod_for_all_namespaces.call_count == 1
+
+    def test_lists_directly_when_kind_missing_from_snapshot(self):
+        k8s = _k8s()
+        snapshot = ClusterSnapshot.fetch(k8s, kinds=("pods",))
+
+        snapshot_items(k8s, snapshot, "warning_events")
+
+        k8s.v1.list_event_for_all_namespaces.assert_called_once_with(field_selector="type=Warning")
+
+
+def test_detect_common_issues_lists_pods_and_services_once():
+    k8s = _k8s()
+
+    asyncio.get_event_loop().run_until_complete(DiagnosticsEngine(k8s).detect_common_issues())
+
+    assert k8s.v1.list_pod_for_all_namespaces.call_count == 1
+    assert k8s.v1.list_service_for_all_namespaces.call_count == 1
+    assert k8s.v1.list_node.call_count == 1
@@ -0,0 +1,110 @@
+"""Tests for src/k8s_diagnostics/core/views.py and the raw-JSON list path"""
+
+import json
+from datetime import datetime, timezone
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+import pytest
+
+from k8s_diagnostics.core.client import iter_pages, list_items
+from k8s_diagnostics.core.views import MapView, ObjectView, parse_list
+
+POD = {
+    "metadata": {
+        "name": "web-1",
+        "namespace": "prod",
+        "labels": {"app": "web"},
+        "deletionTimestamp": "2024-05-01T10:00:00Z",
+    },
+    "spec": {
+        "containers": [{"name": "web", "livenessProbe": {"initialDelaySeconds": 3}}],
+        "selector": None,
+    },
+    "status": {
+        "phase": "Pending",
+        "containerStatuses": [
+            {"name": "web", "restartCount": 4, "state": {"waiting": {"reason": "CrashLoopBackOff"}}}
+        ],
+    },
+}
+
+
+def _raw_response(items, continue_token=None):
+    body = {"items": items, "metadata": {"continue": continue_token} if continue_token else {}}
+    return SimpleNamespace(data=json.dumps(body).encode())
+
+
+class TestObjectView:
+    def test_snake_case_attributes_resolve_camel_case_keys(self):
+        pod = ObjectView(POD)
+
+        assert pod.status.phase == "Pending"
+        assert pod.status.container_statuses[0].state.waiting.reason == "CrashLoopBackOff"
+        assert pod.status.container_statuses[0].restart_count == 4
+        assert pod.spec.containers[0].liveness_probe.initial_delay_seconds == 3
+
+    def test_unset_fields_read_as_none(self):
+        pod = ObjectView(POD)
+
+        assert pod.spec.init_containers is None
+        assert pod.status.container_statuses[0].state.running is None
+
+    def test_timestamps_are_parsed_to_aware_datetimes(self):
+        ts = ObjectView(POD).metadata.deletion_timestamp
+        assert ts == datetime(2024, 5, 1, 10, 0, tzinfo=timezone.utc)
+
+    def test_map_fields_behave_as_read_only_dicts(self):
+        labels = ObjectView(POD).metadata.labels
+
+        assert isinstance(labels, MapView)
+        assert labels == {"app": "web"}
+        assert labels.get("app") == "web"
+        assert dict(labels.items()) == {"app": "web"}
+        with pytest.raises(TypeError):
+            labels["app"] = "other"
+
+    def test_views_are_read_only(self):
+        with pytest.raises(AttributeError):
+            ObjectView(POD).status.phase = "Running"
+
+    def test_reserved_word_attributes_use_model_mapping(self):
+        _, metadata = parse_list(json.dumps({"items": [], "metadata": {"continue": "abc"}}))
+        assert metadata._continue == "abc"
+
+
+class TestRawJsonListPath:
+    def test_list_items_requests_undecoded_body_for_raw_kinds(self):
+        k8s = MagicMock()
+        k8s.informers = None
+        k8s.raw_json_kinds = frozenset({"pods"})
+        k8s.v1.list_pod_for_all_namespaces.return_value = _raw_response([POD])
+
+        pods = list_items(k8s, "pods", field_selector="status.phase=Pending")
+
+        assert pods[0].metadata.name == "web-1"
+        k8s.v1.list_pod_for_all_namespaces.assert_called_once_with(
+            _preload_content=False, field_selector="status.phase=Pending"
+        )
+
+    def test_other_kinds_stay_on_model_path(self):
+        k8s = MagicMock()
+        k8s.informers = None
+        k8s.raw_json_kinds = frozenset({"pods"})
+        k8s.apps_v1.list_deployment_for_all_namespaces.return_value.items = ["model"]
+
+        assert list_items(k8s, "deployments") == ["model"]
+
+    def test_iter_pages_follows_continue_token_from_raw_metadata(self):
+        k8s = MagicMock()
+        k8s.informers = None
+        k8s.raw_json_kinds = frozenset({"pods"})
+        k8s.v1.list_pod_for_all_namespaces.side_effect = [
+            _raw_response([POD], continue_token="next"),
+            _raw_response([POD]),
+        ]
+
+        pages = list(iter_pages(k8s, "pods", page_size=1))
+
+        assert len(pages) == 2
+        assert k8s.v1.list_pod_for_all_namespaces.call_args_list[1].kwargs["_continue"] == "next"